@@ -1,56 +1,95 @@
 from __future__ import annotations
 
+import logging
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Iterator, Mapping, Optional, Sequence, Tuple
 
-import joblib
+import numpy as np
 import pandas as pd
 
+from adapters.artifact_store import COMPILED_FOREST_KEY, SplitArtifact, meta_view, split_sibling
+from adapters.forest_engine import (
+    ANYTIME_FIRST_TREES,
+    DEFAULT_SPREAD_QUANTILES,
+    AnytimeEstimate,
+    CompiledPipeline,
+    EarlyExitDecision,
+    TreeSpread,
+    UnsupportedModelError,
+    compile_pipeline,
+)
+from adapters.inference_policy import inference_scope
+from adapters.input_validation import DEFAULT_REJECT, InputValidator, ValidationReport, validator_for
+from adapters.model_registry import get_registry
+from adapters.onnx_backend import load_onnx_pipeline
+from adapters.prediction_cache import get_prediction_cache
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass(frozen=True)
 class ModelArtifact:
     pipeline: Any
     best_threshold: float
-    meta: Dict[str, Any]
+    meta: Mapping[str, Any]
+    forest: Optional[Any] = None  # mmap artifact의 CompiledForest
 
 
 class PurchaseIntentModelAdapter:
     """
-    - artifacts/*.joblib 로딩 (pipeline + threshold)
+    - artifacts/*.joblib 로딩 (pipeline + threshold, 프로세스 전역 ModelRegistry 공유)
     - 서비스에서 predict/predict_proba 호출할 수 있게 제공
+    - mmap_mode="r" + mmap 디렉토리 artifact면 압축 해제 없이 열고 CompiledForest 배열(forest/*.npy)은 page cache 공유
+      (채점은 ServingPipeline, sklearn pipeline은 큰 배치 / named_steps에 처음 접근할 때만 프로세스마다 로드)
+    - predict_proba 결과는 프로세스 전역 PredictionCache에 (입력 row + artifact 지문) 기준으로 저장
+      (화면 크기 배치만, 대량 채점은 캐시를 거치지 않음)
+    - 검증된 ONNX sidecar + onnxruntime이 있으면 predict_proba는 onnxruntime으로 채점 (없으면 sklearn)
+    - validate() / predict_proba_validated(): 학습 스키마로 배치를 검사하고 통과한 row만 채점
+    - predict_proba_spread(): 확률 + 트리 간 편차 컬럼 (컴파일 엔진 순회 한 번)
+    - predict_progressive(): 일부 트리 추정치(+ 오차 구간)를 먼저 내고 exact 값으로 갱신 (슬라이더 화면용)
     """
 
-    def __init__(self, model_path: str | Path):
+    def __init__(self, model_path: str | Path, mmap_mode: Optional[str] = None):
         self._model_path = Path(model_path)
-        self._artifact: Optional[ModelArtifact] = None
+        self.mmap_mode = mmap_mode
+        # (pipeline weakref, CompiledPipeline 또는 None): early-exit 판정용, artifact가 바뀌면 다시 만든다.
+        self._compiled: Optional[Tuple[Any, Optional[CompiledPipeline]]] = None
+        # (pipeline weakref, ONNX sidecar로 채점하는 CompiledPipeline 또는 None)
+        self._onnx: Optional[Tuple[Any, Optional[CompiledPipeline]]] = None
+        # (pipeline weakref, InputValidator 또는 None)
+        self._validator: Optional[Tuple[Any, Optional[InputValidator]]] = None
 
     def load(self) -> ModelArtifact:
-        if self._artifact is not None:
-            return self._artifact
-
         if not self._model_path.exists():
             raise FileNotFoundError(f"Model artifact not found: {self._model_path}")
 
-        raw = joblib.load(self._model_path)
-        
+        raw = get_registry().load(self._model_path, mmap_mode=self.mmap_mode)
+
         pipeline = None
         best_threshold = 0.5
         meta = {}
+        forest = None
 
         # Case 1: The loaded object is the pipeline itself (legacy support)
         if hasattr(raw, "predict_proba"):
             pipeline = raw
             # Try to infer meta if possible, otherwise empty
         
-        # Case 2: It is a dictionary
-        elif isinstance(raw, dict):
+        # Case 2: It is a dictionary (or a lazily loaded split artifact)
+        elif isinstance(raw, Mapping):
+            forest = raw.get(COMPILED_FOREST_KEY)
+
             # Try to find pipeline
             if "pipeline" in raw:
                 pipeline = raw["pipeline"]
             else:
                 # Search for any value that looks like a model
-                for k, v in raw.items():
+                for k in raw:
+                    if k == COMPILED_FOREST_KEY:
+                        continue
+                    v = raw[k]
                     if hasattr(v, "predict_proba"):
                         pipeline = v
                         break
@@ -60,7 +99,7 @@ class PurchaseIntentModelAdapter:
                 best_threshold = float(raw["best_threshold"])
             
             # Store everything else as meta
-            meta = {k: v for k, v in raw.items() if k not in ("pipeline", "best_threshold")}
+            meta = meta_view(raw, exclude=("pipeline", "best_threshold", COMPILED_FOREST_KEY))
 
         if pipeline is None:
             raise ValueError(
@@ -68,26 +107,175 @@ class PurchaseIntentModelAdapter:
                 "Could not find a valid pipeline model with 'predict_proba'."
             )
 
-        self._artifact = ModelArtifact(
+        return ModelArtifact(
             pipeline=pipeline,
             best_threshold=best_threshold,
             meta=meta,
+            forest=forest,
         )
-        return self._artifact
 
     def predict_proba(self, features: pd.DataFrame) -> pd.Series:
+        registry = get_registry()
+        fingerprint = registry.fingerprint(self._model_path, self.mmap_mode)
         art = self.load()
-        proba = art.pipeline.predict_proba(features)[:, 1]
+
+        onnx = self._onnx_pipeline(art)
+
+        def score(frame: pd.DataFrame):
+            if onnx is not None:
+                try:
+                    return onnx.predict_proba(frame)[:, 1]
+                except Exception:
+                    # onnxruntime에서 실패하면 이 모델은 이후에도 sklearn으로 채점
+                    logger.warning("onnxruntime scoring failed; using sklearn.", exc_info=True)
+                    self._onnx = (weakref.ref(art.pipeline), None)
+            with inference_scope(len(frame)):
+                return art.pipeline.predict_proba(frame)[:, 1]
+
+        # 로드 도중 artifact가 교체됐으면 어느 버전의 결과인지 모호하므로 캐시를 거치지 않는다.
+        if fingerprint is None or fingerprint != registry.fingerprint(self._model_path, self.mmap_mode):
+            proba = score(features)
+        else:
+            token = (str(self._model_path.resolve()), self.mmap_mode, fingerprint)
+            proba = get_prediction_cache().predict(features, token, score)
         return pd.Series(proba, index=features.index, name="purchase_proba")
 
-    def predict(self, features: pd.DataFrame, threshold: Optional[float] = None) -> pd.Series:
+    def validate(self, features: pd.DataFrame, reject: int = DEFAULT_REJECT) -> ValidationReport:
+        """
+        학습 스키마 기준 배치 검증 (artifact의 input_schema, 없으면 모델 전처리에서 생성).
+        검증 규칙을 만들 수 없는 모델이면 모든 row를 valid로 본다.
+        """
+        art = self.load()
+        if self._validator is None or self._validator[0]() is not art.pipeline:
+            raw = get_registry().load(self._model_path, mmap_mode=self.mmap_mode)
+            self._validator = (weakref.ref(art.pipeline), validator_for(raw, art.pipeline))
+        validator = self._validator[1]
+        if validator is None:
+            return ValidationReport(codes=np.zeros(len(features), dtype=np.uint16), reject=reject)
+        return validator.validate(features, reject=reject)
+
+    def predict_proba_validated(
+        self, features: pd.DataFrame, reject: int = DEFAULT_REJECT
+    ) -> Tuple[pd.Series, ValidationReport]:
+        """
+        검증을 통과한 row만 채점한다. 격리된 row의 확률은 NaN (사유는 report.split(features)[1])
+        """
+        report = self.validate(features, reject=reject)
+        proba = pd.Series(np.nan, index=features.index, name="purchase_proba")
+        valid = report.valid
+        if valid.any():
+            frame = features if valid.all() else features.loc[valid]
+            proba.loc[valid] = self.predict_proba(frame).to_numpy()
+        return proba, report
+
+    def predict_proba_spread(
+        self,
+        features: pd.DataFrame,
+        levels: Sequence[float] = DEFAULT_SPREAD_QUANTILES,
+    ) -> pd.DataFrame:
+        """
+        purchase_proba + 트리별 양성 확률의 표준편차 / 분위수 컬럼 (forest_engine.TreeSpread.to_frame)
+        컴파일 엔진이 지원하지 않는 모델이면 predict_proba + NaN 편차
+        """
+        compiled = self._compiled_pipeline(self.load())
+        if compiled is None:
+            spread = TreeSpread.unavailable(self.predict_proba(features).to_numpy(), tuple(levels))
+        else:
+            spread = compiled.predict_spread(features, tuple(levels))
+        return spread.to_frame(index=features.index)
+
+    def predict_progressive(
+        self, features: pd.DataFrame, first_trees: int = ANYTIME_FIRST_TREES
+    ) -> Iterator[AnytimeEstimate]:
+        """
+        anytime 예측 (forest_engine.CompiledForest.predict_progressive)
+        - 앞쪽 first_trees개 트리 추정치 + 확정 구간(lower / upper)을 먼저, 이후 갱신, 마지막은 exact
+        - exact 결과는 PredictionCache에 저장 → 같은 입력은 다음부터 exact 하나만 바로 나온다.
+        - 컴파일 엔진이 지원하지 않는 모델이면 predict_proba 결과 하나 (exact)
+        """
+        registry = get_registry()
+        fingerprint = registry.fingerprint(self._model_path, self.mmap_mode)
+        art = self.load()
+        compiled = self._compiled_pipeline(art)
+        if compiled is None:
+            yield AnytimeEstimate.final(self.predict_proba(features).to_numpy())
+            return
+
+        cache = get_prediction_cache()
+        keys = None
+        if cache.accepts(len(features)) and fingerprint is not None:
+            token = (str(self._model_path.resolve()), self.mmap_mode, fingerprint)
+            keys = cache.keys_for(features, token)
+            values, found = cache.get_many(keys)
+            if found.all():
+                yield AnytimeEstimate.final(values, compiled.forest.n_trees)
+                return
+
+        for estimate in compiled.predict_progressive(features, first_trees=first_trees):
+            if estimate.exact and keys is not None:
+                # 도중에 artifact가 교체됐으면 어느 버전의 결과인지 모호하므로 저장하지 않는다.
+                if fingerprint == registry.fingerprint(self._model_path, self.mmap_mode):
+                    cache.put_many(keys, estimate.probability)
+            yield estimate
+
+    def predict(
+        self,
+        features: pd.DataFrame,
+        threshold: Optional[float] = None,
+        early_exit: bool = False,
+    ) -> pd.Series:
+        """
+        early_exit=True면 decide()로 판정 (결정이 확정되면 남은 트리를 평가하지 않음)
+        """
+        if early_exit:
+            return pd.Series(
+                self.decide(features, threshold).decision.astype(int), index=features.index, name="purchase_pred"
+            )
         art = self.load()
         thr = art.best_threshold if threshold is None else float(threshold)
         proba = self.predict_proba(features)
         pred = (proba >= thr).astype(int)
         return pd.Series(pred.values, index=features.index, name="purchase_pred")
 
+    def _onnx_pipeline(self, art: ModelArtifact) -> Optional[CompiledPipeline]:
+        if self._onnx is None or self._onnx[0]() is not art.pipeline:
+            self._onnx = (weakref.ref(art.pipeline), load_onnx_pipeline(self._model_path, art.pipeline))
+        return self._onnx[1]
+
+    def _compiled_pipeline(self, art: ModelArtifact) -> Optional[CompiledPipeline]:
+        if self._compiled is None or self._compiled[0]() is not art.pipeline:
+            try:
+                compiled = compile_pipeline(art.pipeline, forest=art.forest)
+            except UnsupportedModelError:
+                compiled = None
+            self._compiled = (weakref.ref(art.pipeline), compiled)
+        return self._compiled[1]
+
+    def decide(self, features: pd.DataFrame, threshold: Optional[float] = None) -> EarlyExitDecision:
+        """
+        (확률 >= threshold) 판정 + row별로 실제 평가한 트리 수.
+
+        - 트리를 나눠 평가하다가 남은 트리로는 결과가 뒤집힐 수 없으면 멈춘다. (CompiledForest.decide)
+        - 확률값이 아니라 판정만 필요할 때 사용 (대부분이 뚜렷한 음성인 전체 데이터 채점 등)
+        - 컴파일 엔진이 지원하지 않는 모델이면 predict_proba로 판정 (trees_used = 전체)
+        """
+        art = self.load()
+        thr = art.best_threshold if threshold is None else float(threshold)
+        compiled = self._compiled_pipeline(art)
+        if compiled is not None:
+            return compiled.decide(features, thr)
+
+        proba = self.predict_proba(features).to_numpy()
+        n_trees = len(getattr(art.pipeline, "estimators_", ())) or 0
+        return EarlyExitDecision(proba >= thr, np.full(len(proba), n_trees, dtype=np.intp), n_trees)
+
     def get_threshold(self) -> float:
+        # split artifact(또는 같은 버전을 export한 옆의 <stem>.split)면 manifest.json만 읽는다 (forest 역직렬화 없음)
+        if self._model_path.exists():
+            path = split_sibling(self._model_path) or self._model_path
+            raw = get_registry().load(path, mmap_mode=self.mmap_mode)
+            if isinstance(raw, SplitArtifact):
+                return float(raw.meta.get("best_threshold", 0.5))
         return float(self.load().best_threshold)
 
     def get_training_data(self) -> pd.DataFrame:
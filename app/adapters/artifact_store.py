@@ -0,0 +1,665 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import pickle
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+import joblib
+import numpy as np
+
+from adapters.calibration import CalibrationLayer, base_estimator, upgrade_calibration
+from adapters.forest_engine import (
+    CompiledForest,
+    CompiledPipeline,
+    UnsupportedModelError,
+    _split_pipeline,
+    compile_pipeline,
+)
+from adapters.fused_preprocess import try_build_fused
+from adapters.inference_policy import configure_for_inference
+
+# mmap 디렉토리 레이아웃
+#
+#   best_pr_auc_balancedrf.mmap/
+#     ├ artifact.joblib        # 압축 없는 joblib (mmap_mode로 열 수 있음)
+#     ├ serving.pkl            # 전처리 / calibration 파라미터 / 메타 (mmap_mode로 열면 이것 + forest로 채점)
+#     └ forest/
+#         ├ forest.json        # n_features / max_depth / n_trees
+#         ├ feature.npy        # CompiledForest 노드 배열 (np.load(mmap_mode=...))
+#         ├ threshold.npy
+#         └ ...
+ARTIFACT_FILE = "artifact.joblib"
+SERVING_FILE = "serving.pkl"
+FOREST_DIR = "forest"
+FOREST_META_FILE = "forest.json"
+
+# split 디렉토리 레이아웃 (manifest + 컴포넌트별 파일, 필요한 것만 로드)
+#
+#   best_pr_auc_balancedrf.split/
+#     ├ manifest.json          # threshold / 컬럼 / 지표 / 파라미터 + 컴포넌트 목록과 해시
+#     ├ components/
+#     │   ├ base_pipeline.joblib   # 압축 없음 (mmap 가능)
+#     │   └ pipeline.pkl           # calibrator: base_pipeline은 참조만 저장
+#     └ forest/                # (선택) CompiledForest .npy 블록
+MANIFEST_FILE = "manifest.json"
+COMPONENT_DIR = "components"
+SPLIT_FORMAT_VERSION = 1
+# .joblib 옆에 export한 split 디렉토리의 확장자 (script/export_mmap_artifact.py --layout split)
+SPLIT_SUFFIX = ".split"
+
+# mmap 레이아웃에서 로드한 CompiledForest를 raw dict에 넣어 전달할 때 쓰는 키
+COMPILED_FOREST_KEY = "compiled_forest"
+
+# (경로, mmap_mode, loader) -> 객체. ModelRegistry.load와 같은 모양 (컴포넌트 로딩 위임용)
+ComponentResolver = Callable[[Path, Optional[str], Callable[[Path, Optional[str]], Any]], Any]
+
+
+def is_mmap_artifact(path: str | Path) -> bool:
+    path = Path(path)
+    return path.is_dir() and (path / ARTIFACT_FILE).exists()
+
+
+def is_split_artifact(path: str | Path) -> bool:
+    path = Path(path)
+    return path.is_dir() and (path / MANIFEST_FILE).exists()
+
+
+def artifact_file(path: str | Path) -> Path:
+    """
+    변경 감지(fingerprint)에 쓰는 실제 파일.
+    - split 디렉토리: manifest.json / mmap 디렉토리: artifact.joblib / forest 디렉토리: forest.json
+    """
+    path = Path(path)
+    if is_split_artifact(path):
+        return path / MANIFEST_FILE
+    if is_mmap_artifact(path):
+        return path / ARTIFACT_FILE
+    if path.is_dir() and (path / FOREST_META_FILE).exists():
+        return path / FOREST_META_FILE
+    return path
+
+
+def file_hash(path: Path, chunk_size: int = 1 << 20) -> str:
+    """파일 내용 해시 (mtime만 바뀐 경우(touch, 같은 파일 재복사)를 걸러내는 용도)"""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _start_tmp_dir(out_dir: Path) -> Path:
+    tmp_dir = out_dir.with_name(out_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+    return tmp_dir
+
+
+def _finish_tmp_dir(tmp_dir: Path, out_dir: Path) -> Path:
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    tmp_dir.rename(out_dir)
+    return out_dir
+
+
+def _compile_raw(raw: Mapping[str, Any]) -> Optional[CompiledPipeline]:
+    """
+    raw["pipeline"] -> CompiledPipeline (미지원 구조면 None)
+    raw에 COMPILED_FOREST_KEY가 있으면 (compaction 결과 등) 다시 펼치지 않고 그 forest를 쓴다.
+    """
+    try:
+        return compile_pipeline(raw["pipeline"], forest=raw.get(COMPILED_FOREST_KEY))
+    except (KeyError, UnsupportedModelError):
+        return None
+
+
+def _write_forest(forest: CompiledForest, out_dir: Path) -> Dict[str, Any]:
+    """CompiledForest를 out_dir/forest/*.npy + forest.json으로 저장"""
+    forest_dir = out_dir / FOREST_DIR
+    forest_dir.mkdir()
+    for name, arr in forest.to_arrays().items():
+        np.save(forest_dir / f"{name}.npy", np.ascontiguousarray(arr))
+    info = {"n_features": forest.n_features, "max_depth": forest.max_depth, "n_trees": forest.n_trees}
+    (forest_dir / FOREST_META_FILE).write_text(json.dumps(info, indent=2), encoding="utf-8")
+    return info
+
+
+def save_mmap_artifact(raw: Dict[str, Any], out_dir: str | Path) -> Path:
+    """
+    artifact dict를 mmap 친화적인 디렉토리 레이아웃으로 저장한다.
+
+    - artifact.joblib: 압축 없이 저장 (cold start에서 압축 해제 비용 없음)
+    - forest/*.npy: pipeline을 CompiledForest로 펼친 노드 배열
+    - serving.pkl: 전처리 / calibration 파라미터 / 입력 컬럼 / JSON 메타 (serving_parts)
+      (지원하지 않는 모델 구조면 forest / serving.pkl 생략 → artifact.joblib만 저장)
+
+    mmap_mode를 주고 열면 serving.pkl + forest/*.npy(워커 간 공유)로 채점하고,
+    artifact.joblib(sklearn pipeline)은 named_steps 등이 필요할 때만 unpickle한다. (ServingArtifact)
+
+    같은 경로에 이미 있으면 임시 디렉토리에 다 쓴 뒤 교체한다.
+
+    Returns:
+        Path: 저장된 디렉토리
+    """
+    out_dir = Path(out_dir)
+    tmp_dir = _start_tmp_dir(out_dir)
+    # CompiledForest는 forest/*.npy로만 저장 (pickle에 중복으로 넣지 않음)
+    joblib.dump({k: v for k, v in raw.items() if k != COMPILED_FOREST_KEY}, tmp_dir / ARTIFACT_FILE, compress=0)
+    compiled = _compile_raw(raw)
+    if compiled is not None:
+        _write_forest(compiled.forest, tmp_dir)
+        with open(tmp_dir / SERVING_FILE, "wb") as f:
+            pickle.dump(serving_parts(raw, compiled), f, protocol=pickle.HIGHEST_PROTOCOL)
+    return _finish_tmp_dir(tmp_dir, out_dir)
+
+
+def load_compiled_forest(path: str | Path, mmap_mode: Optional[str] = None) -> Optional[CompiledForest]:
+    """mmap / split 디렉토리의 forest/*.npy -> CompiledForest (없으면 None)"""
+    forest_dir = Path(path) / FOREST_DIR
+    meta_path = forest_dir / FOREST_META_FILE
+    if not meta_path.exists():
+        return None
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    arrays = {
+        name: np.load(forest_dir / f"{name}.npy", mmap_mode=mmap_mode)
+        for name in CompiledForest.ARRAY_FIELDS
+    }
+    return CompiledForest.from_arrays(arrays, n_features=meta["n_features"], max_depth=meta["max_depth"])
+
+
+# --------------------
+# sklearn forest 없이 채점 (mmap_mode / 공유 메모리)
+# --------------------
+def serving_parts(raw: Mapping[str, Any], compiled: CompiledPipeline) -> Dict[str, Any]:
+    """
+    CompiledForest 외에 채점에 필요한 작은 부분 (mmap serving.pkl / shared_model 블록에 저장)
+    - 전처리 / calibration 파라미터 / 입력 컬럼 / classes / JSON 메타 / artifact 키 목록
+    """
+    pipeline = raw["pipeline"]
+    return {
+        "preprocess": compiled.preprocess,
+        "calibration": compiled.calibration.to_dict() if compiled.calibration is not None else None,
+        "feature_names_in": list(getattr(pipeline, "feature_names_in_", [])),
+        "classes": np.asarray(getattr(pipeline, "classes_", [0, 1])).tolist(),
+        "meta": {k: raw[k] for k in raw if k not in ("pipeline", COMPILED_FOREST_KEY) and _is_json_value(raw[k])},
+        "keys": [k for k in raw if k != COMPILED_FOREST_KEY],
+        # 원본 앙상블을 큰 배치용 estimator로 쓸 수 있는지 (트리 수가 forest와 같은지)
+        "estimator": compiled.estimator is not None,
+    }
+
+
+class _LazyEstimator:
+    """
+    CompiledPipeline.estimator 자리에 두는 지연 로더.
+    uses_estimator()가 참인 큰 배치에서 처음 접근할 때 sklearn 앙상블을 로드한다.
+    """
+
+    __slots__ = ("_load_sklearn",)
+
+    def __init__(self, load_sklearn: Callable[[], Any]):
+        self._load_sklearn = load_sklearn
+
+    @property
+    def estimator(self) -> Any:
+        return _split_pipeline(base_estimator(self._load_sklearn()))[1]
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.estimator.classes_
+
+    @property
+    def estimators_(self) -> List[Any]:
+        return self.estimator.estimators_
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self.estimator.predict_proba(X)
+
+
+class ServingPipeline:
+    """
+    CompiledPipeline(전처리 + CompiledForest + calibration)으로 채점하는 객체 (artifact["pipeline"] 대신 사용).
+
+    - predict_proba / classes_ / feature_names_in_: sklearn pipeline과 같은 모양
+    - compiled_: CompiledPipeline (compile_pipeline()이 그대로 사용 → fast path / early-exit도 동작)
+    - forest.batch_row_limit보다 큰 배치(compiled_.estimator)와 named_steps는
+      sklearn pipeline이 필요하므로 그때 처음 로드한다.
+    """
+
+    def __init__(self, compiled: CompiledPipeline, feature_names_in: List[str], classes: List[Any],
+                 load_sklearn: Callable[[], Any]):
+        self.compiled_ = compiled
+        self.classes_ = np.asarray(classes)
+        if feature_names_in:
+            self.feature_names_in_ = np.asarray(feature_names_in, dtype=object)
+        self._load_sklearn = load_sklearn
+
+    @property
+    def sklearn_pipeline(self) -> Any:
+        """원본 artifact["pipeline"] (처음 접근할 때 unpickle)"""
+        return self._load_sklearn()
+
+    @property
+    def named_steps(self) -> Any:
+        """calibration 안쪽 sklearn Pipeline의 named_steps (preprocess / model)"""
+        return base_estimator(self.sklearn_pipeline).named_steps
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        return self.compiled_.predict_proba(X)
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[(self.predict_proba(X)[:, 1] >= 0.5).astype(int)]
+
+
+class ServingArtifact(Mapping):
+    """
+    serving_parts + CompiledForest로 만든 artifact 뷰 (읽기 전용 Mapping, load_raw_artifact와 같은 키).
+
+    - JSON 메타 / "pipeline"(ServingPipeline) / COMPILED_FOREST_KEY는 바로 반환
+    - 그 외 키(base_pipeline 등)와 sklearn pipeline은 처음 필요할 때 load_full()로 원본 artifact를 한 번 읽는다.
+      (configure_for_inference / upgrade_calibration까지 적용)
+    """
+
+    # __dict__가 없어야 레지스트리의 메모리 추정이 지연 로더까지 따라가지 않는다.
+    __slots__ = ("parts", "forest", "pipeline", "_load_full", "_full", "_lock")
+
+    def __init__(
+        self,
+        parts: Mapping[str, Any],
+        forest: CompiledForest,
+        load_full: Callable[[], Any],
+        pipeline_type: type = ServingPipeline,
+        **pipeline_kwargs: Any,
+    ):
+        self.parts = parts
+        self.forest = forest
+        self._load_full = load_full
+        self._full: Optional[Mapping[str, Any]] = None
+        self._lock = threading.Lock()
+
+        def load_sklearn() -> Any:
+            return self.full()["pipeline"]
+
+        calibration = CalibrationLayer.from_dict(parts["calibration"]) if parts["calibration"] else None
+        compiled = CompiledPipeline(
+            preprocess=parts["preprocess"],
+            forest=forest,
+            calibration=calibration,
+            fused=try_build_fused(parts["preprocess"]),
+            estimator=_LazyEstimator(load_sklearn) if parts.get("estimator") else None,
+        )
+        self.pipeline = pipeline_type(
+            compiled, parts["feature_names_in"], parts["classes"], load_sklearn=load_sklearn, **pipeline_kwargs,
+        )
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return self.parts["meta"]
+
+    @property
+    def full_loaded(self) -> bool:
+        return self._full is not None
+
+    def full(self) -> Mapping[str, Any]:
+        """원본 artifact (처음 호출할 때 한 번만 로드)"""
+        if self._full is None:
+            with self._lock:
+                if self._full is None:
+                    raw = self._load_full()
+                    configure_for_inference(raw)
+                    self._full = upgrade_calibration(raw)
+        return self._full
+
+    def _keys(self) -> list:
+        return list(self.parts["keys"]) + [COMPILED_FOREST_KEY]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self.parts["keys"]) + 1
+
+    def __contains__(self, key: object) -> bool:
+        return key == COMPILED_FOREST_KEY or key in self.parts["keys"]
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "pipeline":
+            return self.pipeline
+        if key == COMPILED_FOREST_KEY:
+            return self.forest
+        if key in self.meta:
+            return self.meta[key]
+        if key in self.parts["keys"]:
+            return self.full()[key]
+        raise KeyError(key)
+
+
+# --------------------
+# split 레이아웃
+# --------------------
+def _is_json_value(value: Any) -> bool:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+class _RefPickler(pickle.Pickler):
+    """다른 컴포넌트 객체는 내용 대신 이름(persistent id)만 기록하는 pickler"""
+
+    def __init__(self, file: Any, ref_ids: Mapping[int, str], own_id: int):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._ref_ids = ref_ids
+        self._own_id = own_id
+        self.used: Set[str] = set()
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        name = self._ref_ids.get(id(obj))
+        if name is None or id(obj) == self._own_id:
+            return None
+        self.used.add(name)
+        return name
+
+
+class _RefUnpickler(pickle.Unpickler):
+    def __init__(self, file: Any, resolve_ref: Callable[[str], Any]):
+        super().__init__(file)
+        self._resolve_ref = resolve_ref
+
+    def persistent_load(self, pid: str) -> Any:
+        return self._resolve_ref(pid)
+
+
+def save_split_artifact(
+    raw: Mapping[str, Any],
+    out_dir: str | Path,
+    with_forest: bool = True,
+    source: Optional[str | Path] = None,
+) -> Path:
+    """
+    artifact dict를 manifest + 컴포넌트 파일로 나눠 저장한다.
+
+    - JSON으로 표현되는 값(threshold, 컬럼 목록, 지표, 파라미터 ...) → manifest.json의 "meta"
+    - 그 외 객체(pipeline, base_pipeline ...) → components/ 아래 각각의 파일
+      다른 컴포넌트를 참조하는 객체(예: CalibratedClassifierCV → base_pipeline)는
+      참조 이름만 저장하므로 forest가 두 번 저장/로드되지 않는다.
+    - with_forest=True면 CompiledForest .npy 블록도 함께 저장
+    - source: export 원본 .joblib 경로. 파일 지문(크기, mtime)을 manifest에 남겨
+      원본이 그대로일 때만 split_sibling()이 이 디렉토리를 대신 쓰도록 한다.
+
+    Returns:
+        Path: 저장된 디렉토리
+    """
+    out_dir = Path(out_dir)
+    tmp_dir = _start_tmp_dir(out_dir)
+    (tmp_dir / COMPONENT_DIR).mkdir()
+
+    meta = {k: v for k, v in raw.items() if _is_json_value(v)}
+    objects = {k: v for k, v in raw.items() if k not in meta and k != COMPILED_FOREST_KEY}
+    ref_ids = {id(v): k for k, v in objects.items()}
+
+    components: Dict[str, Any] = {}
+    for name, value in objects.items():
+        buf = io.BytesIO()
+        pickler = _RefPickler(buf, ref_ids, own_id=id(value))
+        pickler.dump(value)
+        if pickler.used:
+            file = tmp_dir / COMPONENT_DIR / f"{name}.pkl"
+            file.write_bytes(buf.getvalue())
+        else:
+            # 참조가 없으면 joblib(압축 없음)으로 저장 → mmap_mode 사용 가능
+            file = tmp_dir / COMPONENT_DIR / f"{name}.joblib"
+            joblib.dump(value, file, compress=0)
+        components[name] = {
+            "file": f"{COMPONENT_DIR}/{file.name}",
+            "type": f"{type(value).__module__}.{type(value).__name__}",
+            "refs": sorted(pickler.used),
+            "size": file.stat().st_size,
+            "hash": file_hash(file),
+        }
+
+    compiled = _compile_raw(raw) if with_forest else None
+    forest = _write_forest(compiled.forest, tmp_dir) if compiled is not None else None
+    manifest = {
+        "format": "split",
+        "version": SPLIT_FORMAT_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "meta": meta,
+        "components": components,
+        "forest": forest,
+    }
+    if source is not None:
+        manifest["source"] = _source_fingerprint(Path(source))
+    (tmp_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return _finish_tmp_dir(tmp_dir, out_dir)
+
+
+def read_manifest(path: str | Path) -> Dict[str, Any]:
+    return json.loads((Path(path) / MANIFEST_FILE).read_text(encoding="utf-8"))
+
+
+def _source_fingerprint(path: Path) -> Dict[str, int]:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def split_sibling(path: str | Path) -> Optional[Path]:
+    """
+    .joblib 파일을 export한 split 디렉토리(<stem>.split)가 옆에 있으면 그 경로.
+    메타만 필요한 호출부(threshold 조회 등)가 forest를 unpickle하지 않고 manifest만 읽도록 할 때 쓴다.
+    원본 지문이 기록되지 않았거나 .joblib이 export 이후 바뀌었으면 None
+    """
+    path = Path(path)
+    sibling = path.with_suffix(SPLIT_SUFFIX)
+    if path.is_dir() or not is_split_artifact(sibling):
+        return None
+    try:
+        source = read_manifest(sibling).get("source")
+        return sibling if source is not None and source == _source_fingerprint(path) else None
+    except (OSError, ValueError):
+        return None
+
+
+def _direct_resolver() -> ComponentResolver:
+    # 레지스트리 없이 쓸 때: SplitArtifact 안에서만 캐시
+    cache: Dict[Any, Any] = {}
+
+    def resolve(path: Path, mmap_mode: Optional[str], loader: Callable[[Path, Optional[str]], Any]) -> Any:
+        key = (path, mmap_mode)
+        if key not in cache:
+            cache[key] = loader(path, mmap_mode)
+        return cache[key]
+
+    return resolve
+
+
+class SplitArtifact(Mapping):
+    """
+    split 레이아웃 artifact의 지연 로딩 뷰 (읽기 전용 Mapping).
+
+    - 생성 시 manifest.json만 읽는다 (수 ms)
+    - artifact["best_threshold"] 같은 메타 값은 manifest에서 바로 반환
+    - artifact["pipeline"] 등 컴포넌트는 처음 접근할 때 해당 파일만 역직렬화
+      (resolver로 ModelRegistry를 넘기면 컴포넌트도 레지스트리에서 공유/교체/해제)
+    - 한 번 꺼낸 컴포넌트는 이 객체가 들고 있는다. → 같은 manifest에서 꺼낸 컴포넌트끼리는 항상 같은 버전
+    """
+
+    # __dict__가 없어야 레지스트리의 메모리 추정이 resolver(레지스트리 자신)까지 따라가지 않는다.
+    __slots__ = ("path", "manifest", "mmap_mode", "_resolve", "_loaded")
+
+    def __init__(
+        self,
+        path: str | Path,
+        manifest: Dict[str, Any],
+        mmap_mode: Optional[str] = None,
+        resolver: Optional[ComponentResolver] = None,
+    ):
+        self.path = Path(path)
+        self.manifest = manifest
+        self.mmap_mode = mmap_mode
+        self._resolve = resolver or _direct_resolver()
+        self._loaded: Dict[str, Any] = {}
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """manifest에 저장된 JSON 메타 (컴포넌트 로딩 없음)"""
+        return self.manifest.get("meta", {})
+
+    @property
+    def components(self) -> Dict[str, Any]:
+        return self.manifest.get("components", {})
+
+    def _keys(self) -> list:
+        keys = list(self.meta) + [k for k in self.components if k not in self.meta]
+        if self.manifest.get("forest"):
+            keys.append(COMPILED_FOREST_KEY)
+        return keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.meta or key in self.components or (
+            key == COMPILED_FOREST_KEY and bool(self.manifest.get("forest"))
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.meta:
+            return self.meta[key]
+        if key in self.components or (key == COMPILED_FOREST_KEY and self.manifest.get("forest")):
+            return self.component(key)
+        raise KeyError(key)
+
+    def _source(self, name: str) -> Tuple[Path, Callable[[Path, Optional[str]], Any]]:
+        if name == COMPILED_FOREST_KEY:
+            return self.path / FOREST_DIR, _load_forest_dir
+        entry = self.components[name]
+        file = self.path / entry["file"]
+        if file.suffix == ".pkl":
+            return file, self._pickled_loader(entry.get("refs", []))
+        return file, _load_joblib_component
+
+    def sources(self) -> List[Tuple[Path, Callable[[Path, Optional[str]], Any]]]:
+        """
+        (파일 경로, loader) 목록. 참조가 없는 컴포넌트 -> 참조가 있는 컴포넌트 -> forest 순서
+        (레지스트리가 새 manifest의 컴포넌트를 미리 읽을 때 이 순서를 따른다)
+        """
+        names = sorted(self.components, key=lambda name: bool(self.components[name].get("refs")))
+        if self.manifest.get("forest"):
+            names.append(COMPILED_FOREST_KEY)
+        return [self._source(name) for name in names]
+
+    def component(self, name: str) -> Any:
+        value = self._loaded.get(name)
+        if value is None:
+            file, loader = self._source(name)
+            value = self._resolve(file, self.mmap_mode, loader)
+            self._loaded[name] = value
+        return value
+
+    def _pickled_loader(self, refs: Iterable[str]) -> Callable[[Path, Optional[str]], Any]:
+        refs = set(refs)
+
+        def load(file: Path, mmap_mode: Optional[str]) -> Any:
+            def resolve_ref(name: str) -> Any:
+                if name not in refs:
+                    raise pickle.UnpicklingError(f"Unknown component reference: {name}")
+                return self.component(name)
+
+            with open(file, "rb") as f:
+                return _RefUnpickler(f, resolve_ref).load()
+
+        return load
+
+
+def _load_joblib_component(file: Path, mmap_mode: Optional[str]) -> Any:
+    return joblib.load(file, mmap_mode=mmap_mode)
+
+
+def _load_forest_dir(forest_dir: Path, mmap_mode: Optional[str]) -> Optional[CompiledForest]:
+    return load_compiled_forest(forest_dir.parent, mmap_mode=mmap_mode)
+
+
+def meta_view(raw: Mapping[str, Any], exclude: Iterable[str] = ("pipeline", COMPILED_FOREST_KEY)) -> Mapping[str, Any]:
+    """
+    artifact에서 exclude 키를 뺀 메타 Mapping.
+    - dict: 새 dict (기존 동작)
+    - SplitArtifact / ServingArtifact: 컴포넌트를 로드하지 않는 지연 뷰 (값은 접근할 때 로드)
+    """
+    exclude = set(exclude)
+    if not isinstance(raw, dict):
+        return _MetaView(raw, exclude)
+    return {k: v for k, v in raw.items() if k not in exclude}
+
+
+class _MetaView(Mapping):
+    __slots__ = ("_raw", "_exclude")
+
+    def __init__(self, raw: Mapping[str, Any], exclude: Set[str]):
+        self._raw = raw
+        self._exclude = exclude
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._exclude:
+            raise KeyError(key)
+        return self._raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return (k for k in self._raw if k not in self._exclude)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, key: object) -> bool:
+        return key not in self._exclude and key in self._raw
+
+
+def load_raw_artifact(
+    path: str | Path,
+    mmap_mode: Optional[str] = None,
+    resolver: Optional[ComponentResolver] = None,
+) -> Any:
+    """
+    .joblib 파일 / mmap 디렉토리 / split 디렉토리를 읽어 raw 객체를 반환한다.
+
+    - .joblib 파일: joblib.load(path, mmap_mode=...)
+      (압축된 파일이면 joblib이 mmap_mode를 무시하고 메모리로 읽는다)
+    - mmap 디렉토리 + mmap_mode: serving.pkl + forest/*.npy로 만든 ServingArtifact
+      (artifact.joblib의 sklearn pipeline은 큰 배치 / named_steps / base_pipeline에 처음 접근할 때 로드)
+    - mmap 디렉토리: artifact.joblib + forest/*.npy
+      → dict이면 COMPILED_FOREST_KEY에 CompiledForest를 담아 반환
+    - split 디렉토리: manifest.json만 읽은 SplitArtifact (컴포넌트는 접근 시 로드)
+
+    ⚠️ sklearn Tree는 unpickle 시 노드 배열을 자체 버퍼로 복사하므로,
+       프로세스 간에 실제로 공유되는 것은 CompiledForest 배열과 그 외 NumPy 배열이다.
+    """
+    path = Path(path)
+    if is_split_artifact(path):
+        return SplitArtifact(path, read_manifest(path), mmap_mode=mmap_mode, resolver=resolver)
+    if not is_mmap_artifact(path):
+        return joblib.load(path, mmap_mode=mmap_mode)
+
+    forest = load_compiled_forest(path, mmap_mode=mmap_mode)
+    if mmap_mode is not None and forest is not None and (path / SERVING_FILE).exists():
+        with open(path / SERVING_FILE, "rb") as f:
+            parts = pickle.load(f)
+
+        def load_full() -> Any:
+            return {**joblib.load(path / ARTIFACT_FILE, mmap_mode=mmap_mode), COMPILED_FOREST_KEY: forest}
+
+        return ServingArtifact(parts, forest, load_full)
+
+    raw = joblib.load(path / ARTIFACT_FILE, mmap_mode=mmap_mode)
+    if forest is not None and isinstance(raw, dict):
+        raw = {**raw, COMPILED_FOREST_KEY: forest}
+    return raw
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Optional
+
+from adapters.model_registry import ModelRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+# 폴링 주기 환경변수 (초)
+WATCH_INTERVAL_ENV_VAR = "ARTIFACT_WATCH_INTERVAL_SEC"
+DEFAULT_WATCH_INTERVAL_SEC = 5.0
+
+
+class ArtifactWatcher:
+    """
+    ModelRegistry에 로드된 artifact 파일을 주기적으로 확인하는 watcher.
+
+    - interval마다 registry.check_for_updates() 호출 (파일 크기/mtime 변경 감지)
+    - 바뀐 artifact만 백그라운드에서 새로 로드 → 준비되면 registry 항목을 원자적으로 교체
+      (내용 해시가 같으면 재로딩 생략)
+    - 교체 전까지 / 진행 중인 예측은 기존 버전으로 처리
+    - 다른 artifact와 그에 딸린 캐시는 건드리지 않음
+
+    - 어댑터의 파생 캐시(스키마, fast path, 컴파일 엔진)는 모델 객체가 바뀌면 다음 요청에서 다시 만든다.
+    - 새 artifact는 임시 파일에 쓴 뒤 rename으로 교체하는 것을 권장 (쓰는 도중의 파일을 읽지 않도록)
+    """
+
+    def __init__(self, registry: Optional[ModelRegistry] = None, interval_sec: Optional[float] = None):
+        self.registry = registry or get_registry()
+        if interval_sec is None:
+            raw = os.environ.get(WATCH_INTERVAL_ENV_VAR, "").strip()
+            interval_sec = float(raw) if raw else DEFAULT_WATCH_INTERVAL_SEC
+        self.interval_sec = float(interval_sec)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "ArtifactWatcher":
+        if self.running:
+            return self
+        self.registry.hot_reload = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="artifact-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.registry.hot_reload = False
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            try:
+                self.registry.check_for_updates()
+            except Exception:
+                # 감시 루프는 죽지 않는다 (다음 주기에 다시 확인)
+                logger.warning("Checking artifacts for updates failed; retrying next interval.", exc_info=True)
+
+
+_WATCHER: Optional[ArtifactWatcher] = None
+_WATCHER_LOCK = threading.Lock()
+
+
+def start_artifact_watcher(interval_sec: Optional[float] = None) -> ArtifactWatcher:
+    """프로세스 전역 watcher 시작 (이미 실행 중이면 그대로 반환)"""
+    global _WATCHER
+    with _WATCHER_LOCK:
+        if _WATCHER is None:
+            _WATCHER = ArtifactWatcher(interval_sec=interval_sec)
+        return _WATCHER.start()
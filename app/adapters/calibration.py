@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+from scipy.special import expit
+from sklearn.base import BaseEstimator, ClassifierMixin
+
+from adapters.forest_engine import UnsupportedModelError, _unwrap_frozen
+
+SIGMOID = "sigmoid"
+ISOTONIC = "isotonic"
+
+
+@dataclass(frozen=True, eq=False)
+class CalibrationLayer:
+    """
+    CalibratedClassifierCV에서 꺼낸 calibration 파라미터 (양성 확률 -> calibrated 확률).
+
+    - sigmoid: p' = expit(-(a * p + b))          (a, b: calibrator별 계수, shape (k,))
+    - isotonic: p' = interp(p, x, y), 범위 밖은 양 끝 값 (CalibratedClassifierCV의 out_of_bounds="clip")
+    - calibrator가 여러 개(k>1)면 CalibratedClassifierCV와 같이 결과를 평균
+    - apply(pos, out=pos)로 base 확률 배열을 제자리에서 바꾼다. (sklearn처럼 중간 배열을 복사하지 않음)
+    - to_dict() / from_dict(): JSON으로 저장 가능한 파라미터 (다른 엔진에서도 같은 calibration 재사용)
+    """
+    method: str
+    a: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    b: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    x: Tuple[np.ndarray, ...] = ()
+    y: Tuple[np.ndarray, ...] = ()
+
+    @property
+    def n_calibrators(self) -> int:
+        return int(self.a.shape[0]) if self.method == SIGMOID else len(self.x)
+
+    @property
+    def is_monotone(self) -> bool:
+        """[0, 1]에서 단조 증가인지 (sigmoid는 a <= 0일 때, isotonic은 항상)"""
+        return self.method == ISOTONIC or bool(np.all(self.a <= 0.0))
+
+    def _one(self, i: int, pos: np.ndarray, out: np.ndarray) -> np.ndarray:
+        if self.method == SIGMOID:
+            np.multiply(pos, -self.a[i], out=out)
+            out -= self.b[i]
+            return expit(out, out=out)
+        out[...] = np.interp(pos, self.x[i], self.y[i])
+        return out
+
+    def apply(self, pos: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """calibrated 양성 확률. out=pos로 주면 제자리에서 계산한다."""
+        pos = np.asarray(pos, dtype=np.float64)
+        if out is None:
+            out = np.empty_like(pos)
+        if self.n_calibrators == 1:
+            return self._one(0, pos, out)
+        acc = np.zeros_like(pos)
+        tmp = np.empty_like(pos)
+        for i in range(self.n_calibrators):
+            acc += self._one(i, pos, tmp)
+        np.divide(acc, self.n_calibrators, out=out)
+        return out
+
+    # --------------------
+    # 변환 / 직렬화
+    # --------------------
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "CalibrationLayer":
+        """
+        fitted CalibratedClassifierCV (binary)에서 파라미터를 꺼낸다.
+
+        Raises:
+            UnsupportedModelError: binary가 아니거나 sigmoid / isotonic 이외의 calibrator일 때
+        """
+        calibrated = getattr(model, "calibrated_classifiers_", None)
+        if not calibrated:
+            raise UnsupportedModelError("Model is not a fitted CalibratedClassifierCV.")
+        if len(getattr(model, "classes_", [0, 1])) != 2:
+            raise UnsupportedModelError("Only binary calibration is supported.")
+
+        calibrators = [cc.calibrators[0] for cc in calibrated]
+        if all(hasattr(c, "a_") and hasattr(c, "b_") for c in calibrators):
+            return cls(
+                method=SIGMOID,
+                a=np.array([float(c.a_) for c in calibrators]),
+                b=np.array([float(c.b_) for c in calibrators]),
+            )
+        if all(hasattr(c, "X_thresholds_") for c in calibrators):
+            if any(getattr(c, "increasing_", True) is False for c in calibrators):
+                raise UnsupportedModelError("Decreasing isotonic calibration is not supported.")
+            return cls(
+                method=ISOTONIC,
+                x=tuple(np.asarray(c.X_thresholds_, dtype=np.float64) for c in calibrators),
+                y=tuple(np.asarray(c.y_thresholds_, dtype=np.float64) for c in calibrators),
+            )
+        names = sorted({type(c).__name__ for c in calibrators})
+        raise UnsupportedModelError(f"Unsupported calibrator: {names}")
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.method == SIGMOID:
+            return {"method": SIGMOID, "a": self.a.tolist(), "b": self.b.tolist()}
+        return {"method": ISOTONIC, "x": [v.tolist() for v in self.x], "y": [v.tolist() for v in self.y]}
+
+    @classmethod
+    def from_dict(cls, params: Mapping[str, Any]) -> "CalibrationLayer":
+        method = params["method"]
+        if method == SIGMOID:
+            return cls(method=SIGMOID, a=np.asarray(params["a"], dtype=np.float64),
+                       b=np.asarray(params["b"], dtype=np.float64))
+        if method == ISOTONIC:
+            return cls(
+                method=ISOTONIC,
+                x=tuple(np.asarray(v, dtype=np.float64) for v in params["x"]),
+                y=tuple(np.asarray(v, dtype=np.float64) for v in params["y"]),
+            )
+        raise ValueError(f"Unknown calibration method: {method}")
+
+
+class CalibratedPipeline(ClassifierMixin, BaseEstimator):
+    """
+    base 모델(predict_proba) + CalibrationLayer.
+
+    CalibratedClassifierCV(FrozenEstimator(base))를 대신해 artifact["pipeline"]에 저장한다.
+    - predict_proba: base 확률 배열의 양성 컬럼에 calibration을 제자리 적용 (sklearn calibrator 경로를 거치지 않음)
+    - classes_ / feature_names_in_ / n_features_in_는 base 것을 그대로 노출
+    """
+
+    def __init__(self, base: Any = None, calibration: Optional[CalibrationLayer] = None):
+        self.base = base
+        self.calibration = calibration
+
+    @classmethod
+    def from_sklearn(cls, model: Any) -> "CalibratedPipeline":
+        """
+        CalibratedClassifierCV(FrozenEstimator(base)) -> CalibratedPipeline(base, layer)
+
+        Raises:
+            UnsupportedModelError: fold별 base 모델이 따로 있거나(cv != None) 지원하지 않는 calibrator일 때
+        """
+        calibrated = getattr(model, "calibrated_classifiers_", None) or []
+        bases = {id(_unwrap_frozen(cc.estimator)) for cc in calibrated}
+        if len(bases) != 1:
+            raise UnsupportedModelError("CalibratedClassifierCV with per-fold estimators is not supported.")
+        return cls(base=_unwrap_frozen(calibrated[0].estimator), calibration=CalibrationLayer.from_sklearn(model))
+
+    @property
+    def classes_(self) -> np.ndarray:
+        return self.base.classes_
+
+    @property
+    def feature_names_in_(self) -> np.ndarray:
+        return self.base.feature_names_in_
+
+    @property
+    def n_features_in_(self) -> int:
+        return self.base.n_features_in_
+
+    def __sklearn_is_fitted__(self) -> bool:
+        return self.base is not None and self.calibration is not None
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        proba = np.asarray(self.base.predict_proba(X), dtype=np.float64)
+        pos = proba[:, 1]
+        self.calibration.apply(pos, out=pos)
+        np.subtract(1.0, pos, out=proba[:, 0])
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        return self.classes_[(self.predict_proba(X)[:, 1] >= 0.5).astype(int)]
+
+
+def base_estimator(model: Any) -> Any:
+    """CalibratedPipeline / CalibratedClassifierCV / FrozenEstimator 안쪽의 base 모델"""
+    if isinstance(model, CalibratedPipeline):
+        return model.base
+    calibrated = getattr(model, "calibrated_classifiers_", None)
+    if calibrated:
+        model = calibrated[0].estimator
+    return _unwrap_frozen(model)
+
+
+def upgrade_calibration(artifact: Any) -> Any:
+    """
+    로드된 artifact의 CalibratedClassifierCV를 CalibratedPipeline으로 바꾼다. (예전 artifact 호환)
+
+    - dict artifact면 "pipeline"을 교체 (in-place), 모델 자체면 변환한 모델을 반환
+    - 변환할 수 없는 구성(fold별 base, 다른 calibrator)은 그대로 둔다.
+    """
+    if isinstance(artifact, dict):
+        model = artifact.get("pipeline")
+        if getattr(model, "calibrated_classifiers_", None):
+            artifact["pipeline"] = upgrade_calibration(model)
+        return artifact
+    if getattr(artifact, "calibrated_classifiers_", None):
+        try:
+            return CalibratedPipeline.from_sklearn(artifact)
+        except UnsupportedModelError:
+            return artifact
+    return artifact
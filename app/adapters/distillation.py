@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import pickle
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.metrics import average_precision_score
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, RobustScaler
+
+from adapters.input_validation import INPUT_SCHEMA_KEY, InputValidator
+
+# student 기본 설정: 얕은 gradient boosting (트리 수 x leaf 수가 teacher의 1/10 이하)
+DEFAULT_STUDENT_PARAMS: Dict[str, Any] = {
+    "max_iter": 300,
+    "learning_rate": 0.08,
+    "max_leaf_nodes": 15,
+    "min_samples_leaf": 20,
+    "l2_regularization": 1.0,
+}
+
+
+@dataclass
+class DistillationConfig:
+    """
+    Attributes:
+        augment_factor: train 크기 대비 합성 샘플 배수 (0이면 합성 없음)
+        swap_prob:      합성 샘플에서 컬럼 하나를 다른 row의 값으로 바꿀 확률
+        student_params: HistGradientBoostingClassifier 파라미터
+        random_state:   합성 / 학습 seed
+    """
+    augment_factor: float = 2.0
+    swap_prob: float = 0.3
+    student_params: Optional[Dict[str, Any]] = None
+    random_state: int = 42
+
+
+def augment_rows(X: pd.DataFrame, n_rows: int, swap_prob: float, rng: np.random.Generator) -> pd.DataFrame:
+    """
+    학습 데이터 주변의 합성 샘플을 만든다.
+
+    - 무작위 row를 복사한 뒤, 컬럼마다 swap_prob 확률로 다른 무작위 row의 값으로 교체
+    - 컬럼별 분포(범주 포함)는 그대로 두면서 teacher가 학습 데이터에서 보지 못한 조합을 채운다.
+    """
+    if n_rows <= 0:
+        return X.iloc[:0].copy()
+    base_idx = rng.integers(0, len(X), size=n_rows)
+    out = X.iloc[base_idx].reset_index(drop=True).copy()
+    for col in X.columns:
+        swap = rng.random(n_rows) < swap_prob
+        if swap.any():
+            donor = rng.integers(0, len(X), size=int(swap.sum()))
+            out.loc[swap, col] = X[col].to_numpy()[donor]
+    return out
+
+
+def build_student(num_cols: List[str], cat_cols: List[str], params: Optional[Dict[str, Any]] = None) -> Pipeline:
+    """teacher와 같은 전처리 구성(dense) + HistGradientBoostingClassifier"""
+    preprocess = ColumnTransformer(
+        transformers=[
+            ("num", RobustScaler(), num_cols),
+            ("cat", OneHotEncoder(handle_unknown="ignore", sparse_output=False), cat_cols),
+        ],
+        remainder="drop",
+        sparse_threshold=0.0,
+    )
+    model = HistGradientBoostingClassifier(**{**DEFAULT_STUDENT_PARAMS, **(params or {})})
+    return Pipeline(steps=[("preprocess", preprocess), ("model", model)])
+
+
+def fit_student(
+    teacher: Any,
+    X_train: pd.DataFrame,
+    num_cols: List[str],
+    cat_cols: List[str],
+    config: Optional[DistillationConfig] = None,
+) -> Pipeline:
+    """
+    teacher의 (calibrated) 확률을 soft label로 student를 학습한다.
+
+    - 입력: train + 합성 샘플 (augment_rows)
+    - soft label 학습: 각 row를 (y=1, weight=p) / (y=0, weight=1-p) 두 개로 넣으면
+      log-loss 최소화가 teacher 확률과의 cross-entropy 최소화와 같아진다.
+      → student는 보통의 classifier라 predict_proba / artifact 형식이 그대로 유지됨
+    """
+    config = config or DistillationConfig()
+    rng = np.random.default_rng(config.random_state)
+    synthetic = augment_rows(X_train, int(len(X_train) * config.augment_factor), config.swap_prob, rng)
+    X = pd.concat([X_train.reset_index(drop=True), synthetic], ignore_index=True)
+    soft = np.asarray(teacher.predict_proba(X))[:, 1]
+
+    X_dup = pd.concat([X, X], ignore_index=True)
+    y_dup = np.concatenate([np.ones(len(X), dtype=int), np.zeros(len(X), dtype=int)])
+    w_dup = np.concatenate([soft, 1.0 - soft])
+
+    params = {"random_state": config.random_state, **(config.student_params or {})}
+    student = build_student(num_cols, cat_cols, params)
+    student.fit(X_dup, y_dup, model__sample_weight=w_dup)
+    return student
+
+
+def _median_ms(fn: Any, repeat: int) -> float:
+    times = []
+    for _ in range(max(1, repeat)):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000.0)
+    return float(np.median(times))
+
+
+def fidelity_report(
+    teacher: Any,
+    student: Any,
+    X: pd.DataFrame,
+    threshold: float,
+    y: Optional[np.ndarray] = None,
+    latency_repeat: int = 20,
+) -> Dict[str, Any]:
+    """
+    student가 teacher를 얼마나 잘 따라가는지 (JSON 저장 가능한 dict).
+
+    - max / mean |p_student - p_teacher|
+    - threshold 판정 일치율 (+ teacher 양성 중 student도 양성인 비율)
+    - y가 있으면 PR-AUC (teacher / student / delta)
+    - 단건 / 전체 배치 predict_proba 지연시간, pickle 크기
+    """
+    p_teacher = np.asarray(teacher.predict_proba(X))[:, 1]
+    p_student = np.asarray(student.predict_proba(X))[:, 1]
+    err = np.abs(p_student - p_teacher)
+    t_pos, s_pos = p_teacher >= threshold, p_student >= threshold
+
+    report: Dict[str, Any] = {
+        "rows": int(len(X)),
+        "threshold": float(threshold),
+        "max_abs_error": float(err.max()),
+        "mean_abs_error": float(err.mean()),
+        "p99_abs_error": float(np.quantile(err, 0.99)),
+        "agreement_at_threshold": float(np.mean(t_pos == s_pos)),
+        "teacher_positive_recall": float(s_pos[t_pos].mean()) if t_pos.any() else None,
+    }
+    if y is not None:
+        pr_teacher = float(average_precision_score(y, p_teacher))
+        pr_student = float(average_precision_score(y, p_student))
+        report.update(
+            {"pr_auc_teacher": pr_teacher, "pr_auc_student": pr_student, "pr_auc_delta": pr_student - pr_teacher}
+        )
+
+    one = X.iloc[:1]
+    report["latency_ms"] = {
+        "teacher_single": _median_ms(lambda: teacher.predict_proba(one), latency_repeat),
+        "student_single": _median_ms(lambda: student.predict_proba(one), latency_repeat),
+        "teacher_batch": _median_ms(lambda: teacher.predict_proba(X), 3),
+        "student_batch": _median_ms(lambda: student.predict_proba(X), 3),
+    }
+    report["size_mb"] = {
+        "teacher": len(pickle.dumps(teacher, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20,
+        "student": len(pickle.dumps(student, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20,
+    }
+    return report
+
+
+def build_student_artifact(
+    teacher_artifact: Mapping[str, Any],
+    X_train: pd.DataFrame,
+    eval_sets: Mapping[str, Tuple[pd.DataFrame, Optional[np.ndarray]]],
+    teacher_path: Optional[str] = None,
+    config: Optional[DistillationConfig] = None,
+) -> Dict[str, Any]:
+    """
+    teacher artifact(dict) -> student artifact(dict). teacher와 같은 키 구성이라 adapter가 그대로 로드한다.
+
+    - pipeline: student (predict_proba)
+    - best_threshold_f2_on_calib / best_threshold: teacher 값을 그대로 사용 (판정 기준 유지)
+    - distillation: eval_sets별 fidelity_report + 설정
+    """
+    config = config or DistillationConfig()
+    teacher = teacher_artifact["pipeline"]
+    num_cols = list(teacher_artifact.get("num_cols") or X_train.select_dtypes(include=["number"]).columns)
+    cat_cols = list(teacher_artifact.get("cat_cols") or [c for c in X_train.columns if c not in num_cols])
+
+    thr_info = teacher_artifact.get("best_threshold_f2_on_calib")
+    if isinstance(thr_info, Mapping):
+        threshold = float(thr_info.get("thr", 0.5))
+    else:
+        threshold = float(teacher_artifact.get("best_threshold", 0.5))
+
+    t = time.perf_counter()
+    student = fit_student(teacher, X_train, num_cols, cat_cols, config)
+    fit_sec = time.perf_counter() - t
+
+    reports = {name: fidelity_report(teacher, student, X, threshold, y) for name, (X, y) in eval_sets.items()}
+    return {
+        "pipeline": student,
+        "best_threshold": threshold,
+        "best_threshold_f2_on_calib": thr_info,
+        "num_cols": num_cols,
+        "cat_cols": cat_cols,
+        INPUT_SCHEMA_KEY: teacher_artifact.get(INPUT_SCHEMA_KEY)
+        or InputValidator.from_training_data(X_train, num_cols, cat_cols).to_dict(),
+        "target_col": teacher_artifact.get("target_col"),
+        "distillation": {
+            "teacher": teacher_path,
+            "student": type(student.named_steps["model"]).__name__,
+            "student_params": student.named_steps["model"].get_params(),
+            "augment_factor": config.augment_factor,
+            "swap_prob": config.swap_prob,
+            "train_rows": int(len(X_train)),
+            "fit_sec": fit_sec,
+            "fidelity": reports,
+        },
+        "meta": {
+            "builder": "distill_pr_auc_student.py",
+            "note": "student fitted to teacher artifact['pipeline'].predict_proba (soft labels)",
+            "random_state": config.random_state,
+        },
+    }
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# artifact meta에 컬럼 목록이 저장되어 있을 때 찾아보는 키들
+_META_COLUMN_KEYS = ("feature_cols", "feature_columns", "columns", "X_columns", "input_columns")
+
+# 입력 컬럼 구성(layout)별 정렬 계획 캐시 크기 (요청마다 컬럼이 달라도 메모리가 늘지 않도록)
+MAX_PLANS = 32
+
+
+def _find_column_transformer(model: Any) -> Any:
+    """Pipeline / CalibratedPipeline / CalibratedClassifierCV 안쪽의 fitted ColumnTransformer를 찾는다 (없으면 None)."""
+    calibrated = getattr(model, "calibrated_classifiers_", None)
+    if calibrated:
+        model = calibrated[0].estimator
+    # CalibratedPipeline(base, calibration)
+    if type(model).__name__ == "CalibratedPipeline":
+        model = model.base
+    # ServingPipeline / SharedPipeline: 컴파일된 전처리를 사용
+    compiled = getattr(model, "compiled_", None)
+    if compiled is not None:
+        model = compiled.preprocess
+    while type(model).__name__ == "FrozenEstimator":
+        model = model.estimator
+
+    for _, step in getattr(model, "steps", []):
+        if hasattr(step, "transformers_"):
+            return step
+    return model if hasattr(model, "transformers_") else None
+
+
+def reference_record(model: Any, columns: Iterable[str]) -> Dict[str, Any]:
+    """
+    모델이 그대로 받아들일 수 있는 대표 입력 1건 (warm-up / 스모크 테스트용).
+
+    - 스케일러 컬럼: fit된 center_ (중앙값) / 없으면 0
+    - OneHotEncoder 컬럼: 학습 시 첫 번째 category
+    - 그 외: 0
+    """
+    values: Dict[str, Any] = {c: 0 for c in columns}
+    ct = _find_column_transformer(model)
+    if ct is None:
+        return values
+    for _, transformer, cols in ct.transformers_:
+        if isinstance(transformer, str):
+            continue
+        center = getattr(transformer, "center_", None)
+        if center is None:
+            center = getattr(transformer, "mean_", None)
+        categories = getattr(transformer, "categories_", None)
+        for i, col in enumerate(cols):
+            if col not in values:
+                continue
+            if categories is not None and len(categories[i]):
+                values[col] = categories[i][0].item() if hasattr(categories[i][0], "item") else categories[i][0]
+            elif center is not None:
+                values[col] = float(center[i])
+    return values
+
+
+@dataclass(frozen=True)
+class FeatureSchema:
+    """
+    모델 입력 스키마 (모델 로딩 시 1회 컴파일).
+
+    Attributes:
+        columns:          모델이 기대하는 입력 컬럼 순서 (feature_names_in_)
+        numeric_columns:  숫자형으로 변환해야 하는 컬럼
+        fill_values:      입력에 없는 컬럼을 채울 기본값 (기존 동작과 같이 0)
+
+    - 없는 컬럼 채우기 / 불필요한 컬럼 제거 / 순서 맞추기 / 숫자형 변환을 한 번에 수행
+    - 입력 컬럼 구성(layout)별 정렬 계획을 최근 MAX_PLANS개까지 캐시해서 같은 모양의 입력은 재계산하지 않음
+    - 이미 모델 순서와 같은 입력은 복사 없이 그대로 통과
+    """
+    columns: Tuple[str, ...]
+    numeric_columns: Tuple[str, ...] = ()
+    fill_values: Mapping[str, Any] = field(default_factory=dict)
+    _plans: "OrderedDict[Tuple[Any, ...], Tuple[Tuple[str, ...], Any]]" = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False
+    )
+    _plans_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+
+    @property
+    def positions(self) -> Dict[str, int]:
+        """컬럼명 -> 모델 입력 위치"""
+        return {c: i for i, c in enumerate(self.columns)}
+
+    # --------------------
+    # 생성
+    # --------------------
+    @classmethod
+    def from_model(
+        cls,
+        model: Any,
+        meta: Optional[Mapping[str, Any]] = None,
+        fallback_columns: Optional[Iterable[str]] = None,
+        default_fill: Any = 0,
+    ) -> "FeatureSchema":
+        """
+        컬럼 순서 탐색 우선순위:
+        1) model.feature_names_in_
+        2) meta의 컬럼 목록 키 (feature_cols, columns, ...)
+        3) fallback_columns
+
+        Raises:
+            ValueError: 어디에서도 컬럼 정보를 찾지 못했을 때
+        """
+        meta = meta or {}
+        columns: Optional[Sequence[str]] = None
+        if hasattr(model, "feature_names_in_"):
+            columns = list(model.feature_names_in_)
+        if columns is None:
+            for key in _META_COLUMN_KEYS:
+                value = meta.get(key)
+                if isinstance(value, (list, tuple)) and len(value) > 0:
+                    columns = list(value)
+                    break
+        if columns is None and fallback_columns is not None:
+            columns = list(fallback_columns)
+        if columns is None:
+            raise ValueError("Could not infer model input columns (feature_names_in_ / meta).")
+
+        numeric = cls._numeric_columns_of(model, meta)
+        return cls(
+            columns=tuple(columns),
+            numeric_columns=tuple(c for c in columns if c in numeric),
+            fill_values={c: default_fill for c in columns},
+        )
+
+    @staticmethod
+    def _numeric_columns_of(model: Any, meta: Mapping[str, Any]) -> set:
+        if meta.get("num_cols"):
+            return set(meta["num_cols"])
+        ct = _find_column_transformer(model)
+        if ct is None:
+            return set()
+        numeric = set()
+        for _, transformer, cols in ct.transformers_:
+            if type(transformer).__name__ in ("RobustScaler", "StandardScaler", "MinMaxScaler"):
+                numeric.update(cols)
+        return numeric
+
+    # --------------------
+    # 정렬
+    # --------------------
+    def _plan(self, df: pd.DataFrame):
+        key = tuple(df.columns)
+        with self._plans_lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+        present = set(key)
+        missing = tuple(c for c in self.columns if c not in present)
+        fills = {self.fill_values.get(c, 0) for c in missing}
+        # 채울 값이 하나뿐이면 reindex(fill_value=...) 한 번으로 끝낸다.
+        uniform_fill = fills.pop() if len(fills) == 1 else None
+        plan = (missing, uniform_fill)
+        with self._plans_lock:
+            self._plans[key] = plan
+            while len(self._plans) > MAX_PLANS:
+                self._plans.popitem(last=False)
+        return plan
+
+    def align(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        임의의 입력 배치 -> 모델 입력 DataFrame (컬럼 순서/구성/숫자형 dtype 일치).
+        입력이 이미 모델 스키마와 같으면 복사 없이 그대로 반환한다.
+        """
+        missing, uniform_fill = self._plan(df)
+
+        if not missing and tuple(df.columns) == self.columns:
+            out = df
+        elif missing and uniform_fill is not None:
+            out = df.reindex(columns=list(self.columns), fill_value=uniform_fill)
+        else:
+            out = df.reindex(columns=list(self.columns))
+            for col in missing:
+                out[col] = self.fill_values.get(col, 0)
+
+        # 숫자형 컬럼이 문자열 등으로 들어온 경우만 변환 (이미 숫자면 건드리지 않음)
+        if self.numeric_columns:
+            dtypes = out.dtypes
+            bad = [c for c in self.numeric_columns if not pd.api.types.is_numeric_dtype(dtypes[c])]
+            if bad:
+                if out is df:
+                    out = df.copy()
+                out[bad] = out[bad].astype(np.float64)
+        return out
+
+    def align_row(self, row: pd.Series | Mapping[str, Any]) -> pd.DataFrame:
+        """단일 row(Series/dict) -> 1행 모델 입력 DataFrame"""
+        values = row.to_dict() if isinstance(row, pd.Series) else dict(row)
+        index = [row.name] if isinstance(row, pd.Series) and row.name is not None else None
+        data = {c: [values.get(c, self.fill_values.get(c, 0))] for c in self.columns}
+        out = pd.DataFrame(data, index=index)
+        return self.align(out)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+from adapters.calibration import base_estimator
+from adapters.forest_engine import CompiledForest, _split_pipeline
+
+# 노드 index / feature index를 담는 정수 dtype (노드 수가 이 범위를 넘으면 int64 유지)
+COMPACT_INDEX_DTYPE = np.int32
+
+
+@dataclass
+class CompactionStats:
+    n_trees_before: int
+    n_trees_after: int
+    n_nodes_before: int
+    n_nodes_after: int
+    collapsed_nodes: int
+    bytes_before: int
+    bytes_after: int
+
+
+def forest_nbytes(forest: CompiledForest) -> int:
+    return int(sum(arr.nbytes for arr in forest.to_arrays().values()))
+
+
+def _float32_floor(threshold: np.ndarray) -> np.ndarray:
+    """
+    threshold 이하의 가장 큰 float32.
+
+    sklearn은 입력을 float32로 내린 뒤 float64 임계값과 비교(x <= t)하므로,
+    float32 입력 x에 대해 x <= t 와 x <= floor32(t)는 항상 같다. (판정이 바뀌지 않는 손실 없는 변환)
+    """
+    t32 = threshold.astype(np.float32)
+    over = t32.astype(np.float64) > threshold
+    t32[over] = np.nextafter(t32[over], np.float32(-np.inf))
+    return t32
+
+
+def _rebuild(
+    forest: CompiledForest,
+    keep_nodes: np.ndarray,
+    leaf: np.ndarray,
+    value: np.ndarray,
+    roots: np.ndarray,
+    value_dtype: Any,
+    threshold_dtype: Any,
+) -> CompiledForest:
+    """keep_nodes(오름차순 전역 index)만 남기고 index를 다시 매겨 CompiledForest를 만든다."""
+    n_keep = keep_nodes.shape[0]
+    index_dtype = COMPACT_INDEX_DTYPE if 2 * n_keep < np.iinfo(COMPACT_INDEX_DTYPE).max else np.intp
+    remap = np.full(forest.n_nodes, -1, dtype=np.int64)
+    remap[keep_nodes] = np.arange(n_keep)
+
+    is_leaf = leaf[keep_nodes]
+    left = np.where(is_leaf, -1, remap[forest.left[keep_nodes]])
+    right = np.where(is_leaf, -1, remap[forest.right[keep_nodes]])
+    feature = np.where(is_leaf, 0, forest.feature[keep_nodes])
+    if threshold_dtype == np.float32:
+        threshold = _float32_floor(np.asarray(forest.threshold[keep_nodes], dtype=np.float64))
+    else:
+        threshold = np.asarray(forest.threshold[keep_nodes], dtype=threshold_dtype)
+
+    idx = np.arange(n_keep, dtype=index_dtype)
+    children = np.empty(2 * n_keep, dtype=index_dtype)
+    children[0::2] = np.where(is_leaf, idx, left)
+    children[1::2] = np.where(is_leaf, idx, right)
+    split = np.where(is_leaf, np.inf, threshold).astype(threshold.dtype)
+
+    arrays = {
+        "feature": np.ascontiguousarray(feature, dtype=index_dtype),
+        "threshold": np.ascontiguousarray(threshold),
+        "left": np.ascontiguousarray(left, dtype=index_dtype),
+        "right": np.ascontiguousarray(right, dtype=index_dtype),
+        "value": np.ascontiguousarray(value[keep_nodes], dtype=value_dtype),
+        "missing_left": np.ascontiguousarray(forest.missing_left[keep_nodes]),
+        "roots": np.ascontiguousarray(remap[roots], dtype=index_dtype),
+        "_children": children,
+        "_split": np.ascontiguousarray(split),
+        "_leaf": np.ascontiguousarray(is_leaf),
+    }
+    max_depth = _max_depth(arrays["left"], arrays["right"], arrays["roots"])
+    return CompiledForest.from_arrays(arrays, n_features=forest.n_features, max_depth=max_depth)
+
+
+def _reachable(left: np.ndarray, right: np.ndarray, leaf: np.ndarray, roots: np.ndarray) -> np.ndarray:
+    """roots에서 도달 가능한 노드 (오름차순)"""
+    seen = np.zeros(left.shape[0], dtype=bool)
+    frontier = np.asarray(roots, dtype=np.intp)
+    while frontier.size:
+        seen[frontier] = True
+        inner = frontier[~leaf[frontier]]
+        frontier = np.concatenate([left[inner], right[inner]]).astype(np.intp)
+    return np.flatnonzero(seen)
+
+
+def _max_depth(left: np.ndarray, right: np.ndarray, roots: np.ndarray) -> int:
+    depth = 0
+    frontier = np.asarray(roots, dtype=np.intp)
+    while True:
+        frontier = np.concatenate([left[frontier], right[frontier]]).astype(np.intp)
+        frontier = frontier[frontier >= 0]
+        if frontier.size == 0:
+            return depth
+        depth += 1
+
+
+def compact_forest(
+    forest: CompiledForest,
+    keep_trees: Optional[Sequence[int]] = None,
+    collapse_tol: float = 0.0,
+    float32: bool = True,
+) -> tuple:
+    """
+    CompiledForest를 작게 만든다. (CompiledForest, CompactionStats) 반환
+
+    - collapse: 두 자식이 모두 leaf이고 값 차이가 collapse_tol 이하인 내부 노드를 leaf로 합친다.
+      (바닥부터 더 이상 합칠 노드가 없을 때까지 반복)
+      collapse_tol=0이면 같은 값끼리만 합치므로 예측이 바뀌지 않는다. (>0이면 부모 노드 값 사용)
+    - keep_trees: 남길 트리 index (None이면 전부)
+    - float32: 임계값은 float32 내림(판정 불변), leaf 값은 float32, index 배열은 int32로 저장
+    """
+    leaf = np.array(forest.is_leaf, dtype=bool)
+    value = np.array(forest.value, dtype=np.float64)
+    left = np.asarray(forest.left, dtype=np.intp)
+    right = np.asarray(forest.right, dtype=np.intp)
+
+    roots = np.asarray(forest.roots, dtype=np.intp)
+    if keep_trees is not None:
+        roots = roots[np.sort(np.asarray(keep_trees, dtype=np.intp))]
+
+    collapsed = 0
+    while True:
+        inner = np.flatnonzero(~leaf)
+        both = leaf[left[inner]] & leaf[right[inner]]
+        cand = inner[both]
+        same = np.abs(value[left[cand]] - value[right[cand]]) <= collapse_tol
+        cand = cand[same]
+        if cand.size == 0:
+            break
+        if collapse_tol == 0.0:
+            value[cand] = value[left[cand]]
+        leaf[cand] = True
+        collapsed += int(cand.size)
+
+    keep_nodes = _reachable(left, right, leaf, roots)
+    compact = _rebuild(
+        forest,
+        keep_nodes,
+        leaf,
+        value,
+        roots,
+        value_dtype=np.float32 if float32 else np.float64,
+        threshold_dtype=np.float32 if float32 else np.float64,
+    )
+    stats = CompactionStats(
+        n_trees_before=forest.n_trees,
+        n_trees_after=compact.n_trees,
+        n_nodes_before=forest.n_nodes,
+        n_nodes_after=compact.n_nodes,
+        collapsed_nodes=collapsed,
+        bytes_before=forest_nbytes(forest),
+        bytes_after=forest_nbytes(compact),
+    )
+    return compact, stats
+
+
+def select_trees(
+    tree_proba: np.ndarray,
+    y: np.ndarray,
+    metric: Callable[[np.ndarray, np.ndarray], float],
+    tol: float,
+    min_trees: int = 1,
+    calibrate: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+) -> List[int]:
+    """
+    metric(y, 확률)이 전체 트리 대비 tol 넘게 떨어지지 않는 범위에서 트리를 뺀다. 남길 트리 index 반환
+
+    - tree_proba: (n_samples, n_trees) 트리별 양성 확률 (calibration set)
+    - leave-one-out 영향이 작은 트리부터 하나씩 빼 보고, 기준을 넘으면 그 트리는 남긴다.
+    - calibrate: 평균 확률 -> 최종 확률 (CompiledPipeline.calibrate 등)
+    """
+    calibrate = calibrate or (lambda p: p)
+    n_trees = tree_proba.shape[1]
+    total = tree_proba.sum(axis=1)
+    baseline = metric(y, calibrate(total / n_trees))
+
+    loo = np.array([metric(y, calibrate((total - tree_proba[:, t]) / (n_trees - 1))) for t in range(n_trees)])
+    order = np.argsort(-loo, kind="stable")  # 빼도 지표가 가장 덜 떨어지는(또는 오르는) 트리부터
+
+    keep = np.ones(n_trees, dtype=bool)
+    kept = n_trees
+    for t in order:
+        if kept <= max(1, min_trees):
+            break
+        trial = total - tree_proba[:, t]
+        if baseline - metric(y, calibrate(trial / (kept - 1))) <= tol:
+            total = trial
+            keep[t] = False
+            kept -= 1
+    return np.flatnonzero(keep).tolist()
+
+
+def drop_estimators(model: Any, keep_trees: Sequence[int]) -> int:
+    """
+    sklearn forest(estimators_)에서 keep_trees만 남긴다. (in-place, 남은 트리 수 반환)
+    Pipeline / CalibratedPipeline / CalibratedClassifierCV(FrozenEstimator(...))도 따라 들어간다.
+    BalancedRandomForest의 samplers_ / pipelines_ 등 트리와 짝인 목록도 같이 자른다.
+    """
+    _, estimator = _split_pipeline(base_estimator(model))
+
+    n_before = len(estimator.estimators_)
+    keep = list(keep_trees)
+    for name in ("estimators_", "samplers_", "pipelines_", "estimators_samples_"):
+        items = estimator.__dict__.get(name)
+        if isinstance(items, list) and len(items) == n_before:
+            estimator.__dict__[name] = [items[i] for i in keep]
+    estimator.n_estimators = len(keep)
+    return len(keep)
@@ -0,0 +1,795 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from adapters.inference_policy import inference_scope, map_row_chunks
+
+
+# 한 번에 순회하는 (row, tree) 쌍의 최대 개수.
+# 얕은 트리는 캐시에 머무는 작은 청크가, 깊은 트리는 compaction 효과가 큰 청크가 유리하다.
+DENSE_MAX_PAIRS_PER_CHUNK = 1 << 16
+DEEP_MAX_PAIRS_PER_CHUNK = 1 << 20
+
+# 이 깊이 이하의 트리는 compaction 없이 고정 횟수로 순회하는 편이 빠르다.
+DENSE_DEPTH_LIMIT = 12
+
+# compiled 순회가 sklearn(Cython) 순회보다 빠른 배치의 상한 (row × tree × depth 단계 수).
+# 1 CPU 실측 역전 지점: 1200 트리 / 깊이 20 모델 ≈ 500 row, 300 트리 / 깊이 8 모델 ≈ 5000 row
+COMPILED_MAX_STEPS = 1 << 23
+
+# early-exit 판정: 한 번에 평가하는 트리 수 / 경계에 걸친 판정을 미루는 여유
+EARLY_EXIT_CHUNK_TREES = 16
+EARLY_EXIT_EPS = 1e-12
+
+# anytime 예측: 처음 추정에 쓰는 트리 수 / 이후 한 번에 더 평가하는 트리 수
+ANYTIME_FIRST_TREES = 32
+ANYTIME_CHUNK_TREES = 256
+
+# 트리 간 편차 요약에 쓰는 기본 분위수 (10% / 90%)
+DEFAULT_SPREAD_QUANTILES: Tuple[float, ...] = (0.1, 0.9)
+
+
+class UnsupportedModelError(TypeError):
+    """컴파일 엔진이 지원하지 않는 모델 구조일 때 발생 (호출부는 sklearn 경로로 fallback)."""
+
+
+@dataclass(frozen=True)
+class EarlyExitDecision:
+    """
+    threshold 판정 결과 (CompiledForest.decide / CompiledPipeline.decide)
+
+    Attributes:
+        decision:   row별 (확률 >= threshold) 여부
+        trees_used: row별로 실제 평가한 트리 수
+        n_trees:    전체 트리 수
+    """
+    decision: np.ndarray
+    trees_used: np.ndarray
+    n_trees: int
+
+    @property
+    def mean_trees_used(self) -> float:
+        return float(self.trees_used.mean()) if self.trees_used.size else 0.0
+
+
+@dataclass(frozen=True, eq=False)
+class AnytimeEstimate:
+    """
+    anytime 예측의 중간 / 최종 결과 (CompiledForest.predict_progressive)
+
+    Attributes:
+        probability: 지금까지 평가한 트리들의 평균 (calibration 적용 후). exact면 predict_proba와 같은 값
+        lower:       최종 확률의 하한 (남은 트리가 모두 leaf 최솟값일 때, 반드시 성립)
+        upper:       최종 확률의 상한 (남은 트리가 모두 leaf 최댓값일 때, 반드시 성립)
+        stderr:      부분 평균의 표준오차 추정 (트리 간 분산 기준, calibration 전), exact면 0
+        trees_used:  평가한 트리 수
+        n_trees:     전체 트리 수
+    """
+    probability: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    stderr: np.ndarray
+    trees_used: int
+    n_trees: int
+
+    @property
+    def exact(self) -> bool:
+        return self.trees_used >= self.n_trees
+
+    @classmethod
+    def final(cls, probability: np.ndarray, n_trees: int = 0) -> "AnytimeEstimate":
+        """부분 평가 없이 바로 얻은 최종 확률 (캐시 hit / 컴파일 엔진 미지원 모델)"""
+        pos = np.asarray(probability, dtype=np.float64)
+        return cls(pos, pos, pos, np.zeros_like(pos), n_trees, n_trees)
+
+
+def spread_column(level: float, prefix: str = "purchase_proba") -> str:
+    """분위수 컬럼명 (예: 0.1 -> purchase_proba_q10)"""
+    return f"{prefix}_q{int(round(level * 100)):02d}"
+
+
+@dataclass(frozen=True, eq=False)
+class TreeSpread:
+    """
+    트리별 양성 확률의 분포 요약 (CompiledForest.predict_spread / CompiledPipeline.predict_spread)
+    평균과 같은 leaf 값 행렬에서 함께 계산하므로 순회는 한 번이다.
+
+    Attributes:
+        probability: 트리 평균 양성 확률 (calibration이 있으면 적용 후) = predict_proba(X)[:, 1]
+        variance:    트리별 확률의 분산 (calibration 전)
+        quantiles:   트리별 확률의 분위수 (n, len(levels)). calibration이 단조 증가면 적용 후 값
+        levels:      quantiles 열의 분위수
+    """
+    probability: np.ndarray
+    variance: np.ndarray
+    quantiles: np.ndarray
+    levels: Tuple[float, ...] = DEFAULT_SPREAD_QUANTILES
+
+    @classmethod
+    def unavailable(cls, probability: np.ndarray, levels: Tuple[float, ...] = DEFAULT_SPREAD_QUANTILES) -> "TreeSpread":
+        """트리별 확률을 얻을 수 없는 모델용 (편차 / 분위수는 NaN)"""
+        n = len(probability)
+        return cls(
+            probability=np.asarray(probability, dtype=np.float64),
+            variance=np.full(n, np.nan),
+            quantiles=np.full((n, len(levels)), np.nan),
+            levels=tuple(float(q) for q in levels),
+        )
+
+    @classmethod
+    def from_summary(cls, out: np.ndarray, levels: Tuple[float, ...]) -> "TreeSpread":
+        """_summarize_trees 결과 (mean, var, quantiles...) 행렬에서 만든다."""
+        return cls(
+            probability=np.ascontiguousarray(out[:, 0]),
+            variance=np.ascontiguousarray(out[:, 1]),
+            quantiles=np.ascontiguousarray(out[:, 2:]),
+            levels=levels,
+        )
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.variance)
+
+    def to_frame(self, index: Optional[pd.Index] = None, prefix: str = "purchase_proba") -> pd.DataFrame:
+        """{prefix}, {prefix}_std, {prefix}_qNN 컬럼의 DataFrame"""
+        data: Dict[str, np.ndarray] = {prefix: self.probability, f"{prefix}_std": self.std}
+        for j, level in enumerate(self.levels):
+            data[spread_column(level, prefix)] = self.quantiles[:, j]
+        return pd.DataFrame(data, index=index)
+
+
+def _summarize_trees(tree: np.ndarray, levels: Tuple[float, ...]) -> np.ndarray:
+    """트리별 확률 (n_rows, n_trees) -> [mean, var, quantiles...] (n_rows, 2 + len(levels))"""
+    out = np.empty((tree.shape[0], 2 + len(levels)), dtype=np.float64)
+    out[:, 0] = tree.mean(axis=1, dtype=np.float64)
+    out[:, 1] = tree.var(axis=1, dtype=np.float64)
+    if levels:
+        out[:, 2:] = np.quantile(tree, levels, axis=1).T
+    return out
+
+
+@dataclass(frozen=True)
+class CompiledForest:
+    """
+    sklearn 트리 앙상블(RandomForest / BalancedRandomForest)을 연속된 NumPy 배열로 펼친 구조체.
+
+    모든 트리의 노드를 하나의 전역 인덱스 공간에 이어 붙인다.
+
+    Attributes:
+        feature:      노드별 분기 feature index (leaf는 0)
+        threshold:    노드별 분기 임계값 (x <= threshold 이면 left)
+        left:         왼쪽 자식의 전역 노드 index (leaf는 -1)
+        right:        오른쪽 자식의 전역 노드 index (leaf는 -1)
+        value:        노드별 양성(1) 클래스 확률
+        missing_left: 결측치(NaN)를 왼쪽으로 보내는지 여부
+        roots:        트리별 루트 노드의 전역 index
+        n_features:   입력 feature 수
+        max_depth:    가장 깊은 트리의 깊이
+
+    - sklearn 트리는 입력을 float32로 변환한 뒤 float64 임계값과 비교한다.
+      동일한 결과를 내기 위해 apply()도 같은 규칙을 따른다.
+    """
+    feature: np.ndarray
+    threshold: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+    value: np.ndarray
+    missing_left: np.ndarray
+    roots: np.ndarray
+    n_features: int
+    max_depth: int
+    # 순회용 파생 배열 (leaf는 자기 자신을 가리키도록 만든 자식 테이블 등)
+    _children: np.ndarray = field(init=False, repr=False, compare=False)
+    _split: np.ndarray = field(init=False, repr=False, compare=False)
+    _leaf: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        leaf = self.left < 0
+        idx = np.arange(self.n_nodes, dtype=np.intp)
+        children = np.empty(2 * self.n_nodes, dtype=np.intp)
+        children[0::2] = np.where(leaf, idx, self.left)
+        children[1::2] = np.where(leaf, idx, self.right)
+        # leaf에서는 x > +inf 가 항상 False → 자기 자신(left 슬롯)에 머문다.
+        split = np.where(leaf, np.inf, self.threshold)
+        object.__setattr__(self, "_children", children)
+        object.__setattr__(self, "_split", np.ascontiguousarray(split, dtype=np.float64))
+        object.__setattr__(self, "_leaf", leaf)
+
+    # --------------------
+    # 배열 직렬화 (mmap artifact용)
+    # --------------------
+    # 순회에 쓰이는 배열 이름 (파생 배열 포함). .npy 블록으로 그대로 저장된다.
+    ARRAY_FIELDS = (
+        "feature", "threshold", "left", "right", "value", "missing_left", "roots",
+        "_children", "_split", "_leaf",
+    )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """ARRAY_FIELDS 이름 -> 배열"""
+        return {name: getattr(self, name) for name in self.ARRAY_FIELDS}
+
+    @classmethod
+    def from_arrays(cls, arrays: Mapping[str, np.ndarray], n_features: int, max_depth: int) -> "CompiledForest":
+        """
+        to_arrays() 결과(예: np.load(..., mmap_mode="r")로 연 배열)로 복원한다.
+        파생 배열도 다시 만들지 않고 그대로 사용하므로 mmap 페이지가 프로세스 간에 공유된다.
+        """
+        missing = [name for name in cls.ARRAY_FIELDS if name not in arrays]
+        if missing:
+            raise ValueError(f"Missing compiled forest arrays: {missing}")
+        forest = cls.__new__(cls)
+        for name in cls.ARRAY_FIELDS:
+            object.__setattr__(forest, name, arrays[name])
+        object.__setattr__(forest, "n_features", int(n_features))
+        object.__setattr__(forest, "max_depth", int(max_depth))
+        return forest
+
+    @property
+    def n_trees(self) -> int:
+        return int(self.roots.shape[0])
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.feature.shape[0])
+
+    @property
+    def batch_row_limit(self) -> int:
+        """compiled 순회가 sklearn보다 빠른 최대 row 수 (COMPILED_MAX_STEPS 기준)"""
+        return max(1, COMPILED_MAX_STEPS // max(self.n_trees * self.max_depth, 1))
+
+    @property
+    def is_leaf(self) -> np.ndarray:
+        return self._leaf
+
+    def leaf_bounds(self) -> tuple:
+        """트리별 leaf 값의 (최솟값, 최댓값). 처음 호출 시 계산해서 보관"""
+        cached = self.__dict__.get("_leaf_bounds")
+        if cached is None:
+            # 노드는 트리 순서대로 이어 붙어 있으므로 roots가 곧 트리별 구간의 시작
+            starts = np.asarray(self.roots, dtype=np.intp)
+            low = np.minimum.reduceat(np.where(self._leaf, self.value, np.inf), starts)
+            high = np.maximum.reduceat(np.where(self._leaf, self.value, -np.inf), starts)
+            cached = (low, high)
+            object.__setattr__(self, "_leaf_bounds", cached)
+        return cached
+
+    @classmethod
+    def from_forest(cls, forest: Any, positive_class: Any = 1) -> "CompiledForest":
+        """
+        학습된 forest(estimators_ 보유)에서 트리 배열을 추출한다.
+
+        Raises:
+            UnsupportedModelError: estimators_가 없거나 트리 구조가 아닐 때
+        """
+        estimators = getattr(forest, "estimators_", None)
+        if not estimators:
+            raise UnsupportedModelError(
+                f"Not a fitted tree ensemble: type={type(forest)}"
+            )
+
+        classes = list(getattr(forest, "classes_", [0, 1]))
+        if positive_class not in classes:
+            raise UnsupportedModelError(
+                f"positive_class={positive_class!r} not in classes_={classes}"
+            )
+
+        features: List[np.ndarray] = []
+        thresholds: List[np.ndarray] = []
+        lefts: List[np.ndarray] = []
+        rights: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        missing: List[np.ndarray] = []
+        roots: List[int] = []
+        max_depth = 0
+
+        offset = 0
+        for est in estimators:
+            tree = getattr(est, "tree_", None)
+            if tree is None:
+                raise UnsupportedModelError(f"Estimator has no tree_: type={type(est)}")
+
+            # 트리마다 학습 시 본 클래스가 다를 수 있으므로 트리 기준으로 위치를 찾는다.
+            est_classes = list(getattr(est, "classes_", classes))
+            if positive_class not in est_classes:
+                raise UnsupportedModelError("Tree was fitted without the positive class.")
+            pos_idx = est_classes.index(positive_class)
+
+            raw_value = tree.value[:, 0, :]
+            normalizer = raw_value.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+
+            is_leaf = tree.children_left < 0
+            left = np.where(is_leaf, -1, tree.children_left + offset)
+            right = np.where(is_leaf, -1, tree.children_right + offset)
+
+            miss = getattr(tree, "missing_go_to_left", None)
+            if miss is None:
+                miss = np.zeros(tree.node_count, dtype=bool)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(left)
+            rights.append(right)
+            values.append(raw_value[:, pos_idx] / normalizer)
+            missing.append(np.asarray(miss, dtype=bool))
+            roots.append(offset)
+            max_depth = max(max_depth, int(tree.max_depth))
+            offset += tree.node_count
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            missing_left=np.ascontiguousarray(np.concatenate(missing)),
+            roots=np.asarray(roots, dtype=np.intp),
+            n_features=int(getattr(forest, "n_features_in_", 0)),
+            max_depth=max_depth,
+        )
+
+    # --------------------
+    # 순회
+    # --------------------
+    def _as_matrix(self, X: Any) -> np.ndarray:
+        # float32로 한 번 내렸다가(sklearn과 동일) 비교는 float64 임계값으로 한다.
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2D matrix, got shape={X.shape}")
+        if self.n_features and X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but forest expects {self.n_features}."
+            )
+        return X.astype(np.float64)
+
+    def _step(self, Xf: np.ndarray, offset: np.ndarray, node: np.ndarray, has_missing: bool) -> np.ndarray:
+        """(row, tree) 쌍들을 한 단계 아래 자식으로 이동"""
+        x = Xf.take(offset + self.feature.take(node))
+        go_right = x > self._split.take(node)
+        if has_missing:
+            nan = np.isnan(x)
+            go_right = np.where(nan, ~self.missing_left.take(node) & ~self._leaf.take(node), go_right)
+        return self._children.take(2 * node + go_right)
+
+    def _apply_chunk(
+        self,
+        X: np.ndarray,
+        roots: Optional[np.ndarray] = None,
+        on_step: Optional[Callable[[np.ndarray, np.ndarray, np.ndarray], None]] = None,
+    ) -> np.ndarray:
+        """
+        level-wise 순회: 모든 (row, tree) 쌍을 한 번에 한 단계씩 내려보낸다.
+        roots를 주면 그 트리들만 순회한다. (early-exit 판정용)
+        on_step(부모 노드, 자식 노드, row offset)은 한 단계 내려갈 때마다 호출된다. (경로 기여도 수집용,
+        leaf에 머문 쌍은 부모 == 자식)
+
+        - 얕은 트리: 깊이만큼 고정 횟수 반복 (leaf는 제자리에 머묾)
+        - 깊은 트리: 절반 이상이 leaf에 도착하면 남은 쌍만 모아서(compaction) 계속 진행
+        """
+        if roots is None:
+            roots = self.roots
+        n_rows, n_cols = X.shape
+        n_trees = int(roots.shape[0])
+        Xf = X.ravel()
+        has_missing = bool(np.isnan(Xf).any())
+
+        cur = np.tile(roots, n_rows)
+        offset = np.repeat(np.arange(n_rows, dtype=np.intp) * n_cols, n_trees)
+
+        if self.max_depth <= DENSE_DEPTH_LIMIT:
+            for _ in range(self.max_depth):
+                nxt = self._step(Xf, offset, cur, has_missing)
+                if on_step is not None:
+                    on_step(cur, nxt, offset)
+                cur = nxt
+            return cur.reshape(n_rows, n_trees)
+
+        leaf = self._leaf
+        node: Optional[np.ndarray] = None
+        pos: Optional[np.ndarray] = None
+        while cur.size:
+            nxt = self._step(Xf, offset, cur, has_missing)
+            if on_step is not None:
+                on_step(cur, nxt, offset)
+            cur = nxt
+            done = leaf.take(cur)
+            n_done = int(np.count_nonzero(done))
+            if n_done == cur.size:
+                break
+            if n_done * 2 > cur.size:
+                keep = ~done
+                if pos is None:
+                    node, pos = cur.copy(), np.flatnonzero(keep)
+                else:
+                    node[pos[done]] = cur[done]
+                    pos = pos[keep]
+                cur, offset = cur[keep], offset[keep]
+
+        if pos is None:
+            return cur.reshape(n_rows, n_trees)
+        node[pos] = cur
+        return node.reshape(n_rows, n_trees)
+
+    def apply(self, X: Any, max_pairs: Optional[int] = None) -> np.ndarray:
+        """
+        각 샘플이 각 트리에서 도착한 leaf의 전역 index를 반환한다.
+        (row, tree) 쌍이 max_pairs를 넘지 않도록 row 단위로 나눠 순회한다. (None이면 트리 깊이로 결정)
+
+        Returns:
+            np.ndarray: shape (n_samples, n_trees)
+        """
+        X = self._as_matrix(X)
+        if max_pairs is None:
+            dense = self.max_depth <= DENSE_DEPTH_LIMIT
+            max_pairs = DENSE_MAX_PAIRS_PER_CHUNK if dense else DEEP_MAX_PAIRS_PER_CHUNK
+        step = max(1, max_pairs // max(self.n_trees, 1))
+        if X.shape[0] <= step:
+            return self._apply_chunk(X)
+        return np.concatenate(
+            [self._apply_chunk(X[i:i + step]) for i in range(0, X.shape[0], step)],
+            axis=0,
+        )
+
+    def predict_tree_proba(self, X: Any) -> np.ndarray:
+        """
+        트리별 양성 클래스 확률. shape (n_samples, n_trees)
+        큰 배치는 InferencePolicy에 따라 row 청크를 여러 스레드에서 순회한다.
+        """
+        return map_row_chunks(lambda chunk: self.value.take(self.apply(chunk)), self._as_matrix(X))
+
+    def _contributions_chunk(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_cols = X.shape
+        acc = np.zeros(n_rows * n_cols, dtype=np.float64)
+
+        def collect(parent: np.ndarray, child: np.ndarray, offset: np.ndarray) -> None:
+            # 분기 feature에 (자식 값 - 부모 값)을 더한다. offset = row * n_cols라 (row, feature) 칸에 바로 합산
+            delta = self.value.take(child).astype(np.float64) - self.value.take(parent)
+            acc[:] += np.bincount(offset + self.feature.take(parent), weights=delta, minlength=acc.size)
+
+        leaves = self._apply_chunk(X, on_step=collect)
+        out = np.empty((n_rows, n_cols + 1), dtype=np.float64)
+        out[:, :n_cols] = acc.reshape(n_rows, n_cols)
+        out[:, n_cols] = self.value.take(leaves).mean(axis=1, dtype=np.float64)
+        return out
+
+    def predict_contributions(self, X: Any) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        트리 경로 기여도 (Saabas): 순회하면서 분기마다 (자식 값 - 부모 값)을 그 분기 feature에 더한다.
+
+        Returns:
+            (pos, contributions, bias)
+            - pos:           predict_proba(X)[:, 1]과 같은 트리 평균 양성 확률 (n_samples,)
+            - contributions: feature별 기여도의 트리 평균 (n_samples, n_features)
+            - bias:          루트 값의 트리 평균 (pos ≈ bias + contributions.sum(axis=1))
+        """
+        X = self._as_matrix(X)
+        dense = self.max_depth <= DENSE_DEPTH_LIMIT
+        step = max(1, (DENSE_MAX_PAIRS_PER_CHUNK if dense else DEEP_MAX_PAIRS_PER_CHUNK) // max(self.n_trees, 1))
+
+        def run(chunk: np.ndarray) -> np.ndarray:
+            if chunk.shape[0] <= step:
+                return self._contributions_chunk(chunk)
+            return np.concatenate(
+                [self._contributions_chunk(chunk[i:i + step]) for i in range(0, chunk.shape[0], step)], axis=0
+            )
+
+        out = map_row_chunks(run, X)
+        contributions = out[:, :-1]
+        contributions /= self.n_trees
+        bias = float(self.value.take(self.roots).mean(dtype=np.float64))
+        return np.ascontiguousarray(out[:, -1]), contributions, bias
+
+    def _spread_chunk(self, X: np.ndarray, levels: Tuple[float, ...]) -> np.ndarray:
+        return _summarize_trees(self.value.take(self.apply(X)), levels)
+
+    def predict_spread(self, X: Any, levels: Tuple[float, ...] = DEFAULT_SPREAD_QUANTILES) -> TreeSpread:
+        """
+        트리 평균 확률 + 트리 간 분산 / 분위수.
+        청크마다 (n_chunk, n_trees) leaf 값에서 바로 요약하므로 채점 비용은 predict_proba와 거의 같다.
+        """
+        levels = tuple(float(q) for q in levels)
+        out = map_row_chunks(lambda chunk: self._spread_chunk(chunk, levels), self._as_matrix(X))
+        return TreeSpread.from_summary(out, levels)
+
+    def predict_progressive(
+        self,
+        X: Any,
+        first_trees: int = ANYTIME_FIRST_TREES,
+        chunk_trees: int = ANYTIME_CHUNK_TREES,
+        transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+    ) -> Iterator[AnytimeEstimate]:
+        """
+        anytime 예측: 앞쪽 first_trees개 트리의 평균을 먼저 내고, 남은 트리를 chunk_trees개씩 평가하며 갱신한다.
+        마지막 결과는 모든 트리의 leaf 값을 predict_proba와 같은 순서로 평균한 값이다. (exact)
+
+        - 트리는 각자 bootstrap으로 학습되므로 앞쪽 k개는 전체 forest의 무작위 부분집합 역할을 한다.
+        - lower / upper: decide()와 같은 계산 (남은 트리의 leaf 최솟값/최댓값 합) → 최종 값은 항상 그 안
+        - transform: 평균 -> 최종 확률 (calibration). 단조 증가여야 구간이 유지된다.
+        - generator라 호출부가 중간에 멈추면 남은 트리는 평가하지 않는다.
+        """
+        X = self._as_matrix(X)
+        n_rows, n_trees = X.shape[0], self.n_trees
+        transform = transform or (lambda p: p)
+        low, high = self.leaf_bounds()
+        rest_low = np.concatenate([np.cumsum(low[::-1], dtype=np.float64)[::-1], [0.0]])
+        rest_high = np.concatenate([np.cumsum(high[::-1], dtype=np.float64)[::-1], [0.0]])
+
+        tree = np.empty((n_rows, n_trees), dtype=self.value.dtype)
+        start, stop = 0, min(max(1, int(first_trees)), n_trees)
+        while True:
+            tree[:, start:stop] = self.value.take(self._apply_chunk(X, roots=self.roots[start:stop]))
+            if stop == n_trees:
+                pos = transform(tree.mean(axis=1, dtype=np.float64))
+                yield AnytimeEstimate(pos, pos, pos, np.zeros(n_rows), n_trees, n_trees)
+                return
+
+            done = tree[:, :stop]
+            total = done.sum(axis=1, dtype=np.float64)
+            # 유한 모집단 보정: 남은 트리가 적을수록 오차가 0에 가까워진다.
+            var = done.var(axis=1, dtype=np.float64, ddof=1) if stop > 1 else np.zeros(n_rows)
+            stderr = np.sqrt(var / stop * (n_trees - stop) / max(n_trees - 1, 1))
+            yield AnytimeEstimate(
+                probability=transform(total / stop),
+                lower=transform((total + rest_low[stop]) / n_trees),
+                upper=transform((total + rest_high[stop]) / n_trees),
+                stderr=stderr,
+                trees_used=stop,
+                n_trees=n_trees,
+            )
+            start, stop = stop, min(stop + max(1, int(chunk_trees)), n_trees)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """RandomForestClassifier.predict_proba와 동일한 (n_samples, 2) 확률."""
+        # leaf 값이 float32로 저장된(compaction) forest도 평균은 float64로 계산
+        pos = self.predict_tree_proba(X).mean(axis=1, dtype=np.float64)
+        return np.column_stack([1.0 - pos, pos])
+
+    def decide(
+        self,
+        X: Any,
+        threshold: float,
+        transform: Optional[Callable[[np.ndarray], np.ndarray]] = None,
+        chunk_trees: int = EARLY_EXIT_CHUNK_TREES,
+    ) -> EarlyExitDecision:
+        """
+        (확률 >= threshold) 판정만 필요할 때 트리를 chunk_trees개씩 평가하다가
+        남은 트리가 결과를 바꿀 수 없으면 그 row는 멈춘다.
+
+        - k개 트리까지의 합 S, 남은 트리의 leaf 최솟값/최댓값 합 (L, H)
+          → 최종 평균은 [(S + L) / n, (S + H) / n] 안에 있다.
+          하한 >= threshold면 양성, 상한 < threshold면 음성으로 확정
+        - transform: 평균 -> 최종 확률 (calibration). 반드시 단조 증가여야 한다.
+        - 끝까지 확정되지 않은 row는 누적 합 S / n으로 판정하고,
+          그 값이 경계(EARLY_EXIT_EPS 이내)에 걸친 row만 predict_proba와 같은 합산 순서로 다시 순회한다.
+        """
+        X = self._as_matrix(X)
+        n_rows, n_trees = X.shape[0], self.n_trees
+        transform = transform or (lambda p: p)
+        low, high = self.leaf_bounds()
+        # 트리 k개 이후 남은 트리들의 하한/상한 합 (suffix sum)
+        rest_low = np.concatenate([np.cumsum(low[::-1], dtype=np.float64)[::-1], [0.0]])
+        rest_high = np.concatenate([np.cumsum(high[::-1], dtype=np.float64)[::-1], [0.0]])
+
+        decision = np.zeros(n_rows, dtype=bool)
+        trees_used = np.full(n_rows, n_trees, dtype=np.intp)
+        total = np.zeros(n_rows, dtype=np.float64)
+        active = np.arange(n_rows, dtype=np.intp)
+        step = max(1, int(chunk_trees))
+
+        for start in range(0, n_trees, step):
+            if active.size == 0:
+                break
+            stop = min(start + step, n_trees)
+            leaves = self._apply_chunk(X[active], roots=self.roots[start:stop])
+            total[active] += self.value.take(leaves).sum(axis=1, dtype=np.float64)
+            if stop == n_trees:
+                break
+
+            lower = transform((total[active] + rest_low[stop]) / n_trees)
+            upper = transform((total[active] + rest_high[stop]) / n_trees)
+            yes = lower >= threshold + EARLY_EXIT_EPS
+            no = upper < threshold - EARLY_EXIT_EPS
+            done = yes | no
+            decision[active[yes]] = True
+            trees_used[active[done]] = stop
+            active = active[~done]
+
+        if active.size:
+            # 모든 트리를 본 row는 누적 합이 곧 평균 (합산 순서 차이는 경계 근처에서만 판정을 바꿀 수 있다)
+            pos = transform(total[active] / n_trees)
+            decision[active] = pos >= threshold
+            edge = active[np.abs(pos - threshold) <= EARLY_EXIT_EPS]
+            if edge.size:
+                exact = transform(self.value.take(self.apply(X[edge])).mean(axis=1, dtype=np.float64))
+                decision[edge] = exact >= threshold
+        return EarlyExitDecision(decision=decision, trees_used=trees_used, n_trees=n_trees)
+
+
+@dataclass(frozen=True)
+class CompiledPipeline:
+    """
+    (전처리) + CompiledForest + (calibration) 조합.
+
+    Attributes:
+        preprocess:  fitted 전처리 transformer (없으면 입력을 그대로 forest에 전달)
+        forest:      CompiledForest
+        calibration: adapters.calibration.CalibrationLayer (없으면 None)
+        fused:       preprocess를 대체하는 FusedPreprocessor (지원 안 되는 구성이면 None)
+        estimator:   forest의 원본 sklearn 앙상블 (없으면 None).
+                     forest.batch_row_limit보다 큰 배치는 sklearn(Cython) 순회가 더 빠르므로 이쪽으로 채점한다.
+    """
+    preprocess: Any
+    forest: CompiledForest
+    calibration: Any = None
+    fused: Any = None
+    estimator: Any = field(default=None, repr=False, compare=False)
+
+    def transform(self, features: Any) -> np.ndarray:
+        if self.preprocess is None:
+            return np.asarray(features)
+        if self.fused is not None and isinstance(features, pd.DataFrame):
+            return self.fused.transform(features)
+        Xt = self.preprocess.transform(features)
+        if hasattr(Xt, "toarray"):
+            Xt = Xt.toarray()
+        return Xt
+
+    def calibrate(self, pos: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """평균 확률 -> 최종 확률. out=pos로 주면 제자리에서 계산"""
+        if self.calibration is None:
+            return pos
+        return self.calibration.apply(pos, out=out)
+
+    def uses_estimator(self, n_rows: int) -> bool:
+        """n_rows 배치를 원본 sklearn 앙상블로 채점하는지"""
+        return self.estimator is not None and n_rows > self.forest.batch_row_limit
+
+    def predict_base(self, X: np.ndarray) -> np.ndarray:
+        """전처리된 X -> calibration 전 양성 확률 (n_samples,)"""
+        if not self.uses_estimator(len(X)):
+            return np.ascontiguousarray(self.forest.predict_proba(X)[:, 1])
+        with inference_scope(len(X)):
+            proba = self.estimator.predict_proba(np.asarray(X, dtype=np.float32))
+        return np.ascontiguousarray(proba[:, list(self.estimator.classes_).index(1)], dtype=np.float64)
+
+    def _estimator_tree_proba(self, X: np.ndarray) -> np.ndarray:
+        """원본 앙상블의 트리별 양성 확률 (n_samples, n_trees)"""
+        X = np.asarray(X, dtype=np.float32)
+        out = np.empty((X.shape[0], self.forest.n_trees), dtype=np.float64)
+        for j, est in enumerate(self.estimator.estimators_):
+            out[:, j] = est.predict_proba(X, check_input=False)[:, list(est.classes_).index(1)]
+        return out
+
+    def predict_proba(self, features: Any) -> np.ndarray:
+        pos = self.calibrate(self.predict_base(self.transform(features)))
+        return np.column_stack([1.0 - pos, pos])
+
+    def predict_progressive(
+        self,
+        features: Any,
+        first_trees: int = ANYTIME_FIRST_TREES,
+        chunk_trees: int = ANYTIME_CHUNK_TREES,
+    ) -> Iterator[AnytimeEstimate]:
+        """
+        CompiledForest.predict_progressive + calibration.
+        calibration이 단조 증가가 아니면 구간을 보장할 수 없으므로 중간 결과 없이 최종 결과만 낸다.
+        """
+        X = self.transform(features)
+        if self.calibration is not None and not self.calibration_is_monotone():
+            first_trees = self.forest.n_trees
+        return self.forest.predict_progressive(X, first_trees, chunk_trees, transform=self.calibrate)
+
+    def predict_spread(self, features: Any, levels: Tuple[float, ...] = DEFAULT_SPREAD_QUANTILES) -> TreeSpread:
+        """
+        CompiledForest.predict_spread + calibration.
+        probability와 (단조 증가 calibration이면) quantiles는 calibrate 후 값, variance는 calibration 전 트리 기준
+        """
+        X = self.transform(features)
+        if self.uses_estimator(len(X)):
+            levels = tuple(float(q) for q in levels)
+            spread = TreeSpread.from_summary(_summarize_trees(self._estimator_tree_proba(X), levels), levels)
+        else:
+            spread = self.forest.predict_spread(X, levels)
+        if self.calibration is not None:
+            self.calibrate(spread.probability, out=spread.probability)
+            if self.calibration_is_monotone():
+                self.calibrate(spread.quantiles, out=spread.quantiles)
+        return spread
+
+    def calibration_is_monotone(self) -> bool:
+        """calibrate()가 [0, 1]에서 단조 증가인지 (early-exit 판정 가능 여부)"""
+        cached = self.__dict__.get("_monotone")
+        if cached is None and self.calibration is not None and self.calibration.is_monotone:
+            cached = True
+        if cached is None:
+            grid = self.calibrate(np.linspace(0.0, 1.0, 1001))
+            cached = bool(np.all(np.diff(grid) >= 0.0))
+            object.__setattr__(self, "_monotone", cached)
+        return cached
+
+    def decide(self, features: Any, threshold: float, chunk_trees: int = EARLY_EXIT_CHUNK_TREES) -> EarlyExitDecision:
+        """
+        (최종 확률 >= threshold) 판정. CompiledForest.decide 참고.
+        calibration이 단조 증가가 아니면 모든 트리를 평가해서 판정한다.
+        """
+        X = self.transform(features)
+        if not self.calibration_is_monotone():
+            pos = self.calibrate(self.predict_base(X))
+            n_trees = self.forest.n_trees
+            return EarlyExitDecision(pos >= threshold, np.full(len(pos), n_trees, dtype=np.intp), n_trees)
+        return self.forest.decide(X, threshold, transform=self.calibrate, chunk_trees=chunk_trees)
+
+
+def _unwrap_frozen(estimator: Any) -> Any:
+    # sklearn.frozen.FrozenEstimator는 .estimator에 원본을 들고 있다.
+    while type(estimator).__name__ == "FrozenEstimator":
+        estimator = estimator.estimator
+    return estimator
+
+
+def _split_pipeline(model: Any):
+    """Pipeline이면 (전처리, 마지막 estimator)로, 아니면 (None, model)로 나눈다."""
+    steps = getattr(model, "steps", None)
+    if not steps:
+        return None, model
+    if len(steps) == 1:
+        return None, steps[-1][1]
+    return model[:-1], steps[-1][1]
+
+
+def compile_pipeline(model: Any, forest: Optional[CompiledForest] = None) -> CompiledPipeline:
+    """
+    artifact["pipeline"] (Pipeline / CalibratedPipeline / CalibratedClassifierCV)를 CompiledPipeline으로 변환한다.
+
+    지원 구조:
+    - Pipeline(preprocess, forest)
+    - CalibratedPipeline(Pipeline(preprocess, forest), CalibrationLayer)
+    - CalibratedClassifierCV(FrozenEstimator(Pipeline(preprocess, forest))) (sigmoid / isotonic)
+    - compiled_ 속성으로 CompiledPipeline을 들고 있는 모델 (artifact_store.ServingPipeline / shared_model.SharedPipeline)
+
+    forest를 넘기면 (mmap artifact에 저장된 CompiledForest 등) 트리를 다시 펼치지 않고 그대로 사용한다.
+    원본 앙상블은 트리 수가 forest와 같을 때만 큰 배치용 estimator로 붙인다.
+
+    Raises:
+        UnsupportedModelError: 위 구조가 아닐 때
+    """
+    # calibration / fused_preprocess가 이 모듈의 UnsupportedModelError를 쓰므로 순환 import를 피해 여기서 import
+    from adapters.calibration import CalibratedPipeline
+    from adapters.fused_preprocess import try_build_fused
+
+    # 이미 컴파일된 모델 (ServingPipeline / SharedPipeline 등)
+    prebuilt = getattr(model, "compiled_", None)
+    if isinstance(prebuilt, CompiledPipeline):
+        return prebuilt if forest is None or forest is prebuilt.forest else replace(prebuilt, forest=forest)
+
+    calibration = None
+    if getattr(model, "calibrated_classifiers_", None):
+        model = CalibratedPipeline.from_sklearn(model)
+    if isinstance(model, CalibratedPipeline):
+        calibration = model.calibration
+        model = model.base
+
+    preprocess, estimator = _split_pipeline(_unwrap_frozen(model))
+    if forest is None:
+        forest = CompiledForest.from_forest(estimator)
+    # ONNX 등 다른 엔진의 forest는 배치에서도 그 엔진으로 채점
+    if not isinstance(forest, CompiledForest) or len(getattr(estimator, "estimators_", ())) != forest.n_trees:
+        estimator = None
+    return CompiledPipeline(
+        preprocess=preprocess,
+        forest=forest,
+        calibration=calibration,
+        fused=try_build_fused(preprocess),
+        estimator=estimator,
+    )
+
+
+def max_abs_diff(model: Any, compiled: CompiledPipeline, features: pd.DataFrame) -> float:
+    """sklearn predict_proba 대비 컴파일 엔진의 최대 절대 오차 (parity 확인용)."""
+    expected = np.asarray(model.predict_proba(features))[:, 1]
+    actual = compiled.predict_proba(features)[:, 1]
+    return float(np.max(np.abs(expected - actual))) if len(expected) else 0.0
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from adapters.forest_engine import UnsupportedModelError
+
+
+@dataclass(frozen=True)
+class _CategoricalBlock:
+    column: str
+    categories: pd.Index   # fitted categories_ (get_indexer로 한 번에 조회)
+    out_start: int         # 이 컬럼의 one-hot 블록 시작 위치
+
+
+class FusedPreprocessor:
+    """
+    fitted ColumnTransformer(RobustScaler + OneHotEncoder)를 대체하는 전처리 커널.
+
+    - 학습 시 fit된 center_/scale_, categories_를 꺼내 NumPy 테이블로 보관
+    - transform(): 미리 할당한 dense 행렬 하나에 스케일링 + one-hot을 바로 기록
+      (sklearn 디스패치 / sparse 행렬 생성 / hstack 없음)
+    - ColumnTransformer.transform(...).toarray()와 같은 값, 같은 컬럼 순서
+
+    - RobustScaler / OneHotEncoder(handle_unknown="ignore", drop=None) / remainder="drop"
+    - 그 외 구성이면 UnsupportedModelError (호출부는 sklearn transform 사용)
+    """
+
+    def __init__(self, column_transformer: Any):
+        out_slices = getattr(column_transformer, "output_indices_", None)
+        if out_slices is None:
+            raise UnsupportedModelError("Preprocess step is not a fitted ColumnTransformer.")
+
+        numeric_columns: List[str] = []
+        centers: List[float] = []
+        scales: List[float] = []
+        numeric_out: List[int] = []
+        self.categorical: List[_CategoricalBlock] = []
+        self.n_out = 0
+
+        for name, transformer, columns in column_transformer.transformers_:
+            if name == "remainder" or (isinstance(transformer, str) and transformer == "drop"):
+                if not isinstance(transformer, str) or (transformer != "drop" and len(columns)):
+                    raise UnsupportedModelError("remainder='passthrough' is not supported.")
+                continue
+
+            start = out_slices[name].start
+            kind = type(transformer).__name__
+            if kind == "RobustScaler":
+                center = getattr(transformer, "center_", None)
+                scale = getattr(transformer, "scale_", None)
+                for i, col in enumerate(columns):
+                    numeric_columns.append(col)
+                    centers.append(float(center[i]) if center is not None else 0.0)
+                    scales.append(float(scale[i]) if scale is not None else 1.0)
+                    numeric_out.append(start + i)
+            elif kind == "OneHotEncoder":
+                if getattr(transformer, "drop_idx_", None) is not None:
+                    raise UnsupportedModelError("OneHotEncoder(drop=...) is not supported.")
+                if getattr(transformer, "_infrequent_enabled", False):
+                    raise UnsupportedModelError("OneHotEncoder infrequent categories are not supported.")
+                if getattr(transformer, "handle_unknown", "error") == "error":
+                    raise UnsupportedModelError("OneHotEncoder(handle_unknown='error') is not supported.")
+                pos = start
+                for col, cats in zip(columns, transformer.categories_):
+                    self.categorical.append(
+                        _CategoricalBlock(column=col, categories=pd.Index(cats, dtype=object), out_start=pos)
+                    )
+                    pos += len(cats)
+            else:
+                raise UnsupportedModelError(f"Unsupported transformer in fused preprocess: {kind}")
+
+            self.n_out = max(self.n_out, out_slices[name].stop)
+
+        self.numeric_columns: Tuple[str, ...] = tuple(numeric_columns)
+        self.centers = np.asarray(centers, dtype=np.float64)
+        self.scales = np.asarray(scales, dtype=np.float64)
+        self.numeric_out = np.asarray(numeric_out, dtype=np.intp)
+        # 단건 변환(transform_record)은 NumPy scalar보다 파이썬 float가 빠르다.
+        self._record_plan = list(zip(numeric_columns, numeric_out, centers, scales))
+        # 숫자형 출력 위치가 연속이면 slice view에 바로 기록
+        self._numeric_slice: Optional[slice] = None
+        if len(numeric_out) and numeric_out == list(range(numeric_out[0], numeric_out[0] + len(numeric_out))):
+            self._numeric_slice = slice(numeric_out[0], numeric_out[0] + len(numeric_out))
+
+        try:
+            self._feature_names_out = np.asarray(column_transformer.get_feature_names_out(), dtype=object)
+        except (AttributeError, ValueError):
+            self._feature_names_out = None
+
+    @classmethod
+    def from_pipeline(cls, preprocess: Any) -> "FusedPreprocessor":
+        """ColumnTransformer 또는 Pipeline(ColumnTransformer[, model])에서 생성"""
+        if hasattr(preprocess, "transformers_"):
+            return cls(preprocess)
+        steps = getattr(preprocess, "steps", None) or []
+        # 첫 step이 ColumnTransformer이고, 뒤에는 최종 모델만 올 수 있다.
+        if steps and hasattr(steps[0][1], "transformers_"):
+            tail = [step for _, step in steps[1:]]
+            if len(tail) <= 1 and all(hasattr(step, "predict") for step in tail):
+                return cls(steps[0][1])
+        raise UnsupportedModelError(f"No supported ColumnTransformer in: type={type(preprocess)}")
+
+    @property
+    def encoding_key(self) -> Tuple[Any, ...]:
+        """
+        전처리 파라미터 지문. 값이 같은 두 커널은 같은 입력을 같은 행렬로 변환한다.
+        (따로 학습된 artifact끼리 인코딩 결과를 공유해도 되는지 판단할 때 사용)
+        """
+        key = self.__dict__.get("_encoding_key")
+        if key is None:
+            key = (
+                self.n_out,
+                self.numeric_columns,
+                self.numeric_out.tobytes(),
+                self.centers.tobytes(),
+                self.scales.tobytes(),
+                tuple((b.column, b.out_start, tuple(b.categories)) for b in self.categorical),
+            )
+            self._encoding_key = key
+        return key
+
+    def get_feature_names_out(self) -> np.ndarray:
+        if self._feature_names_out is None:
+            raise AttributeError("Feature names are not available for this transformer.")
+        return self._feature_names_out
+
+    # --------------------
+    # 변환
+    # --------------------
+    def transform(self, features: pd.DataFrame, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        DataFrame 배치 -> dense 모델 입력 행렬 (n_rows, n_out).
+        out을 넘기면 그 버퍼에 기록한다 (shape (n_rows, n_out), float64).
+        """
+        n_rows = len(features)
+        if out is None:
+            out = np.zeros((n_rows, self.n_out), dtype=np.float64)
+        else:
+            out[...] = 0.0
+
+        if len(self.numeric_columns):
+            raw = features[list(self.numeric_columns)].to_numpy(dtype=np.float64)
+            if self._numeric_slice is not None:
+                block = out[:, self._numeric_slice]
+                np.subtract(raw, self.centers, out=block)
+                np.divide(block, self.scales, out=block)
+            else:
+                out[:, self.numeric_out] = (raw - self.centers) / self.scales
+
+        rows = np.arange(n_rows, dtype=np.intp)
+        for block in self.categorical:
+            column = features[block.column]
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                # pd.Categorical 입력: 범주 목록만 한 번 조회하고 row별 코드는 표로 변환 (row별 객체 없음)
+                lut = np.append(block.categories.get_indexer(column.cat.categories.astype(object)), -1)
+                codes = lut[column.cat.codes.to_numpy()]
+            else:
+                codes = block.categories.get_indexer(column.to_numpy(dtype=object))
+            known = codes >= 0
+            # handle_unknown="ignore": 모르는 값(-1)은 전부 0으로 둔다.
+            out[rows[known], block.out_start + codes[known]] = 1.0
+        return out
+
+    def transform_record(self, values: Mapping[str, Any], default: Any = 0) -> np.ndarray:
+        """dict 1건 -> (1, n_out) 모델 입력 (단일 세션 fast path용)"""
+        row = np.zeros((1, self.n_out), dtype=np.float64)
+        out = row[0]
+        for col, pos, center, scale in self._record_plan:
+            value = values.get(col, default)
+            # DataFrame 경로(to_numpy(float64))처럼 None은 NaN으로 변환
+            x = np.nan if value is None else float(value)
+            out[pos] = (x - center) / scale
+        for block in self.categorical:
+            value = values.get(block.column)
+            if hasattr(value, "item"):
+                value = value.item()
+            try:
+                code = block.categories.get_loc(value)
+            except (KeyError, TypeError):
+                continue
+            if isinstance(code, (int, np.integer)):
+                out[block.out_start + int(code)] = 1.0
+        return row
+
+
+def try_build_fused(preprocess: Any) -> Optional[FusedPreprocessor]:
+    """지원하지 않는 전처리 구성이면 None"""
+    if preprocess is None:
+        return None
+    try:
+        return FusedPreprocessor.from_pipeline(preprocess)
+    except UnsupportedModelError:
+        return None
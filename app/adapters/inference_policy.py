@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+import numpy as np
+from joblib import parallel_config
+
+# 환경변수: 배치 하나에 쓸 최대 스레드 수 / 병렬로 전환하는 최소 row 수
+MAX_THREADS_ENV_VAR = "INFERENCE_MAX_THREADS"
+MIN_PARALLEL_ROWS_ENV_VAR = "INFERENCE_PARALLEL_MIN_ROWS"
+
+# 기본값 (script/bench_inference_parallelism.py 결과 기준)
+# - 300~1200 트리 BRF는 수천 row 아래에서는 스레드 기동/합산 비용이 이득보다 크다.
+# - 여러 사용자가 동시에 요청하는 Streamlit 서버라 배치 하나가 코어를 모두 쓰지 않도록 상한을 둔다.
+DEFAULT_MIN_PARALLEL_ROWS = 2048
+DEFAULT_MAX_THREADS = 4
+# 스레드 하나가 최소한 맡아야 하는 row 수 (이보다 작게 쪼개면 오히려 느려짐)
+MIN_ROWS_PER_THREAD = 1024
+
+
+@dataclass(frozen=True)
+class InferencePolicy:
+    """
+    배치 크기에 따라 추론 스레드 수를 정하는 정책.
+
+    - n_rows < min_parallel_rows : 단일 스레드
+    - 그 이상                    : min(max_threads, n_rows // MIN_ROWS_PER_THREAD) 스레드
+
+    - 학습 스크립트의 n_jobs=-1은 artifact에 그대로 저장된다.
+      ModelRegistry가 로드 시 configure_for_inference()로 n_jobs를 None으로 바꾸므로,
+      추론 스레드 수는 이 정책(joblib.parallel_config)이 정한다.
+    """
+
+    min_parallel_rows: int = DEFAULT_MIN_PARALLEL_ROWS
+    max_threads: int = DEFAULT_MAX_THREADS
+
+    @classmethod
+    def from_env(cls) -> "InferencePolicy":
+        cpu = os.cpu_count() or 1
+        raw_threads = os.environ.get(MAX_THREADS_ENV_VAR, "").strip()
+        raw_rows = os.environ.get(MIN_PARALLEL_ROWS_ENV_VAR, "").strip()
+        max_threads = int(raw_threads) if raw_threads else DEFAULT_MAX_THREADS
+        return cls(
+            min_parallel_rows=int(raw_rows) if raw_rows else DEFAULT_MIN_PARALLEL_ROWS,
+            max_threads=max(1, min(max_threads, cpu)),
+        )
+
+    def n_threads(self, n_rows: int) -> int:
+        if self.max_threads <= 1 or n_rows < self.min_parallel_rows:
+            return 1
+        return max(1, min(self.max_threads, n_rows // MIN_ROWS_PER_THREAD))
+
+
+def configure_for_inference(obj: Any) -> int:
+    """
+    로드된 artifact 안의 estimator들의 n_jobs를 None으로 바꾼다. (바꾼 개수 반환)
+
+    - Pipeline / CalibratedClassifierCV / FrozenEstimator 등 중첩 구조를 따라간다.
+    - n_jobs=None이면 sklearn은 joblib.parallel_config의 값(기본 1)을 쓰므로
+      요청별로 inference_scope()가 스레드 수를 정할 수 있다.
+    """
+    changed = 0
+    seen: set = set()
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if id(cur) in seen or isinstance(cur, (np.ndarray, str, bytes, int, float)):
+            continue
+        seen.add(id(cur))
+
+        if isinstance(cur, dict):
+            stack.extend(cur.values())
+            continue
+        if isinstance(cur, (list, tuple)):
+            stack.extend(cur)
+            continue
+        if not hasattr(cur, "get_params") or not hasattr(cur, "__dict__"):
+            continue
+
+        if getattr(cur, "n_jobs", None) is not None:
+            cur.n_jobs = None
+            changed += 1
+        stack.extend(vars(cur).values())
+    return changed
+
+
+_POLICY: Optional[InferencePolicy] = None
+_POLICY_LOCK = threading.Lock()
+_NATIVE_LIMITS: Any = None
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+# 모델(전략)별 채점용 풀. 작업 안에서 map_row_chunks가 _EXECUTOR를 쓰므로 같은 풀을 쓰면 서로 기다리다 막힐 수 있다.
+_MODEL_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def get_policy() -> InferencePolicy:
+    """프로세스 전역 정책 (처음 호출 시 BLAS/OpenMP 스레드 풀도 max_threads로 제한)"""
+    global _POLICY, _NATIVE_LIMITS
+    if _POLICY is None:
+        with _POLICY_LOCK:
+            if _POLICY is None:
+                policy = InferencePolicy.from_env()
+                try:
+                    from threadpoolctl import threadpool_limits
+
+                    # 프로세스 전역 설정이라 요청마다 바꾸지 않고 한 번만 건다.
+                    _NATIVE_LIMITS = threadpool_limits(limits=policy.max_threads)
+                except ImportError:
+                    _NATIVE_LIMITS = None
+                _POLICY = policy
+    return _POLICY
+
+
+def _executor(max_workers: int) -> ThreadPoolExecutor:
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _POLICY_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+    return _EXECUTOR
+
+
+def _model_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _MODEL_EXECUTOR
+    if _MODEL_EXECUTOR is None:
+        with _POLICY_LOCK:
+            if _MODEL_EXECUTOR is None:
+                _MODEL_EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference-model")
+    return _MODEL_EXECUTOR
+
+
+@contextmanager
+def inference_scope(n_rows: int, n_jobs: Optional[int] = None) -> Iterator[int]:
+    """
+    n_rows 배치에 맞는 스레드 수로 joblib 병렬도를 설정한다. (스레드 수를 yield)
+    parallel_config는 스레드별 설정이라 동시 요청끼리 영향을 주지 않는다.
+    n_jobs를 주면 정책 대신 그 값을 쓴다. (벤치마크용)
+    """
+    if n_jobs is None:
+        n_jobs = get_policy().n_threads(n_rows)
+    with parallel_config(backend="threading", n_jobs=n_jobs):
+        yield n_jobs
+
+
+def map_row_chunks(
+    fn: Callable[[np.ndarray], np.ndarray],
+    X: np.ndarray,
+    n_jobs: Optional[int] = None,
+) -> np.ndarray:
+    """
+    X를 row 방향으로 나눠 공용 스레드 풀에서 fn을 실행하고 결과를 이어 붙인다.
+    (CompiledForest처럼 NumPy 연산 위주라 GIL을 놓는 채점 함수용)
+    작은 배치는 나누지 않고 현재 스레드에서 바로 실행한다. (n_jobs를 주면 정책 대신 그 값)
+    """
+    policy = get_policy()
+    if n_jobs is None:
+        n_jobs = policy.n_threads(X.shape[0])
+    if n_jobs <= 1:
+        return fn(X)
+    bounds = np.linspace(0, X.shape[0], n_jobs + 1, dtype=int)
+    chunks = [X[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+    return np.concatenate(list(_executor(max(policy.max_threads, n_jobs)).map(fn, chunks)), axis=0)
+
+
+def map_models(fn: Callable[[T], R], items: Iterable[T]) -> List[R]:
+    """
+    모델(전략)별 채점 함수를 전용 스레드 풀에서 동시에 실행하고 입력 순서대로 결과를 돌려준다.
+    항목이 하나뿐이거나 정책상 스레드가 1개면 현재 스레드에서 차례로 실행한다.
+    (예외는 호출한 쪽으로 그대로 전달됨)
+    """
+    items = list(items)
+    policy = get_policy()
+    if len(items) <= 1 or policy.max_threads <= 1:
+        return [fn(item) for item in items]
+    return list(_model_executor(policy.max_threads).map(fn, items))
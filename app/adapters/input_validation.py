@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from adapters.feature_schema import _find_column_transformer
+
+# artifact에 검증 규칙(InputValidator.to_dict())을 저장하는 키 (JSON이라 split artifact면 manifest.json에 들어감)
+INPUT_SCHEMA_KEY = "input_schema"
+
+# row별 오류 코드 (비트 플래그, 한 row에 여러 개가 겹칠 수 있음)
+MISSING = 1 << 0           # 값 없음 (NaN / None / 컬럼 자체가 없음)
+BAD_TYPE = 1 << 1          # 숫자 컬럼에 숫자가 아닌 값, bool 컬럼에 "True" 같은 문자열 등
+NEGATIVE = 1 << 2          # 학습 데이터에서 항상 0 이상이던 컬럼에 음수
+NOT_INTEGER = 1 << 3       # 학습 데이터에서 정수형이던 컬럼에 소수
+UNKNOWN_CATEGORY = 1 << 4  # 학습 때 보지 못한 범주 (OneHotEncoder가 조용히 전부 0으로 만드는 값)
+OUT_OF_RANGE = 1 << 5      # 학습 데이터 관측 범위(min~max) 밖 (외삽 경고)
+
+ERROR_NAMES: Dict[int, str] = {
+    MISSING: "missing",
+    BAD_TYPE: "bad_type",
+    NEGATIVE: "negative",
+    NOT_INTEGER: "not_integer",
+    UNKNOWN_CATEGORY: "unknown_category",
+    OUT_OF_RANGE: "out_of_range",
+}
+
+# 기본으로 격리하는 오류. OUT_OF_RANGE는 트리 모델이 끝 값으로 처리하므로 경고로만 남긴다.
+DEFAULT_REJECT = MISSING | BAD_TYPE | NEGATIVE | NOT_INTEGER | UNKNOWN_CATEGORY
+
+
+def describe_code(code: int) -> List[str]:
+    """오류 코드 -> 오류 이름 목록 (예: 18 -> ["bad_type", "unknown_category"])"""
+    return [name for flag, name in ERROR_NAMES.items() if code & flag]
+
+
+def _plain(value: Any) -> Any:
+    return value.item() if hasattr(value, "item") else value
+
+
+def _category_kind(categories: Sequence[Any]) -> str:
+    values = [_plain(v) for v in categories]
+    if values and all(isinstance(v, bool) for v in values):
+        return "bool"
+    if values and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+        return "number"
+    return "str"
+
+
+@dataclass(frozen=True, eq=False)
+class ValidationReport:
+    """
+    InputValidator.validate() 결과.
+
+    Attributes:
+        codes:          row별 오류 비트 (len(batch),) uint16, 0이면 문제 없음
+        reject:         격리 대상 오류 비트 (기본 DEFAULT_REJECT)
+        column_counts:  컬럼별 문제 row 수 (문제 없는 컬럼은 빠짐)
+    """
+    codes: np.ndarray
+    reject: int = DEFAULT_REJECT
+    column_counts: Mapping[str, int] = field(default_factory=dict)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """채점해도 되는 row (reject 비트가 하나도 없음)"""
+        return (self.codes & self.reject) == 0
+
+    @property
+    def n_rejected(self) -> int:
+        return int(np.count_nonzero(~self.valid))
+
+    def summary(self) -> Dict[str, int]:
+        """오류 이름 -> 해당 row 수"""
+        return {
+            name: int(np.count_nonzero(self.codes & flag))
+            for flag, name in ERROR_NAMES.items()
+            if np.any(self.codes & flag)
+        }
+
+    def split(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        (채점할 row, 격리할 row)로 나눈다.
+        격리 쪽에는 error_code / error_reasons 컬럼을 붙인다. (원본 index 유지)
+        """
+        valid = self.valid
+        quarantined = df.loc[~valid].copy()
+        codes = self.codes[~valid]
+        quarantined["error_code"] = codes
+        quarantined["error_reasons"] = [",".join(describe_code(int(c))) for c in codes]
+        return df.loc[valid], quarantined
+
+
+@dataclass(frozen=True, eq=False)
+class InputValidator:
+    """
+    학습 스키마(num_cols / cat_cols + 학습 데이터의 관측 범위 / 범주 집합)로 만든 배치 검증기.
+
+    - 숫자 컬럼은 (n, k) 행렬 하나로 만들어 NumPy 마스크로 한 번에 검사
+      (결측 / 숫자 아님 / 음수 / 정수 아님 / 관측 범위 밖)
+    - 범주 컬럼은 pd.Index.get_indexer 한 번으로 학습 범주에 있는지 검사
+      (문자열 "True"가 bool 컬럼에 들어온 경우 등은 BAD_TYPE)
+    - row별 오류 비트(ValidationReport.codes)를 돌려주고, 호출부는 valid row만 채점 / 나머지는 격리
+    - to_dict() / from_dict(): artifact[INPUT_SCHEMA_KEY]에 JSON으로 저장
+
+    - 입력에 없는 컬럼은 모든 row가 MISSING이 된다. (adapter의 정렬은 0으로 채우지만 검증은 알려준다)
+    - 모델에서 만든 검증기(from_model)는 관측 범위를 모르므로 범위 / 음수 / 정수 검사를 하지 않는다.
+    """
+    numeric_columns: Tuple[str, ...] = ()
+    lower: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    upper: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    non_negative: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+    integer: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+    categories: Mapping[str, pd.Index] = field(default_factory=dict)
+
+    # --------------------
+    # 생성 / 직렬화
+    # --------------------
+    @classmethod
+    def from_training_data(
+        cls,
+        df: pd.DataFrame,
+        num_cols: Sequence[str],
+        cat_cols: Sequence[str],
+    ) -> "InputValidator":
+        numeric = df[list(num_cols)]
+        values = numeric.to_numpy(dtype=np.float64)
+        return cls(
+            numeric_columns=tuple(num_cols),
+            lower=np.nanmin(values, axis=0) if len(values) else np.full(len(num_cols), -np.inf),
+            upper=np.nanmax(values, axis=0) if len(values) else np.full(len(num_cols), np.inf),
+            non_negative=np.nanmin(values, axis=0) >= 0.0 if len(values) else np.zeros(len(num_cols), dtype=bool),
+            integer=np.array([pd.api.types.is_integer_dtype(numeric[c].dtype) for c in num_cols], dtype=bool),
+            categories={c: pd.Index([_plain(v) for v in pd.unique(df[c].dropna())], dtype=object) for c in cat_cols},
+        )
+
+    @classmethod
+    def from_model(cls, model: Any) -> "InputValidator":
+        """
+        fitted ColumnTransformer의 스케일러 컬럼 / OneHotEncoder categories_로 만든다. (검증 규칙이 없는 예전 artifact용)
+
+        Raises:
+            ValueError: 모델에서 ColumnTransformer를 찾지 못했을 때
+        """
+        ct = _find_column_transformer(model)
+        if ct is None:
+            raise ValueError("Could not find a fitted ColumnTransformer to build input validation from.")
+        numeric: List[str] = []
+        categories: Dict[str, pd.Index] = {}
+        for name, transformer, cols in ct.transformers_:
+            if isinstance(transformer, str):
+                continue
+            fitted = getattr(transformer, "categories_", None)
+            if fitted is not None:
+                for col, cats in zip(cols, fitted):
+                    categories[col] = pd.Index([_plain(v) for v in cats], dtype=object)
+            else:
+                numeric.extend(cols)
+        n = len(numeric)
+        return cls(
+            numeric_columns=tuple(numeric),
+            lower=np.full(n, -np.inf),
+            upper=np.full(n, np.inf),
+            non_negative=np.zeros(n, dtype=bool),
+            integer=np.zeros(n, dtype=bool),
+            categories=categories,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "numeric": [
+                {"column": c, "min": float(lo), "max": float(hi), "non_negative": bool(nn), "integer": bool(it)}
+                for c, lo, hi, nn, it in zip(self.numeric_columns, self.lower, self.upper, self.non_negative, self.integer)
+            ],
+            "categorical": {c: [_plain(v) for v in cats] for c, cats in self.categories.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, params: Mapping[str, Any]) -> "InputValidator":
+        rules = list(params.get("numeric", []))
+        return cls(
+            numeric_columns=tuple(r["column"] for r in rules),
+            lower=np.array([r.get("min", -np.inf) for r in rules], dtype=np.float64),
+            upper=np.array([r.get("max", np.inf) for r in rules], dtype=np.float64),
+            non_negative=np.array([bool(r.get("non_negative", False)) for r in rules], dtype=bool),
+            integer=np.array([bool(r.get("integer", False)) for r in rules], dtype=bool),
+            categories={c: pd.Index(list(v), dtype=object) for c, v in params.get("categorical", {}).items()},
+        )
+
+    # --------------------
+    # 검증
+    # --------------------
+    def _numeric_matrix(self, df: pd.DataFrame, present: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(값 행렬, 숫자로 읽을 수 없던 칸 마스크). 숫자 dtype 컬럼은 변환 없이 한 번에 읽는다."""
+        frame = df[present]
+        bad = np.zeros((len(df), len(present)), dtype=bool)
+        if all(pd.api.types.is_numeric_dtype(t) or pd.api.types.is_bool_dtype(t) for t in frame.dtypes):
+            return frame.to_numpy(dtype=np.float64), bad
+        values = np.empty((len(df), len(present)), dtype=np.float64)
+        for j, col in enumerate(present):
+            series = frame[col]
+            if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+                values[:, j] = series.to_numpy(dtype=np.float64)
+                continue
+            parsed = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+            bad[:, j] = np.isnan(parsed) & series.notna().to_numpy()
+            values[:, j] = parsed
+        return values, bad
+
+    def validate(self, df: pd.DataFrame, reject: int = DEFAULT_REJECT) -> ValidationReport:
+        """배치 전체를 한 번에 검사해 row별 오류 코드를 만든다. (입력은 바꾸지 않음)"""
+        n = len(df)
+        codes = np.zeros(n, dtype=np.uint16)
+        column_counts: Dict[str, int] = {}
+        columns = set(df.columns)
+
+        # 숫자 컬럼: (n, k) 행렬 하나로 검사
+        idx = [j for j, c in enumerate(self.numeric_columns) if c in columns]
+        missing_cols = [c for c in self.numeric_columns if c not in columns]
+        if idx:
+            present = [self.numeric_columns[j] for j in idx]
+            values, bad = self._numeric_matrix(df, present)
+            with np.errstate(invalid="ignore"):
+                nan = np.isnan(values)
+                checks = (
+                    (MISSING, nan & ~bad),
+                    (BAD_TYPE, bad),
+                    (NEGATIVE, (values < 0.0) & self.non_negative[idx]),
+                    (NOT_INTEGER, (np.mod(values, 1.0) != 0.0) & ~nan & self.integer[idx]),
+                    (OUT_OF_RANGE, (values < self.lower[idx]) | (values > self.upper[idx])),
+                )
+            flagged = np.zeros_like(bad)
+            for flag, mask in checks:
+                codes[mask.any(axis=1)] |= flag
+                flagged |= mask
+            counts = flagged.sum(axis=0)
+            column_counts.update({c: int(k) for c, k in zip(present, counts) if k})
+
+        # 범주 컬럼: 학습 범주 조회 한 번
+        for col, cats in self.categories.items():
+            if col not in columns:
+                missing_cols.append(col)
+                continue
+            values = df[col].to_numpy(dtype=object)
+            null = pd.isna(values)
+            unknown = (cats.get_indexer(values) < 0) & ~null
+            codes[null] |= MISSING
+            if unknown.any():
+                kind = _category_kind(cats)
+                rows = np.flatnonzero(unknown)
+                # 범주 밖 값만 (대개 소수) 타입을 확인한다.
+                if kind == "bool":
+                    wrong_type = np.ones(len(rows), dtype=bool)
+                elif kind == "number":
+                    wrong_type = np.array([isinstance(v, (str, bytes, bool)) for v in values[rows]], dtype=bool)
+                else:
+                    wrong_type = np.array([not isinstance(v, str) for v in values[rows]], dtype=bool)
+                codes[rows[wrong_type]] |= BAD_TYPE
+                codes[rows[~wrong_type]] |= UNKNOWN_CATEGORY
+            k = int(np.count_nonzero(null | unknown))
+            if k:
+                column_counts[col] = k
+
+        if missing_cols and n:
+            codes |= MISSING
+            column_counts.update({c: n for c in missing_cols})
+        return ValidationReport(codes=codes, reject=reject, column_counts=column_counts)
+
+
+def validator_for(artifact: Any, model: Any) -> Optional[InputValidator]:
+    """
+    artifact에 저장된 검증 규칙 (INPUT_SCHEMA_KEY) → 없으면 모델의 ColumnTransformer에서 생성.
+    어느 쪽도 없으면 None (검증 없이 채점)
+    """
+    if isinstance(artifact, Mapping) and INPUT_SCHEMA_KEY in artifact:
+        return InputValidator.from_dict(artifact[INPUT_SCHEMA_KEY])
+    try:
+        return InputValidator.from_model(model)
+    except ValueError:
+        return None
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence
+
+import numpy as np
+
+# 환경변수: 배치 최대 크기 / 첫 요청 이후 기다리는 시간(ms) / 대기열 한도 / 요청별 기한(ms)
+MAX_BATCH_ENV_VAR = "MICRO_BATCH_MAX_SIZE"
+MAX_WAIT_ENV_VAR = "MICRO_BATCH_MAX_WAIT_MS"
+MAX_QUEUE_ENV_VAR = "MICRO_BATCH_MAX_QUEUE"
+DEADLINE_ENV_VAR = "MICRO_BATCH_DEADLINE_MS"
+
+DEFAULT_MAX_BATCH = 64
+# 0이면 기다리지 않고 대기열에 쌓인 만큼만 묶는다. (채점하는 동안 들어온 요청이 다음 배치가 됨)
+# 단독 요청은 지연 없이 바로 처리되고, 부하가 걸릴수록 배치가 자연스럽게 커진다.
+DEFAULT_MAX_WAIT_MS = 0.0
+DEFAULT_MAX_QUEUE = 1024
+DEFAULT_DEADLINE_MS = 250.0
+
+# records -> 1(구매) 클래스 확률 배열 (len(records),)
+BatchPredictFn = Callable[[Sequence[Any]], np.ndarray]
+
+
+class DispatcherOverloaded(RuntimeError):
+    """대기열이 가득 차서 요청을 받을 수 없을 때 (호출부는 직접 채점으로 fallback)"""
+
+
+@dataclass
+class _Request:
+    record: Any
+    future: Future
+    deadline: float
+
+
+@dataclass(frozen=True)
+class MicroBatchConfig:
+    max_batch: int = DEFAULT_MAX_BATCH
+    max_wait_ms: float = DEFAULT_MAX_WAIT_MS
+    max_queue: int = DEFAULT_MAX_QUEUE
+    deadline_ms: float = DEFAULT_DEADLINE_MS
+
+    @classmethod
+    def from_env(cls) -> "MicroBatchConfig":
+        def read(name: str, default: float) -> float:
+            raw = os.environ.get(name, "").strip()
+            return float(raw) if raw else default
+
+        return cls(
+            max_batch=max(1, int(read(MAX_BATCH_ENV_VAR, DEFAULT_MAX_BATCH))),
+            max_wait_ms=max(0.0, read(MAX_WAIT_ENV_VAR, DEFAULT_MAX_WAIT_MS)),
+            max_queue=max(1, int(read(MAX_QUEUE_ENV_VAR, DEFAULT_MAX_QUEUE))),
+            deadline_ms=max(1.0, read(DEADLINE_ENV_VAR, DEFAULT_DEADLINE_MS)),
+        )
+
+
+class MicroBatchDispatcher:
+    """
+    여러 세션에서 동시에 들어온 단일 세션 예측을 모아 한 번에 채점하는 dispatcher.
+
+    - 요청을 대기열에 넣고 Future를 돌려준다.
+    - 백그라운드 스레드가 대기열에 쌓인 요청을 max_batch개까지 모아 predict_many(records)를 한 번 호출하고,
+      결과를 각 Future에 나눠 준다. (max_wait_ms > 0이면 첫 요청 이후 그만큼 더 기다렸다가 묶음)
+    - 대기열이 max_queue를 넘으면 DispatcherOverloaded → predict()는 호출 스레드에서 직접 채점
+    - 요청별 기한(deadline_ms)이 지나도록 결과가 없으면 predict()는 요청을 취소하고 직접 채점
+      (배치가 밀려도 tail latency가 기한 + 단건 채점 시간을 넘지 않도록)
+
+    - predict_many는 record 순서대로 확률을 반환해야 한다.
+    - 한 배치는 predict_many 호출 시점의 모델 하나로 채점된다. (hot reload 도중에도 섞이지 않음)
+    """
+
+    def __init__(
+        self,
+        predict_many: BatchPredictFn,
+        fallback: Optional[Callable[[Any], float]] = None,
+        config: Optional[MicroBatchConfig] = None,
+        name: str = "micro-batch",
+    ):
+        self.predict_many = predict_many
+        self.fallback = fallback or (lambda record: float(predict_many([record])[0]))
+        self.config = config or MicroBatchConfig.from_env()
+        self.name = name
+        self._queue: "queue.Queue[_Request]" = queue.Queue(maxsize=self.config.max_queue)
+        # 배치 스레드 시작과 통계 카운터(predict 호출 스레드 / 배치 스레드가 함께 갱신)를 보호
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        # 통계
+        self.batches = 0
+        self.batched_requests = 0
+        self.overloaded = 0
+        self.expired = 0
+
+    # --------------------
+    # 요청
+    # --------------------
+    def submit(self, record: Any, deadline_ms: Optional[float] = None) -> Future:
+        """
+        Raises:
+            DispatcherOverloaded: 대기열이 가득 찼을 때
+        """
+        self._ensure_started()
+        deadline_ms = self.config.deadline_ms if deadline_ms is None else deadline_ms
+        request = _Request(record, Future(), time.monotonic() + deadline_ms / 1000.0)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._lock:
+                self.overloaded += 1
+            raise DispatcherOverloaded(f"{self.name}: queue is full ({self.config.max_queue})") from None
+        return request.future
+
+    def predict(self, record: Any, deadline_ms: Optional[float] = None) -> float:
+        """단일 세션 확률 (기존 단건 API와 같은 형태)"""
+        try:
+            future = self.submit(record, deadline_ms)
+        except DispatcherOverloaded:
+            return self.fallback(record)
+
+        deadline_ms = self.config.deadline_ms if deadline_ms is None else deadline_ms
+        try:
+            return future.result(timeout=deadline_ms / 1000.0)
+        except FutureTimeoutError:
+            pass
+        # 기한 초과: 아직 배치에 들어가지 않았으면 취소하고 직접 채점 (이미 채점 중이면 결과를 기다린다)
+        if future.cancel():
+            with self._lock:
+                self.expired += 1
+            return self.fallback(record)
+        try:
+            return future.result()
+        except FutureTimeoutError:
+            # 대기열에서 기한이 지나 dispatcher가 버린 요청
+            return self.fallback(record)
+
+    # --------------------
+    # 배치 스레드
+    # --------------------
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _collect(self) -> List[_Request]:
+        batch = [self._queue.get()]
+        wait_until = time.monotonic() + self.config.max_wait_ms / 1000.0
+        while len(batch) < self.config.max_batch:
+            remaining = wait_until - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            now = time.monotonic()
+            live: List[_Request] = []
+            for request in batch:
+                # 취소된 요청(호출부가 기한 초과로 직접 채점)은 건너뛴다.
+                if not request.future.set_running_or_notify_cancel():
+                    continue
+                if request.deadline < now:
+                    with self._lock:
+                        self.expired += 1
+                    request.future.set_exception(FutureTimeoutError(f"{self.name}: deadline exceeded in queue"))
+                    continue
+                live.append(request)
+            if not live:
+                continue
+
+            try:
+                proba = np.asarray(self.predict_many([r.record for r in live]), dtype=np.float64)
+            except Exception as e:
+                for request in live:
+                    request.future.set_exception(e)
+                continue
+
+            with self._lock:
+                self.batches += 1
+                self.batched_requests += len(live)
+            for request, p in zip(live, proba):
+                request.future.set_result(float(p))
+
+    def stats(self) -> dict:
+        with self._lock:
+            batches, requests, overloaded, expired = self.batches, self.batched_requests, self.overloaded, self.expired
+        return {
+            "batches": batches,
+            "requests": requests,
+            "avg_batch": requests / batches if batches else 0.0,
+            "queue_depth": self._queue.qsize(),
+            "overloaded": overloaded,
+            "expired": expired,
+        }
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Mapping, Optional
 
-import joblib
+from adapters.artifact_store import COMPILED_FOREST_KEY, SplitArtifact, meta_view, split_sibling
+from adapters.model_registry import get_registry
 
 
 @dataclass(frozen=True)
@@ -19,9 +20,14 @@ class ModelArtifact:
         meta:
             pipeline을 제외한 나머지 메타 정보(파라미터, 컬럼 정보, 평가 지표 등).
             예: {"best_params": ..., "target_col": "Revenue", ...}
+            split artifact면 값에 처음 접근할 때 해당 컴포넌트만 로드하는 지연 Mapping.
+        forest:
+            mmap 디렉토리 artifact에 함께 저장된 CompiledForest (없으면 None).
+            compile_pipeline(pipeline, forest=forest)로 트리를 다시 펼치지 않고 쓸 수 있다.
     """
     pipeline: Any
-    meta: Dict[str, Any]
+    meta: Mapping[str, Any]
+    forest: Optional[Any] = None
 
 
 class JoblibArtifactLoader:
@@ -30,7 +36,12 @@ class JoblibArtifactLoader:
 
     ✅ 역할
     - artifacts/*.joblib 파일을 읽어서 내부 객체(pipeline + meta)를 반환
-    - 한 번 로드한 결과를 메모리에 캐시하여, 서비스 요청마다 디스크 I/O가 반복되지 않게 함
+    - 실제 로딩은 프로세스 전역 ModelRegistry에 위임
+      (같은 파일을 여러 로더/어댑터가 열어도 메모리에는 한 벌만 올라감)
+    - mmap 디렉토리(save_mmap_artifact): artifact.forest로 CompiledForest(forest/*.npy)도 반환
+      (mmap_mode를 주면 pipeline은 forest/*.npy로 채점하는 ServingPipeline,
+       sklearn 트리는 큰 배치 / named_steps에 처음 접근할 때만 워커마다 unpickle)
+    - split 디렉토리(save_split_artifact): load_meta()는 manifest.json만 읽고, 컴포넌트는 처음 접근할 때 로드
 
     ✅ 기대하는 joblib 포맷 (dict)
     - 최소 키: "pipeline"
@@ -56,17 +67,18 @@ class JoblibArtifactLoader:
       (학습/서빙 환경의 패키지 버전을 맞추는 게 안전)
     """
 
-    def __init__(self, path: str | Path):
+    def __init__(self, path: str | Path, mmap_mode: Optional[str] = None):
         """
         Args:
-            path: joblib 아티팩트 파일 경로 (상대/절대 모두 가능)
+            path: joblib 아티팩트 파일 또는 mmap / split 디렉토리 경로 (상대/절대 모두 가능)
+            mmap_mode: None이면 메모리로 읽기, "r"이면 읽기 전용 mmap (np.load와 동일한 값)
         """
         self.path = Path(path)
-        self._cached: Optional[ModelArtifact] = None
+        self.mmap_mode = mmap_mode
 
     def load(self) -> ModelArtifact:
         """
-        아티팩트를 로드하여 반환한다. 이미 로드했다면 캐시된 값을 반환한다.
+        아티팩트를 로드하여 반환한다. 이미 로드된 파일이면 레지스트리의 객체를 공유한다.
 
         Returns:
             ModelArtifact: (pipeline, meta)로 구성된 객체
@@ -75,23 +87,35 @@ class JoblibArtifactLoader:
             FileNotFoundError: path에 파일이 없을 때
             ValueError: joblib 내부 포맷이 예상(dict + pipeline 키)과 다를 때
         """
-        if self._cached is not None:
-            return self._cached
-
         if not self.path.exists():
             raise FileNotFoundError(f"Artifact not found: {self.path}")
 
-        raw = joblib.load(self.path)
+        # 로더는 객체를 붙잡지 않는다 (레지스트리가 evict하면 실제로 메모리가 해제되도록)
+        raw = get_registry().load(self.path, mmap_mode=self.mmap_mode)
 
-        # 우리가 저장한 artifact는 dict 형태를 기대
-        if not isinstance(raw, dict):
+        # 우리가 저장한 artifact는 dict 형태(또는 split artifact의 Mapping)를 기대
+        if not isinstance(raw, Mapping):
             raise ValueError("Invalid artifact format: expected dict saved via joblib.dump({...}).")
 
         if "pipeline" not in raw:
             raise ValueError("Invalid artifact format: missing required key 'pipeline'.")
 
-        self._cached = ModelArtifact(
+        return ModelArtifact(
             pipeline=raw["pipeline"],
-            meta={k: v for k, v in raw.items() if k != "pipeline"},
+            meta=meta_view(raw),
+            forest=raw.get(COMPILED_FOREST_KEY),
         )
-        return self._cached
+
+    def load_meta(self) -> Mapping[str, Any]:
+        """
+        메타 정보만 반환한다.
+        - split artifact: manifest.json의 JSON 메타 (모델 컴포넌트를 로드하지 않음, 수 ms)
+          .joblib 경로여도 같은 버전을 export한 <stem>.split이 옆에 있으면 그 manifest를 읽는다.
+        - 그 외: load().meta (단일 pickle이라 전체 로드가 필요)
+        """
+        if not self.path.exists():
+            raise FileNotFoundError(f"Artifact not found: {self.path}")
+        raw = get_registry().load(split_sibling(self.path) or self.path, mmap_mode=self.mmap_mode)
+        if isinstance(raw, SplitArtifact):
+            return raw.meta
+        return self.load().meta
@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from adapters.artifact_store import SplitArtifact, artifact_file, file_hash, load_raw_artifact
+from adapters.calibration import upgrade_calibration
+from adapters.inference_policy import configure_for_inference
+from adapters.shared_model import attach_shared_artifact, shared_enabled
+
+logger = logging.getLogger(__name__)
+
+# 메모리 예산 환경변수 (MB 단위, 0 또는 음수면 무제한)
+BUDGET_ENV_VAR = "MODEL_REGISTRY_BUDGET_MB"
+DEFAULT_BUDGET_MB = 2048
+
+# 파일 지문: (크기, 수정시각 ns) -> 같은 경로라도 파일이 바뀌면 새로 로드
+Fingerprint = Tuple[int, int]
+# 레지스트리 키: (절대 경로, mmap_mode)
+RegistryKey = Tuple[Path, Optional[str]]
+# (경로, mmap_mode) -> 객체
+Loader = Callable[[Path, Optional[str]], Any]
+
+
+def file_fingerprint(path: Path) -> Fingerprint:
+    st = path.stat()
+    return st.st_size, st.st_mtime_ns
+
+
+def estimate_resident_bytes(obj: Any) -> int:
+    """
+    로딩된 객체가 차지하는 메모리(대략)를 계산한다.
+
+    - NumPy 배열: nbytes (view는 원본 배열 기준으로 한 번만)
+      단, mmap으로 연 배열 / 공유 메모리 view는 다른 프로세스와 공유하므로 세지 않는다.
+    - sklearn Tree: 노드 배열 + value 배열
+    - 그 외 컨테이너/객체: dict / list / tuple / __dict__를 따라가며 합산
+    """
+    seen: set = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if id(cur) in seen:
+            continue
+        seen.add(id(cur))
+
+        if isinstance(cur, np.ndarray):
+            if isinstance(cur, np.memmap) or isinstance(cur.base, mmap.mmap):
+                continue
+            # 공유 메모리 블록(shared_model) 위의 view: 다른 프로세스와 공유
+            if isinstance(cur.base, memoryview) and isinstance(cur.base.obj, mmap.mmap):
+                continue
+            if isinstance(cur.base, np.ndarray):
+                stack.append(cur.base)
+                continue
+            total += cur.nbytes
+            if cur.dtype == object:
+                stack.extend(cur.ravel().tolist())
+            continue
+
+        if type(cur).__name__ == "Tree" and hasattr(cur, "__getstate__"):
+            state = cur.__getstate__()
+            total += state["nodes"].nbytes + state["values"].nbytes
+            continue
+
+        total += sys.getsizeof(cur, 0)
+        if isinstance(cur, dict):
+            stack.extend(cur.keys())
+            stack.extend(cur.values())
+        elif isinstance(cur, (list, tuple, set, frozenset)):
+            stack.extend(cur)
+        elif hasattr(cur, "__dict__") and not isinstance(cur, type):
+            stack.append(vars(cur))
+    return total
+
+
+@dataclass
+class RegistryEntry:
+    path: Path
+    mmap_mode: Optional[str]
+    fingerprint: Fingerprint
+    value: Any
+    resident_bytes: int
+    loaded_at: float
+    load_seconds: float
+    hits: int = 0
+    # 같은 key로 교체(swap)될 때마다 1씩 증가
+    version: int = 1
+    # 내용 해시 (watcher가 백그라운드에서 채움)
+    content_hash: Optional[str] = None
+    # 다시 로드할 때 쓰는 함수 (None이면 load_raw_artifact)
+    loader: Optional[Loader] = None
+
+
+class ModelRegistry:
+    """
+    프로세스 전역 모델 레지스트리.
+
+    - 같은 artifact 파일은 프로세스 안에서 한 번만 로드 (경로 + 파일 지문 기준)
+    - 항목별 resident size를 추정해서 보고 (stats())
+    - 합계가 memory budget을 넘으면 가장 오래 안 쓴(LRU) 모델부터 해제
+    - 파일이 교체되면(크기/mtime 변경) 다음 요청에서 새로 로드
+      hot_reload=True(ArtifactWatcher 사용 시)면 새 버전을 백그라운드에서 로드한 뒤 원자적으로 교체하고,
+      그동안 요청은 기존 버전으로 처리한다.
+    - .joblib 파일과 mmap 디렉토리(artifact_store.save_mmap_artifact) 모두 지원
+    - 로드한 estimator의 n_jobs를 None으로 바꿔, 추론 스레드 수는 inference_policy가 정하도록 함
+    - MODEL_SHARED_MEMORY=1이면 loader 프로세스(script/publish_shared_models.py)가 공유 메모리에 게시한
+      forest에 연결한다. (worker별로 모델을 unpickle하지 않음, 파일이 바뀌면 새 버전 블록으로 다시 연결)
+
+    - 레지스트리는 반환한 객체를 "공유"한다. 호출부에서 모델을 수정(fit, set_params)하면 안 됨
+    - 호출부가 객체를 오래 붙잡고 있으면 evict 후에도 메모리가 해제되지 않는다.
+      (어댑터들은 필요할 때마다 registry.load()로 다시 가져온다)
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None):
+        self.budget_bytes = budget_bytes
+        self._entries: "OrderedDict[RegistryKey, RegistryEntry]" = OrderedDict()
+        self._lock = threading.RLock()
+        # 경로별 로딩 락: 동시에 같은 파일을 요청해도 joblib.load는 한 번만
+        self._load_locks: Dict[RegistryKey, threading.Lock] = {}
+        self.evictions = 0
+        # True면 파일 변경 시 기존 객체를 계속 반환하면서 백그라운드에서 새 버전을 로드
+        self.hot_reload = False
+        self._reloading: Dict[RegistryKey, threading.Thread] = {}
+        self.reload_errors: Dict[RegistryKey, str] = {}
+        # True면 loader 프로세스가 공유 메모리에 게시한 모델에 먼저 연결 (adapters.shared_model)
+        self.shared_memory = False
+
+    @classmethod
+    def from_env(cls) -> "ModelRegistry":
+        raw = os.environ.get(BUDGET_ENV_VAR, "").strip()
+        budget_mb = float(raw) if raw else float(DEFAULT_BUDGET_MB)
+        registry = cls(budget_bytes=int(budget_mb * 1024 * 1024) if budget_mb > 0 else None)
+        registry.shared_memory = shared_enabled()
+        return registry
+
+    # --------------------
+    # 조회 / 로드
+    # --------------------
+    def load(self, path: str | Path, mmap_mode: Optional[str] = None, loader: Optional[Loader] = None) -> Any:
+        """
+        artifact를 반환한다 (이미 로드되어 있고 파일이 그대로면 같은 객체).
+
+        Args:
+            path:      .joblib 파일 / mmap 디렉토리 / split 디렉토리 / split 컴포넌트 파일
+            mmap_mode: None(메모리로 읽기) / "r" / "c" 등 (np.load, joblib.load와 동일)
+            loader:    기본 로더 대신 쓸 함수 (split 컴포넌트 로딩 등)
+
+        Raises:
+            FileNotFoundError: path에 파일이 없을 때
+        """
+        path = Path(path).resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Artifact not found: {path}")
+        key = (path, mmap_mode)
+        fingerprint = file_fingerprint(artifact_file(path))
+
+        hit = self._lookup(key, fingerprint)
+        if hit is not None:
+            return hit
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        with load_lock:
+            # 기다리는 동안 다른 스레드가 로드했을 수 있다.
+            hit = self._lookup(key, fingerprint)
+            if hit is not None:
+                return hit
+
+            entry = self._read_entry(key, fingerprint, loader)
+            self._install(key, entry)
+            return entry.value
+
+    def _default_load(self, path: Path, mmap_mode: Optional[str]) -> Any:
+        if self.shared_memory:
+            # 게시된 버전이 현재 파일과 같을 때만 연결 (아직 게시 전이면 일반 로드)
+            shared = attach_shared_artifact(path)
+            if shared is not None:
+                return shared
+        # split artifact의 컴포넌트도 이 레지스트리를 거쳐 로드/공유되도록 resolver로 자신을 넘긴다.
+        return load_raw_artifact(path, mmap_mode=mmap_mode, resolver=self.load)
+
+    def _read_entry(self, key: RegistryKey, fingerprint: Fingerprint, loader: Optional[Loader]) -> RegistryEntry:
+        path, mmap_mode = key
+        start = time.perf_counter()
+        value = (loader or self._default_load)(path, mmap_mode)
+        # 학습 시 저장된 n_jobs=-1 대신 요청별 inference_scope()가 스레드 수를 정하도록
+        configure_for_inference(value)
+        # 예전 artifact의 CalibratedClassifierCV → CalibratedPipeline (calibration 파라미터만 꺼내서 적용)
+        value = upgrade_calibration(value)
+        return RegistryEntry(
+            path=path,
+            mmap_mode=mmap_mode,
+            fingerprint=fingerprint,
+            value=value,
+            resident_bytes=estimate_resident_bytes(value),
+            loaded_at=time.time(),
+            load_seconds=time.perf_counter() - start,
+            loader=loader,
+        )
+
+    def _install(self, key: RegistryKey, entry: RegistryEntry) -> None:
+        """entry를 등록(교체)한다. 이미 있던 key면 version을 이어서 올린다."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                entry.version = old.version + 1
+            self._entries[key] = entry
+            self._evict_over_budget()
+
+    def _lookup(self, key: RegistryKey, fingerprint: Fingerprint) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.fingerprint != fingerprint:
+                if not self.hot_reload:
+                    # 파일이 바뀌었으면 예전 객체는 버리고 새로 로드
+                    del self._entries[key]
+                    return None
+                # hot reload: 새 버전이 준비될 때까지 기존 객체로 응답
+                self._schedule_reload(key)
+            entry.hits += 1
+            self._entries.move_to_end(key)
+            return entry.value
+
+    # --------------------
+    # Hot reload
+    # --------------------
+    def _schedule_reload(self, key: RegistryKey) -> bool:
+        """key의 백그라운드 재로딩을 시작 (이미 진행 중이면 False)"""
+        with self._lock:
+            running = self._reloading.get(key)
+            if running is not None and running.is_alive():
+                return False
+            thread = threading.Thread(
+                target=self._reload, args=(key,), name=f"artifact-reload-{key[0].name}", daemon=True
+            )
+            self._reloading[key] = thread
+            thread.start()
+            return True
+
+    def _reload(self, key: RegistryKey) -> None:
+        path = key[0]
+        try:
+            target = artifact_file(path)
+            fingerprint = file_fingerprint(target)
+            with self._lock:
+                old = self._entries.get(key)
+            if old is None or old.fingerprint == fingerprint:
+                return
+
+            # 내용이 같으면(touch 등) 지문만 갱신하고 재로딩하지 않는다.
+            new_hash = file_hash(target)
+            if old.content_hash is not None and old.content_hash == new_hash:
+                with self._lock:
+                    old.fingerprint = fingerprint
+                return
+
+            entry = self._read_entry(key, fingerprint, old.loader)
+            entry.content_hash = new_hash
+            if isinstance(entry.value, SplitArtifact):
+                self._refresh_components(entry.value)
+            # 교체는 lock 안에서 dict 항목 하나만 바꾼다: 이후 요청부터 새 버전,
+            # 이미 객체를 받아간 요청은 기존 버전으로 끝까지 처리된다.
+            self._install(key, entry)
+            self.reload_errors.pop(key, None)
+        except Exception as e:  # 새 버전 로딩 실패 시 기존 버전을 계속 사용
+            logger.warning("Reloading %s failed; keeping the loaded version.", path, exc_info=True)
+            self.reload_errors[key] = f"{type(e).__name__}: {e}"
+
+    def _refresh_components(self, artifact: SplitArtifact) -> None:
+        """
+        새 manifest가 가리키는 컴포넌트 중 이미 등록된(예전 버전을 쓰던) 것을 지금 다시 로드한다.
+        hot reload 중에는 바뀐 파일에도 기존 객체를 돌려주므로,
+        manifest보다 먼저 교체하지 않으면 새 메타 + 예전 컴포넌트 조합이 만들어질 수 있다.
+        """
+        for path, loader in artifact.sources():
+            key = (path.resolve(), artifact.mmap_mode)
+            with self._lock:
+                current = self._entries.get(key)
+            if current is None:
+                # 아직 쓰지 않은 컴포넌트는 처음 접근할 때 새 파일에서 로드된다.
+                continue
+            fingerprint = file_fingerprint(artifact_file(key[0]))
+            if current.fingerprint != fingerprint:
+                self._install(key, self._read_entry(key, fingerprint, loader))
+
+    def check_for_updates(self) -> List[RegistryKey]:
+        """
+        로드된 artifact들의 파일 지문을 확인해서, 바뀐 것만 백그라운드 재로딩을 시작한다.
+        아직 내용 해시가 없는 항목은 여기서 채운다 (로드 경로에는 해시 비용을 넣지 않음).
+
+        Returns:
+            재로딩을 시작한 key 목록
+        """
+        with self._lock:
+            entries = list(self._entries.items())
+        scheduled = []
+        for key, entry in entries:
+            target = artifact_file(key[0])
+            try:
+                fingerprint = file_fingerprint(target)
+            except FileNotFoundError:
+                # 배포 중 잠깐 파일이 없을 수 있다: 기존 버전 유지
+                continue
+            if fingerprint != entry.fingerprint:
+                if self._schedule_reload(key):
+                    scheduled.append(key)
+            elif entry.content_hash is None:
+                entry.content_hash = file_hash(target)
+        return scheduled
+
+    def fingerprint(self, path: str | Path, mmap_mode: Optional[str] = None) -> Optional[Fingerprint]:
+        """현재 서빙 중인 객체를 로드한 파일의 지문 (로드 전이면 None). 예측 캐시 key에 사용"""
+        with self._lock:
+            entry = self._entries.get((Path(path).resolve(), mmap_mode))
+            return entry.fingerprint if entry is not None else None
+
+    def version(self, path: str | Path, mmap_mode: Optional[str] = None) -> int:
+        """현재 등록된 버전 (로드 전이면 0)"""
+        with self._lock:
+            entry = self._entries.get((Path(path).resolve(), mmap_mode))
+            return entry.version if entry is not None else 0
+
+    # --------------------
+    # 메모리 관리
+    # --------------------
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(e.resident_bytes for e in self._entries.values())
+
+    def _evict_over_budget(self) -> None:
+        # 가장 최근에 쓴 모델 하나는 예산을 넘더라도 유지한다.
+        if self.budget_bytes is None:
+            return
+        total = sum(e.resident_bytes for e in self._entries.values())
+        while total > self.budget_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            total -= entry.resident_bytes
+            self.evictions += 1
+
+    def set_budget(self, budget_bytes: Optional[int]) -> None:
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            self._evict_over_budget()
+
+    def evict(self, path: str | Path) -> bool:
+        """path의 모든 mmap_mode 항목을 해제"""
+        path = Path(path).resolve()
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == path]
+            for key in keys:
+                del self._entries[key]
+            return bool(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """로드된 artifact 목록 (LRU 순서: 오래 안 쓴 것부터)"""
+        with self._lock:
+            return [
+                {
+                    "path": str(e.path),
+                    "mmap_mode": e.mmap_mode,
+                    "resident_mb": round(e.resident_bytes / (1024 * 1024), 2),
+                    "hits": e.hits,
+                    "version": e.version,
+                    "load_seconds": round(e.load_seconds, 3),
+                    "loaded_at": e.loaded_at,
+                }
+                for e in self._entries.values()
+            ]
+
+
+_REGISTRY: Optional[ModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    """프로세스 전역 ModelRegistry (최초 호출 시 환경변수 예산으로 생성)"""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = ModelRegistry.from_env()
+    return _REGISTRY
+
+
+def load_artifact(path: str | Path, mmap_mode: Optional[str] = None) -> Any:
+    """get_registry().load(path, mmap_mode) 축약"""
+    return get_registry().load(path, mmap_mode=mmap_mode)
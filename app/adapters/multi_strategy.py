@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from adapters.feature_schema import FeatureSchema
+from adapters.forest_engine import CompiledPipeline
+from adapters.inference_policy import inference_scope, map_models
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StrategyModel:
+    """
+    전략 하나를 채점하는 데 필요한 모델과 파생 객체 (PurchaseModelAdapter가 모델 객체별로 캐시해 둔 것)
+
+    Attributes:
+        strategy:  전략 이름 (결과 행 이름)
+        model:     sklearn 모델 (compiled가 없을 때 채점)
+        schema:    입력 정렬 스키마 (None이면 입력 그대로)
+        compiled:  fused 전처리 + forest (없으면 None)
+        onnx:      ONNX sidecar로 채점하는 CompiledPipeline (없으면 None)
+    """
+    strategy: str
+    model: Any
+    schema: Optional[FeatureSchema] = None
+    compiled: Optional[CompiledPipeline] = None
+    onnx: Optional[CompiledPipeline] = None
+
+
+def predict_proba_many(
+    session_df: pd.DataFrame,
+    models: Sequence[StrategyModel],
+    on_onnx_error: Optional[Callable[[StrategyModel], None]] = None,
+) -> np.ndarray:
+    """
+    여러 모델의 1(구매) 클래스 확률 행렬 (len(models), n)
+
+    - 입력 정렬은 같은 스키마끼리 한 번만
+    - fused 전처리 파라미터가 같은 모델끼리는 인코딩 행렬도 한 번만 만들고 forest만 따로 채점
+      (작은 배치는 CompiledForest, forest.batch_row_limit을 넘는 배치는 원본 sklearn forest)
+    - 모델별 채점은 inference_policy.map_models 스레드 풀에서 동시에 실행
+    - onnxruntime 채점이 실패하면 on_onnx_error(model)를 부르고 그 모델은 sklearn으로 채점
+    """
+    aligned: Dict[Any, pd.DataFrame] = {}
+    encoded: Dict[Any, np.ndarray] = {}
+    jobs: List[Any] = []
+    for item in models:
+        schema = item.schema
+        align_key = schema.columns if schema is not None else None
+        frame = aligned.get(align_key)
+        if frame is None:
+            frame = schema.align(session_df) if schema is not None else session_df
+            aligned[align_key] = frame
+
+        compiled = item.compiled if item.compiled is not None and item.compiled.fused is not None else None
+        X = None
+        if compiled is not None:
+            encode_key = (align_key, compiled.fused.encoding_key)
+            X = encoded.get(encode_key)
+            if X is None:
+                X = compiled.fused.transform(frame)
+                encoded[encode_key] = X
+        jobs.append((item, frame, compiled, X))
+
+    def score(job) -> np.ndarray:
+        item, frame, compiled, X = job
+        if compiled is None:
+            with inference_scope(len(frame)):
+                return np.asarray(item.model.predict_proba(frame))[:, 1]
+        if item.onnx is not None:
+            try:
+                base = np.ascontiguousarray(item.onnx.forest.predict_proba(X)[:, 1])
+                return compiled.calibrate(base, out=base)
+            except Exception:
+                logger.warning("onnxruntime scoring failed for %s; using sklearn.", item.strategy, exc_info=True)
+                if on_onnx_error is not None:
+                    on_onnx_error(item)
+        base = compiled.predict_base(X)
+        return compiled.calibrate(base, out=base)
+
+    return np.vstack(map_models(score, jobs)) if jobs else np.empty((0, len(session_df)))
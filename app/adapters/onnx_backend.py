@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from adapters.artifact_store import artifact_file, file_hash
+from adapters.forest_compaction import _float32_floor
+from adapters.forest_engine import CompiledForest, CompiledPipeline, UnsupportedModelError, compile_pipeline
+from adapters.inference_policy import get_policy
+
+logger = logging.getLogger(__name__)
+
+# 환경변수: "auto"(기본, sidecar .onnx + onnxruntime이 있으면 사용) / "sklearn"(사용 안 함)
+BACKEND_ENV_VAR = "INFERENCE_BACKEND"
+BACKEND_AUTO = "auto"
+BACKEND_SKLEARN = "sklearn"
+
+# artifact 파일 옆(joblib) 또는 디렉토리 안(mmap / split)에 두는 ONNX 파일 이름
+ONNX_SUFFIX = ".onnx"
+ONNX_DIR_FILE = "forest.onnx"
+
+# metadata_props 키
+META_SOURCE_HASH = "source_hash"
+META_CALIBRATION = "calibration"
+META_CHECK = "equivalence_check"
+
+ONNX_OPSET = 17
+ONNX_ML_OPSET = 1
+# onnxruntime 1.x 대부분이 읽을 수 있는 IR 버전
+ONNX_IR_VERSION = 8
+
+
+def onnx_sidecar_path(artifact_path: str | Path) -> Path:
+    """artifact에 대응하는 ONNX 파일 경로 (joblib: <stem>.onnx / 디렉토리: <dir>/forest.onnx)"""
+    path = Path(artifact_path)
+    if path.is_dir():
+        return path / ONNX_DIR_FILE
+    return path.with_suffix(ONNX_SUFFIX)
+
+
+def source_hash(artifact_path: str | Path) -> str:
+    """ONNX가 어떤 artifact에서 만들어졌는지 확인하는 해시 (artifact가 바뀌면 sidecar는 무시됨)"""
+    return file_hash(artifact_file(artifact_path))
+
+
+# --------------------
+# export
+# --------------------
+def tree_ensemble_attributes(forest: CompiledForest) -> Dict[str, Any]:
+    """
+    CompiledForest -> ONNX TreeEnsembleRegressor 속성 (트리별 local node id 기준)
+
+    - 임계값은 float32 내림(_float32_floor)으로 저장 → float32 입력에 대해 sklearn과 같은 분기
+    - 결측치 방향(missing_left)은 nodes_missing_value_tracks_true로 옮긴다. (true 분기 = 왼쪽)
+
+    Raises:
+        UnsupportedModelError: 트리별 노드가 연속된 구간이 아닐 때
+    """
+    roots = np.asarray(forest.roots, dtype=np.int64)
+    if roots.size == 0 or np.any(np.diff(roots) <= 0) or roots[0] != 0:
+        raise UnsupportedModelError("Compiled forest trees are not stored contiguously.")
+    node = np.arange(forest.n_nodes, dtype=np.int64)
+    tree = np.searchsorted(roots, node, side="right") - 1
+    local = node - roots[tree]
+
+    leaf = np.asarray(forest.is_leaf, dtype=bool)
+    true_ids = np.where(leaf, 0, np.asarray(forest.left, dtype=np.int64) - roots[tree])
+    false_ids = np.where(leaf, 0, np.asarray(forest.right, dtype=np.int64) - roots[tree])
+    threshold = _float32_floor(np.asarray(forest.threshold, dtype=np.float64))
+    threshold[leaf] = 0.0
+    leaves = np.flatnonzero(leaf)
+    return {
+        "n_targets": 1,
+        "aggregate_function": "AVERAGE",
+        "post_transform": "NONE",
+        "nodes_treeids": tree.tolist(),
+        "nodes_nodeids": local.tolist(),
+        "nodes_featureids": np.where(leaf, 0, forest.feature).astype(np.int64).tolist(),
+        "nodes_values": threshold.tolist(),
+        "nodes_modes": ["LEAF" if is_leaf else "BRANCH_LEQ" for is_leaf in leaf],
+        "nodes_truenodeids": true_ids.tolist(),
+        "nodes_falsenodeids": false_ids.tolist(),
+        "nodes_missing_value_tracks_true": np.asarray(forest.missing_left, dtype=np.int64).tolist(),
+        "target_treeids": tree[leaves].tolist(),
+        "target_nodeids": local[leaves].tolist(),
+        "target_ids": [0] * len(leaves),
+        "target_weights": np.asarray(forest.value, dtype=np.float32)[leaves].tolist(),
+    }
+
+
+def forest_to_onnx(forest: CompiledForest, metadata: Optional[Dict[str, str]] = None) -> Any:
+    """
+    CompiledForest -> ONNX 모델 (TreeEnsembleRegressor, AVERAGE). 출력은 트리 평균 양성 확률 (N, 1)
+
+    - 입력: 전처리된 float32 행렬 (sklearn 트리와 같은 입력)
+    - onnx 패키지가 필요하다. (서빙에는 onnxruntime만 있으면 됨)
+    """
+    from onnx import TensorProto, helper
+
+    ensemble = helper.make_node(
+        "TreeEnsembleRegressor",
+        inputs=["X"],
+        outputs=["Y"],
+        domain="ai.onnx.ml",
+        **tree_ensemble_attributes(forest),
+    )
+    graph = helper.make_graph(
+        [ensemble],
+        "compiled_forest",
+        inputs=[helper.make_tensor_value_info("X", TensorProto.FLOAT, [None, forest.n_features])],
+        outputs=[helper.make_tensor_value_info("Y", TensorProto.FLOAT, [None, 1])],
+    )
+    model = helper.make_model(
+        graph,
+        opset_imports=[helper.make_opsetid("", ONNX_OPSET), helper.make_opsetid("ai.onnx.ml", ONNX_ML_OPSET)],
+        producer_name="adapters.onnx_backend",
+    )
+    model.ir_version = ONNX_IR_VERSION
+    helper.set_model_props(model, {"n_trees": str(forest.n_trees), **(metadata or {})})
+    return model
+
+
+def export_metadata(artifact_path: str | Path, compiled: CompiledPipeline) -> Dict[str, str]:
+    """sidecar에 같이 저장하는 metadata (원본 artifact 해시 + calibration 파라미터)"""
+    meta = {META_SOURCE_HASH: source_hash(artifact_path)}
+    if compiled.calibration is not None:
+        meta[META_CALIBRATION] = json.dumps(compiled.calibration.to_dict())
+    return meta
+
+
+# --------------------
+# serving
+# --------------------
+class OnnxForest:
+    """
+    onnxruntime InferenceSession을 CompiledForest.predict_proba와 같은 형태로 감싼다.
+    (CompiledPipeline(forest=OnnxForest(...))로 전처리 / calibration은 기존 경로를 그대로 사용)
+    """
+
+    def __init__(self, session: Any, n_features: int, metadata: Optional[Dict[str, str]] = None):
+        self.session = session
+        self.n_features = int(n_features)
+        self.metadata = dict(metadata or {})
+        self._input = session.get_inputs()[0].name
+
+    @classmethod
+    def open(cls, path: str | Path, n_threads: Optional[int] = None) -> "OnnxForest":
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = n_threads or get_policy().max_threads
+        options.inter_op_num_threads = 1
+        session = ort.InferenceSession(str(path), sess_options=options, providers=["CPUExecutionProvider"])
+        n_features = session.get_inputs()[0].shape[1]
+        return cls(session, n_features, session.get_modelmeta().custom_metadata_map)
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        Xf = np.ascontiguousarray(X, dtype=np.float32)
+        pos = self.session.run(None, {self._input: Xf})[0][:, 0].astype(np.float64)
+        return np.column_stack([1.0 - pos, pos])
+
+
+_ORT_AVAILABLE: Optional[bool] = None
+_ORT_LOCK = threading.Lock()
+
+
+def onnxruntime_available() -> bool:
+    global _ORT_AVAILABLE
+    if _ORT_AVAILABLE is None:
+        with _ORT_LOCK:
+            if _ORT_AVAILABLE is None:
+                try:
+                    import onnxruntime  # noqa: F401
+
+                    _ORT_AVAILABLE = True
+                except ImportError:
+                    _ORT_AVAILABLE = False
+    return _ORT_AVAILABLE
+
+
+def backend_enabled() -> bool:
+    return os.environ.get(BACKEND_ENV_VAR, BACKEND_AUTO).strip().lower() != BACKEND_SKLEARN
+
+
+def load_onnx_pipeline(artifact_path: str | Path, model: Any) -> Optional[CompiledPipeline]:
+    """
+    artifact의 ONNX sidecar로 채점하는 CompiledPipeline. 사용할 수 없으면 None (호출부는 sklearn으로 채점)
+
+    None이 되는 경우:
+    - INFERENCE_BACKEND=sklearn / onnxruntime 미설치 / sidecar 없음
+    - sidecar의 source_hash가 현재 artifact와 다름 (artifact만 새로 학습된 경우)
+    - 전처리 / calibration을 컴파일 엔진이 지원하지 않는 모델
+    """
+    if not backend_enabled() or not onnxruntime_available():
+        return None
+    onnx_path = onnx_sidecar_path(artifact_path)
+    if not onnx_path.exists():
+        return None
+    try:
+        forest = OnnxForest.open(onnx_path)
+        if forest.metadata.get(META_SOURCE_HASH) != source_hash(artifact_path):
+            logger.info("Ignoring stale ONNX sidecar %s (artifact changed since export).", onnx_path)
+            return None
+        return compile_pipeline(model, forest=forest)
+    except Exception:
+        # onnxruntime 버전 차이 / 손상된 파일 등 어떤 이유로든 열 수 없으면 sklearn으로 채점
+        logger.warning("Cannot use ONNX sidecar %s; scoring with sklearn.", onnx_path, exc_info=True)
+        return None
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Iterable, List, Tuple
+
+import numpy as np
+
+from adapters.forest_engine import CompiledPipeline, UnsupportedModelError
+
+# 기여도 0으로 남는 top-k 칸
+NO_FEATURE = -1
+
+
+@dataclass(frozen=True, eq=False)
+class PathExplanation:
+    """
+    채점과 같은 순회에서 모은 세션별 설명 (CompiledForest.predict_contributions).
+
+    Attributes:
+        probability:        최종(calibrated) 양성 확률 (n,)
+        bias:               루트 값의 트리 평균 (calibration 전 기준값)
+        top_features:       기여도 절댓값 상위 k개 입력 컬럼 index int16 (n, k), 없으면 NO_FEATURE
+        top_contributions:  그 컬럼의 기여도 float32 (n, k), +면 구매 확률을 높인 쪽
+        feature_names:      top_features가 가리키는 입력 컬럼명 (one-hot 열은 원래 컬럼으로 합산)
+
+    ⚠️ 기여도는 calibration 전 트리 평균 확률 기준이다. (순위 / 방향 판단용)
+    """
+    probability: np.ndarray
+    bias: float
+    top_features: np.ndarray
+    top_contributions: np.ndarray
+    feature_names: Tuple[str, ...]
+
+
+def _column_groups(compiled: CompiledPipeline) -> Tuple[Tuple[str, ...], np.ndarray]:
+    """인코딩 열 -> 입력 컬럼 합산 행렬 (n_out, n_columns). fused 전처리에서만 만들 수 있다."""
+    fused = compiled.fused
+    if fused is None:
+        raise UnsupportedModelError("Path contributions need a fused (RobustScaler + OneHotEncoder) preprocess.")
+    cached = compiled.__dict__.get("_column_groups")
+    if cached is not None:
+        return cached
+
+    names: List[str] = list(fused.numeric_columns)
+    group = np.full(fused.n_out, -1, dtype=np.intp)
+    group[fused.numeric_out] = np.arange(len(names))
+    for block in fused.categorical:
+        group[block.out_start:block.out_start + len(block.categories)] = len(names)
+        names.append(block.column)
+    matrix = np.zeros((fused.n_out, len(names)), dtype=np.float64)
+    used = group >= 0
+    matrix[np.flatnonzero(used), group[used]] = 1.0
+    cached = (tuple(names), matrix)
+    object.__setattr__(compiled, "_column_groups", cached)
+    return cached
+
+
+def top_k_columns(contributions: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """기여도 행렬 (n, m) -> 절댓값 상위 k개 (index int16, 기여도 float32), 큰 순서. 기여도 0은 NO_FEATURE"""
+    n, m = contributions.shape
+    k = max(0, min(int(k), m))
+    if k == 0:
+        return np.full((n, 0), NO_FEATURE, dtype=np.int16), np.zeros((n, 0), dtype=np.float32)
+    magnitude = np.abs(contributions)
+    top = np.argpartition(-magnitude, k - 1, axis=1)[:, :k] if k < m else np.tile(np.arange(m), (n, 1))
+    order = np.argsort(-np.take_along_axis(magnitude, top, axis=1), axis=1, kind="stable")
+    top = np.take_along_axis(top, order, axis=1)
+    values = np.take_along_axis(contributions, top, axis=1)
+    top = top.astype(np.int16)
+    top[values == 0.0] = NO_FEATURE
+    return top, values.astype(np.float32)
+
+
+def explain_compiled(
+    compiled: CompiledPipeline,
+    features: Any,
+    top_k: int = 3,
+    exclude: Iterable[str] = (),
+) -> PathExplanation:
+    """
+    CompiledPipeline으로 채점하면서 입력 컬럼별 경로 기여도 상위 top_k를 함께 구한다. (별도 SHAP 계산 없음)
+    exclude: 근거 후보에서 뺄 입력 컬럼 (row_id처럼 설명으로 의미가 없는 feature). 확률에는 영향 없음
+
+    Raises:
+        UnsupportedModelError: fused 전처리가 아닌 모델 (입력 컬럼으로 되돌릴 수 없음)
+    """
+    names, groups = _column_groups(compiled)
+    X = compiled.transform(features)
+    pos, contributions, bias = compiled.forest.predict_contributions(X)
+    by_column = contributions @ groups
+    excluded = set(exclude)
+    hidden = [j for j, name in enumerate(names) if name in excluded]
+    if hidden:
+        by_column[:, hidden] = 0.0
+    top, values = top_k_columns(by_column, top_k)
+    return PathExplanation(
+        probability=compiled.calibrate(pos, out=pos),
+        bias=bias,
+        top_features=top,
+        top_contributions=values,
+        feature_names=names,
+    )
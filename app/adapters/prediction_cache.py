@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 환경변수: 최대 항목 수(0이면 캐시 끔) / TTL(초, 0이면 무제한) / 연속형 입력 반올림 자릿수
+#           / 캐시를 거치는 최대 row 수
+SIZE_ENV_VAR = "PREDICTION_CACHE_SIZE"
+TTL_ENV_VAR = "PREDICTION_CACHE_TTL_SEC"
+QUANTIZE_ENV_VAR = "PREDICTION_CACHE_QUANTIZE_DECIMALS"
+MAX_ROWS_ENV_VAR = "PREDICTION_CACHE_MAX_ROWS"
+
+DEFAULT_MAX_ENTRIES = 8192
+DEFAULT_TTL_SEC = 600.0
+# 화면에서 다루는 배치(micro_batcher.DEFAULT_MAX_BATCH와 같은 크기)까지만 캐시한다.
+# 대량 채점은 row별 hash / dict 작업이 채점보다 비싸고, 한 번에 LRU를 밀어내 화면 입력의 hit까지 잃는다.
+DEFAULT_MAX_ROWS = 64
+
+# (artifact 식별자, 컬럼 구성 hash, row hash)
+CacheKey = Tuple[Hashable, int, int]
+
+
+@dataclass
+class _CacheItem:
+    value: float
+    stored_at: float
+
+
+class PredictionCache:
+    """
+    정렬된(aligned) feature 벡터 -> 1(구매) 클래스 확률 LRU 캐시.
+
+    - key = (artifact 식별자, 컬럼 구성, row 내용 hash)
+      * artifact 식별자에 파일 지문(크기/mtime)이 들어가므로 모델이 바뀌면 자연히 miss
+      * row hash는 pd.util.hash_pandas_object로 한 번에 계산 (컬럼 순서/dtype 기준으로 정규화된 입력)
+    - quantize_decimals를 주면 float 컬럼을 그 자릿수로 반올림한 값으로 key를 만든다.
+      (슬라이더처럼 거의 같은 입력이 반복될 때 hit을 늘림, 값은 처음 채점한 입력의 결과)
+    - 항목 수가 max_entries를 넘으면 LRU부터 제거, ttl_sec이 지난 항목은 조회 시 제거
+    - max_rows보다 큰 배치는 캐시를 거치지 않고 바로 채점 (대량 채점)
+    - hit / miss / eviction / expiration 통계 (stats())
+
+    - 입력은 모델 스키마로 정렬된 DataFrame이어야 한다. (같은 세션이 같은 key가 되도록)
+    - 캐시에는 확률(float)만 저장한다. 모델 객체나 입력을 붙잡지 않음
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_sec: Optional[float] = DEFAULT_TTL_SEC,
+        quantize_decimals: Optional[int] = None,
+        max_rows: int = DEFAULT_MAX_ROWS,
+    ):
+        self.max_entries = max(0, int(max_entries))
+        self.max_rows = max(0, int(max_rows))
+        self.ttl_sec = ttl_sec if ttl_sec and ttl_sec > 0 else None
+        self.quantize_decimals = quantize_decimals
+        self._items: "OrderedDict[CacheKey, _CacheItem]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bypassed_rows = 0
+
+    @classmethod
+    def from_env(cls) -> "PredictionCache":
+        raw_size = os.environ.get(SIZE_ENV_VAR, "").strip()
+        raw_ttl = os.environ.get(TTL_ENV_VAR, "").strip()
+        raw_quantize = os.environ.get(QUANTIZE_ENV_VAR, "").strip()
+        raw_rows = os.environ.get(MAX_ROWS_ENV_VAR, "").strip()
+        return cls(
+            max_entries=int(raw_size) if raw_size else DEFAULT_MAX_ENTRIES,
+            ttl_sec=float(raw_ttl) if raw_ttl else DEFAULT_TTL_SEC,
+            quantize_decimals=int(raw_quantize) if raw_quantize else None,
+            max_rows=int(raw_rows) if raw_rows else DEFAULT_MAX_ROWS,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def accepts(self, n_rows: int) -> bool:
+        """n_rows 배치를 캐시로 처리하는지 (꺼져 있거나 max_rows를 넘으면 False)"""
+        return self.enabled and 0 < n_rows <= self.max_rows
+
+    # --------------------
+    # key
+    # --------------------
+    def keys_for(self, frame: pd.DataFrame, token: Hashable) -> List[CacheKey]:
+        """row별 key (frame의 index는 key에 포함하지 않음)"""
+        canonical = frame
+        if self.quantize_decimals is not None:
+            float_cols = frame.select_dtypes(include="floating").columns
+            if len(float_cols):
+                canonical = frame.copy()
+                canonical[float_cols] = canonical[float_cols].round(self.quantize_decimals)
+        layout = hash(tuple((str(c), str(t)) for c, t in canonical.dtypes.items()))
+        rows = pd.util.hash_pandas_object(canonical, index=False).to_numpy()
+        return [(token, layout, int(h)) for h in rows]
+
+    # --------------------
+    # 조회 / 저장
+    # --------------------
+    def get_many(self, keys: List[CacheKey]) -> Tuple[np.ndarray, np.ndarray]:
+        """(값 배열, hit 여부 배열). miss인 자리는 NaN"""
+        values = np.full(len(keys), np.nan)
+        found = np.zeros(len(keys), dtype=bool)
+        now = time.monotonic()
+        with self._lock:
+            for i, key in enumerate(keys):
+                item = self._items.get(key)
+                if item is None:
+                    continue
+                if self.ttl_sec is not None and now - item.stored_at > self.ttl_sec:
+                    del self._items[key]
+                    self.expirations += 1
+                    continue
+                self._items.move_to_end(key)
+                values[i] = item.value
+                found[i] = True
+            n_hit = int(found.sum())
+            self.hits += n_hit
+            self.misses += len(keys) - n_hit
+        return values, found
+
+    def put_many(self, keys: List[CacheKey], values: np.ndarray) -> None:
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key, value in zip(keys, values):
+                self._items[key] = _CacheItem(float(value), now)
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def predict(
+        self,
+        frame: pd.DataFrame,
+        token: Hashable,
+        predict_fn: Callable[[pd.DataFrame], Any],
+    ) -> np.ndarray:
+        """
+        frame의 row별 확률. 캐시에 없는 row만 모아서 predict_fn(부분 DataFrame)을 한 번 호출한다.
+        predict_fn은 1(구매) 클래스 확률 배열 (len(rows),)을 반환해야 한다.
+        """
+        if not self.accepts(len(frame)):
+            if self.enabled:
+                with self._lock:
+                    self.bypassed_rows += len(frame)
+            return np.asarray(predict_fn(frame), dtype=np.float64)
+
+        keys = self.keys_for(frame, token)
+        values, found = self.get_many(keys)
+        if found.all():
+            return values
+
+        missing = np.flatnonzero(~found)
+        fresh = np.asarray(predict_fn(frame.iloc[missing]), dtype=np.float64)
+        values[missing] = fresh
+        self.put_many([keys[i] for i in missing], fresh)
+        return values
+
+    # --------------------
+    # 관리 / 통계
+    # --------------------
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl_sec,
+                "quantize_decimals": self.quantize_decimals,
+                "max_rows": self.max_rows,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "bypassed_rows": self.bypassed_rows,
+            }
+
+
+_CACHE: Optional[PredictionCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_prediction_cache() -> PredictionCache:
+    """프로세스 전역 예측 캐시 (rerun / 사용자 간 공유)"""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = PredictionCache.from_env()
+    return _CACHE
@@ -1,31 +1,107 @@
 from __future__ import annotations
 
+import weakref
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional, Sequence, Tuple
 
 import pandas as pd
 
 # from src.adapters.model_loader import JoblibArtifactLoader
 from adapters.model_loader import JoblibArtifactLoader
+from adapters.feature_schema import FeatureSchema
+from adapters.forest_engine import (
+    DEFAULT_SPREAD_QUANTILES,
+    CompiledPipeline,
+    TreeSpread,
+    UnsupportedModelError,
+    compile_pipeline,
+)
+from adapters.inference_policy import inference_scope
+
+InferenceEngine = Literal["sklearn", "compiled"]
+
 
 class PurchaseIntentPRAUCModelAdapter:
     """
     PR-AUC 최적화로 선택된 모델 artifact를 로드해서
     서비스에서 사용할 수 있게 predict_proba 중심 API 제공
+
+    engine:
+        - "sklearn"  : artifact["pipeline"].predict_proba 그대로 사용 (기본값)
+        - "compiled" : forest를 NumPy 배열로 펼친 CompiledPipeline으로 채점 (대량 배치용)
+
+    mmap_mode:
+        artifact_path가 mmap 디렉토리면 "r"로 열어 저장된 CompiledForest를 그대로 사용
+
+    predict_proba_spread():
+        확률 + 트리 간 편차(std / 분위수) 컬럼. engine과 관계없이 컴파일 엔진의 같은 순회에서 계산
     """
 
-    def __init__(self, artifact_path: str | Path):
-        self._loader = JoblibArtifactLoader(artifact_path)
+    def __init__(
+        self,
+        artifact_path: str | Path,
+        engine: InferenceEngine = "sklearn",
+        mmap_mode: Optional[str] = None,
+    ):
+        self._loader = JoblibArtifactLoader(artifact_path, mmap_mode=mmap_mode)
+        # (pipeline weakref, 파생 객체): artifact가 hot reload로 바뀌면 다시 만든다.
+        self._compiled: Optional[Tuple[Any, CompiledPipeline]] = None
+        self._schema: Optional[Tuple[Any, FeatureSchema]] = None
+        self.set_engine(engine)
 
     @property
     def meta(self) -> Dict[str, Any]:
         return self._loader.load().meta
 
+    @property
+    def engine(self) -> InferenceEngine:
+        return self._engine
+
+    def set_engine(self, engine: InferenceEngine) -> None:
+        if engine not in ("sklearn", "compiled"):
+            raise ValueError(f"Unknown inference engine: {engine}")
+        self._engine = engine
+
+    def schema(self) -> FeatureSchema:
+        """모델 입력 스키마 (artifact 버전별 1회 컴파일)"""
+        art = self._loader.load()
+        if self._schema is None or self._schema[0]() is not art.pipeline:
+            self._schema = (weakref.ref(art.pipeline), FeatureSchema.from_model(art.pipeline, meta=art.meta))
+        return self._schema[1]
+
+    def compiled(self) -> CompiledPipeline:
+        """컴파일 엔진을 (artifact 버전별 1회) 생성해서 반환"""
+        art = self._loader.load()
+        if self._compiled is None or self._compiled[0]() is not art.pipeline:
+            self._compiled = (weakref.ref(art.pipeline), compile_pipeline(art.pipeline, forest=art.forest))
+        return self._compiled[1]
+
     def predict_proba(self, features: pd.DataFrame) -> pd.Series:
-        pipe = self._loader.load().pipeline
-        proba = pipe.predict_proba(features)[:, 1]
+        if self._engine == "compiled":
+            proba = self.compiled().predict_proba(features)[:, 1]
+        else:
+            pipe = self._loader.load().pipeline
+            with inference_scope(len(features)):
+                proba = pipe.predict_proba(features)[:, 1]
         return pd.Series(proba, index=features.index, name="purchase_proba")
 
+    def predict_proba_spread(
+        self,
+        features: pd.DataFrame,
+        levels: Sequence[float] = DEFAULT_SPREAD_QUANTILES,
+    ) -> pd.DataFrame:
+        """
+        purchase_proba + 트리별 양성 확률의 편차 (forest_engine.TreeSpread.to_frame)
+        - purchase_proba_std: 트리 간 표준편차 (calibration 전)
+        - purchase_proba_qNN: 트리별 확률의 분위수 (calibration 후, 경계 근처 판단용)
+        - 컴파일 엔진이 지원하지 않는 모델이면 편차 컬럼은 NaN
+        """
+        try:
+            spread = self.compiled().predict_spread(features, tuple(levels))
+        except UnsupportedModelError:
+            spread = TreeSpread.unavailable(self.predict_proba(features).to_numpy(), tuple(levels))
+        return spread.to_frame(index=features.index)
+
     def predict(self, features: pd.DataFrame, threshold: float) -> pd.Series:
         # PR-AUC 모델은 threshold를 “정책”으로 서비스가 주는 걸 권장
         proba = self.predict_proba(features)
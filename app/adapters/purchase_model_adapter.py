@@ -1,12 +1,42 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import logging
+import os
 from pathlib import Path
-from typing import Literal, Optional, Any, List
+import weakref
+from typing import Literal, Optional, Any, Dict, Mapping, Sequence, Tuple, Union
 
-import joblib
+import numpy as np
 import pandas as pd
 
+from adapters.artifact_store import COMPILED_FOREST_KEY
+from adapters.feature_schema import FeatureSchema, reference_record
+from adapters.forest_engine import DEFAULT_SPREAD_QUANTILES, CompiledPipeline, TreeSpread, UnsupportedModelError
+from adapters.inference_policy import inference_scope
+from adapters.input_validation import DEFAULT_REJECT, InputValidator, ValidationReport, validator_for
+from adapters.prediction_cache import get_prediction_cache
+from adapters.model_registry import get_registry
+from adapters.multi_strategy import StrategyModel, predict_proba_many
+from adapters.onnx_backend import load_onnx_pipeline
+from adapters.path_contributions import PathExplanation, explain_compiled
+from adapters.record_batching import DispatcherPool, SessionRecord, records_frame
+from adapters.session_fast_path import SessionFastPath, try_build_fast_path
+
+logger = logging.getLogger(__name__)
+
 ModelStrategy = Literal["roc_auc", "pr_auc"]
+# predict_proba_all()이 기본으로 채점하는 전략 (등록된 모델 전체)
+MODEL_STRATEGIES: Tuple[ModelStrategy, ...] = ("roc_auc", "pr_auc")
+
+# "1"이면 PurchaseModelAdapterConfig.from_default_layout()에서 micro-batching을 켠다.
+MICRO_BATCH_ENV_VAR = "MICRO_BATCH_ENABLED"
+# "1"이면 pr_auc 전략에 distill된 student(script/distill_pr_auc_student.py)를 사용한다. (파일이 있을 때만)
+DISTILLED_STUDENT_ENV_VAR = "SERVE_DISTILLED_STUDENT"
+DISTILLED_STUDENT_FILE = "distilled_pr_auc_student.joblib"
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes")
 
 
 @dataclass
@@ -15,6 +45,10 @@ class PurchaseModelAdapterConfig:
     app_dir: Path
     roc_auc_model_path: Path
     pr_auc_model_path: Path
+    # 모델 경로가 mmap 디렉토리(artifact_store.save_mmap_artifact)일 때 "r" 권장
+    mmap_mode: Optional[str] = None
+    # True면 동시에 들어온 단일 세션 예측을 모아서 한 번에 채점 (adapters.micro_batcher)
+    micro_batch: bool = False
 
     @classmethod
     def from_default_layout(cls) -> "PurchaseModelAdapterConfig":
@@ -28,24 +62,31 @@ class PurchaseModelAdapterConfig:
               ├ pages/
               └ artifacts/
                   ├ best_balancedrf_pipeline.joblib
-                  └ best_pr_auc_balancedrf.joblib
+                  ├ best_pr_auc_balancedrf.joblib
+                  └ distilled_pr_auc_student.joblib (옵션, SERVE_DISTILLED_STUDENT=1일 때 pr_auc로 사용)
         """
         adapter_dir = Path(__file__).resolve().parent   # app/adapter
         app_dir = adapter_dir.parent                    # app
         root_dir = adapter_dir.parent.parent
         artifact_dir = app_dir / "artifacts"
 
+        pr_auc_model_path = artifact_dir / "best_pr_auc_balancedrf.joblib"
+        student_path = artifact_dir / DISTILLED_STUDENT_FILE
+        if _env_flag(DISTILLED_STUDENT_ENV_VAR) and student_path.exists():
+            pr_auc_model_path = student_path
+
         return cls(
             app_dir=app_dir,
             root_dir=root_dir,
             roc_auc_model_path=artifact_dir / "best_balancedrf_pipeline.joblib",
-            pr_auc_model_path=artifact_dir / "best_pr_auc_balancedrf.joblib",
+            pr_auc_model_path=pr_auc_model_path,
+            micro_batch=_env_flag(MICRO_BATCH_ENV_VAR),
         )
 
 
 def _extract_model(artifact: Any) -> Any:
     """
-    joblib.load() 결과가 dict일 때, 안에서 진짜 모델 객체를 꺼내는 헬퍼.
+    artifact 로드 결과가 dict일 때, 안에서 진짜 모델 객체를 꺼내는 헬퍼.
 
     - artifact가 이미 predict_proba를 갖고 있으면 그대로 반환
     - dict이면 흔한 키들("model", "pipeline", "clf", "estimator", "classifier")을 우선 확인
@@ -56,7 +97,7 @@ def _extract_model(artifact: Any) -> Any:
         return artifact
 
     # 2) dict 안에 모델이 들어있는 경우
-    if isinstance(artifact, dict):
+    if isinstance(artifact, Mapping):
         candidate_keys = ["model", "pipeline", "clf", "estimator", "classifier"]
         for key in candidate_keys:
             if key in artifact and hasattr(artifact[key], "predict_proba"):
@@ -80,23 +121,37 @@ class PurchaseModelAdapter:
 
     def __init__(self, config: Optional[PurchaseModelAdapterConfig] = None):
         self.config = config or PurchaseModelAdapterConfig.from_default_layout()
-        self._roc_auc_model = None
-        self._pr_auc_model = None
+        # strategy -> (모델 weakref, SessionFastPath) (지원 안 되는 모델이면 None)
+        self._fast_paths: Dict[str, Tuple[Any, Optional[SessionFastPath]]] = {}
+        # strategy -> (모델 weakref, FeatureSchema) (feature_names_in_이 없으면 None)
+        self._schemas: Dict[str, Tuple[Any, Optional[FeatureSchema]]] = {}
+        # strategy -> (모델 weakref, ONNX sidecar로 채점하는 CompiledPipeline) (사용 불가면 None)
+        self._onnx: Dict[str, Tuple[Any, Optional[CompiledPipeline]]] = {}
+        # strategy -> (모델 weakref, InputValidator) (artifact 검증 규칙 / 모델 전처리로 만들 수 없으면 None)
+        self._validators: Dict[str, Tuple[Any, Optional[InputValidator]]] = {}
+        # strategy별 MicroBatchDispatcher (config.micro_batch=True일 때 처음 요청된 strategy만 생성)
+        self._dispatchers = DispatcherPool(self.predict_records_probability, self._predict_record_direct)
 
     # --------------------
     # 내부 로더
     # --------------------
+    # 모델 객체는 ModelRegistry가 보관한다 (같은 파일은 프로세스에서 한 번만 로드).
+    def _artifact_path(self, strategy: ModelStrategy) -> Path:
+        if strategy == "roc_auc":
+            return Path(self.config.roc_auc_model_path)
+        elif strategy == "pr_auc":
+            return Path(self.config.pr_auc_model_path)
+        else:
+            raise ValueError(f"Unknown model strategy: {strategy}")
+
+    def _load_artifact(self, strategy: ModelStrategy) -> Any:
+        return get_registry().load(self._artifact_path(strategy), mmap_mode=self.config.mmap_mode)
+
     def _load_roc_auc_model(self):
-        if self._roc_auc_model is None:
-            artifact = joblib.load(self.config.roc_auc_model_path)
-            self._roc_auc_model = _extract_model(artifact)
-        return self._roc_auc_model
+        return _extract_model(self._load_artifact("roc_auc"))
 
     def _load_pr_auc_model(self):
-        if self._pr_auc_model is None:
-            artifact = joblib.load(self.config.pr_auc_model_path)
-            self._pr_auc_model = _extract_model(artifact)
-        return self._pr_auc_model
+        return _extract_model(self._load_artifact("pr_auc"))
 
     def _get_model(self, strategy: ModelStrategy):
         if strategy == "roc_auc":
@@ -106,41 +161,75 @@ class PurchaseModelAdapter:
         else:
             raise ValueError(f"Unknown model strategy: {strategy}")
 
+    # 파생 캐시(스키마 / fast path)는 만들 때의 모델 객체에 묶어 둔다.
+    # artifact가 hot reload로 교체되면 모델 객체가 달라지므로 다음 요청에서 다시 만든다.
+    # (weakref라서 어댑터가 예전 모델을 붙잡고 있지 않음)
+    @staticmethod
+    def _cached_for(cache: Dict[str, Tuple[Any, Any]], strategy: str, model: Any) -> Tuple[bool, Any]:
+        cached = cache.get(strategy)
+        if cached is not None and cached[0]() is model:
+            return True, cached[1]
+        return False, None
+
+    def _get_fast_path(self, strategy: ModelStrategy) -> Optional[SessionFastPath]:
+        artifact = self._load_artifact(strategy)
+        model = _extract_model(artifact)
+        hit, fast_path = self._cached_for(self._fast_paths, strategy, model)
+        if not hit:
+            # mmap artifact면 저장된 CompiledForest를 그대로 사용
+            forest = artifact.get(COMPILED_FOREST_KEY) if isinstance(artifact, Mapping) else None
+            fast_path = try_build_fast_path(model, self._get_schema(strategy, model), forest=forest)
+            self._fast_paths[strategy] = (weakref.ref(model), fast_path)
+        return fast_path
+
+    def _get_compiled(self, strategy: ModelStrategy, model: Any) -> Optional[CompiledPipeline]:
+        """model로 만든 fast path의 CompiledPipeline (fused 전처리 + forest). 지원 안 되거나 모델이 바뀌었으면 None"""
+        fast_path = self._get_fast_path(strategy)
+        hit, _ = self._cached_for(self._fast_paths, strategy, model)
+        return fast_path.compiled if hit and fast_path is not None else None
+
+    def _get_onnx(self, strategy: ModelStrategy, model: Any) -> Optional[CompiledPipeline]:
+        """ONNX Runtime backend (onnx_backend.load_onnx_pipeline). 설치/export가 안 되어 있으면 None"""
+        hit, onnx = self._cached_for(self._onnx, strategy, model)
+        if not hit:
+            onnx = load_onnx_pipeline(self._artifact_path(strategy), model)
+            self._onnx[strategy] = (weakref.ref(model), onnx)
+        return onnx
+
+    def _get_validator(self, strategy: ModelStrategy, model: Any) -> Optional[InputValidator]:
+        hit, validator = self._cached_for(self._validators, strategy, model)
+        if not hit:
+            validator = validator_for(self._load_artifact(strategy), model)
+            self._validators[strategy] = (weakref.ref(model), validator)
+        return validator
+
     # --------------------
     # Feature 정렬/채우기
     # --------------------
-    def _align_features(self, df: pd.DataFrame, model: Any) -> pd.DataFrame:
+    def _get_schema(self, strategy: ModelStrategy, model: Any = None) -> Optional[FeatureSchema]:
+        """
+        모델별 입력 스키마 (모델 객체별 1회 컴파일 후 재사용).
+        feature_names_in_이 없는 모델이면 None → 입력 df를 그대로 사용
+        """
+        if model is None:
+            model = self._get_model(strategy)
+        hit, schema = self._cached_for(self._schemas, strategy, model)
+        if not hit:
+            schema = FeatureSchema.from_model(model) if hasattr(model, "feature_names_in_") else None
+            self._schemas[strategy] = (weakref.ref(model), schema)
+        return schema
+
+    def _align_features(self, df: pd.DataFrame, strategy: ModelStrategy, model: Any = None) -> pd.DataFrame:
         """
         - 모델이 학습에 사용한 feature_names_in_에 맞춰
           * 없는 컬럼은 기본값(0)으로 추가
+          * (모델이 쓰지 않는) 추가 컬럼은 버림
           * 순서를 동일하게 맞춰줌
         """
-        # feature_names_in_ 이 있으면 그걸 기준으로 맞춘다.
-        feature_names: Optional[List[str]] = None
-
-        if hasattr(model, "feature_names_in_"):
-            feature_names = list(model.feature_names_in_)
-        # Pipeline일 경우도 feature_names_in_을 대부분 갖고 있음
-        # 없으면 그냥 원본 df 그대로 사용
-        if feature_names is None:
+        schema = self._get_schema(strategy, model)
+        if schema is None:
             return df
-
-        df = df.copy()
-
-        # 없는 컬럼은 0으로 채워서 추가
-        for col in feature_names:
-            if col not in df.columns:
-                df[col] = 0
-
-        # (모델이 쓰지 않는) 추가 컬럼은 버린다.
-        extra_cols = [c for c in df.columns if c not in feature_names]
-        if extra_cols:
-            df = df.drop(columns=extra_cols)
-
-        # 최종 순서 맞추기
-        df = df[feature_names]
-
-        return df
+        return schema.align(df)
 
     # --------------------
     # Public API
@@ -152,19 +241,220 @@ class PurchaseModelAdapter:
     ):
         """
         - session_df: 1개 이상 row를 가진 DataFrame
-        - return: model.predict_proba(aligned_df)
+        - return: model.predict_proba(aligned_df)와 같은 (n, 2) 배열
+        - 이미 채점한 (정렬된 입력 row + artifact 지문) 조합은 PredictionCache에서 바로 반환
+          (PredictionCache.max_rows보다 큰 대량 채점은 캐시를 거치지 않음)
+        - artifact 옆에 검증된 ONNX sidecar가 있고 onnxruntime이 설치되어 있으면 onnxruntime으로 채점
+          (script/export_onnx_artifact.py, 없거나 실패하면 sklearn)
         """
+        registry = get_registry()
+        path = self._artifact_path(strategy)
+        fingerprint = registry.fingerprint(path, self.config.mmap_mode)
+        # 예측 한 건은 처음 가져온 모델 객체로 끝까지 처리 (도중에 교체되어도 섞이지 않음)
         model = self._get_model(strategy)
-        aligned_df = self._align_features(session_df, model)
-        return model.predict_proba(aligned_df)
+        aligned_df = self._align_features(session_df, strategy, model)
 
-    def predict_purchase_probability(
+        onnx = self._get_onnx(strategy, model)
+
+        def score(frame: pd.DataFrame) -> np.ndarray:
+            if onnx is not None:
+                try:
+                    return onnx.predict_proba(frame)[:, 1]
+                except Exception:
+                    # onnxruntime에서 실패하면 이 모델은 이후에도 sklearn으로 채점
+                    logger.warning("onnxruntime scoring failed for %s; using sklearn.", strategy, exc_info=True)
+                    self._onnx[strategy] = (weakref.ref(model), None)
+            with inference_scope(len(frame)):
+                return model.predict_proba(frame)[:, 1]
+
+        # 로드 도중 artifact가 교체됐으면 어느 버전의 결과인지 모호하므로 캐시를 거치지 않는다.
+        if fingerprint is None or fingerprint != registry.fingerprint(path, self.config.mmap_mode):
+            pos = score(aligned_df)
+        else:
+            token = (str(path.resolve()), self.config.mmap_mode, fingerprint)
+            pos = get_prediction_cache().predict(aligned_df, token, score)
+        return np.column_stack([1.0 - pos, pos])
+
+    def validate(
+        self,
+        session_df: pd.DataFrame,
+        strategy: ModelStrategy = "roc_auc",
+        reject: int = DEFAULT_REJECT,
+    ) -> ValidationReport:
+        """
+        학습 스키마 기준 배치 검증 (adapters.input_validation). row별 오류 코드를 한 번에 계산한다.
+        검증 규칙을 만들 수 없는 모델이면 모든 row를 valid로 본다.
+        """
+        validator = self._get_validator(strategy, self._get_model(strategy))
+        if validator is None:
+            return ValidationReport(codes=np.zeros(len(session_df), dtype=np.uint16), reject=reject)
+        return validator.validate(session_df, reject=reject)
+
+    def predict_proba_validated(
+        self,
+        session_df: pd.DataFrame,
+        strategy: ModelStrategy = "roc_auc",
+        reject: int = DEFAULT_REJECT,
+    ) -> Tuple[np.ndarray, ValidationReport]:
+        """
+        검증을 통과한 row만 채점한다. (대량 채점용: 잘못된 row 하나로 배치 전체가 실패하지 않음)
+
+        - return: (1(구매) 클래스 확률 (n,), 격리된 row는 NaN, ValidationReport)
+        - 격리된 row 내용 / 사유는 report.split(session_df)[1]
+        """
+        report = self.validate(session_df, strategy=strategy, reject=reject)
+        pos = np.full(len(session_df), np.nan)
+        valid = report.valid
+        if valid.any():
+            frame = session_df if valid.all() else session_df.loc[valid]
+            pos[valid] = self.predict_proba(frame, strategy=strategy)[:, 1]
+        return pos, report
+
+    def predict_proba_spread(
         self,
         session_df: pd.DataFrame,
         strategy: ModelStrategy = "roc_auc",
+        levels: Sequence[float] = DEFAULT_SPREAD_QUANTILES,
+    ) -> pd.DataFrame:
+        """
+        확률 + 트리 간 편차 (forest_engine.TreeSpread.to_frame, index = session_df.index)
+        - purchase_proba: predict_proba(session_df)[:, 1]과 같은 값
+        - purchase_proba_std / purchase_proba_qNN: 같은 leaf 값에서 계산한 트리 간 표준편차 / 분위수
+        - 컴파일 엔진을 지원하지 않는 모델이면 편차 컬럼은 NaN
+        """
+        model = self._get_model(strategy)
+        compiled = self._get_compiled(strategy, model)
+        if compiled is None:
+            pos = self.predict_proba(session_df, strategy=strategy)[:, 1]
+            spread = TreeSpread.unavailable(pos, tuple(levels))
+        else:
+            spread = compiled.predict_spread(self._align_features(session_df, strategy, model), tuple(levels))
+        return spread.to_frame(index=session_df.index)
+
+    def explain(
+        self,
+        session_df: pd.DataFrame,
+        strategy: ModelStrategy = "roc_auc",
+        top_k: int = 3,
+        exclude: Sequence[str] = (),
+    ) -> Optional[PathExplanation]:
+        """
+        채점 + 트리 경로 기여도 상위 top_k 입력 컬럼 (adapters.path_contributions, 순회 한 번)
+        - probability는 predict_proba(session_df)[:, 1]과 같다. (컴파일 엔진 경로의 부동소수 오차 수준)
+        - exclude: 근거 후보에서 뺄 입력 컬럼 (확률에는 영향 없음)
+        - 컴파일 엔진 / fused 전처리를 지원하지 않는 모델(distill student 등)이면 None
+        """
+        model = self._get_model(strategy)
+        compiled = self._get_compiled(strategy, model)
+        if compiled is None:
+            return None
+        features = self._align_features(session_df, strategy, model)
+        try:
+            return explain_compiled(compiled, features, top_k=top_k, exclude=exclude)
+        except UnsupportedModelError:
+            return None
+
+    def predict_proba_all(
+        self,
+        session_df: pd.DataFrame,
+        strategies: Optional[Sequence[ModelStrategy]] = None,
+    ) -> pd.DataFrame:
+        """
+        여러 전략(모델)의 1(구매) 클래스 확률을 한 번에 계산 (전략 비교 화면용)
+
+        - return: index=전략, columns=session_df.index 인 확률 행렬 (len(strategies), n)
+        - 입력 정렬 / 인코딩 행렬은 모델끼리 공유하고 전략별 채점은 동시에 실행 (multi_strategy.predict_proba_many)
+        - 모델별 결과는 predict_proba(strategy=...)와 같다. (컴파일 엔진 경로의 부동소수 오차 수준)
+          PredictionCache는 거치지 않는다.
+        """
+        strategies = tuple(strategies) if strategies is not None else MODEL_STRATEGIES
+        models = []
+        for strategy in strategies:
+            model = self._get_model(strategy)
+            models.append(StrategyModel(
+                strategy=strategy,
+                model=model,
+                schema=self._get_schema(strategy, model),
+                compiled=self._get_compiled(strategy, model),
+                onnx=self._get_onnx(strategy, model),
+            ))
+
+        def disable_onnx(item: StrategyModel) -> None:
+            # onnxruntime에서 실패하면 이 모델은 이후에도 sklearn으로 채점
+            self._onnx[item.strategy] = (weakref.ref(item.model), None)
+
+        matrix = predict_proba_many(session_df, models, on_onnx_error=disable_onnx)
+        return pd.DataFrame(matrix, index=pd.Index(strategies, name="strategy"), columns=session_df.index)
+
+    def predict_record_probability(
+        self,
+        record: SessionRecord,
+        strategy: ModelStrategy = "roc_auc",
+    ) -> float:
+        """
+        단일 세션 fast path.
+        - record: dict 또는 NumPy record (없는 컬럼은 0 / 알 수 없는 category는 무시)
+        - 컬럼 위치/전처리 파라미터는 모델별로 한 번만 계산해 두고 재사용
+        - 지원하지 않는 모델 구조면 1-row DataFrame 경로로 fallback
+        - config.micro_batch=True면 다른 세션의 요청과 모아서 한 번에 채점 (결과는 동일)
+        """
+        if self.config.micro_batch:
+            return self._dispatchers.get(strategy).predict(record)
+        return self._predict_record_direct(record, strategy)
+
+    def _predict_record_direct(self, record: SessionRecord, strategy: ModelStrategy) -> float:
+        fast_path = self._get_fast_path(strategy)
+        if fast_path is not None:
+            return fast_path.predict_one(record)
+
+        proba = self.predict_proba(records_frame([record]), strategy=strategy)
+        return float(proba[0][1])
+
+    def predict_records_probability(
+        self,
+        records: Sequence[SessionRecord],
+        strategy: ModelStrategy = "roc_auc",
+    ) -> np.ndarray:
+        """
+        여러 세션(dict / NumPy record)의 1(구매) 클래스 확률을 한 번에 계산 (micro-batch용)
+        - fast path가 있으면 입력 행렬을 쌓아서 forest를 한 번만 순회
+        - 없으면 DataFrame 하나로 만들어 predict_proba 한 번
+        """
+        fast_path = self._get_fast_path(strategy)
+        if fast_path is not None:
+            return fast_path.predict_many(records)
+
+        proba = self.predict_proba(records_frame(records), strategy=strategy)
+        return np.asarray(proba)[:, 1]
+
+    def warm_up(self, strategy: ModelStrategy = "roc_auc") -> float:
+        """
+        모델 로드 + 스키마/fast path 준비 + 더미 예측 1회 (lazy 초기화를 미리 끝내 둔다).
+        - sklearn / threadpool 초기화는 첫 predict_proba에서 일어나므로 DataFrame 경로도 한 번 호출
+
+        Returns:
+            float: 더미 세션의 구매 확률 (sanity check용)
+        """
+        model = self._get_model(strategy)
+        schema = self._get_schema(strategy, model)
+        columns = schema.columns if schema is not None else getattr(model, "feature_names_in_", [])
+        record = reference_record(model, columns)
+
+        self.predict_proba(pd.DataFrame([record]), strategy=strategy)
+        return self.predict_record_probability(record, strategy=strategy)
+
+    def predict_purchase_probability(
+        self,
+        session: Union[pd.DataFrame, SessionRecord],
+        strategy: ModelStrategy = "roc_auc",
     ) -> float:
         """
         하나의 세션(row)에 대한 1(구매) 클래스 확률만 반환
+        (dict / NumPy record가 들어오면 fast path 사용)
         """
-        proba = self.predict_proba(session_df, strategy=strategy)
+        if not isinstance(session, pd.DataFrame):
+            return self.predict_record_probability(session, strategy=strategy)
+        if self.config.micro_batch and len(session) == 1:
+            return self.predict_record_probability(session.iloc[0].to_dict(), strategy=strategy)
+        proba = self.predict_proba(session, strategy=strategy)
         return float(proba[0][1])
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Mapping, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from adapters.micro_batcher import MicroBatchDispatcher
+
+# 단일 세션 입력: {"컬럼명": 값} dict 또는 NumPy structured record
+SessionRecord = Union[Mapping[str, Any], np.void]
+
+
+def records_frame(records: Sequence[SessionRecord]) -> pd.DataFrame:
+    """dict / NumPy record 목록 -> DataFrame (fast path를 쓸 수 없는 모델의 입력)"""
+    rows = [dict(r) if isinstance(r, Mapping) else dict(zip(r.dtype.names, r.tolist())) for r in records]
+    return pd.DataFrame(rows)
+
+
+class DispatcherPool:
+    """
+    strategy별 MicroBatchDispatcher (처음 요청된 strategy만 만든다)
+
+    - predict_many(records, strategy): 모인 요청을 한 번에 채점
+    - predict_one(record, strategy): 대기열이 가득 찼거나 기한이 지난 요청을 호출 스레드에서 직접 채점
+    """
+
+    def __init__(
+        self,
+        predict_many: Callable[[Sequence[SessionRecord], str], np.ndarray],
+        predict_one: Callable[[SessionRecord, str], float],
+    ):
+        self._predict_many = predict_many
+        self._predict_one = predict_one
+        self._dispatchers: Dict[str, MicroBatchDispatcher] = {}
+        self._lock = threading.Lock()
+
+    def get(self, strategy: str) -> MicroBatchDispatcher:
+        dispatcher = self._dispatchers.get(strategy)
+        if dispatcher is None:
+            with self._lock:
+                dispatcher = self._dispatchers.get(strategy)
+                if dispatcher is None:
+                    dispatcher = MicroBatchDispatcher(
+                        lambda records: self._predict_many(records, strategy),
+                        fallback=lambda record: self._predict_one(record, strategy),
+                        name=f"micro-batch-{strategy}",
+                    )
+                    self._dispatchers[strategy] = dispatcher
+        return dispatcher
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from adapters.feature_schema import FeatureSchema
+from adapters.forest_engine import CompiledForest, CompiledPipeline, UnsupportedModelError, compile_pipeline
+from adapters.fused_preprocess import FusedPreprocessor
+
+
+class _RecordView(Mapping):
+    """NumPy structured record를 미리 계산한 위치로 읽는 읽기 전용 Mapping"""
+
+    __slots__ = ("_record", "_positions")
+
+    def __init__(self, record: Any, positions: Dict[str, int]):
+        self._record = record
+        self._positions = positions
+
+    def __getitem__(self, key: str) -> Any:
+        return self._record[self._positions[key]]
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class SessionFastPath:
+    """
+    단일 세션 전용 채점 경로.
+
+    - 모델 로딩 시 1회: 컬럼 위치, 전처리 파라미터, forest 배열을 미리 준비
+    - 호출 시: dict / NumPy record -> 입력 벡터 -> CompiledForest (pandas 생성/정렬 없음)
+    """
+
+    def __init__(self, compiled: CompiledPipeline, schema: FeatureSchema):
+        if compiled.fused is None:
+            raise UnsupportedModelError("Fast path needs a fused (RobustScaler + OneHotEncoder) preprocess.")
+
+        self.compiled = compiled
+        self.schema = schema
+        self.feature_names: Tuple[str, ...] = schema.columns
+        # 모델 입력 컬럼명 -> 위치 (NumPy record/시퀀스 입력에 사용)
+        self.positions: Dict[str, int] = schema.positions
+        self._encoder: FusedPreprocessor = compiled.fused
+        self._record_positions: Dict[Any, Dict[str, int]] = {}
+
+    @classmethod
+    def from_model(
+        cls,
+        model: Any,
+        schema: Optional[FeatureSchema] = None,
+        forest: Optional[CompiledForest] = None,
+    ) -> "SessionFastPath":
+        if schema is None:
+            if not hasattr(model, "feature_names_in_"):
+                raise UnsupportedModelError("Model has no feature_names_in_.")
+            schema = FeatureSchema.from_model(model)
+        return cls(compile_pipeline(model, forest=forest), schema)
+
+    def _as_mapping(self, record: Any) -> Mapping[str, Any]:
+        if isinstance(record, Mapping):
+            return record
+
+        names = getattr(getattr(record, "dtype", None), "names", None)
+        if names:
+            # structured record: dtype별로 위치를 한 번만 계산
+            positions = self._record_positions.get(record.dtype)
+            if positions is None:
+                positions = {name: i for i, name in enumerate(names)}
+                self._record_positions[record.dtype] = positions
+            return _RecordView(record, positions)
+
+        # 이름 없는 시퀀스는 feature_names_in_ 순서라고 가정
+        if len(record) != len(self.feature_names):
+            raise ValueError(
+                f"Expected {len(self.feature_names)} values in model column order, got {len(record)}."
+            )
+        return _RecordView(record, self.positions)
+
+    def encode(self, record: Any) -> np.ndarray:
+        """record -> 전처리된 (1, n_out) 입력 행렬"""
+        return self._encoder.transform_record(self._as_mapping(record))
+
+    def predict_one(self, record: Any) -> float:
+        """1(구매) 클래스 확률"""
+        base = self.compiled.forest.predict_proba(self.encode(record))[:, 1]
+        return float(self.compiled.calibrate(base, out=base)[0])
+
+    def predict_many(self, records: Sequence[Any]) -> np.ndarray:
+        """record 여러 건 -> 1(구매) 클래스 확률 (len(records),). forest 순회는 한 번"""
+        X = np.vstack([self.encode(record) for record in records])
+        base = self.compiled.predict_base(X)
+        return self.compiled.calibrate(base, out=base)
+
+
+def try_build_fast_path(
+    model: Any,
+    schema: Optional[FeatureSchema] = None,
+    forest: Optional[CompiledForest] = None,
+) -> Optional[SessionFastPath]:
+    """지원하지 않는 모델이면 None (호출부는 DataFrame 경로 사용)"""
+    try:
+        return SessionFastPath.from_model(model, schema, forest=forest)
+    except UnsupportedModelError:
+        return None
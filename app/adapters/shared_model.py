@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from adapters.artifact_store import (
+    COMPILED_FOREST_KEY,
+    ServingArtifact,
+    ServingPipeline,
+    artifact_file,
+    load_raw_artifact,
+    serving_parts,
+)
+from adapters.forest_engine import CompiledForest, CompiledPipeline, compile_pipeline
+
+# 환경변수: "1"이면 ModelRegistry가 공유 메모리에 게시된 모델을 우선 사용 / descriptor 디렉토리
+SHARED_ENV_VAR = "MODEL_SHARED_MEMORY"
+SHARED_DIR_ENV_VAR = "MODEL_SHARED_MEMORY_DIR"
+DEFAULT_SHARED_DIR = Path(tempfile.gettempdir()) / "purchase-model-shm"
+
+DESCRIPTOR_FORMAT_VERSION = 2
+# descriptor가 아직 이전 파일 기준이면(게시 프로세스가 새 버전을 올리는 중) 기다리는 최대 시간
+STALE_WAIT_SEC = 5.0
+# 배열 시작 위치 정렬 (캐시 라인)
+_ALIGN = 64
+
+
+def shared_dir() -> Path:
+    raw = os.environ.get(SHARED_DIR_ENV_VAR, "").strip()
+    return Path(raw) if raw else DEFAULT_SHARED_DIR
+
+
+def shared_enabled() -> bool:
+    return os.environ.get(SHARED_ENV_VAR, "").strip().lower() in ("1", "true", "yes")
+
+
+def artifact_key(path: str | Path) -> str:
+    """artifact 절대 경로 -> descriptor / 블록 이름에 쓰는 짧은 key"""
+    return hashlib.blake2b(str(Path(path).resolve()).encode("utf-8"), digest_size=6).hexdigest()
+
+
+def descriptor_path(path: str | Path, directory: Optional[Path] = None) -> Path:
+    return (directory or shared_dir()) / f"{artifact_key(path)}.json"
+
+
+def source_fingerprint(path: str | Path) -> List[int]:
+    """ModelRegistry.file_fingerprint와 같은 (크기, mtime ns)"""
+    st = artifact_file(path).stat()
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _read_descriptor(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _attach_block(name: str) -> shared_memory.SharedMemory:
+    """
+    기존 블록에 붙는다. 블록의 수명은 게시 프로세스가 관리하므로
+    이 프로세스가 끝날 때 resource_tracker가 블록을 지우지 않도록 추적에서 뺀다.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+# --------------------
+# 게시 (loader 프로세스)
+# --------------------
+@dataclass
+class PublishedModel:
+    artifact: Path
+    version: int
+    block: shared_memory.SharedMemory
+    descriptor: Dict[str, Any]
+
+
+def _layout(arrays: Dict[str, np.ndarray], blob_size: int) -> Tuple[Dict[str, Dict[str, Any]], Tuple[int, int], int]:
+    offset = 0
+    table: Dict[str, Dict[str, Any]] = {}
+    for name, arr in arrays.items():
+        offset = -(-offset // _ALIGN) * _ALIGN
+        table[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset += arr.nbytes
+    offset = -(-offset // _ALIGN) * _ALIGN
+    return table, (offset, blob_size), offset + blob_size
+
+
+def publish_artifact(
+    path: str | Path,
+    version: int,
+    directory: Optional[Path] = None,
+) -> PublishedModel:
+    """
+    artifact를 공유 메모리 블록 하나에 게시하고 descriptor(JSON)를 원자적으로 교체한다.
+
+    블록 구성:
+    - CompiledForest 노드 배열 (to_arrays(), 64바이트 정렬)
+    - 작은 pickle blob: artifact_store.serving_parts (전처리 / calibration 파라미터 / 입력 컬럼 / classes / JSON 메타)
+
+    블록은 이 프로세스가 만든 것이므로 프로세스가 끝나면 resource_tracker가 정리한다.
+    (반환된 PublishedModel.block을 살려 두는 동안만 유효)
+    """
+    path = Path(path).resolve()
+    directory = directory or shared_dir()
+    # 로드 도중 파일이 교체되면 어느 버전인지 모호하므로 지문이 로드 전후로 같을 때까지 다시 읽는다.
+    while True:
+        fingerprint = source_fingerprint(path)
+        raw = load_raw_artifact(path)
+        if source_fingerprint(path) == fingerprint:
+            break
+    compiled = compile_pipeline(raw["pipeline"], forest=raw.get(COMPILED_FOREST_KEY))
+    forest = compiled.forest
+
+    arrays = {name: np.ascontiguousarray(arr) for name, arr in forest.to_arrays().items()}
+    blob = pickle.dumps(serving_parts(raw, compiled), protocol=pickle.HIGHEST_PROTOCOL)
+    table, blob_span, size = _layout(arrays, len(blob))
+
+    name = f"pm-{artifact_key(path)}-v{version}-{os.getpid()}"
+    block = shared_memory.SharedMemory(name=name, create=True, size=size)
+    for arr_name, arr in arrays.items():
+        spec = table[arr_name]
+        view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=block.buf, offset=spec["offset"])
+        view[...] = arr
+        del view
+    block.buf[blob_span[0]:blob_span[0] + blob_span[1]] = blob
+
+    descriptor = {
+        "format": DESCRIPTOR_FORMAT_VERSION,
+        "artifact": str(path),
+        "source_fingerprint": fingerprint,
+        "version": version,
+        "block": name,
+        "size": size,
+        "arrays": table,
+        "blob": list(blob_span),
+        "n_features": forest.n_features,
+        "max_depth": forest.max_depth,
+        "publisher_pid": os.getpid(),
+        "published_at": time.time(),
+    }
+    directory.mkdir(parents=True, exist_ok=True)
+    target = descriptor_path(path, directory)
+    tmp = target.with_name(target.name + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(descriptor, indent=2), encoding="utf-8")
+    tmp.replace(target)
+    return PublishedModel(artifact=path, version=version, block=block, descriptor=descriptor)
+
+
+class SharedModelPublisher:
+    """
+    artifact들을 공유 메모리에 게시하고, 파일이 바뀌면 새 버전으로 다시 게시하는 loader 프로세스용 객체.
+
+    - publish_all(): 모든 artifact 게시 (descriptor 디렉토리: MODEL_SHARED_MEMORY_DIR)
+    - check(): artifact 지문이 바뀐 것만 새 버전으로 게시 → descriptor 교체 → 이전 블록 unlink
+      (이미 붙어 있는 worker의 매핑은 unlink 후에도 유효하고, worker가 새 버전으로 옮기면 해제됨)
+    - close(): 게시한 블록 unlink + descriptor 삭제
+
+    (script/publish_shared_models.py 참고)
+    """
+
+    def __init__(self, artifacts: Iterable[str | Path], directory: Optional[Path] = None):
+        self.artifacts = [Path(p).resolve() for p in artifacts]
+        self.directory = directory or shared_dir()
+        self.published: Dict[Path, PublishedModel] = {}
+        self.errors: Dict[Path, str] = {}
+        self._lock = threading.Lock()
+
+    def _next_version(self, path: Path) -> int:
+        current = self.published.get(path)
+        if current is not None:
+            return current.version + 1
+        # 게시 프로세스를 재시작해도 버전이 이어지도록
+        old = _read_descriptor(descriptor_path(path, self.directory))
+        return int(old["version"]) + 1 if old else 1
+
+    def publish(self, path: str | Path) -> PublishedModel:
+        path = Path(path).resolve()
+        with self._lock:
+            model = publish_artifact(path, self._next_version(path), self.directory)
+            old = self.published.get(path)
+            self.published[path] = model
+            self.errors.pop(path, None)
+        if old is not None:
+            old.block.close()
+            old.block.unlink()
+        return model
+
+    def publish_all(self) -> List[PublishedModel]:
+        return [self.publish(path) for path in self.artifacts]
+
+    def check(self) -> List[Path]:
+        """바뀐 artifact를 다시 게시 (게시한 경로 목록). 실패하면 이전 버전을 유지"""
+        changed = []
+        for path in self.artifacts:
+            current = self.published.get(path)
+            try:
+                if current is not None and current.descriptor["source_fingerprint"] == source_fingerprint(path):
+                    continue
+                self.publish(path)
+                changed.append(path)
+            except Exception as e:  # 배포 중 파일이 잠깐 없거나 깨진 경우: 기존 버전 유지
+                self.errors[path] = f"{type(e).__name__}: {e}"
+        return changed
+
+    def close(self) -> None:
+        with self._lock:
+            for path, model in self.published.items():
+                target = descriptor_path(path, self.directory)
+                current = _read_descriptor(target)
+                if current is not None and current.get("block") == model.block.name:
+                    target.unlink(missing_ok=True)
+                model.block.close()
+                model.block.unlink()
+            self.published.clear()
+
+
+# --------------------
+# 연결 (worker 프로세스)
+# --------------------
+class SharedPipeline(ServingPipeline):
+    """
+    공유 메모리 블록 위에 만든 ServingPipeline.
+    forest 배열은 블록의 읽기 전용 view (복사 없음), 전처리 / calibration만 프로세스별로 보유
+    """
+
+    def __init__(self, compiled: CompiledPipeline, feature_names_in: List[str], classes: List[Any],
+                 load_sklearn: Callable[[], Any], block: shared_memory.SharedMemory, version: int):
+        super().__init__(compiled, feature_names_in, classes, load_sklearn)
+        self.shared_version = version
+        # 배열 view가 살아 있는 동안 블록 매핑을 유지
+        self._block = block
+
+
+def _current_block(path: Path, directory: Optional[Path], wait_sec: float) -> Optional[Tuple[Dict[str, Any], Any]]:
+    """현재 artifact 파일과 지문이 같은 descriptor + 연결된 블록 (없으면 None)"""
+    deadline = time.monotonic() + wait_sec
+    while True:
+        descriptor = _read_descriptor(descriptor_path(path, directory))
+        if descriptor is None or descriptor.get("format") != DESCRIPTOR_FORMAT_VERSION:
+            return None
+        try:
+            if descriptor["source_fingerprint"] == source_fingerprint(path):
+                return descriptor, _attach_block(descriptor["block"])
+        except FileNotFoundError:
+            # 블록이 방금 교체(unlink)됐거나 artifact 파일이 잠깐 없는 경우: descriptor를 다시 읽는다.
+            pass
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(0.1)
+
+
+def attach_shared_artifact(
+    path: str | Path,
+    directory: Optional[Path] = None,
+    wait_sec: float = STALE_WAIT_SEC,
+) -> Optional[ServingArtifact]:
+    """
+    게시된 artifact를 ServingArtifact로 연결한다. (load_raw_artifact와 같은 키)
+
+    - "pipeline": SharedPipeline, COMPILED_FOREST_KEY: CompiledForest(view), JSON 메타
+    - 그 외 키(base_pipeline 등) / named_steps / 큰 배치는 처음 필요할 때 이 프로세스에서 artifact를 로드
+    - descriptor가 없으면 바로 None, 현재 artifact 파일과 지문이 다르면(새 버전 게시 중)
+      wait_sec까지 기다렸다가 None → 호출부는 일반 로드로 fallback
+    """
+    path = Path(path).resolve()
+    current = _current_block(path, directory, wait_sec)
+    if current is None:
+        return None
+    descriptor, block = current
+
+    arrays = {}
+    for name, spec in descriptor["arrays"].items():
+        view = np.ndarray(tuple(spec["shape"]), dtype=np.dtype(spec["dtype"]), buffer=block.buf, offset=spec["offset"])
+        view.flags.writeable = False
+        arrays[name] = view
+    forest = CompiledForest.from_arrays(arrays, n_features=descriptor["n_features"], max_depth=descriptor["max_depth"])
+
+    start, length = descriptor["blob"]
+    parts = pickle.loads(bytes(block.buf[start:start + length]))
+    return ServingArtifact(
+        parts,
+        forest,
+        lambda: load_raw_artifact(path),
+        pipeline_type=SharedPipeline,
+        block=block,
+        version=descriptor["version"],
+    )
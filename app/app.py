@@ -7,5 +7,22 @@ st.set_page_config(
     layout="wide"
 )
 
+from adapters.artifact_watcher import start_artifact_watcher
+from service.model_warmup import ModelWarmup, start_warmup
+
+
+@st.cache_resource
+def warm_up_models() -> ModelWarmup:
+    """
+    프로세스당 1회: 두 전략(roc_auc / pr_auc) 모델을 백그라운드 스레드에서 미리 로드 + 더미 예측.
+    (첫 사용자가 모델 로딩 비용을 떠안지 않도록)
+    + artifact watcher: 재학습된 artifact가 배포되면 백그라운드에서 로드 후 교체 (캐시 전체 초기화 불필요)
+    """
+    start_artifact_watcher()
+    return start_warmup()
+
+
+warm_up_models()
+
 # 앱 실행 시 홈 페이지로 즉시 이동
 st.switch_page("pages/00_home.py")
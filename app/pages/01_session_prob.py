@@ -9,6 +9,7 @@ from service.session_probability_service import (
     SessionProbabilityService,
     SessionPredictionResult,
 )
+from service.model_warmup import start_warmup
 
 from ui.header import render_header
 
@@ -55,12 +56,15 @@ st.markdown(
 def get_session_probability_service() -> SessionProbabilityService:
     """
     - 모델/어댑터는 여기서 한 번만 로드 (Streamlit 캐싱)
+    - app.py에서 시작한 warm-up의 adapter를 공유 (이미 로드/예열된 모델 사용)
     - Global 평균 값은 추후 실제 데이터 기준으로 수정 가능
     """
-    return SessionProbabilityService(global_avg_purchase_prob=0.15)
+    return SessionProbabilityService(adapter=start_warmup().adapter, global_avg_purchase_prob=0.15)
 
 
 service = get_session_probability_service()
+if not start_warmup().is_ready():
+    st.info("⏳ 모델을 준비하는 중입니다. 첫 예측은 조금 느릴 수 있습니다.")
 
 
 # ======================
@@ -190,25 +194,24 @@ with left_col:
     predict_btn = st.button("🔮 구매 확률 예측하기", type="primary")
 
 
-def build_input_dataframe() -> pd.DataFrame:
+def build_input_record() -> dict:
     """
-    Service/Adapter에 넘길 원본 DataFrame 생성
+    Service/Adapter에 넘길 원본 세션 dict 생성
     (컬럼명은 학습 시 사용한 이름과 동일해야 함)
+    - DataFrame 대신 dict를 넘기면 서비스가 단일 세션 fast path로 채점한다.
     """
-    data = {
-        "Administrative": [administrative],
-        "Informational": [informational],
-        "ProductRelated": [product_related],
-        "BounceRates": [bounce_rates],
-        "ExitRates": [exit_rates],
-        "PageValues": [page_values],
-        "Month": [month],
-        "VisitorType": [visitor_type],
-        "Weekend": [weekend],
-        "TrafficType": [traffic_type],
+    return {
+        "Administrative": administrative,
+        "Informational": informational,
+        "ProductRelated": product_related,
+        "BounceRates": bounce_rates,
+        "ExitRates": exit_rates,
+        "PageValues": page_values,
+        "Month": month,
+        "VisitorType": visitor_type,
+        "Weekend": weekend,
+        "TrafficType": traffic_type,
     }
-    df = pd.DataFrame(data)
-    return df
 
 
 def risk_band_to_css_class(risk_band: str) -> str:
@@ -227,11 +230,11 @@ with right_col:
     st.subheader("예측 결과")
 
     if predict_btn:
-        input_df = build_input_dataframe()
+        input_record = build_input_record()
 
         try:
             result: SessionPredictionResult = service.predict_session(
-                input_df,
+                input_record,
                 strategy=selected_strategy,  # "roc_auc" 또는 "pr_auc"
             )
         except Exception as e:
@@ -259,7 +262,7 @@ with right_col:
             st.markdown(f"**평균 대비:** {result.average_text}")
 
         with st.expander("📁 디버깅용 입력 데이터 보기"):
-            st.dataframe(input_df)
+            st.dataframe(pd.DataFrame([input_record]))
     else:
         st.info(
             "왼쪽에서 세션 정보를 입력하고 **'구매 확률 예측하기'** 버튼을 눌러주세요."
@@ -9,15 +9,17 @@ if APP_DIR not in sys.path:
 
 import streamlit as st
 from ui.header import render_header
+from ui.progressive import render_progressive
 
 render_header()
 st.set_page_config(page_title="What-if 시뮬레이터", layout="wide")
 
 import pandas as pd
-import joblib
 import altair as alt
 import numpy as np
 
+from adapters.PurchaseIntentModelAdapter import PurchaseIntentModelAdapter
+
 # -------------------------------
 # 데이터 / 모델 경로
 # -------------------------------
@@ -32,13 +34,15 @@ MODEL_PATH = os.path.join(BASE_DIR, "app/artifacts/best_balancedrf_pipeline.jobl
 X_train = pd.read_csv(TRAIN_PATH)
 X_test = pd.read_csv(TEST_PATH)
 
-model_dict = joblib.load(MODEL_PATH)
-pipeline = model_dict["pipeline"]
-best_threshold = model_dict["best_threshold"]
+# rerun마다 다시 읽지 않도록 프로세스 전역 레지스트리에서 공유
+# (같은 슬라이더 값은 rerun / 사용자 간 공유되는 예측 캐시에서 바로 반환)
+model_adapter = PurchaseIntentModelAdapter(MODEL_PATH)
+best_threshold = model_adapter.get_threshold()
 
-# 무작위 샘플 선택
-sample_idx = np.random.choice(X_test.index, size=5, replace=False)
-X_sample = X_test.loc[sample_idx]
+# 무작위 샘플 선택 (session 동안 고정: 백그라운드 계산이 끝난 뒤의 rerun에서도 같은 입력)
+if "what_if_sample_idx" not in st.session_state:
+    st.session_state["what_if_sample_idx"] = np.random.choice(X_test.index, size=5, replace=False).tolist()
+X_sample = X_test.loc[st.session_state["what_if_sample_idx"]]
 
 # -------------------------------
 # 2. 탭 가시성 강화 (CSS)
@@ -133,16 +137,19 @@ with col_left:
             )
 
 # 우측: 출력
-with col_right:
-    X_input = X_sample.copy()
-    for col in target_cols:
-        X_input[col] = slider_values[col] * feature_weights[col]
-
-    prob = pipeline.predict_proba(X_input)[:, 1][0]
+def render_result(prob: float, estimate=None) -> None:
+    """결과 영역. estimate가 exact가 아니면 일부 트리 기준 추정치라는 안내를 함께 표시"""
     decision = "구매 판단 영역" if prob >= best_threshold else "비구매 판단 영역"
 
     st.write(f"예측 구매 확률: {prob:.2%}")
     st.write(f"결정 기준값({best_threshold:.2%}) 대비 결과: {decision}")
+    if estimate is not None and not estimate.exact:
+        settled = estimate.lower[0] >= best_threshold or estimate.upper[0] < best_threshold
+        st.caption(
+            f"⏳ 트리 {estimate.trees_used}/{estimate.n_trees}개 기준 추정치 "
+            f"(오차 약 ±{2 * float(estimate.stderr[0]):.1%}p) · 전체 트리로 계산 중"
+            + (" · 판정은 이미 확정" if settled else "")
+        )
 
     data_prob = pd.DataFrame(
         {
@@ -175,3 +182,18 @@ with col_right:
         st.write(f"현재 행동 조합은 기준값(Threshold)보다 {threshold_pct:.2f}% 높아 구매 가능성이 충분함")
     else:
         st.write(f"현재 행동 조합은 기준값(Threshold)보다 {abs(threshold_pct):.2f}% 낮아 구매 가능성 부족")
+
+
+with col_right:
+    X_input = X_sample.copy()
+    for col in target_cols:
+        X_input[col] = slider_values[col] * feature_weights[col]
+
+    # 일부 트리 추정치를 먼저 그리고, 백그라운드에서 계산한 전체 트리 결과(exact)로 같은 자리를 갱신
+    # (슬라이더를 다시 움직이면 남은 계산은 중단되고 새 입력으로 다시 시작)
+    render_progressive(
+        "what_if",
+        X_input.iloc[:1],
+        model_adapter.predict_progressive,
+        lambda estimate: render_result(float(estimate.probability[0]), estimate),
+    )
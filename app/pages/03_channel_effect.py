@@ -10,6 +10,7 @@ st.set_page_config(page_title="chennel_effect", layout="wide")
 
 from ui.header import render_header
 from adapters.PurchaseIntentModelAdapter import PurchaseIntentModelAdapter
+from adapters.model_registry import get_registry
 
 render_header()
 
@@ -36,6 +37,14 @@ default_model_path = ARTIFACTS_DIR / "best_balancedrf_pipeline.joblib"
 def get_adapter(path: str) -> PurchaseIntentModelAdapter:
     return PurchaseIntentModelAdapter(path)
 
+@st.cache_data(show_spinner=False)
+def predict_revenue(path: str, fingerprint, _df: pd.DataFrame) -> pd.Series:
+    """
+    판정만 필요하므로 결과가 확정되면 남은 트리를 평가하지 않는다 (early exit).
+    artifact 지문별로 한 번만 계산 → 위젯 변경으로 rerun돼도 다시 채점하지 않는다.
+    """
+    return get_adapter(path).predict(_df, early_exit=True)
+
 # 데이터 로드용 어댑터
 loading_adapter = get_adapter(str(default_model_path))
 
@@ -90,13 +99,15 @@ if df is not None:
     except:
         pass
 
-    # 모델 예측 수행
-    with st.spinner("모델 예측 중..."):
-        try:
-            preds = prediction_adapter.predict(df) 
-            df['Predicted_Revenue'] = preds
-        except Exception as e:
-            st.error(f"예측 실패: {e}")
+    # 모델 예측 수행 (실제 전환율 모드에서는 예측값을 쓰지 않으므로 모델을 로드하지 않는다)
+    if not metric_choice.startswith("Actual"):
+        with st.spinner("모델 예측 중..."):
+            try:
+                fingerprint = get_registry().fingerprint(model_path)
+                preds = predict_revenue(str(model_path), fingerprint, df)
+                df['Predicted_Revenue'] = preds
+            except Exception as e:
+                st.error(f"예측 실패: {e}")
 
     # 선택에 따른 타겟 컬럼 설정
     target_metric = 'Revenue' if metric_choice.startswith("Actual") else 'Predicted_Revenue'
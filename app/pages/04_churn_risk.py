@@ -228,6 +228,7 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import sys
 import os
 import plotly.graph_objects as go  # 시각화를 위한 추가
@@ -261,6 +262,11 @@ if app_dir not in sys.path:
 from service.CustomerCareCenter import PurchaseIntentService
 from adapters.model_loader import JoblibArtifactLoader
 from adapters.purchase_intent_pr_auc_adapter import PurchaseIntentPRAUCModelAdapter
+from service.model_warmup import start_warmup
+
+# 페이지로 바로 들어온 경우에도 warm-up 시작 (이미 시작했으면 그대로)
+if not start_warmup().is_ready("pr_auc"):
+    st.info("⏳ 모델을 준비하는 중입니다. 잠시만 기다려 주세요.")
 
 # =========================================================
 # [STEP 3] 데이터 및 서비스 로드
@@ -305,46 +311,20 @@ df = load_data()
 # - ✅ "입력 DataFrame을 모델기준으로 맞춰줘" 요구사항 반영
 # - UI/문구/그래프는 그대로 유지하고 내부 입력만 정렬
 # =========================================================
-@st.cache_data
-def get_expected_columns(df_sample: pd.DataFrame) -> list[str]:
-    # 1) adapter.pipeline.feature_names_in_ 우선
-    if hasattr(adapter, "pipeline") and hasattr(adapter.pipeline, "feature_names_in_"):
-        return list(adapter.pipeline.feature_names_in_)
-
-    # 2) artifact.pipeline.feature_names_in_
-    if hasattr(artifact, "pipeline") and hasattr(artifact.pipeline, "feature_names_in_"):
-        return list(artifact.pipeline.feature_names_in_)
-
-    # 3) artifact.meta에 feature 리스트가 저장된 경우
-    if hasattr(artifact, "meta") and isinstance(artifact.meta, dict):
-        for k in ["feature_cols", "feature_columns", "columns", "X_columns"]:
-            if k in artifact.meta:
-                return list(artifact.meta[k])
-
-    # 4) 최후 fallback: df에서 Revenue 제외
-    return [c for c in df_sample.columns if c != "Revenue"]
-
-
-EXPECTED_COLS = get_expected_columns(df)
+# - 컬럼 순서/기본값/dtype 변환은 모델 로딩 시 FeatureSchema로 1회 컴파일
+SCHEMA = adapter.schema()
 
 
 def align_to_model_schema(row_or_df):
     """
-    row(Series) 또는 df(DataFrame)를 모델이 기대하는 feature 컬럼(EXPECTED_COLS)에 맞춘다.
+    row(Series) 또는 df(DataFrame)를 모델이 기대하는 feature 컬럼(SCHEMA.columns)에 맞춘다.
     - 없는 컬럼은 0으로 채움
-    - 추가 컬럼은 제거
+    - 추가 컬럼(Revenue 포함)은 제거
     - 컬럼 순서도 모델 기준으로 정렬
     """
     if isinstance(row_or_df, pd.Series):
-        X = pd.DataFrame([row_or_df.drop("Revenue", errors="ignore")])
-    else:
-        X = row_or_df.drop(columns=["Revenue"], errors="ignore").copy()
-
-    for col in EXPECTED_COLS:
-        if col not in X.columns:
-            X[col] = 0
-
-    return X[EXPECTED_COLS]
+        return SCHEMA.align_row(row_or_df)
+    return SCHEMA.align(row_or_df)
 
 # =========================================================
 # [추가] 개발 중 코드/메시지 변경이 반영 안 될 때를 대비한 캐시 초기화 버튼
@@ -463,7 +443,11 @@ with left_col:
 
     # ✅ 단일 row도 모델 기준 컬럼 정렬
     X_one = align_to_model_schema(row)
-    proba = float(adapter.predict_proba(X_one).iloc[0])
+    # 확률 + 트리 간 편차 (같은 트리 출력에서 함께 계산, 10% / 90% 분위수)
+    spread_one = adapter.predict_proba_spread(X_one).iloc[0]
+    proba = float(spread_one["purchase_proba"])
+    proba_low = float(spread_one["purchase_proba_q10"])
+    proba_high = float(spread_one["purchase_proba_q90"])
     risk = service.classify_risk(proba)
 
     # group_id(1~10)를 recommend_action에 전달
@@ -483,7 +467,9 @@ with right_col:
             'steps': [
                 {'range': [0, 20], 'color': "#ff4b4b"},
                 {'range': [20, 60], 'color': "#ffa500"},
-                {'range': [60, 100], 'color': "#28a745"}
+                {'range': [60, 100], 'color': "#28a745"},
+                # 트리 간 편차 구간 (10% ~ 90% 분위수)
+                {'range': [proba_low * 100, proba_high * 100], 'color': "rgba(31, 119, 180, 0.35)", 'thickness': 0.4},
             ],
             'threshold': {
                 'line': {'color': "white", 'width': 4},
@@ -495,6 +481,12 @@ with right_col:
     fig.update_layout(height=350, margin=dict(l=20, r=20, t=50, b=20))
     st.plotly_chart(fig, use_container_width=True)
 
+    if np.isfinite(proba_low) and np.isfinite(proba_high):
+        st.caption(f"🌲 트리 간 예측 범위(10~90%): {proba_low*100:.1f}% ~ {proba_high*100:.1f}%")
+        # 예측 범위가 등급 경계(20% / 60%)에 걸치면 판정이 불안정하다는 안내
+        if any(proba_low < edge <= proba_high for edge in (0.2, 0.6)):
+            st.caption("⚠️ 예측 범위가 등급 경계에 걸쳐 있어, 트리마다 판정이 엇갈리는 세션입니다.")
+
     if risk == "HIGH_RISK":
         st.error(f"🚨 **상태: 고위험 이탈군** (확률: {proba*100:.1f}%)")
     elif risk == "OPPORTUNITY":
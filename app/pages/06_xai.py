@@ -2,14 +2,17 @@
 import streamlit as st
 from ui.header import render_header
 import pandas as pd
-import joblib
 import shap
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 from pathlib import Path
+from collections.abc import Mapping
 import os
 import platform
+from adapters.fused_preprocess import try_build_fused
+from adapters.model_registry import load_artifact
+from service.model_warmup import start_warmup
 
 render_header()
 st.set_page_config(page_title="XAI", layout="wide")
@@ -77,11 +80,15 @@ def load_resources():
         st.error(f"모델 파일을 찾을 수 없습니다: {main_model_path}")
         st.stop()
         
-    artifact = joblib.load(main_model_path)
-    pipeline = artifact["base_pipeline"] if isinstance(artifact, dict) else artifact
+    artifact = load_artifact(main_model_path)
+    pipeline = artifact["base_pipeline"] if isinstance(artifact, Mapping) else artifact
     
     return pipeline, df
 
+# warm-up이 끝나지 않았으면 안내 (모델 로딩은 warm-up과 공유되어 두 번 하지 않음)
+if not start_warmup().is_ready("pr_auc"):
+    st.info("⏳ 모델을 준비하는 중입니다. 첫 화면은 조금 느릴 수 있습니다.")
+
 # 전역 변수로 초기화
 model = None
 feature_names_kor = []  # 한글 피처 이름 리스트
@@ -90,6 +97,8 @@ preprocessor = None
 try:
     pipeline, df = load_resources()
     preprocessor = pipeline.named_steps['preprocess']
+    # RobustScaler + OneHotEncoder를 한 번에 dense로 변환하는 fused 커널 (미지원 구성이면 sklearn 그대로)
+    preprocessor = try_build_fused(preprocessor) or preprocessor
     model = pipeline.named_steps['model']
 
     # 1. 원본 피처 이름 추출 (영어)
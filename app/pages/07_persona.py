@@ -143,13 +143,13 @@ def generate_persona_session(
     visitor_type: str,
     intent_label: str,
     weekend: bool,
-) -> tuple[pd.DataFrame, str, str]:
+) -> tuple[dict, str, str]:
     """
     선택한 옵션(방문 유형, 의도, 주말 여부)에 따라
     UCI Online Shoppers 스타일의 세션 feature를 구성.
 
     return:
-        - session_df: 1 row DataFrame
+        - session: 1개 세션 feature dict (서비스 fast path 입력)
         - persona_name: "재방문 · 구매 직전 · 주말 형" 같은 짧은 이름
         - narrative: 자연어 설명
     """
@@ -248,8 +248,7 @@ def generate_persona_session(
         f"또한 **{weekend_kor} 방문 세션**으로, {time_desc}을 가정합니다."
     )
 
-    session_df = pd.DataFrame({k: [v] for k, v in base.items()})
-    return session_df, persona_name, narrative
+    return base, persona_name, narrative
 
 
 def risk_band_to_css_class(risk_band: str) -> str:
@@ -269,7 +268,7 @@ with right:
 
     if generate_btn:
         # 1) 페르소나 기반 세션 생성
-        persona_df, persona_name, narrative = generate_persona_session(
+        persona_session, persona_name, narrative = generate_persona_session(
             visitor_type=visitor_type,
             intent_label=intent_label,
             weekend=weekend,
@@ -278,7 +277,7 @@ with right:
         # 2) 모델 예측
         try:
             result: SessionPredictionResult = service.predict_session(
-                persona_df,
+                persona_session,
                 strategy=selected_strategy,
             )
         except Exception as e:
@@ -319,7 +318,7 @@ with right:
 
         # 5) 실제로 모델에 들어간 feature 확인용
         with st.expander("📁 생성된 세션 feature (디버깅/교육용)", expanded=False):
-            st.dataframe(persona_df)
+            st.dataframe(pd.DataFrame([persona_session]))
     else:
         st.info(
             "좌측에서 방문 유형 · 세션 의도 · 요일을 선택하고 "
@@ -7,15 +7,17 @@ if APP_DIR not in sys.path:
 
 import streamlit as st
 from ui.header import render_header
+from ui.progressive import render_progressive
 
 render_header()
 st.set_page_config(page_title="ab_test", layout="wide")
 
 import pandas as pd
-import joblib
 import altair as alt
 import numpy as np
 
+from adapters.PurchaseIntentModelAdapter import PurchaseIntentModelAdapter
+
 # -------------------------------
 # 데이터 / 모델 경로
 # -------------------------------
@@ -30,9 +32,10 @@ MODEL_PATH = os.path.join(BASE_DIR, "app/artifacts/best_balancedrf_pipeline.jobl
 X_train = pd.read_csv(TRAIN_PATH)
 X_test = pd.read_csv(TEST_PATH)
 
-model_dict = joblib.load(MODEL_PATH)
-pipeline = model_dict["pipeline"]
-best_threshold = model_dict["best_threshold"]
+# rerun마다 다시 읽지 않도록 프로세스 전역 레지스트리에서 공유
+# (같은 슬라이더 값은 rerun / 사용자 간 공유되는 예측 캐시에서 바로 반환)
+model_adapter = PurchaseIntentModelAdapter(MODEL_PATH)
+best_threshold = model_adapter.get_threshold()
 
 # -------------------------------
 # 샘플 고정 (Streamlit rerun 방지)
@@ -106,22 +109,18 @@ with col_left:
 # -------------------------------
 # 우측: 결과 출력
 # -------------------------------
-with col_right:
-    # 독립적 DataFrame 생성 (A/B 슬라이더 독립성 보장)
-    X_a = pd.DataFrame([X_base.iloc[0].copy()])
-    X_b = pd.DataFrame([X_base.iloc[0].copy()])
-    for col in cols:
-        X_a[col] = scenario_a[col]
-        X_b[col] = scenario_b[col]
-
-    prob_a = pipeline.predict_proba(X_a)[:, 1][0]
-    prob_b = pipeline.predict_proba(X_b)[:, 1][0]
-
+def render_result(prob_a: float, prob_b: float, estimate=None) -> None:
+    """결과 영역. estimate가 exact가 아니면 일부 트리 기준 추정치라는 안내를 함께 표시"""
     decision_a = prob_a >= best_threshold
     decision_b = prob_b >= best_threshold
 
     st.write(f"Scenario A 구매 확률: {prob_a:.2%}")
     st.write(f"Scenario B 구매 확률: {prob_b:.2%}")
+    if estimate is not None and not estimate.exact:
+        st.caption(
+            f"⏳ 트리 {estimate.trees_used}/{estimate.n_trees}개 기준 추정치 "
+            f"(오차 약 ±{2 * float(estimate.stderr.max()):.1%}p) · 전체 트리로 계산 중"
+        )
 
     data_scenario = pd.DataFrame({
         "category": ["Scenario A", "Scenario B", "결정 기준값"],
@@ -158,4 +157,22 @@ with col_right:
 
     st.write(f"구매 확률 차이: {diff:.2%}p")
     st.write(f"기준값(Threshold) 기준 비교: A={'구매' if decision_a else '비구매'}, B={'구매' if decision_b else '비구매'}")
-    st.write(f"해석 결과: {interpretation}")
\ No newline at end of file
+    st.write(f"해석 결과: {interpretation}")
+
+
+with col_right:
+    # 독립적 DataFrame 생성 (A/B 슬라이더 독립성 보장)
+    X_a = pd.DataFrame([X_base.iloc[0].copy()])
+    X_b = pd.DataFrame([X_base.iloc[0].copy()])
+    for col in cols:
+        X_a[col] = scenario_a[col]
+        X_b[col] = scenario_b[col]
+
+    # 일부 트리 추정치를 먼저 그리고, 백그라운드에서 계산한 전체 트리 결과(exact)로 같은 자리를 갱신
+    # (슬라이더를 다시 움직이면 남은 계산은 중단되고 새 입력으로 다시 시작)
+    render_progressive(
+        "ab_test",
+        pd.concat([X_a, X_b], ignore_index=True),
+        model_adapter.predict_progressive,
+        lambda estimate: render_result(*estimate.probability.tolist(), estimate),
+    )
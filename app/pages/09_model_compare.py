@@ -1,13 +1,16 @@
 import streamlit as st
 from ui.header import render_header
 import pandas as pd
-import joblib
 import shap
 import matplotlib.pyplot as plt
 import numpy as np
 from pathlib import Path
+from collections.abc import Mapping
 import os
 import platform
+from adapters.fused_preprocess import try_build_fused
+from adapters.model_registry import load_artifact
+from service.model_warmup import start_warmup
 
 render_header()
 st.set_page_config(page_title="Model Compare", layout="wide")
@@ -80,14 +83,14 @@ def load_all():
         st.error(f"❌ 모델 파일을 찾을 수 없습니다: {main_model_file}")
         st.stop()
         
-    main_art = joblib.load(main_model_file)
-    main_pipe = main_art["base_pipeline"] if isinstance(main_art, dict) else main_art
+    main_art = load_artifact(main_model_file)
+    main_pipe = main_art["base_pipeline"] if isinstance(main_art, Mapping) else main_art
     
     # 비교 모델들
     others = {}
     cat_path = art_dir / "catboost_model.joblib"
     if cat_path.exists():
-        others["CatBoost"] = joblib.load(cat_path)
+        others["CatBoost"] = load_artifact(cat_path)
         
     if DL_AVAILABLE:
         dnn_path = art_dir / "dnn_model.h5"
@@ -99,6 +102,8 @@ def load_all():
 try:
     main_pipe, others, df = load_all()
     preprocessor = main_pipe.named_steps['preprocess']
+    # RobustScaler + OneHotEncoder를 한 번에 dense로 변환하는 fused 커널 (미지원 구성이면 sklearn 그대로)
+    preprocessor = try_build_fused(preprocessor) or preprocessor
     main_model = main_pipe.named_steps['model']
     
     raw_names = preprocessor.get_feature_names_out()
@@ -154,14 +159,22 @@ if df is not None:
     target_row = df.iloc[[row_idx]].drop(columns=['Revenue'], errors='ignore')
     
     # 모든 모델 예측값 출력
-    all_m = {"Balanced RF (Main)": main_pipe}
+    # 메인 모델은 전략(ROC-AUC / PR-AUC)별 확률을 한 번에 채점 (입력 정렬 / 인코딩 공유)
+    strategy_labels = {"roc_auc": "Balanced RF (ROC-AUC)", "pr_auc": "Balanced RF (PR-AUC)"}
+    try:
+        strategy_proba = start_warmup().adapter.predict_proba_all(target_row, strategies=tuple(strategy_labels))
+        all_m = {label: float(strategy_proba.loc[s].iloc[0]) for s, label in strategy_labels.items()}
+    except Exception:
+        all_m = {"Balanced RF (Main)": main_pipe}
     all_m.update(others)
 
     cols = st.columns(len(all_m))
     for i, (name, m) in enumerate(all_m.items()):
         with cols[i]:
             try:
-                if "Deep Learning" in name:
+                if isinstance(m, float):
+                    prob = m
+                elif "Deep Learning" in name:
                     input_dl = preprocessor.transform(target_row)
                     if hasattr(input_dl, "toarray"): input_dl = input_dl.toarray()
                     prob = float(m.predict(input_dl, verbose=0)[0][0])
@@ -284,62 +284,18 @@ df = load_data().head(30)
 # - 모델이 학습한 컬럼이 df에 없으면 ColumnTransformer에서 바로 터짐
 # - 따라서 "모델이 기대하는 컬럼 목록"을 추출하고, X_one을 그 스키마에 맞춘다
 # =========================================================
-@st.cache_data
-def get_model_expected_columns() -> list[str]:
-    """
-    모델 파이프라인이 기대하는 입력 컬럼 목록을 추출한다.
-    - sklearn 1.0+ 에서 Pipeline/Estimator에 feature_names_in_가 존재할 수 있음
-    - 존재하지 않으면 artifact/meta에 저장된 컬럼 정보를 탐색
-    """
-    # 1) adapter가 pipeline을 들고 있는 경우 (가장 흔한 케이스)
-    pipe = getattr(adapter, "pipeline", None)
-    if pipe is not None and hasattr(pipe, "feature_names_in_"):
-        return list(pipe.feature_names_in_)
-
-    # 2) artifact.pipeline로 접근 가능한 경우
-    art = artifact
-    if hasattr(art, "pipeline") and hasattr(art.pipeline, "feature_names_in_"):
-        return list(art.pipeline.feature_names_in_)
-
-    # 3) meta에 컬럼 목록을 저장해둔 경우 (팀 규약에 따라 키명이 다를 수 있음)
-    if hasattr(art, "meta") and isinstance(art.meta, dict):
-        for key in ["feature_cols", "feature_columns", "columns", "X_columns", "input_columns"]:
-            if key in art.meta and isinstance(art.meta[key], (list, tuple)) and len(art.meta[key]) > 0:
-                return list(art.meta[key])
-
-    # 4) 최후의 수단: 현재 df의 feature 컬럼을 사용 (Revenue 제외)
-    #    (이 케이스는 "모델과 df 컬럼이 원래 동일"한 상황에서만 안전)
-    fallback = [c for c in df.columns if c != "Revenue"]
-    return fallback
-
-
-EXPECTED_COLS = get_model_expected_columns()
+# - 컬럼 순서/기본값/dtype 변환은 모델 로딩 시 FeatureSchema로 1회 컴파일
+SCHEMA = adapter.schema()
 
 
 def align_features_to_model_schema(row: pd.Series) -> pd.DataFrame:
     """
-    단일 row를 모델이 기대하는 컬럼 스키마(EXPECTED_COLS)에 맞춰 DataFrame(1행)으로 만든다.
-    - df에 없는 컬럼은 기본값으로 채움
-    - df에 있지만 모델이 기대하지 않는 컬럼은 제거
-    - 컬럼 순서를 EXPECTED_COLS로 정렬
+    단일 row를 모델이 기대하는 컬럼 스키마(SCHEMA.columns)에 맞춰 DataFrame(1행)으로 만든다.
+    - df에 없는 컬럼은 기본값(0)으로 채움
+    - df에 있지만 모델이 기대하지 않는 컬럼(Revenue 등)은 제거
+    - 컬럼 순서를 모델 기준으로 정렬
     """
-    # 타겟/불필요 컬럼 제거 (Revenue는 예측 입력에서 제외)
-    feature_row = row.drop("Revenue", errors="ignore")
-
-    # 1행 DataFrame 생성
-    X = pd.DataFrame([feature_row.to_dict()])
-
-    # 모델이 기대하는 컬럼만 남기고/추가
-    # 없는 컬럼은 0으로 채움 (범주형이어도 0으로 두는 이유: 전처리에서 handle_unknown/빈값 처리 기대)
-    # 필요 시 아래 default 값을 "Unknown" 같은 문자열로 바꾸는 것도 가능
-    for col in EXPECTED_COLS:
-        if col not in X.columns:
-            X[col] = 0
-
-    # 모델이 기대하지 않는 컬럼은 제거
-    X = X[EXPECTED_COLS]
-
-    return X
+    return SCHEMA.align_row(row)
 
 # =========================================================
 # [유지] 그룹별 Google Drive 이미지 (10개)
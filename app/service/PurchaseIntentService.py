@@ -1,8 +1,13 @@
+from typing import Union
+
 import numpy as np
 import pandas as pd
 
 from adapters.purchase_intent_pr_auc_adapter import PurchaseIntentPRAUCModelAdapter
+from service.session_batch import SessionBatch, SessionBatchResult, risk_band_codes
 
+# score_top_k_batch 결과의 label 인덱스 (0: 타깃 아님, 1: 상위 k% 타깃)
+TARGET_LABELS = ("비타깃", "타깃")
 
 
 class PurchaseIntentService:
@@ -11,8 +16,12 @@ class PurchaseIntentService:
     
     # top_k_ratio: 상위 k%만 타깃팅(1)으로 표시하기 위한 비율 (예: 0.05 = 상위 5%)
     # 내부적으로 purchase_proba를 내림차순 정렬 후, 상위 k% 커트라인(threshold)을 quantile로 계산해 적용
-    def score_top_k(self, features: pd.DataFrame, top_k_ratio: float = 0.05) -> pd.DataFrame:
-        proba = self.adapter.predict_proba(features)
+    # with_spread=True면 트리 간 편차 컬럼(purchase_proba_std / purchase_proba_qNN)도 추가 (같은 순회에서 계산)
+    def score_top_k(
+        self, features: pd.DataFrame, top_k_ratio: float = 0.05, with_spread: bool = False
+    ) -> pd.DataFrame:
+        spread = self.adapter.predict_proba_spread(features) if with_spread else None
+        proba = spread["purchase_proba"] if spread is not None else self.adapter.predict_proba(features)
 
         # 상위 k% 컷
         thr = float(np.quantile(proba.values, 1.0 - top_k_ratio))
@@ -23,4 +32,43 @@ class PurchaseIntentService:
         out["purchase_pred"] = pred
         out["threshold_used"] = thr
         out["top_k_ratio"] = top_k_ratio
+        if spread is not None:
+            for column in spread.columns.drop("purchase_proba"):
+                out[column] = spread[column]
         return out
+
+    def score_top_k_batch(
+        self,
+        batch: Union[SessionBatch, pd.DataFrame],
+        top_k_ratio: float = 0.05,
+        with_spread: bool = False,
+    ) -> SessionBatchResult:
+        """
+        score_top_k의 struct-of-arrays 버전 (입력 복사 / 결과 컬럼 추가 없음, 대량 배치용)
+        - label: TARGET_LABELS 인덱스 (상위 k%면 1), risk_band: session_batch.RISK_BANDS 코드
+        - 사용한 커트라인은 result.threshold
+        - with_spread=True면 result.std에 트리 간 표준편차
+        """
+        if isinstance(batch, pd.DataFrame):
+            batch = SessionBatch.from_frame(batch)
+        std = None
+        if len(batch) and with_spread:
+            spread = self.adapter.predict_proba_spread(batch.to_frame(), levels=())
+            proba = spread["purchase_proba"].to_numpy(dtype=np.float64)
+            std = spread["purchase_proba_std"].to_numpy(dtype=np.float64)
+        elif len(batch):
+            proba = self.adapter.predict_proba(batch.to_frame()).to_numpy(dtype=np.float64)
+        else:
+            proba = np.zeros(0, dtype=np.float64)
+            std = np.zeros(0, dtype=np.float64) if with_spread else None
+        thr = float(np.quantile(proba, 1.0 - top_k_ratio)) if len(proba) else float("nan")
+        return SessionBatchResult(
+            probability=proba,
+            risk_band=risk_band_codes(proba),
+            label=(proba >= thr).astype(np.int8),
+            reasons=np.zeros((len(proba), 0), dtype=np.int16),
+            labels=TARGET_LABELS,
+            index=batch.index,
+            threshold=thr,
+            std=std,
+        )
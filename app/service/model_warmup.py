@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Literal, Optional, Sequence
+
+from adapters.purchase_model_adapter import (
+    ModelStrategy,
+    PurchaseModelAdapter,
+    PurchaseModelAdapterConfig,
+)
+
+WarmupStatus = Literal["pending", "loading", "ready", "failed"]
+
+
+@dataclass
+class WarmupState:
+    status: WarmupStatus = "pending"
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class ModelWarmup:
+    """
+    앱 시작 시 백그라운드 스레드에서 모델을 미리 준비하는 warm-up 단계.
+
+    - strategy별 스레드에서 artifact 로드 + 더미 예측 1회 (PurchaseModelAdapter.warm_up)
+    - 페이지에서 확인할 수 있는 준비 상태(is_ready / status) 제공
+    - warm-up에 쓴 adapter를 그대로 공유 (스키마 / fast path까지 준비된 상태)
+
+    - artifact 로딩은 ModelRegistry를 거치므로, warm-up 도중 페이지가 같은 모델을 요청하면
+      두 번 로드하지 않고 warm-up 쪽 로딩이 끝나기를 기다린다.
+    """
+
+    def __init__(
+        self,
+        adapter: Optional[PurchaseModelAdapter] = None,
+        strategies: Sequence[ModelStrategy] = ("roc_auc", "pr_auc"),
+    ):
+        self.adapter = adapter or PurchaseModelAdapter(PurchaseModelAdapterConfig.from_default_layout())
+        self.strategies = tuple(strategies)
+        self._states: Dict[str, WarmupState] = {s: WarmupState() for s in self.strategies}
+        self._threads: Dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> "ModelWarmup":
+        """strategy별 daemon 스레드 시작 (여러 번 호출해도 한 번만 실행)"""
+        with self._lock:
+            for strategy in self.strategies:
+                if strategy in self._threads:
+                    continue
+                thread = threading.Thread(
+                    target=self._run, args=(strategy,), name=f"model-warmup-{strategy}", daemon=True
+                )
+                self._threads[strategy] = thread
+                thread.start()
+        return self
+
+    def _run(self, strategy: ModelStrategy) -> None:
+        state = self._states[strategy]
+        state.status = "loading"
+        start = time.perf_counter()
+        try:
+            self.adapter.warm_up(strategy)
+        except Exception as e:  # warm-up 실패는 앱을 멈추지 않는다 (페이지에서 다시 로드 시도)
+            state.error = f"{type(e).__name__}: {e}"
+            state.status = "failed"
+        else:
+            state.status = "ready"
+        finally:
+            state.seconds = time.perf_counter() - start
+
+    # --------------------
+    # 상태 조회
+    # --------------------
+    def is_ready(self, strategy: Optional[ModelStrategy] = None) -> bool:
+        """strategy가 None이면 전체가 준비되었는지"""
+        if strategy is not None:
+            state = self._states.get(strategy)
+            return state is not None and state.status == "ready"
+        return all(state.status == "ready" for state in self._states.values())
+
+    def wait(self, timeout: Optional[float] = None, strategy: Optional[ModelStrategy] = None) -> bool:
+        """warm-up이 끝날 때까지 대기 (timeout 초). 준비 완료 여부를 반환"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        targets = [strategy] if strategy is not None else list(self.strategies)
+        for name in targets:
+            thread = self._threads.get(name)
+            if thread is None:
+                continue
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return self.is_ready(strategy)
+
+    def status(self) -> Dict[str, WarmupState]:
+        return dict(self._states)
+
+
+_WARMUP: Optional[ModelWarmup] = None
+_WARMUP_LOCK = threading.Lock()
+
+
+def get_warmup() -> ModelWarmup:
+    """프로세스 전역 ModelWarmup (시작하지 않은 상태일 수 있음)"""
+    global _WARMUP
+    if _WARMUP is None:
+        with _WARMUP_LOCK:
+            if _WARMUP is None:
+                _WARMUP = ModelWarmup()
+    return _WARMUP
+
+
+def start_warmup() -> ModelWarmup:
+    """프로세스 전역 warm-up을 시작하고 반환 (이미 시작했으면 그대로 반환)"""
+    return get_warmup().start()
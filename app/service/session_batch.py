@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 위험 구간 코드 (SessionBatchResult.risk_band 값 = 이 튜플의 인덱스)
+RISK_BANDS: Tuple[str, ...] = ("low", "medium", "high")
+RISK_BAND_LOW, RISK_BAND_MEDIUM, RISK_BAND_HIGH = 0, 1, 2
+# 구간 경계: [0, 0.30) low / [0.30, 0.60) medium / [0.60, 1] high
+RISK_BAND_EDGES = np.array([0.30, 0.60])
+STATUS_LABELS: Tuple[str, ...] = ("구매 가능성 낮음", "구매 가능성 보통", "구매 가능성 높음")
+
+
+def risk_band_codes(probability: np.ndarray) -> np.ndarray:
+    """확률 배열 -> 위험 구간 코드 (int8, RISK_BANDS 인덱스)"""
+    return np.searchsorted(RISK_BAND_EDGES, probability, side="right").astype(np.int8)
+
+
+@dataclass(frozen=True, eq=False)
+class SessionBatch:
+    """
+    세션 배치의 컬럼형(array-backed) 표현. 서비스 계층의 대량 채점 입력.
+
+    Attributes:
+        columns:     컬럼명 -> 타입이 고정된 NumPy 배열 (float64 / int64 / bool), 길이 n
+        codes:       범주 컬럼명 -> 범주 코드 (int32, 결측은 -1)
+        categories:  범주 컬럼명 -> 코드가 가리키는 범주 값 배열
+        index:       원본 row index (없으면 RangeIndex)
+
+    - 범주 컬럼은 row마다 문자열 객체를 들지 않고 (코드 배열, 범주 목록)으로 보관
+    - to_frame(): 범주 컬럼을 pd.Categorical로 감싼 DataFrame (값 복사 / 문자열 생성 없음)
+      → adapter의 정렬 / fused 전처리가 범주 목록 단위로 한 번만 조회
+    - take(): row 부분집합 (배열 slicing만)
+    """
+    columns: Mapping[str, np.ndarray] = field(default_factory=dict)
+    codes: Mapping[str, np.ndarray] = field(default_factory=dict)
+    categories: Mapping[str, np.ndarray] = field(default_factory=dict)
+    index: Optional[pd.Index] = None
+
+    def __post_init__(self) -> None:
+        lengths = {len(v) for v in self.columns.values()} | {len(v) for v in self.codes.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"SessionBatch columns have different lengths: {sorted(lengths)}")
+        if set(self.codes) != set(self.categories):
+            raise ValueError("Every categorical column needs both codes and categories.")
+
+    # --------------------
+    # 생성
+    # --------------------
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "SessionBatch":
+        """
+        DataFrame -> SessionBatch.
+        숫자 / bool 컬럼은 그대로, 그 외(문자열 / object / category)는 범주 코드로 바꾼다.
+        """
+        columns: Dict[str, np.ndarray] = {}
+        codes: Dict[str, np.ndarray] = {}
+        categories: Dict[str, np.ndarray] = {}
+        for name in df.columns:
+            series = df[name]
+            dtype = series.dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                codes[name] = series.cat.codes.to_numpy(dtype=np.int32)
+                categories[name] = np.asarray(dtype.categories, dtype=object)
+            elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+                columns[name] = series.to_numpy()
+            else:
+                col_codes, uniques = pd.factorize(series, use_na_sentinel=True)
+                codes[name] = col_codes.astype(np.int32, copy=False)
+                categories[name] = np.asarray(uniques, dtype=object)
+        return cls(columns=columns, codes=codes, categories=categories, index=df.index)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        columns: Optional[Mapping[str, Any]] = None,
+        categorical: Optional[Mapping[str, Tuple[Any, Sequence[Any]]]] = None,
+    ) -> "SessionBatch":
+        """
+        이미 배열로 가진 데이터로 생성 (DataFrame을 거치지 않음).
+        categorical: 컬럼명 -> (코드 배열, 범주 목록)
+        """
+        categorical = categorical or {}
+        return cls(
+            columns={k: np.asarray(v) for k, v in (columns or {}).items()},
+            codes={k: np.asarray(c, dtype=np.int32) for k, (c, _) in categorical.items()},
+            categories={k: np.asarray(list(cats), dtype=object) for k, (_, cats) in categorical.items()},
+        )
+
+    # --------------------
+    # 조회 / 변환
+    # --------------------
+    def __len__(self) -> int:
+        for values in self.columns.values():
+            return len(values)
+        for values in self.codes.values():
+            return len(values)
+        return 0
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.columns) + [c for c in self.codes if c not in self.columns]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.columns or name in self.codes
+
+    def numeric(self, name: str, dtype: Any = np.float64) -> np.ndarray:
+        """숫자 / bool 컬럼 배열 (dtype이 이미 같으면 복사 없음)"""
+        return np.asarray(self.columns[name], dtype=dtype)
+
+    def category_mask(self, name: str, value: Any) -> np.ndarray:
+        """범주 컬럼 == value 인 row 마스크 (범주 목록에서 한 번 찾고 코드 비교)"""
+        hits = np.flatnonzero(self.categories[name] == value)
+        if not len(hits):
+            return np.zeros(len(self), dtype=bool)
+        return np.isin(self.codes[name], hits)
+
+    def take(self, rows: Any) -> "SessionBatch":
+        """row 부분집합 (정수 위치 또는 bool 마스크)"""
+        return SessionBatch(
+            columns={k: v[rows] for k, v in self.columns.items()},
+            codes={k: v[rows] for k, v in self.codes.items()},
+            categories=dict(self.categories),
+            index=self.index[rows] if self.index is not None else None,
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        """모델 입력용 DataFrame. 범주 컬럼은 pd.Categorical (코드 배열 그대로 사용)"""
+        data: Dict[str, Any] = dict(self.columns)
+        for name, col_codes in self.codes.items():
+            data[name] = pd.Categorical.from_codes(col_codes, categories=pd.Index(self.categories[name]))
+        return pd.DataFrame(data, index=self.index, copy=False)
+
+
+@dataclass(frozen=True, eq=False)
+class SessionBatchResult:
+    """
+    배치 채점 결과 (struct-of-arrays). row별 dataclass / 문자열 리스트를 만들지 않는다.
+
+    Attributes:
+        probability:   1(구매) 클래스 확률 float64 (n,)
+        risk_band:     위험 구간 코드 int8 (n,) → RISK_BANDS
+        label:         라벨 인덱스 int8 (n,) → labels
+        reasons:       근거 코드 행렬 int16 (n, k), 값은 reason_texts 인덱스 (중요한 순서, 빈 칸은 -1)
+        labels:        label 인덱스가 가리키는 문구
+        reason_texts:  reasons 열이 가리키는 문구
+        index:         입력 batch의 row index
+        threshold:     label 판정에 쓴 확률 커트라인 (구간 코드로 label을 정했으면 None)
+        std:           트리 간 양성 확률 표준편차 (n,) (요청한 경우만, 아니면 None)
+
+    문구가 필요한 화면(1건 상세 등)에서만 reasons_of(i) / to_frame()으로 풀어 쓴다.
+    """
+    probability: np.ndarray
+    risk_band: np.ndarray
+    label: np.ndarray
+    reasons: np.ndarray
+    labels: Tuple[str, ...] = STATUS_LABELS
+    reason_texts: Tuple[str, ...] = ()
+    index: Optional[pd.Index] = None
+    threshold: Optional[float] = None
+    std: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.probability)
+
+    def reasons_of(self, i: int) -> List[str]:
+        """i번째 세션의 근거 문구 (중요한 순서)"""
+        return [self.reason_texts[int(code)] for code in self.reasons[i] if code >= 0]
+
+    def label_of(self, i: int) -> str:
+        return self.labels[int(self.label[i])]
+
+    def band_counts(self) -> Dict[str, int]:
+        """위험 구간별 세션 수"""
+        counts = np.bincount(self.risk_band, minlength=len(RISK_BANDS))
+        return {band: int(k) for band, k in zip(RISK_BANDS, counts)}
+
+    def reason_counts(self) -> Dict[str, int]:
+        """근거 문구별 해당 세션 수"""
+        codes = self.reasons[self.reasons >= 0]
+        counts = np.bincount(codes, minlength=len(self.reason_texts))
+        return {text: int(k) for text, k in zip(self.reason_texts, counts) if k}
+
+    def to_frame(self) -> pd.DataFrame:
+        """표 출력용 DataFrame (문구 컬럼은 범주형이라 row별 문자열을 만들지 않음)"""
+        data: Dict[str, Any] = {"probability": self.probability}
+        if self.std is not None:
+            data["probability_std"] = self.std
+        data["risk_band"] = pd.Categorical.from_codes(self.risk_band, categories=list(RISK_BANDS))
+        data["label"] = pd.Categorical.from_codes(self.label, categories=list(self.labels))
+        data["n_reasons"] = (self.reasons >= 0).sum(axis=1)
+        return pd.DataFrame(data, index=self.index)
@@ -1,18 +1,165 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Literal, Optional
+from typing import Any, Dict, List, Literal, Mapping, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from adapters.purchase_model_adapter import (
     PurchaseModelAdapter,
     PurchaseModelAdapterConfig,
     ModelStrategy,
+    SessionRecord,
+)
+from adapters.path_contributions import PathExplanation
+from service.session_batch import (
+    RISK_BANDS,
+    STATUS_LABELS,
+    SessionBatch,
+    SessionBatchResult,
+    risk_band_codes,
 )
 
 
 RiskBand = Literal["high", "medium", "low"]
 
+# 설명 문구 템플릿: (컬럼, 값 조건, 방향, 문구)
+# - 방향 +1: 그 컬럼이 구매 확률을 높인 경우 / -1: 낮춘 경우 (트리 경로 기여도의 부호)
+# - 값 조건이 None이 아니면 세션 값이 같을 때만 사용
+_REASON_TEMPLATES: Tuple[Tuple[str, Any, int, str], ...] = (
+    ("ProductRelated", None, 1, "상품 페이지를 많이 조회하고 있어 관심도가 높습니다."),
+    ("ProductRelated", None, -1, "상품 페이지 조회 수가 적어 아직 탐색 단계일 가능성이 있습니다."),
+    ("PageValues", None, 1, "이미 장바구니/결제 단계 등 높은 가치 페이지에 도달했습니다."),
+    ("PageValues", None, -1, "아직 구매 여정의 앞단에 있어 구체적인 구매 신호가 약합니다."),
+    ("ExitRates", None, 1, "세션 종료 비율이 낮아 이탈 위험이 비교적 적습니다."),
+    ("ExitRates", None, -1, "세션 종료 비율이 높아 이탈 가능성이 큽니다."),
+    ("VisitorType", "Returning_Visitor", 1, "재방문 고객으로, 사이트 경험이 있어 구매 가능성이 더 높습니다."),
+    ("VisitorType", "New_Visitor", -1, "신규 방문자로, 아직 사이트에 익숙하지 않아 구매까지 시간이 걸릴 수 있습니다."),
+    ("Weekend", True, 1, "주말 방문 세션으로, 여유 있는 쇼핑 가능성이 있습니다."),
+    ("Weekend", False, -1, "평일 방문 세션으로, 짧은 탐색 후 이탈할 수도 있습니다."),
+)
+
+# 템플릿이 없는 (또는 방향 / 값이 맞지 않는) 컬럼은 컬럼 이름으로 만든 일반 문구를 쓴다.
+_COLUMN_LABELS: Dict[str, str] = {
+    "Administrative": "관리 페이지 조회 수",
+    "Administrative_Duration": "관리 페이지 체류 시간",
+    "Informational": "정보 페이지 조회 수",
+    "Informational_Duration": "정보 페이지 체류 시간",
+    "ProductRelated": "제품 관련 페이지 조회 수",
+    "ProductRelated_Duration": "제품 관련 페이지 체류 시간",
+    "BounceRates": "이탈률",
+    "ExitRates": "종료율",
+    "PageValues": "페이지 가치",
+    "SpecialDay": "기념일 근접도",
+    "Month": "방문 월",
+    "OperatingSystems": "운영체제",
+    "Browser": "브라우저",
+    "Region": "지역",
+    "TrafficType": "트래픽 유형",
+    "VisitorType": "방문자 유형",
+    "Weekend": "주말 여부",
+}
+_OTHER_LABEL = "기타 입력값"
+# 모델 입력이지만 근거로 보여주지 않는 컬럼 (학습 데이터의 행 번호)
+_HIDDEN_REASON_COLUMNS: Tuple[str, ...] = ("row_id",)
+
+
+def _generic_texts(label: str) -> Tuple[str, str]:
+    return (
+        f"{label} 값이 구매 가능성을 높이는 방향으로 작용했습니다.",
+        f"{label} 값이 구매 가능성을 낮추는 방향으로 작용했습니다.",
+    )
+
+
+# SessionBatchResult.reasons 코드가 가리키는 문구 (템플릿 → 컬럼별 일반 문구(높임, 낮춤) → 기타)
+REASON_TEXTS: Tuple[str, ...] = (
+    tuple(t[3] for t in _REASON_TEMPLATES)
+    + tuple(text for label in _COLUMN_LABELS.values() for text in _generic_texts(label))
+    + _generic_texts(_OTHER_LABEL)
+)
+_TEMPLATE_CODES = {(t[0], t[1], t[2]): i for i, t in enumerate(_REASON_TEMPLATES)}
+_GENERIC_CODES: Dict[str, Tuple[int, int]] = {
+    column: (len(_REASON_TEMPLATES) + 2 * i, len(_REASON_TEMPLATES) + 2 * i + 1)
+    for i, column in enumerate(_COLUMN_LABELS)
+}
+_OTHER_CODES = (len(REASON_TEXTS) - 2, len(REASON_TEXTS) - 1)
+
+# 트리 경로 기여도를 쓸 수 없는 모델(distill student 등)용 규칙: (컬럼, 비교, 기준값, 템플릿 index)
+# 비교는 "ge"(>=) / "le"(<=) / "eq"(==)
+_FALLBACK_RULES: Tuple[Tuple[str, str, Any, int], ...] = (
+    ("ProductRelated", "ge", 20, _TEMPLATE_CODES[("ProductRelated", None, 1)]),
+    ("ProductRelated", "le", 3, _TEMPLATE_CODES[("ProductRelated", None, -1)]),
+    ("PageValues", "ge", 50, _TEMPLATE_CODES[("PageValues", None, 1)]),
+    ("PageValues", "eq", 0, _TEMPLATE_CODES[("PageValues", None, -1)]),
+    ("ExitRates", "le", 0.2, _TEMPLATE_CODES[("ExitRates", None, 1)]),
+    ("ExitRates", "ge", 0.5, _TEMPLATE_CODES[("ExitRates", None, -1)]),
+    ("VisitorType", "eq", "Returning_Visitor", _TEMPLATE_CODES[("VisitorType", "Returning_Visitor", 1)]),
+    ("VisitorType", "eq", "New_Visitor", _TEMPLATE_CODES[("VisitorType", "New_Visitor", -1)]),
+    ("Weekend", "eq", True, _TEMPLATE_CODES[("Weekend", True, 1)]),
+    ("Weekend", "eq", False, _TEMPLATE_CODES[("Weekend", False, -1)]),
+)
+
+
+def _value_mask(batch: SessionBatch, column: str, value: Any, rows: np.ndarray) -> np.ndarray:
+    """rows 위치의 세션 값 == value 마스크 (bool 값은 bool / 정수 컬럼에서만 비교)"""
+    if column in batch.codes:
+        return batch.category_mask(column, value)[rows]
+    if column not in batch.columns or isinstance(value, str):
+        return np.zeros(len(rows), dtype=bool)
+    values = batch.columns[column][rows]
+    if isinstance(value, bool):
+        return values.astype(bool) == value if values.dtype.kind in "bi" else np.zeros(len(rows), dtype=bool)
+    return values == value
+
+
+def _rule_mask(batch: SessionBatch, column: str, op: str, target: Any) -> np.ndarray:
+    """배치 전체에 fallback 규칙 적용 (row별 파이썬 객체 없음)"""
+    if op == "eq":
+        return _value_mask(batch, column, target, np.arange(len(batch)))
+    if column not in batch.columns:
+        return np.zeros(len(batch), dtype=bool)
+    values = batch.numeric(column)
+    return values >= target if op == "ge" else values <= target
+
+
+def reason_codes(batch: SessionBatch, explanation: PathExplanation) -> np.ndarray:
+    """
+    경로 기여도 상위 컬럼 (n, k) -> REASON_TEXTS 코드 (n, k) int16
+
+    컬럼 / 기여 방향 / 세션 값이 맞는 템플릿이 있으면 그 문구, 없으면 컬럼 이름의 일반 문구.
+    컬럼 단위로 처리하므로 row별 파이썬 객체를 만들지 않는다.
+    """
+    top = explanation.top_features
+    codes = np.full(top.shape, -1, dtype=np.int16)
+    for j, column in enumerate(explanation.feature_names):
+        rows, slots = np.nonzero(top == j)
+        if not len(rows):
+            continue
+        up = explanation.top_contributions[rows, slots] > 0
+        raise_code, lower_code = _GENERIC_CODES.get(column, _OTHER_CODES)
+        chosen = np.where(up, raise_code, lower_code)
+        for code, (t_column, value, direction, _) in enumerate(_REASON_TEMPLATES):
+            if t_column != column:
+                continue
+            match = up if direction > 0 else ~up
+            if value is not None:
+                match = match & _value_mask(batch, column, value, rows)
+            chosen[match] = code
+        codes[rows, slots] = chosen
+    return codes
+
+
+def fallback_reason_codes(batch: SessionBatch, top_k: int) -> np.ndarray:
+    """규칙 기반 근거 코드 (n, top_k) int16. 규칙 순서대로 해당하는 것을 앞에서부터 채운다."""
+    hits = np.zeros((len(batch), len(_FALLBACK_RULES)), dtype=bool)
+    for j, (column, op, target, _) in enumerate(_FALLBACK_RULES):
+        hits[:, j] = _rule_mask(batch, column, op, target)
+    k = min(int(top_k), len(_FALLBACK_RULES))
+    order = np.argsort(~hits, axis=1, kind="stable")[:, :k]
+    codes = np.asarray([rule[3] for rule in _FALLBACK_RULES], dtype=np.int16)[order]
+    codes[~np.take_along_axis(hits, order, axis=1)] = -1
+    return codes
+
 
 @dataclass
 class SessionPredictionResult:
@@ -30,49 +177,108 @@ class SessionProbabilityService:
         adapter: Optional[PurchaseModelAdapter] = None,
         global_avg_purchase_prob: float = 0.15,
         default_strategy: ModelStrategy = "roc_auc",
+        reason_top_k: int = 3,
     ):
         self.adapter = adapter or PurchaseModelAdapter(
             PurchaseModelAdapterConfig.from_default_layout()
         )
         self.global_avg_purchase_prob = global_avg_purchase_prob
         self.default_strategy = default_strategy
+        # 세션별로 보여줄 근거 수 (트리 경로 기여도 상위 k개 컬럼)
+        self.reason_top_k = reason_top_k
 
     def predict_session(
         self,
-        session_df: pd.DataFrame,
+        session: Union[pd.DataFrame, SessionRecord],
         strategy: Optional[ModelStrategy] = None,
     ) -> SessionPredictionResult:
-        strategy = strategy or self.default_strategy
-        prob = self.adapter.predict_purchase_probability(session_df, strategy=strategy)
-
-        risk_band, status_label = self._get_risk_band_and_label(prob)
-        compare_text = self._build_compare_text(prob, self.global_avg_purchase_prob)
+        """
+        session:
+            - 1-row DataFrame (기존 방식)
+            - dict / NumPy record
 
-        row = session_df.iloc[0]
-        reasons, avg_text = self._build_explanation(row, prob, self.global_avg_purchase_prob)
+        확률과 근거는 predict_batch와 같은 순회 한 번으로 계산한다. (근거 = 트리 경로 기여도 상위 컬럼)
+        """
+        result = self.predict_batch(SessionBatch.from_frame(self._as_frame(session)), strategy=strategy)
+        prob = float(result.probability[0])
 
+        risk_band, status_label = self._get_risk_band_and_label(prob)
         return SessionPredictionResult(
             probability=prob,
             risk_band=risk_band,
             status_label=status_label,
-            compare_text=compare_text,
+            compare_text=self._build_compare_text(prob, self.global_avg_purchase_prob),
+            reasons=result.reasons_of(0),
+            average_text=self._build_average_text(prob, self.global_avg_purchase_prob),
+        )
+
+    @staticmethod
+    def _as_frame(session: Union[pd.DataFrame, SessionRecord]) -> pd.DataFrame:
+        if isinstance(session, pd.DataFrame):
+            return session.iloc[:1]
+        if isinstance(session, Mapping):
+            return pd.DataFrame([dict(session)])
+        # NumPy structured record
+        return pd.DataFrame.from_records([session], columns=session.dtype.names)
+
+    def predict_batch(
+        self,
+        batch: Union[SessionBatch, pd.DataFrame],
+        strategy: Optional[ModelStrategy] = None,
+    ) -> SessionBatchResult:
+        """
+        대량 세션 채점 (struct-of-arrays 결과, row별 SessionPredictionResult / 문자열을 만들지 않음)
+
+        batch:
+            - SessionBatch (범주 컬럼은 코드 배열)
+            - DataFrame (SessionBatch.from_frame으로 변환)
+
+        - label은 STATUS_LABELS 인덱스 (= risk_band)
+        - reasons는 REASON_TEXTS 코드 (n, reason_top_k): forest를 순회하면서 모은 경로 기여도 상위 컬럼을
+          기존 문구 템플릿에 대응시킨 것 (별도 SHAP 계산 없음)
+        - 컴파일 엔진을 지원하지 않는 모델이면 확률은 predict_proba, 근거는 규칙 기반 (_FALLBACK_RULES)
+        """
+        if isinstance(batch, pd.DataFrame):
+            batch = SessionBatch.from_frame(batch)
+        strategy = strategy or self.default_strategy
+
+        explanation = None
+        if len(batch):
+            frame = batch.to_frame()
+            explanation = self.adapter.explain(
+                frame, strategy=strategy, top_k=self.reason_top_k, exclude=_HIDDEN_REASON_COLUMNS
+            )
+        if explanation is not None:
+            prob = np.ascontiguousarray(explanation.probability, dtype=np.float64)
+            reasons = reason_codes(batch, explanation)
+        else:
+            if len(batch):
+                proba = self.adapter.predict_proba(frame, strategy=strategy)
+                prob = np.ascontiguousarray(np.asarray(proba)[:, 1], dtype=np.float64)
+            else:
+                prob = np.zeros(0, dtype=np.float64)
+            reasons = fallback_reason_codes(batch, self.reason_top_k)
+
+        band = risk_band_codes(prob)
+        return SessionBatchResult(
+            probability=prob,
+            risk_band=band,
+            label=band,
             reasons=reasons,
-            average_text=avg_text,
+            labels=STATUS_LABELS,
+            reason_texts=REASON_TEXTS,
+            index=batch.index,
         )
-        
+
     def _get_risk_band_and_label(self, prob: float):
         """
-        확률 구간에 따라 라벨링
+        확률 구간에 따라 라벨링 (session_batch.RISK_BAND_EDGES)
         - 0.60 이상: 높음
         - 0.30 ~ 0.60: 보통
         - 0.30 미만: 낮음
         """
-        if prob >= 0.60:
-            return "high", "구매 가능성 높음"
-        elif prob >= 0.30:
-            return "medium", "구매 가능성 보통"
-        else:
-            return "low", "구매 가능성 낮음"
+        code = int(risk_band_codes(np.asarray([prob]))[0])
+        return RISK_BANDS[code], STATUS_LABELS[code]
     
     def _build_compare_text(self, prob: float, avg_prob: float) -> str:
         """
@@ -97,48 +303,7 @@ class SessionProbabilityService:
             f"{diff_abs:.1f}%p {direction}."
         )
 
-    def _build_explanation(
-        self,
-        row: pd.Series,
-        prob: float,
-        avg_prob: float,
-    ):
-        reasons: List[str] = []
-
-        product_related = row.get("ProductRelated", None)
-        if product_related is not None:
-            if product_related >= 20:
-                reasons.append("상품 페이지를 많이 조회하고 있어 관심도가 높습니다.")
-            elif product_related <= 3:
-                reasons.append("상품 페이지 조회 수가 적어 아직 탐색 단계일 가능성이 있습니다.")
-
-        page_values = row.get("PageValues", None)
-        if page_values is not None:
-            if page_values >= 50:
-                reasons.append("이미 장바구니/결제 단계 등 높은 가치 페이지에 도달했습니다.")
-            elif page_values == 0:
-                reasons.append("아직 구매 여정의 앞단에 있어 구체적인 구매 신호가 약합니다.")
-
-        exit_rates = row.get("ExitRates", None)
-        if exit_rates is not None:
-            if exit_rates <= 0.2:
-                reasons.append("세션 종료 비율이 낮아 이탈 위험이 비교적 적습니다.")
-            elif exit_rates >= 0.5:
-                reasons.append("세션 종료 비율이 높아 이탈 가능성이 큽니다.")
-
-        visitor_type = row.get("VisitorType", None)
-        if visitor_type == "Returning_Visitor":
-            reasons.append("재방문 고객으로, 사이트 경험이 있어 구매 가능성이 더 높습니다.")
-        elif visitor_type == "New_Visitor":
-            reasons.append("신규 방문자로, 아직 사이트에 익숙하지 않아 구매까지 시간이 걸릴 수 있습니다.")
-
-        weekend = row.get("Weekend", None)
-        if isinstance(weekend, (bool, int)):
-            if bool(weekend):
-                reasons.append("주말 방문 세션으로, 여유 있는 쇼핑 가능성이 있습니다.")
-            else:
-                reasons.append("평일 방문 세션으로, 짧은 탐색 후 이탈할 수도 있습니다.")
-                
+    def _build_average_text(self, prob: float, avg_prob: float) -> str:
         diff_pp = (prob - avg_prob) * 100
         if diff_pp >= 10:
             avg_text = f"이 세션의 구매 확률은 전체 평균보다 약 {diff_pp:.1f}%p 높습니다."
@@ -147,7 +312,7 @@ class SessionProbabilityService:
         else:
             avg_text = "이 세션의 구매 확률은 전체 평균과 비슷한 수준입니다."
 
-        return reasons, avg_text
+        return avg_text
 
     def get_training_data(self) -> pd.DataFrame:
         """
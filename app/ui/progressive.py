@@ -0,0 +1,106 @@
+"""
+predict_progressive를 백그라운드 스레드에서 돌리고, fragment가 최신 추정치로 같은 자리를 갱신한다.
+
+- 스크립트(rerun)는 첫 추정치만 기다렸다가 바로 끝난다. → 슬라이더 조작이 막히지 않음
+- 입력이 바뀌면 이전 계산은 다음 추정치 사이에서 중단된다.
+- exact 결과가 나오면 전체 rerun 한 번으로 polling을 멈춘다.
+  (rerun 사이에 입력이 그대로여야 하므로 페이지의 샘플은 session_state에 고정해 둘 것)
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+import pandas as pd
+import streamlit as st
+
+from adapters.forest_engine import AnytimeEstimate
+
+POLL_INTERVAL = 0.25  # 초
+FIRST_ESTIMATE_TIMEOUT = 5.0  # 초
+
+
+class ProgressiveJob:
+    """추정치 iterator를 스레드에서 끝까지 소비하고 마지막 값만 보관"""
+
+    def __init__(self, inputs: Hashable, estimates: Iterator[AnytimeEstimate]):
+        self.inputs = inputs
+        self._estimates = estimates
+        self._latest: Optional[AnytimeEstimate] = None
+        self._error: Optional[BaseException] = None
+        self._cancelled = threading.Event()
+        self._updated = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="progressive-estimate", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            for estimate in self._estimates:
+                with self._updated:
+                    self._latest = estimate
+                    self._updated.notify_all()
+                if self._cancelled.is_set():
+                    break
+        except BaseException as e:  # 스크립트 스레드에서 다시 raise
+            with self._updated:
+                self._error = e
+                self._updated.notify_all()
+        finally:
+            close = getattr(self._estimates, "close", None)
+            if close is not None:
+                close()
+
+    @property
+    def done(self) -> bool:
+        latest = self._latest
+        return self._error is not None or (latest is not None and latest.exact)
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def latest(self, timeout: Optional[float] = None) -> Optional[AnytimeEstimate]:
+        """지금까지의 마지막 추정치. 아직 없으면 timeout까지 첫 추정치를 기다린다."""
+        with self._updated:
+            if self._latest is None and self._error is None:
+                self._updated.wait_for(lambda: self._latest is not None or self._error is not None, timeout)
+            if self._error is not None:
+                raise self._error
+            return self._latest
+
+
+def inputs_key(frame: pd.DataFrame) -> Hashable:
+    return tuple(frame.columns), pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes()
+
+
+def render_progressive(
+    key: str,
+    frame: pd.DataFrame,
+    estimates: Callable[[pd.DataFrame], Iterator[AnytimeEstimate]],
+    render: Callable[[AnytimeEstimate], Any],
+) -> None:
+    """estimates(frame)의 추정치를 background에서 계산하면서 render(estimate)로 그린다. (key: 페이지 내 자리 이름)"""
+    state_key = f"_progressive_{key}"
+    wanted = inputs_key(frame)
+    job: Optional[ProgressiveJob] = st.session_state.get(state_key)
+    if job is None or job.inputs != wanted:
+        if job is not None:
+            job.cancel()
+        job = ProgressiveJob(wanted, estimates(frame.copy()))
+        st.session_state[state_key] = job
+
+    # 첫 추정치(캐시 hit이면 exact)를 기다린 뒤에 polling 여부를 정한다.
+    job.latest(timeout=FIRST_ESTIMATE_TIMEOUT)
+    polling = not job.done
+
+    @st.fragment(run_every=POLL_INTERVAL if polling else None)
+    def _show() -> None:
+        estimate = job.latest(timeout=FIRST_ESTIMATE_TIMEOUT)
+        if estimate is None:
+            st.caption("⏳ 계산 중")
+            return
+        render(estimate)
+        if polling and estimate.exact and st.session_state.get(state_key) is job:
+            st.rerun()
+
+    _show()
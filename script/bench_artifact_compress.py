@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark joblib compress settings for a model artifact.
+
+Input:
+  - app/artifacts/best_pr_auc_balancedrf.joblib (압축 여부 무관)
+
+Output (codec/level 별):
+  - file size (MB)
+  - dump time (s)
+  - cold load: 새 프로세스 + (가능하면) page cache에서 파일을 내린 뒤 joblib.load
+  - warm load: 같은 프로세스에서 한 번 더 joblib.load
+  - peak RSS 증가량 (MB): 새 프로세스에서 import 이후 대비 load 중 최대 RSS
+
+Notes:
+  - lz4 / zstd는 패키지가 설치되어 있고 joblib이 지원할 때만 측정한다.
+  - page cache 비우기는 posix_fadvise(DONTNEED) 기반이라 환경에 따라 완전하지 않을 수 있다.
+  - BuildBestPRAUCBalancedrf.py의 --compress 기본값은 이 스크립트의 결과로 정한다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+
+# (라벨, joblib compress 값)
+CANDIDATES = [
+    ("none", 0),
+    ("zlib:1", ("zlib", 1)),
+    ("zlib:3", ("zlib", 3)),
+    ("zlib:6", ("zlib", 6)),
+    ("gzip:3", ("gzip", 3)),
+    ("bz2:3", ("bz2", 3)),
+    ("xz:1", ("xz", 1)),
+    ("xz:3", ("xz", 3)),
+    ("lz4:1", ("lz4", 1)),
+    ("lz4:3", ("lz4", 3)),
+    ("zstd:3", ("zstd", 3)),
+]
+
+# 새 프로세스에서 실행: import 이후 RSS 기준으로 cold/warm load 측정
+_CHILD = r"""
+import json, os, resource, sys, time
+import joblib, numpy, sklearn, imblearn  # import 비용은 측정에서 제외
+
+path = sys.argv[1]
+sys.path.insert(0, sys.argv[2])
+
+def rss_mb():
+    # ru_maxrss는 fork한 부모(이미 artifact를 들고 있음)의 값을 exec 후에도 이어받으므로
+    # Linux에서는 주소 공간별 최대값인 VmHWM을 우선 사용한다. (둘 다 KB 단위)
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+try:
+    fd = os.open(path, os.O_RDONLY)
+    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    os.close(fd)
+    cache_dropped = True
+except (AttributeError, OSError):
+    cache_dropped = False
+
+base = rss_mb()
+t = time.perf_counter()
+obj = joblib.load(path)
+cold = time.perf_counter() - t
+peak = rss_mb() - base
+
+del obj
+t = time.perf_counter()
+obj = joblib.load(path)
+warm = time.perf_counter() - t
+
+print(json.dumps({"cold_s": cold, "warm_s": warm, "peak_rss_mb": peak, "cache_dropped": cache_dropped}))
+"""
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark joblib compress settings for an artifact.")
+    default_artifact = APP_DIR / "artifacts" / "best_pr_auc_balancedrf.joblib"
+
+    p.add_argument("--artifact", type=str, default=str(default_artifact), help="Path to joblib artifact")
+    p.add_argument(
+        "--codecs",
+        type=str,
+        default=None,
+        help="Comma separated labels to run (default: all available), e.g. 'none,zlib:3,xz:3'",
+    )
+    p.add_argument("--repeat", type=int, default=1, help="Cold-load repetitions per codec (median)")
+    p.add_argument("--workdir", type=str, default=None, help="Where to write temporary artifacts")
+    p.add_argument("--json", type=str, default=None, help="Optional path to save results as JSON")
+    return p.parse_args()
+
+
+def codec_available(compress: Any) -> bool:
+    """joblib이 해당 codec을 지원하고 필요한 패키지가 설치되어 있는지"""
+    if compress == 0:
+        return True
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            joblib.dump([0], Path(tmp) / "probe.joblib", compress=compress)
+        except (ValueError, ImportError, RuntimeError):
+            return False
+    return True
+
+
+def measure_load(path: Path, repeat: int) -> Dict[str, Any]:
+    runs: List[Dict[str, Any]] = []
+    for _ in range(max(1, repeat)):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD, str(path), str(APP_DIR)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    runs.sort(key=lambda r: r["cold_s"])
+    return runs[len(runs) // 2]
+
+
+def main() -> None:
+    args = parse_args()
+    src = Path(args.artifact)
+    if not src.exists():
+        raise FileNotFoundError(f"Artifact not found: {src}")
+
+    wanted: Optional[set] = set(args.codecs.split(",")) if args.codecs else None
+    obj = joblib.load(src)
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(dir=args.workdir) as tmp:
+        for label, compress in CANDIDATES:
+            if wanted is not None and label not in wanted:
+                continue
+            if not codec_available(compress):
+                print(f"- {label:<7} skipped (codec not available)")
+                continue
+
+            path = Path(tmp) / f"artifact.{label.replace(':', '_')}.joblib"
+            t = time.perf_counter()
+            joblib.dump(obj, path, compress=compress)
+            dump_s = time.perf_counter() - t
+
+            row = {
+                "compress": label,
+                "size_mb": path.stat().st_size / (1024 * 1024),
+                "dump_s": dump_s,
+                **measure_load(path, args.repeat),
+            }
+            results.append(row)
+            print(
+                f"- {label:<7} size={row['size_mb']:8.2f}MB  dump={row['dump_s']:6.2f}s  "
+                f"cold={row['cold_s']:6.3f}s  warm={row['warm_s']:6.3f}s  "
+                f"peakRSS=+{row['peak_rss_mb']:.1f}MB"
+            )
+            path.unlink()
+
+    if not results:
+        raise SystemExit("No codec could be measured.")
+
+    print("\n[Summary] sorted by cold load time")
+    for row in sorted(results, key=lambda r: r["cold_s"]):
+        print(f"  {row['compress']:<7} cold={row['cold_s']:.3f}s  size={row['size_mb']:.2f}MB")
+    if not all(r["cache_dropped"] for r in results):
+        print("  (page cache could not be dropped: cold numbers include a warm page cache)")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nSaved results to: {Path(args.json).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark inference thread count vs batch size (sklearn / compiled engine).
+
+Input:
+  - app/artifacts/best_pr_auc_balancedrf.joblib
+  - data/processed/test.csv (배치 크기만큼 row를 반복해서 채움)
+
+Output (engine / batch size / n_jobs 별):
+  - 배치당 채점 시간 (ms, median)
+  - row당 시간 (us)
+  - engine별 crossover: 병렬(n_jobs>1)이 단일 스레드보다 --margin 이상 빨라지는 가장 작은 배치
+
+Notes:
+  - artifact에 저장된 n_jobs=-1은 ModelRegistry 로드 시 None으로 바뀌고,
+    여기서는 inference_scope(n_jobs=...)로 스레드 수를 고정해서 측정한다.
+  - adapters/inference_policy.py의 DEFAULT_MIN_PARALLEL_ROWS는 이 스크립트의 crossover로 정한다.
+    (서버마다 다르면 INFERENCE_PARALLEL_MIN_ROWS / INFERENCE_MAX_THREADS 환경변수로 조정)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.forest_engine import compile_pipeline  # noqa: E402
+from adapters.inference_policy import get_policy, inference_scope, map_row_chunks  # noqa: E402
+from adapters.model_loader import JoblibArtifactLoader  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark inference parallelism vs batch size.")
+    default_artifact = APP_DIR / "artifacts" / "best_pr_auc_balancedrf.joblib"
+    default_data = ROOT / "data" / "processed" / "test.csv"
+    cpu = os.cpu_count() or 1
+
+    p.add_argument("--artifact", type=str, default=str(default_artifact), help="Path to joblib artifact")
+    p.add_argument("--data", type=str, default=str(default_data), help="Path to csv to score")
+    p.add_argument("--target", type=str, default="Revenue", help="Target column name (dropped)")
+    p.add_argument("--batches", type=str, default="1,16,128,512,2048,8192,32768", help="Comma separated batch sizes")
+    p.add_argument(
+        "--threads",
+        type=str,
+        default=",".join(str(n) for n in sorted({1, 2, 4, cpu}) if n <= cpu),
+        help="Comma separated thread counts",
+    )
+    p.add_argument("--engines", type=str, default="sklearn,compiled", help="sklearn / compiled")
+    p.add_argument("--repeat", type=int, default=5, help="Repetitions per cell (median)")
+    p.add_argument("--margin", type=float, default=0.1, help="Required speed-up to count as crossover")
+    p.add_argument("--json", type=str, default=None, help="Optional path to save results as JSON")
+    return p.parse_args()
+
+
+def make_batch(features: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+    reps = -(-n_rows // len(features))
+    return pd.concat([features] * reps, ignore_index=True).iloc[:n_rows]
+
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    fn()  # 첫 호출(스레드 풀 기동 등)은 제외
+    times = []
+    for _ in range(max(1, repeat)):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000.0)
+    return float(np.median(times))
+
+
+def crossover(rows: List[Dict[str, Any]], engine: str, margin: float) -> Optional[int]:
+    """병렬이 단일 스레드보다 margin 이상 빠른 가장 작은 배치 크기"""
+    by_batch: Dict[int, Dict[int, float]] = {}
+    for r in rows:
+        if r["engine"] == engine:
+            by_batch.setdefault(r["batch"], {})[r["n_jobs"]] = r["ms"]
+    for batch in sorted(by_batch):
+        cells = by_batch[batch]
+        single = cells.get(1)
+        best = min((ms for n, ms in cells.items() if n > 1), default=None)
+        if single is not None and best is not None and best < single * (1.0 - margin):
+            return batch
+    return None
+
+
+def main() -> None:
+    args = parse_args()
+    batches = [int(b) for b in args.batches.split(",")]
+    threads = [int(n) for n in args.threads.split(",")]
+    engines = [e.strip() for e in args.engines.split(",")]
+
+    artifact = JoblibArtifactLoader(args.artifact).load()
+    pipeline = artifact.pipeline
+    compiled = compile_pipeline(pipeline, forest=artifact.forest)
+    forest = compiled.forest
+    features = pd.read_csv(args.data).drop(columns=[args.target], errors="ignore")
+
+    print(f"cpu={os.cpu_count()}  policy={get_policy()}  trees={forest.n_trees}")
+    rows: List[Dict[str, Any]] = []
+    for batch in batches:
+        X = make_batch(features, batch)
+        Xt = compiled.transform(X)
+        for engine in engines:
+            for n_jobs in threads:
+                if engine == "sklearn":
+                    def run() -> Any:
+                        with inference_scope(batch, n_jobs=n_jobs):
+                            return pipeline.predict_proba(X)
+                else:
+                    def run() -> Any:
+                        return map_row_chunks(lambda c: forest.value.take(forest.apply(c)), Xt, n_jobs=n_jobs)
+
+                ms = median_ms(run, args.repeat)
+                rows.append({"engine": engine, "batch": batch, "n_jobs": n_jobs, "ms": ms})
+                print(
+                    f"- {engine:<8} batch={batch:>6}  n_jobs={n_jobs:>2}  "
+                    f"{ms:9.2f}ms  {ms * 1000.0 / batch:9.2f}us/row"
+                )
+
+    print("\n[Crossover] smallest batch where n_jobs>1 beats single-threaded")
+    for engine in engines:
+        point = crossover(rows, engine, args.margin)
+        print(f"  {engine:<8} {point if point is not None else 'none (single-threaded is best)'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        print(f"\nSaved results to: {Path(args.json).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
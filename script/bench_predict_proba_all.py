@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark PurchaseModelAdapter.predict_proba_all vs strategy별 predict_proba 호출.
+
+Input:
+  - app/artifacts/best_balancedrf_pipeline.joblib (roc_auc)
+  - app/artifacts/best_pr_auc_balancedrf.joblib (pr_auc)
+  - data/processed/test.csv (배치 크기만큼 row를 반복해서 채움)
+
+Output (배치 크기별):
+  - predict_proba_all 한 번 / strategy별 predict_proba 합 (ms, median)
+  - 두 결과의 최대 절대 오차
+
+Notes:
+  - PredictionCache는 끄고 측정한다. (PREDICTION_CACHE_SIZE=0)
+  - predict_proba_all은 인코딩 행렬을 모델끼리 공유하고, forest.batch_row_limit을 넘는 배치는
+    원본 sklearn forest로 채점한다. (adapters.forest_engine.COMPILED_MAX_STEPS)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.prediction_cache import SIZE_ENV_VAR  # noqa: E402
+from adapters.purchase_model_adapter import (  # noqa: E402
+    MODEL_STRATEGIES,
+    PurchaseModelAdapter,
+    PurchaseModelAdapterConfig,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Benchmark predict_proba_all vs per-strategy predict_proba.")
+    artifact_dir = APP_DIR / "artifacts"
+    default_data = ROOT / "data" / "processed" / "test.csv"
+
+    p.add_argument("--roc-artifact", type=str, default=str(artifact_dir / "best_balancedrf_pipeline.joblib"))
+    p.add_argument("--pr-artifact", type=str, default=str(artifact_dir / "best_pr_auc_balancedrf.joblib"))
+    p.add_argument("--data", type=str, default=str(default_data), help="Path to csv to score")
+    p.add_argument("--target", type=str, default="Revenue", help="Target column name (dropped)")
+    p.add_argument("--batches", type=str, default="1,16,128,1024,9864", help="Comma separated batch sizes")
+    p.add_argument("--repeat", type=int, default=3, help="Repetitions per cell (median)")
+    p.add_argument("--json", type=str, default=None, help="Optional path to save results as JSON")
+    return p.parse_args()
+
+
+def make_batch(features: pd.DataFrame, n_rows: int) -> pd.DataFrame:
+    reps = -(-n_rows // len(features))
+    return pd.concat([features] * reps, ignore_index=True).iloc[:n_rows]
+
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    fn()  # 첫 호출(모델 로드 / 컴파일)은 제외
+    times = []
+    for _ in range(max(1, repeat)):
+        t = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t) * 1000.0)
+    return float(np.median(times))
+
+
+def main() -> None:
+    args = parse_args()
+    os.environ[SIZE_ENV_VAR] = "0"
+
+    config = PurchaseModelAdapterConfig(
+        root_dir=ROOT,
+        app_dir=APP_DIR,
+        roc_auc_model_path=Path(args.roc_artifact),
+        pr_auc_model_path=Path(args.pr_artifact),
+    )
+    adapter = PurchaseModelAdapter(config)
+    features = pd.read_csv(args.data).drop(columns=[args.target], errors="ignore")
+
+    rows: List[Dict[str, Any]] = []
+    for batch in [int(b) for b in args.batches.split(",")]:
+        X = make_batch(features, batch)
+
+        def separate() -> np.ndarray:
+            return np.vstack([adapter.predict_proba(X, strategy=s)[:, 1] for s in MODEL_STRATEGIES])
+
+        all_ms = median_ms(lambda: adapter.predict_proba_all(X), args.repeat)
+        separate_ms = median_ms(separate, args.repeat)
+        diff = float(np.max(np.abs(adapter.predict_proba_all(X).to_numpy() - separate())))
+        rows.append({"batch": batch, "all_ms": all_ms, "separate_ms": separate_ms, "max_abs_diff": diff})
+        print(
+            f"- batch={batch:>6}  predict_proba_all {all_ms:9.2f}ms  "
+            f"separate {separate_ms:9.2f}ms  x{separate_ms / all_ms:5.2f}  max|diff|={diff:.2e}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        print(f"\nSaved results to: {Path(args.json).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parity check: sklearn predict_proba vs compiled NumPy forest engine.
+
+Input:
+  - app/artifacts/best_pr_auc_balancedrf.joblib
+  - data/processed/test.csv
+
+Output:
+  - max |p_sklearn - p_compiled|, 각 엔진의 채점 시간
+  - 허용 오차(--atol)를 넘으면 exit code 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.model_loader import JoblibArtifactLoader  # noqa: E402
+from adapters.forest_engine import compile_pipeline, max_abs_diff  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Check compiled forest engine parity against sklearn.")
+    default_artifact = APP_DIR / "artifacts" / "best_pr_auc_balancedrf.joblib"
+    default_data = ROOT / "data" / "processed" / "test.csv"
+
+    p.add_argument("--artifact", type=str, default=str(default_artifact), help="Path to joblib artifact")
+    p.add_argument("--data", type=str, default=str(default_data), help="Path to csv to score")
+    p.add_argument("--target", type=str, default="Revenue", help="Target column name (dropped)")
+    p.add_argument("--atol", type=float, default=1e-9, help="Allowed max absolute difference")
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    artifact = JoblibArtifactLoader(args.artifact).load()
+    features = pd.read_csv(args.data).drop(columns=[args.target], errors="ignore")
+
+    t0 = time.perf_counter()
+    compiled = compile_pipeline(artifact.pipeline)
+    compile_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    artifact.pipeline.predict_proba(features)
+    sklearn_sec = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    compiled.predict_proba(features)
+    compiled_sec = time.perf_counter() - t0
+
+    diff = max_abs_diff(artifact.pipeline, compiled, features)
+
+    print(f"rows            : {len(features)}")
+    print(f"trees / nodes   : {compiled.forest.n_trees} / {compiled.forest.n_nodes}")
+    print(f"compile (sec)   : {compile_sec:.4f}")
+    print(f"sklearn (sec)   : {sklearn_sec:.4f}")
+    print(f"compiled (sec)  : {compiled_sec:.4f}")
+    print(f"max abs diff    : {diff:.3e} (atol={args.atol:.1e})")
+
+    if diff > args.atol:
+        print("❌ parity check FAILED")
+        sys.exit(1)
+    print("✅ parity check passed")
+
+
+if __name__ == "__main__":
+    main()
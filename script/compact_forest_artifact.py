@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compact a trained forest artifact for deployment (학습 후 실행).
+
+Input:
+  - app/artifacts/best_balancedrf_pipeline.joblib (또는 PR-AUC artifact / mmap / split 디렉토리)
+  - data/processed/calib.csv (지표 비교 / 트리 제거 판단용)
+  - data/processed/test.csv  (held-out 지표: 트리 제거는 calib에 맞춰 고르므로 calib 지표는 낙관적)
+
+Steps:
+  1) 같은 leaf 값을 가진 subtree를 하나의 leaf로 합침 (--collapse_tol 0이면 예측 불변)
+  2) (옵션) --drop_tol: calib PR-AUC 하락이 허용치 이하인 범위에서 트리 제거
+     (sklearn pipeline의 estimators_도 같이 줄여서 두 경로가 같은 트리를 쓰도록)
+  3) CompiledForest 저장: 임계값 float32(판정 불변 내림), leaf 값 float32, index int32
+
+Output:
+  - <artifact stem>.compact.<layout>/ (mmap 또는 split 레이아웃)
+  - <out>/compaction_report.json: 크기, 노드 수, 지연시간, 지표 변화
+
+서빙 쪽에서는 출력 디렉토리를 그대로 model path로 사용한다. (mmap_mode="r" 권장)
+
+compaction은 CompiledForest(forest/*.npy)에만 적용된다.
+artifact.joblib의 sklearn pipeline은 float64 트리를 그대로 담고 있고 (--drop_tol로 뺀 트리만 제거),
+큰 배치(forest.batch_row_limit 초과) 채점과 named_steps를 쓰는 화면(SHAP 등)은 이 sklearn forest를 쓴다.
+그래서 artifact 전체 크기는 forest 배열 크기만큼만 줄어든다. (report의 size_mb / serving 참고)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+from sklearn.metrics import average_precision_score, roc_auc_score
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.artifact_store import (  # noqa: E402
+    COMPILED_FOREST_KEY,
+    load_raw_artifact,
+    save_mmap_artifact,
+    save_split_artifact,
+)
+from adapters.forest_compaction import compact_forest, drop_estimators, select_trees  # noqa: E402
+from adapters.forest_engine import CompiledPipeline, compile_pipeline  # noqa: E402
+
+REPORT_FILE = "compaction_report.json"
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Compact a forest artifact (collapse / float32 / tree drop).")
+    default_artifact = APP_DIR / "artifacts" / "best_balancedrf_pipeline.joblib"
+    default_calib = ROOT / "data" / "processed" / "calib.csv"
+    default_holdout = ROOT / "data" / "processed" / "test.csv"
+
+    p.add_argument("--artifact", type=str, default=str(default_artifact), help="Path to artifact")
+    p.add_argument("--calib", type=str, default=str(default_calib), help="Calibration csv for metric deltas")
+    p.add_argument("--holdout", type=str, default=str(default_holdout), help="Held-out csv for metric deltas")
+    p.add_argument("--target", type=str, default="Revenue", help="Target column name")
+    p.add_argument("--out", type=str, default=None, help="Output directory (default: <stem>.compact.<layout>)")
+    p.add_argument("--layout", type=str, default="mmap", choices=["mmap", "split"], help="Output layout")
+    p.add_argument(
+        "--collapse_tol",
+        type=float,
+        default=0.0,
+        help="Merge sibling leaves whose values differ by <= tol (0: exact, predictions unchanged)",
+    )
+    p.add_argument(
+        "--drop_tol",
+        type=float,
+        default=None,
+        help="Drop trees while calib PR-AUC drops by <= tol (default: keep all trees)",
+    )
+    p.add_argument("--min_trees", type=int, default=50, help="Never keep fewer trees than this")
+    p.add_argument("--no_float32", action="store_true", help="Keep float64 thresholds / leaf values")
+    p.add_argument("--repeat", type=int, default=3, help="Latency repetitions (median)")
+    return p.parse_args()
+
+
+def median_sec(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(max(1, repeat)):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return float(np.median(times))
+
+
+def dir_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+def metrics(y: np.ndarray, proba: np.ndarray) -> Dict[str, float]:
+    return {"pr_auc": float(average_precision_score(y, proba)), "roc_auc": float(roc_auc_score(y, proba))}
+
+
+def main() -> None:
+    args = parse_args()
+    src = Path(args.artifact)
+    suffix = f".compact.{args.layout}"
+    out = Path(args.out) if args.out else src.with_name(src.name.split(".")[0] + suffix)
+
+    loaded = load_raw_artifact(src)
+    if "pipeline" not in loaded:
+        raise SystemExit(f"Invalid artifact format (expected 'pipeline'): {src}")
+    # split artifact도 여기서 모든 컴포넌트를 읽어 dict로 만든다.
+    raw: Dict[str, Any] = {k: loaded[k] for k in loaded}
+    pipeline = raw["pipeline"]
+
+    calib = pd.read_csv(args.calib)
+    y = calib[args.target].to_numpy()
+    X = calib.drop(columns=[args.target])
+
+    holdout = pd.read_csv(args.holdout)
+    y_hold = holdout[args.target].to_numpy()
+    X_hold = holdout.drop(columns=[args.target])
+
+    before: CompiledPipeline = compile_pipeline(pipeline, forest=raw.get(COMPILED_FOREST_KEY))
+    hold_before = metrics(y_hold, before.predict_proba(X_hold)[:, 1])
+    Xt = before.transform(X)
+    tree_proba = before.forest.predict_tree_proba(Xt)
+    proba_before = before.calibrate(tree_proba.mean(axis=1, dtype=np.float64))
+    sklearn_sec_before = median_sec(lambda: pipeline.predict_proba(X), args.repeat)
+    compiled_sec_before = median_sec(lambda: before.predict_proba(X), args.repeat)
+    pickle_before = len(pickle.dumps(pipeline, protocol=pickle.HIGHEST_PROTOCOL))
+
+    # 1) 트리 선택 (옵션)
+    keep_trees = None
+    if args.drop_tol is not None:
+        t = time.perf_counter()
+        keep_trees = select_trees(
+            tree_proba, y, average_precision_score, tol=args.drop_tol,
+            min_trees=args.min_trees, calibrate=before.calibrate,
+        )
+        print(f"tree selection: kept {len(keep_trees)}/{before.forest.n_trees} ({time.perf_counter() - t:.1f}s)")
+
+    # 2) collapse + float32
+    compact, stats = compact_forest(
+        before.forest, keep_trees=keep_trees, collapse_tol=args.collapse_tol, float32=not args.no_float32,
+    )
+    if keep_trees is not None:
+        drop_estimators(pipeline, keep_trees)
+    after = CompiledPipeline(
+        preprocess=before.preprocess, forest=compact, calibration=before.calibration, fused=before.fused
+    )
+
+    proba_after = after.predict_proba(X)[:, 1]
+    proba_sklearn_after = pipeline.predict_proba(X)[:, 1]
+    sklearn_sec_after = median_sec(lambda: pipeline.predict_proba(X), args.repeat)
+    compiled_sec_after = median_sec(lambda: after.predict_proba(X), args.repeat)
+    pickle_after = len(pickle.dumps(pipeline, protocol=pickle.HIGHEST_PROTOCOL))
+
+    m_before, m_after = metrics(y, proba_before), metrics(y, proba_after)
+    hold_after = metrics(y_hold, after.predict_proba(X_hold)[:, 1])
+    report: Dict[str, Any] = {
+        "source": str(src.resolve()),
+        "output": str(out.resolve()),
+        "serving": {
+            "compact_forest": "compiled engine (forest/*.npy): single rows and batches up to forest.batch_row_limit",
+            "sklearn_forest": "artifact.joblib keeps the full float64 sklearn forest (dropped trees removed): "
+                              "larger batches and named_steps consumers (SHAP) use it",
+        },
+        "options": {
+            "collapse_tol": args.collapse_tol,
+            "drop_tol": args.drop_tol,
+            "min_trees": args.min_trees,
+            "float32": not args.no_float32,
+        },
+        "trees": {"before": stats.n_trees_before, "after": stats.n_trees_after},
+        "nodes": {"before": stats.n_nodes_before, "after": stats.n_nodes_after, "collapsed": stats.collapsed_nodes},
+        "size_mb": {
+            "forest_arrays_before": stats.bytes_before / 2**20,
+            "forest_arrays_after": stats.bytes_after / 2**20,
+            "sklearn_pipeline_before": pickle_before / 2**20,
+            "sklearn_pipeline_after": pickle_after / 2**20,
+            "artifact_before": dir_size(src) / 2**20,
+        },
+        "latency_ms": {
+            "rows": int(len(X)),
+            "sklearn_before": sklearn_sec_before * 1000.0,
+            "sklearn_after": sklearn_sec_after * 1000.0,
+            "compiled_before": compiled_sec_before * 1000.0,
+            "compiled_after": compiled_sec_after * 1000.0,
+        },
+        "metrics": {
+            "before": m_before,
+            "after": m_after,
+            "delta": {k: m_after[k] - m_before[k] for k in m_before},
+            "max_abs_proba_diff": float(np.max(np.abs(proba_after - proba_before))),
+            "max_abs_diff_sklearn_vs_compiled_after": float(np.max(np.abs(proba_sklearn_after - proba_after))),
+            "holdout_before": hold_before,
+            "holdout_after": hold_after,
+            "holdout_delta": {k: hold_after[k] - hold_before[k] for k in hold_before},
+        },
+    }
+
+    # 3) 저장 (compact forest를 그대로 forest/*.npy로)
+    raw[COMPILED_FOREST_KEY] = compact
+    raw["compaction"] = {
+        "trees": report["trees"], "nodes": report["nodes"], "metrics_delta": report["metrics"]["delta"],
+        "holdout_delta": report["metrics"]["holdout_delta"],
+        "options": report["options"],
+    }
+    if args.layout == "split":
+        save_split_artifact(raw, out)
+    else:
+        save_mmap_artifact(raw, out)
+
+    t = time.perf_counter()
+    reopened = load_raw_artifact(out, mmap_mode="r")
+    _ = reopened["pipeline"]
+    report["load_sec_mmap"] = time.perf_counter() - t
+    report["size_mb"]["artifact_after"] = dir_size(out) / 2**20
+    (out / REPORT_FILE).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    print(f"Saved compacted artifact to: {out.resolve()}")
+    print(f"trees   : {stats.n_trees_before} -> {stats.n_trees_after}")
+    print(f"nodes   : {stats.n_nodes_before} -> {stats.n_nodes_after} (collapsed {stats.collapsed_nodes})")
+    print(f"arrays  : {stats.bytes_before / 2**20:.2f}MB -> {stats.bytes_after / 2**20:.2f}MB")
+    print(f"sklearn : {pickle_before / 2**20:.2f}MB -> {pickle_after / 2**20:.2f}MB "
+          "(pickled pipeline; full float64 trees, only --drop_tol shrinks it)")
+    lat = report["latency_ms"]
+    print(f"latency : sklearn {lat['sklearn_before']:.1f} -> {lat['sklearn_after']:.1f}ms, "
+          f"compiled {lat['compiled_before']:.1f} -> {lat['compiled_after']:.1f}ms ({lat['rows']} rows)")
+    delta = report["metrics"]["delta"]
+    print(f"metrics : PR-AUC {m_after['pr_auc']:.4f} ({delta['pr_auc']:+.5f}), "
+          f"ROC-AUC {m_after['roc_auc']:.4f} ({delta['roc_auc']:+.5f}), "
+          f"max |dp| {report['metrics']['max_abs_proba_diff']:.2e}  [calib]")
+    hold = report["metrics"]["holdout_delta"]
+    print(f"holdout : PR-AUC {hold_after['pr_auc']:.4f} ({hold['pr_auc']:+.5f}), "
+          f"ROC-AUC {hold_after['roc_auc']:.4f} ({hold['roc_auc']:+.5f})")
+    print(f"report  : {(out / REPORT_FILE).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Distill the calibrated PR-AUC BalancedRF (teacher) into a cheap serving model (student).
+
+Input:
+  - app/artifacts/best_pr_auc_balancedrf.joblib (teacher, 또는 mmap / split 디렉토리)
+  - data/processed/train.csv (student 학습: train + 합성 샘플, label = teacher 확률)
+  - data/processed/calib.csv, data/processed/test.csv (fidelity 리포트)
+
+Output:
+  - app/artifacts/distilled_pr_auc_student.joblib
+      teacher와 같은 artifact 형식 (pipeline / best_threshold_f2_on_calib / num_cols / cat_cols)
+      + distillation: fidelity 리포트 (max/mean 확률 오차, threshold 판정 일치율, PR-AUC delta, 지연시간)
+  - <out>.report.json: 같은 리포트
+
+서빙: SERVE_DISTILLED_STUDENT=1 이면 PurchaseModelAdapterConfig.from_default_layout()이
+pr_auc 전략에 student를 사용한다. (teacher는 오프라인 채점 / 분석 페이지용으로 유지)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.artifact_store import load_raw_artifact  # noqa: E402
+from adapters.distillation import DistillationConfig, build_student_artifact  # noqa: E402
+
+DEFAULT_COMPRESS = "zlib:3"
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Distill the PR-AUC BalancedRF artifact into a small student model.")
+    data_dir = ROOT / "data" / "processed"
+    artifact_dir = APP_DIR / "artifacts"
+
+    p.add_argument("--teacher", type=str, default=str(artifact_dir / "best_pr_auc_balancedrf.joblib"))
+    p.add_argument("--train", type=str, default=str(data_dir / "train.csv"))
+    p.add_argument("--calib", type=str, default=str(data_dir / "calib.csv"))
+    p.add_argument("--test", type=str, default=str(data_dir / "test.csv"))
+    p.add_argument("--target", type=str, default="Revenue", help="Target column name")
+    p.add_argument("--out", type=str, default=str(artifact_dir / "distilled_pr_auc_student.joblib"))
+    p.add_argument("--augment_factor", type=float, default=2.0, help="Synthetic rows per train row")
+    p.add_argument("--swap_prob", type=float, default=0.3, help="Per-column swap probability for synthetic rows")
+    p.add_argument("--max_iter", type=int, default=None, help="Student boosting iterations")
+    p.add_argument("--max_leaf_nodes", type=int, default=None, help="Student leaves per tree")
+    p.add_argument("--random_state", type=int, default=42, help="Random seed")
+    p.add_argument("--compress", type=str, default=DEFAULT_COMPRESS, help="joblib compress, e.g. 'zlib:3' or 'none'")
+    return p.parse_args()
+
+
+def parse_compress_arg(s: str):
+    s = (s or "").strip().lower()
+    if s in ("none", "0", "false", "off"):
+        return 0
+    if ":" in s:
+        method, lvl = s.split(":", 1)
+        return (method, int(lvl))
+    if s.isdigit():
+        return int(s)
+    return parse_compress_arg(DEFAULT_COMPRESS)
+
+
+def read_split(path: str, target: str):
+    df = pd.read_csv(path)
+    if target in df.columns:
+        return df.drop(columns=[target]), df[target].astype(int).to_numpy()
+    return df, None
+
+
+def main() -> None:
+    args = parse_args()
+    teacher_path = Path(args.teacher)
+    loaded = load_raw_artifact(teacher_path)
+    if "pipeline" not in loaded:
+        raise SystemExit(f"Invalid artifact format (expected 'pipeline'): {teacher_path}")
+    teacher_artifact = {k: loaded[k] for k in loaded}
+
+    X_train, _ = read_split(args.train, args.target)
+    eval_sets = {}
+    for name, path in (("calib", args.calib), ("test", args.test)):
+        if Path(path).exists():
+            eval_sets[name] = read_split(path, args.target)
+
+    student_params = {}
+    if args.max_iter is not None:
+        student_params["max_iter"] = args.max_iter
+    if args.max_leaf_nodes is not None:
+        student_params["max_leaf_nodes"] = args.max_leaf_nodes
+    config = DistillationConfig(
+        augment_factor=args.augment_factor,
+        swap_prob=args.swap_prob,
+        student_params=student_params or None,
+        random_state=args.random_state,
+    )
+
+    artifact = build_student_artifact(
+        teacher_artifact, X_train, eval_sets, teacher_path=str(teacher_path.resolve()), config=config
+    )
+
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(artifact, out_path, compress=parse_compress_arg(args.compress))
+    report_path = out_path.with_suffix(".report.json")
+    summary = {k: v for k, v in artifact["distillation"].items() if k != "student_params"}
+    report_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+
+    print(f"Saved student artifact to: {out_path.resolve()}")
+    print(f"student : {summary['student']} (fit {summary['fit_sec']:.1f}s, {summary['train_rows']} train rows "
+          f"x{1 + args.augment_factor:g} with synthetic)")
+    for name, rep in summary["fidelity"].items():
+        line = (f"[{name}] |dp| max {rep['max_abs_error']:.4f} mean {rep['mean_abs_error']:.4f}, "
+                f"agreement@{rep['threshold']:.4f} {rep['agreement_at_threshold']:.4f}")
+        if "pr_auc_delta" in rep:
+            line += f", PR-AUC {rep['pr_auc_student']:.4f} ({rep['pr_auc_delta']:+.4f})"
+        print(line)
+        lat = rep["latency_ms"]
+        print(f"         single {lat['teacher_single']:.1f} -> {lat['student_single']:.1f}ms, "
+              f"batch({rep['rows']}) {lat['teacher_batch']:.1f} -> {lat['student_batch']:.1f}ms, "
+              f"size {rep['size_mb']['teacher']:.1f} -> {rep['size_mb']['student']:.2f}MB")
+    print(f"report  : {report_path.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
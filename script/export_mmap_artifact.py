@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Export a joblib artifact to a directory layout (mmap / split).
+
+Input:
+  - app/artifacts/best_pr_auc_balancedrf.joblib (압축 여부 무관)
+
+Output (--layout mmap, 기본값):
+  - app/artifacts/best_pr_auc_balancedrf.mmap/
+      ├ artifact.joblib   (압축 없음)
+      ├ serving.pkl       (전처리 / calibration 파라미터 / 메타)
+      └ forest/*.npy      (CompiledForest 노드 배열)
+
+Output (--layout split):
+  - app/artifacts/best_pr_auc_balancedrf.split/
+      ├ manifest.json     (threshold / 컬럼 / 지표 / 컴포넌트 해시)
+      ├ components/       (pipeline, base_pipeline ... 컴포넌트별 파일)
+      └ forest/*.npy
+
+mmap 레이아웃을 mmap_mode로 열면 워커는 serving.pkl + forest/*.npy(워커 간 공유)로 채점하고,
+sklearn pipeline은 큰 배치 / named_steps가 필요할 때만 워커마다 unpickle한다.
+워커당 메모리는 script/measure_worker_memory.py로 확인한다.
+(워커 간 모델 공유가 필요하면 MODEL_SHARED_MEMORY=1 + script/publish_shared_models.py)
+
+서빙 쪽에서는 JoblibArtifactLoader(path, mmap_mode="r") 또는
+PurchaseIntentPRAUCModelAdapter(path, mmap_mode="r")로 연다.
+메타만 필요하면 JoblibArtifactLoader(path).load_meta() (split 레이아웃은 manifest만 읽음).
+기본 경로(<stem>.split)로 export하면 .joblib 경로로 연 load_meta() / get_threshold()도
+.joblib이 그대로인 동안 이 manifest를 읽는다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.artifact_store import load_raw_artifact, save_mmap_artifact, save_split_artifact  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Export a joblib artifact to a directory layout (mmap / split).")
+    default_artifact = APP_DIR / "artifacts" / "best_pr_auc_balancedrf.joblib"
+
+    p.add_argument("--artifact", type=str, default=str(default_artifact), help="Path to joblib artifact")
+    p.add_argument(
+        "--out",
+        type=str,
+        default=None,
+        help="Output directory (default: <artifact stem>.<layout> next to the artifact)",
+    )
+    p.add_argument(
+        "--layout",
+        type=str,
+        default="mmap",
+        choices=["mmap", "split"],
+        help="mmap: single uncompressed pickle + forest blocks / split: manifest + per-component files",
+    )
+    return p.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    src = Path(args.artifact)
+    out = Path(args.out) if args.out else src.with_suffix(f".{args.layout}")
+
+    raw = load_raw_artifact(src)
+    if not isinstance(raw, dict) or "pipeline" not in raw:
+        raise SystemExit(f"Invalid artifact format (expected dict with 'pipeline'): {src}")
+
+    if args.layout == "split":
+        save_split_artifact(raw, out, source=src)
+    else:
+        save_mmap_artifact(raw, out)
+    print(f"Saved {args.layout} artifact to: {out.resolve()}")
+    for f in sorted(out.rglob("*")):
+        if f.is_file():
+            print(f"  {f.relative_to(out)}  {f.stat().st_size / (1024 * 1024):.2f} MB")
+
+    # 확인용: 파일만 열고 끝나는 비용 (page cache 상태에 따라 달라짐)
+    start = time.perf_counter()
+    load_raw_artifact(out, mmap_mode="r")
+    print(f"open ({args.layout}, mmap_mode='r'): {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Export a trained forest artifact to ONNX for the onnxruntime serving backend (학습 후 실행).
+
+Input:
+  - app/artifacts/best_pr_auc_balancedrf.joblib (또는 ROC artifact / mmap / split / compact 디렉토리)
+  - data/processed/test.csv (동등성 검사용)
+
+Steps:
+  1) compile_pipeline: 전처리 / forest / calibration 분리
+  2) forest -> ONNX TreeEnsembleRegressor (AVERAGE, float32 임계값은 판정 불변 내림)
+     전처리는 기존 컴파일 엔진(fused) 경로, calibration은 CalibrationLayer를 그대로 사용
+     (calibration 파라미터는 ONNX metadata에도 JSON으로 저장)
+  3) 동등성 검사: onnxruntime 경로 vs artifact["pipeline"].predict_proba (test.csv)
+     --atol을 넘거나 threshold 판정이 다르면 저장하지 않고 종료 코드 1
+
+Output:
+  - joblib artifact: <stem>.onnx / 디렉토리 artifact: <dir>/forest.onnx
+    서빙 쪽 adapter는 onnxruntime이 설치되어 있고 sidecar의 source_hash가 artifact와 같을 때만 사용한다.
+    (INFERENCE_BACKEND=sklearn 으로 끌 수 있음)
+
+Requirements: onnx, onnxruntime (export 시 둘 다 필요 / 서빙은 onnxruntime만)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.artifact_store import COMPILED_FOREST_KEY, load_raw_artifact  # noqa: E402
+from adapters.forest_engine import CompiledPipeline, compile_pipeline  # noqa: E402
+from adapters.onnx_backend import (  # noqa: E402
+    META_CHECK,
+    OnnxForest,
+    export_metadata,
+    forest_to_onnx,
+    onnx_sidecar_path,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Export a forest artifact to ONNX with an equivalence check.")
+    default_artifact = APP_DIR / "artifacts" / "best_pr_auc_balancedrf.joblib"
+    default_data = ROOT / "data" / "processed" / "test.csv"
+
+    p.add_argument("--artifact", type=str, default=str(default_artifact), help="Path to artifact")
+    p.add_argument("--data", type=str, default=str(default_data), help="CSV for the equivalence check")
+    p.add_argument("--target", type=str, default="Revenue", help="Target column name (dropped if present)")
+    p.add_argument("--out", type=str, default=None, help="Output .onnx path (default: artifact sidecar)")
+    p.add_argument("--atol", type=float, default=1e-5, help="Max allowed |p_onnx - p_sklearn|")
+    p.add_argument("--threads", type=int, default=None, help="onnxruntime intra-op threads for the check")
+    p.add_argument("--repeat", type=int, default=3, help="Latency repetitions (median)")
+    return p.parse_args()
+
+
+def median_sec(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(max(1, repeat)):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return float(np.median(times))
+
+
+def threshold_of(raw: Any) -> float:
+    if "best_threshold" in raw:
+        return float(raw["best_threshold"])
+    thr = raw.get("best_threshold_f2_on_calib")
+    return float(thr["thr"]) if isinstance(thr, dict) else 0.5
+
+
+def main() -> None:
+    args = parse_args()
+    try:
+        import onnx  # noqa: F401
+        import onnxruntime  # noqa: F401
+    except ImportError as e:
+        raise SystemExit(f"onnx and onnxruntime are required for export ({e}). pip install onnx onnxruntime")
+
+    src = Path(args.artifact)
+    out = Path(args.out) if args.out else onnx_sidecar_path(src)
+    raw = load_raw_artifact(src)
+    if "pipeline" not in raw:
+        raise SystemExit(f"Invalid artifact format (expected 'pipeline'): {src}")
+    pipeline = raw["pipeline"]
+    compiled = compile_pipeline(pipeline, forest=raw.get(COMPILED_FOREST_KEY))
+
+    t = time.perf_counter()
+    model = forest_to_onnx(compiled.forest, metadata=export_metadata(src, compiled))
+    convert_sec = time.perf_counter() - t
+
+    # 검사를 통과한 뒤에만 최종 경로로 옮긴다. (서빙 중인 adapter가 검증 안 된 파일을 읽지 않도록)
+    tmp = out.with_name(out.name + ".tmp")
+    tmp.write_bytes(model.SerializeToString())
+
+    df = pd.read_csv(args.data)
+    X = df.drop(columns=[args.target]) if args.target in df.columns else df
+    backend = CompiledPipeline(
+        preprocess=compiled.preprocess,
+        forest=OnnxForest.open(tmp, n_threads=args.threads),
+        calibration=compiled.calibration,
+        fused=compiled.fused,
+    )
+    expected = np.asarray(pipeline.predict_proba(X))[:, 1]
+    actual = backend.predict_proba(X)[:, 1]
+    thr = threshold_of(raw)
+    diff = np.abs(actual - expected)
+    check = {
+        "data": str(Path(args.data).resolve()),
+        "rows": int(len(X)),
+        "max_abs_diff": float(diff.max()) if len(diff) else 0.0,
+        "mean_abs_diff": float(diff.mean()) if len(diff) else 0.0,
+        "threshold": thr,
+        "decision_mismatches": int(np.sum((actual >= thr) != (expected >= thr))),
+        "atol": args.atol,
+        "sklearn_ms": median_sec(lambda: pipeline.predict_proba(X), args.repeat) * 1000.0,
+        "onnxruntime_ms": median_sec(lambda: backend.predict_proba(X), args.repeat) * 1000.0,
+    }
+    check["passed"] = bool(check["max_abs_diff"] <= args.atol and check["decision_mismatches"] == 0)
+
+    print(f"convert : {convert_sec:.2f}s, {tmp.stat().st_size / 2**20:.2f}MB ({compiled.forest.n_trees} trees)")
+    print(f"check   : max |dp| {check['max_abs_diff']:.3e} (atol={args.atol:.1e}), "
+          f"decision mismatches {check['decision_mismatches']} @ {thr:.4f} ({check['rows']} rows)")
+    print(f"latency : sklearn {check['sklearn_ms']:.1f}ms, onnxruntime {check['onnxruntime_ms']:.1f}ms")
+
+    if not check["passed"]:
+        tmp.unlink()
+        print("❌ equivalence check failed: ONNX model was not saved")
+        sys.exit(1)
+
+    # 검사 결과도 metadata에 남긴다. (source_hash는 export 시점 artifact 기준)
+    model.metadata_props.add(key=META_CHECK, value=json.dumps(check))
+    tmp.write_bytes(model.SerializeToString())
+    tmp.replace(out)
+    print(f"✅ saved ONNX model to: {out.resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Measure resident memory per serving worker for an artifact layout (.joblib / .mmap / .split).
+
+Input:
+  - app/artifacts/best_pr_auc_balancedrf.joblib (또는 export_mmap_artifact.py로 만든 디렉토리)
+  - data/processed/test.csv (워커마다 한 번 채점)
+
+Output (워커별, 모든 워커가 살아 있는 상태에서 측정):
+  - RSS: 워커가 매핑한 물리 메모리 전체
+  - PSS: 공유 페이지를 공유 프로세스 수로 나눠 더한 값 (워커 N개의 실제 합계 ≈ PSS × N)
+  - USS: 그 워커만 쓰는 메모리 (Private_Clean + Private_Dirty)
+  - 로드 전(baseline) 대비 증가분
+
+Notes:
+  - /proc/self/smaps_rollup을 읽으므로 Linux 전용
+  - 워커는 spawn으로 띄운다. (fork면 부모가 이미 읽은 페이지가 copy-on-write로 공유되어 측정이 섞임)
+  - mmap 레이아웃 + mmap_mode면 워커는 serving.pkl + forest/*.npy(공유)로 채점하고 sklearn 트리는 로드하지 않는다.
+    .joblib / mmap_mode=none에서는 sklearn 트리가 unpickle 시 노드 배열을 자체 버퍼로 복사하므로 워커마다 USS에 잡힌다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Measure resident memory per worker for an artifact layout.")
+    default_artifact = APP_DIR / "artifacts" / "best_pr_auc_balancedrf.joblib"
+    default_data = ROOT / "data" / "processed" / "test.csv"
+
+    p.add_argument("--artifact", type=str, default=str(default_artifact), help="Path to artifact (file or directory)")
+    p.add_argument("--data", type=str, default=str(default_data), help="Path to csv to score")
+    p.add_argument("--target", type=str, default="Revenue", help="Target column name (dropped)")
+    p.add_argument("--workers", type=int, default=4, help="Number of worker processes")
+    p.add_argument("--mmap-mode", type=str, default="r", help="mmap_mode for loading ('none' to disable)")
+    p.add_argument("--json", type=str, default=None, help="Optional path to save results as JSON")
+    return p.parse_args()
+
+
+def read_memory_kb() -> Dict[str, int]:
+    """/proc/self/smaps_rollup -> {rss, pss, uss} (kB)"""
+    fields: Dict[str, int] = {}
+    with open("/proc/self/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def worker(
+    artifact: str,
+    data: str,
+    target: str,
+    mmap_mode: Optional[str],
+    loaded: Any,
+    measure: Any,
+    results: Any,
+) -> None:
+    import pandas as pd
+
+    from adapters.forest_engine import compile_pipeline
+    from adapters.model_loader import JoblibArtifactLoader
+
+    features = pd.read_csv(data).drop(columns=[target], errors="ignore")
+    before = read_memory_kb()
+
+    # 서빙과 같은 순서: artifact 로드 -> 단건(CompiledForest) / 배치 채점
+    art = JoblibArtifactLoader(artifact, mmap_mode=mmap_mode).load()
+    compile_pipeline(art.pipeline, forest=art.forest).predict_proba(features.head(1))
+    art.pipeline.predict_proba(features)
+
+    loaded.wait()
+    # 모든 워커가 로드를 마친 뒤에 측정해야 PSS가 공유 프로세스 수를 반영한다.
+    after = read_memory_kb()
+    results.put({"before": before, "after": after})
+    measure.wait()
+
+
+def main() -> None:
+    args = parse_args()
+    mmap_mode = None if args.mmap_mode.lower() == "none" else args.mmap_mode
+
+    ctx = mp.get_context("spawn")
+    loaded = ctx.Barrier(args.workers)
+    measure = ctx.Barrier(args.workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(
+            target=worker,
+            args=(args.artifact, args.data, args.target, mmap_mode, loaded, measure, results),
+        )
+        for _ in range(args.workers)
+    ]
+    for proc in procs:
+        proc.start()
+    rows: List[Dict[str, Any]] = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+
+    print(f"artifact={args.artifact}  workers={args.workers}  mmap_mode={mmap_mode}")
+    for i, row in enumerate(rows):
+        before, after = row["before"], row["after"]
+        print(
+            f"- worker {i}: RSS {after['rss'] / 1024:8.1f} MB  PSS {after['pss'] / 1024:8.1f} MB  "
+            f"USS {after['uss'] / 1024:8.1f} MB  (+USS after load {(after['uss'] - before['uss']) / 1024:7.1f} MB)"
+        )
+    total_pss = sum(r["after"]["pss"] for r in rows) / 1024
+    total_uss = sum(r["after"]["uss"] for r in rows) / 1024
+    print(f"total PSS {total_pss:.1f} MB  (private {total_uss:.1f} MB, shared {total_pss - total_uss:.1f} MB)")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        print(f"\nSaved results to: {Path(args.json).resolve()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Publish serving artifacts into shared memory for all app worker processes on this host.
+
+여러 Streamlit 서버 프로세스가 같은 호스트에서 돌 때, 각 프로세스가 artifact를 따로 unpickle하지 않고
+이 프로세스가 게시한 공유 메모리 블록(forest 노드 배열 + 작은 전처리/calibration blob)에 읽기 전용으로 연결한다.
+
+Usage:
+  # loader 프로세스 (서버들보다 먼저 실행, 계속 떠 있어야 함)
+  python script/publish_shared_models.py
+
+  # worker 프로세스
+  MODEL_SHARED_MEMORY=1 streamlit run app/app.py
+
+  - descriptor 디렉토리: MODEL_SHARED_MEMORY_DIR (기본: <tmp>/purchase-model-shm), 양쪽이 같아야 함
+  - artifact가 바뀌면 --poll_sec 간격으로 감지해 새 버전을 게시하고 이전 블록을 unlink
+    (worker는 ModelRegistry의 파일 지문 확인 / ArtifactWatcher로 새 버전에 다시 연결)
+  - 종료(Ctrl+C / SIGTERM) 시 블록과 descriptor를 정리
+  - 게시되지 않은 artifact는 worker가 기존처럼 직접 로드
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.shared_model import SharedModelPublisher, shared_dir  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Publish forest artifacts into shared memory for worker processes.")
+    artifact_dir = APP_DIR / "artifacts"
+    p.add_argument(
+        "--artifact",
+        action="append",
+        default=None,
+        help="Artifact path (repeatable). Default: ROC-AUC and PR-AUC artifacts",
+    )
+    p.add_argument("--dir", type=str, default=None, help="Descriptor directory (default: MODEL_SHARED_MEMORY_DIR)")
+    p.add_argument("--poll_sec", type=float, default=2.0, help="Artifact change polling interval")
+    p.add_argument("--once", action="store_true", help="Publish, print the descriptors, and exit (cleans up)")
+    args = p.parse_args()
+    if not args.artifact:
+        args.artifact = [
+            str(artifact_dir / "best_balancedrf_pipeline.joblib"),
+            str(artifact_dir / "best_pr_auc_balancedrf.joblib"),
+        ]
+    return args
+
+
+def _interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def main() -> None:
+    args = parse_args()
+    directory = Path(args.dir) if args.dir else shared_dir()
+    paths = [Path(p) for p in args.artifact if Path(p).exists()]
+    missing = [p for p in args.artifact if not Path(p).exists()]
+    for p in missing:
+        print(f"⚠️ skip (not found): {p}")
+    if not paths:
+        raise SystemExit("No artifacts to publish.")
+
+    publisher = SharedModelPublisher(paths, directory=directory)
+    # SIGTERM도 KeyboardInterrupt처럼 finally에서 정리되도록
+    signal.signal(signal.SIGTERM, _interrupt)
+    try:
+        for model in publisher.publish_all():
+            d = model.descriptor
+            print(f"published v{d['version']} {d['block']} ({d['size'] / 2**20:.1f}MB) <- {d['artifact']}")
+        print(f"descriptors: {directory}")
+        if args.once:
+            return
+        while True:
+            time.sleep(args.poll_sec)
+            for path in publisher.check():
+                d = publisher.published[path].descriptor
+                print(f"republished v{d['version']} {d['block']} <- {path}")
+            for path, err in publisher.errors.items():
+                print(f"⚠️ publish failed (keeping previous version): {path}: {err}")
+            publisher.errors.clear()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        publisher.close()
+        print("shared memory blocks released")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,13 @@ Saves a joblib containing:
 - best_threshold: float
 - best_params: dict
 - column lists (num_cols, cat_cols)
+- input_schema: observed ranges / category sets for serving-side input validation
 """
 
 from __future__ import annotations
 
 import argparse
+import sys
 from pathlib import Path
 import joblib
 import pandas as pd
@@ -28,6 +30,13 @@ from sklearn.metrics import (
 
 from imblearn.ensemble import BalancedRandomForestClassifier
 
+# app/adapters를 import하기 위해 app 디렉토리를 path에 추가
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+from adapters.input_validation import INPUT_SCHEMA_KEY, InputValidator  # noqa: E402
+
 
 DEFAULT_BEST_PARAMS = {
     "n_estimators": 1200,
@@ -137,6 +146,7 @@ def main() -> None:
         "best_params": DEFAULT_BEST_PARAMS,
         "num_cols": num_cols,
         "cat_cols": cat_cols,
+        INPUT_SCHEMA_KEY: InputValidator.from_training_data(X_train, num_cols, cat_cols).to_dict(),
         "target_col": args.target,
     }
 
@@ -0,0 +1,111 @@
+"""
+공용 fixture.
+
+- 실제 artifact: ARTIFACT_DIR 환경변수 (없으면 app/artifacts)에 있으면 그대로 사용
+- 없으면 data/processed로 같은 구조의 작은 모델을 학습해서 사용
+  (roc_auc: Pipeline(ColumnTransformer, BalancedRF) / pr_auc: CalibratedClassifierCV(FrozenEstimator(...)))
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+DATA_DIR = ROOT / "data" / "processed"
+if str(APP_DIR) not in sys.path:
+    sys.path.insert(0, str(APP_DIR))
+
+TARGET = "Revenue"
+ARTIFACT_FILES = {
+    "roc_auc": "best_balancedrf_pipeline.joblib",
+    "pr_auc": "best_pr_auc_balancedrf.joblib",
+}
+
+
+def artifact_dir() -> Path:
+    return Path(os.environ.get("ARTIFACT_DIR", APP_DIR / "artifacts"))
+
+
+def _read(name: str) -> pd.DataFrame:
+    return pd.read_csv(DATA_DIR / f"{name}.csv")
+
+
+def build_standin(strategy: str, n_estimators: int = 40, random_state: int = 0):
+    """artifact와 같은 구조의 작은 모델 (data/processed로 학습)"""
+    from imblearn.ensemble import BalancedRandomForestClassifier
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.compose import ColumnTransformer
+    from sklearn.frozen import FrozenEstimator
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, RobustScaler
+
+    train = _read("train")
+    X, y = train.drop(columns=[TARGET]), train[TARGET].astype(int)
+    num_cols = X.select_dtypes(include=["number"]).columns.tolist()
+    cat_cols = X.select_dtypes(include=["object", "str", "bool", "category"]).columns.tolist()
+    preprocess = ColumnTransformer(
+        transformers=[
+            ("num", RobustScaler(), num_cols),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), cat_cols),
+        ],
+        remainder="drop",
+    )
+    max_depth = 20 if strategy == "roc_auc" else 8
+    pipeline = Pipeline(
+        steps=[
+            ("preprocess", preprocess),
+            ("model", BalancedRandomForestClassifier(
+                n_estimators=n_estimators,
+                max_depth=max_depth,
+                sampling_strategy="all",
+                replacement=True,
+                bootstrap=False,
+                random_state=random_state,
+            )),
+        ]
+    )
+    pipeline.fit(X, y)
+    if strategy == "roc_auc":
+        return pipeline
+
+    calib = _read("calib")
+    calibrator = CalibratedClassifierCV(estimator=FrozenEstimator(pipeline), method="sigmoid", cv=None)
+    calibrator.fit(calib.drop(columns=[TARGET]), calib[TARGET].astype(int))
+    return calibrator
+
+
+_MODELS = {}
+
+
+def load_model(strategy: str):
+    """strategy별 artifact["pipeline"] (세션 동안 1회 로드/학습)"""
+    if strategy not in _MODELS:
+        path = artifact_dir() / ARTIFACT_FILES[strategy]
+        if path.exists():
+            import joblib
+
+            _MODELS[strategy] = joblib.load(path)["pipeline"]
+        else:
+            _MODELS[strategy] = build_standin(strategy)
+    return _MODELS[strategy]
+
+
+@pytest.fixture(params=sorted(ARTIFACT_FILES))
+def strategy(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def model(strategy):
+    return load_model(strategy)
+
+
+@pytest.fixture(scope="session")
+def features() -> pd.DataFrame:
+    return _read("test").drop(columns=[TARGET])
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import joblib
+import numpy as np
+import pytest
+
+from adapters import forest_engine
+from adapters.PurchaseIntentModelAdapter import PurchaseIntentModelAdapter
+from adapters.artifact_store import (
+    ServingArtifact,
+    load_raw_artifact,
+    save_mmap_artifact,
+    save_split_artifact,
+    split_sibling,
+)
+from adapters.calibration import base_estimator
+from adapters.model_loader import JoblibArtifactLoader
+from adapters.model_registry import ModelRegistry, get_registry
+
+from conftest import build_standin
+
+
+@pytest.fixture(scope="module")
+def versions():
+    return build_standin("roc_auc", n_estimators=8, random_state=1), build_standin("roc_auc", n_estimators=8, random_state=2)
+
+
+@pytest.fixture(scope="module", params=["roc_auc", "pr_auc"])
+def mmap_dir(request, tmp_path_factory):
+    model = build_standin(request.param, n_estimators=8, random_state=3)
+    raw = {"pipeline": model, "best_threshold": 0.3, "base_pipeline": base_estimator(model)}
+    return model, save_mmap_artifact(raw, tmp_path_factory.mktemp("mmap") / "model.mmap")
+
+
+def _hot_reload(registry: ModelRegistry, path) -> None:
+    # 요청 경로와 같이: 바뀐 manifest를 조회하면 기존 객체를 주면서 manifest만 백그라운드 재로딩
+    registry.load(path)
+    for thread in list(registry._reloading.values()):
+        thread.join()
+    assert not registry.reload_errors
+
+
+def test_split_artifact_lazy_components(versions, features, tmp_path):
+    model, _ = versions
+    out = save_split_artifact({"pipeline": model, "best_threshold": 0.3}, tmp_path / "model.split")
+    art = load_raw_artifact(out)
+    assert art.meta["best_threshold"] == 0.3
+    assert art["pipeline"] is art["pipeline"]
+    np.testing.assert_array_equal(art["pipeline"].predict_proba(features), model.predict_proba(features))
+
+
+def test_hot_reload_swaps_manifest_and_components_together(versions, features, tmp_path):
+    old_model, new_model = versions
+    path = tmp_path / "model.split"
+    registry = ModelRegistry()
+    registry.hot_reload = True
+
+    save_split_artifact({"pipeline": old_model, "best_threshold": 0.3}, path)
+    old = registry.load(path)
+    old_pipeline = old["pipeline"]
+
+    save_split_artifact({"pipeline": new_model, "best_threshold": 0.7}, path)
+    _hot_reload(registry, path)
+    new = registry.load(path)
+
+    assert new["best_threshold"] == 0.7
+    np.testing.assert_array_equal(new["pipeline"].predict_proba(features), new_model.predict_proba(features))
+    # 이미 꺼낸 예전 버전은 그대로 (요청 도중 섞이지 않음)
+    assert old["pipeline"] is old_pipeline
+
+
+def test_joblib_metadata_reads_exported_manifest(versions, tmp_path):
+    model, _ = versions
+    path = tmp_path / "model.joblib"
+    raw = {"pipeline": model, "best_threshold": 0.3}
+    joblib.dump(raw, path)
+    assert split_sibling(path) is None
+
+    save_split_artifact(raw, path.with_suffix(".split"), source=path)
+    assert split_sibling(path) == path.with_suffix(".split")
+    assert PurchaseIntentModelAdapter(path).get_threshold() == 0.3
+    assert JoblibArtifactLoader(path).load_meta()["best_threshold"] == 0.3
+    # 메타 조회로는 .joblib(forest)을 로드하지 않는다.
+    assert get_registry().fingerprint(path) is None
+
+    # export 이후 .joblib이 바뀌면 manifest를 믿지 않고 원본을 읽는다.
+    joblib.dump({**raw, "best_threshold": 0.6}, path)
+    assert split_sibling(path) is None
+    assert PurchaseIntentModelAdapter(path).get_threshold() == 0.6
+
+
+def test_mmap_mode_serves_without_sklearn(mmap_dir, features):
+    model, path = mmap_dir
+    art = load_raw_artifact(path, mmap_mode="r")
+    assert isinstance(art, ServingArtifact)
+    assert art["best_threshold"] == 0.3
+    assert JoblibArtifactLoader(path, mmap_mode="r").load_meta()["best_threshold"] == 0.3
+    np.testing.assert_allclose(art["pipeline"].predict_proba(features), model.predict_proba(features), atol=1e-12)
+    assert not art.full_loaded
+
+
+def test_mmap_mode_loads_sklearn_on_demand(mmap_dir, features, monkeypatch):
+    model, path = mmap_dir
+    art = load_raw_artifact(path, mmap_mode="r")
+    # forest.batch_row_limit를 1로 낮춰 배치가 sklearn 앙상블로 가도록
+    monkeypatch.setattr(forest_engine, "COMPILED_MAX_STEPS", 1)
+    np.testing.assert_allclose(art["pipeline"].predict_proba(features), model.predict_proba(features), atol=1e-12)
+    assert art.full_loaded
+
+    art = load_raw_artifact(path, mmap_mode="r")
+    assert list(art["pipeline"].named_steps) == ["preprocess", "model"]
+    assert list(art["base_pipeline"].named_steps) == ["preprocess", "model"]
+    # mmap_mode 없이 열면 예전처럼 dict
+    assert isinstance(load_raw_artifact(path), dict)
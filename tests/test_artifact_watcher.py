@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+import os
+import time
+
+import joblib
+import numpy as np
+import pytest
+
+from adapters.artifact_watcher import ArtifactWatcher
+from adapters.model_registry import ModelRegistry
+
+from conftest import build_standin
+
+
+def _publish(path, payload) -> None:
+    # 배포와 같이: 임시 파일에 쓴 뒤 rename으로 교체
+    tmp = path.with_suffix(".tmp")
+    if isinstance(payload, bytes):
+        tmp.write_bytes(payload)
+    else:
+        joblib.dump(payload, tmp)
+    os.replace(tmp, path)
+
+
+def _wait_for(condition, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "watcher did not react in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def watched(tmp_path):
+    path = tmp_path / "model.joblib"
+    old_model = build_standin("roc_auc", n_estimators=8, random_state=1)
+    _publish(path, {"pipeline": old_model, "best_threshold": 0.3})
+    registry = ModelRegistry()
+    old = registry.load(path)
+    watcher = ArtifactWatcher(registry, interval_sec=0.01).start()
+    yield registry, path, old
+    watcher.stop()
+
+
+def test_watcher_swaps_to_new_version(watched, features):
+    registry, path, old = watched
+    old_proba = old["pipeline"].predict_proba(features)
+    new_model = build_standin("roc_auc", n_estimators=8, random_state=2)
+    _publish(path, {"pipeline": new_model, "best_threshold": 0.7})
+
+    # 교체 전까지는 기존 객체, 교체 후에는 완성된 새 artifact만 보인다.
+    seen = []
+    def swapped() -> bool:
+        value = registry.load(path)
+        seen.append(value)
+        return value is not old
+    _wait_for(swapped)
+
+    new = registry.load(path)
+    assert registry.version(path) == 2
+    assert new["best_threshold"] == 0.7
+    np.testing.assert_array_equal(new["pipeline"].predict_proba(features), new_model.predict_proba(features))
+    assert all(value is old or value is new for value in seen)
+    # 이미 받아간 예전 버전은 그대로 쓸 수 있다.
+    np.testing.assert_array_equal(old["pipeline"].predict_proba(features), old_proba)
+    assert not registry.reload_errors
+
+
+def test_failed_reload_keeps_old_version(watched, caplog):
+    registry, path, old = watched
+    with caplog.at_level(logging.WARNING, logger="adapters.model_registry"):
+        _publish(path, b"not a joblib file")
+        _wait_for(lambda: bool(registry.reload_errors))
+
+    assert registry.load(path) is old
+    assert registry.version(path) == 1
+    assert any(r.exc_info for r in caplog.records if r.name == "adapters.model_registry")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+
+import joblib
+import numpy as np
+import pytest
+from scipy.special import expit
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.frozen import FrozenEstimator
+
+from adapters.calibration import ISOTONIC, SIGMOID, CalibratedPipeline, CalibrationLayer, upgrade_calibration
+
+from conftest import TARGET, _read, build_standin
+
+ATOL = 1e-12
+
+
+@pytest.fixture(scope="module")
+def base():
+    return build_standin("roc_auc", n_estimators=10, random_state=3)
+
+
+@pytest.fixture(scope="module")
+def calib():
+    frame = _read("calib")
+    return frame.drop(columns=[TARGET]), frame[TARGET].astype(int)
+
+
+def _calibrated(base, calib, method: str) -> CalibratedClassifierCV:
+    X, y = calib
+    return CalibratedClassifierCV(estimator=FrozenEstimator(base), method=method, cv=None).fit(X, y)
+
+
+@pytest.mark.parametrize("method", [SIGMOID, ISOTONIC])
+def test_layer_matches_sklearn(base, calib, features, method):
+    model = _calibrated(base, calib, method)
+    layer = CalibrationLayer.from_sklearn(model)
+    assert layer.method == method and layer.is_monotone
+
+    expected = model.predict_proba(features)[:, 1]
+    pos = base.predict_proba(features)[:, 1].copy()
+    np.testing.assert_allclose(layer.apply(pos), expected, rtol=0, atol=ATOL)
+    # 제자리 계산도 같은 값
+    np.testing.assert_allclose(layer.apply(pos, out=pos), expected, rtol=0, atol=ATOL)
+
+    raw = base.predict_proba(features)[:, 1]
+    restored = CalibrationLayer.from_dict(json.loads(json.dumps(layer.to_dict())))
+    np.testing.assert_array_equal(restored.apply(raw), layer.apply(raw))
+
+
+def test_layer_averages_calibrators():
+    layer = CalibrationLayer(method=SIGMOID, a=np.array([-4.0, -2.0]), b=np.array([1.0, 0.5]))
+    pos = np.linspace(0.0, 1.0, 11)
+    expected = (expit(4.0 * pos - 1.0) + expit(2.0 * pos - 0.5)) / 2
+    np.testing.assert_allclose(layer.apply(pos), expected, rtol=0, atol=ATOL)
+
+
+@pytest.mark.parametrize("method", [SIGMOID, ISOTONIC])
+def test_upgrade_calibration_round_trip(base, calib, features, method, tmp_path):
+    model = _calibrated(base, calib, method)
+    expected = model.predict_proba(features)
+
+    artifact = upgrade_calibration({"pipeline": model, "best_threshold": 0.4})
+    upgraded = artifact["pipeline"]
+    assert isinstance(upgraded, CalibratedPipeline) and upgraded.base is base
+    np.testing.assert_allclose(upgraded.predict_proba(features), expected, rtol=0, atol=ATOL)
+    np.testing.assert_array_equal(upgraded.classes_, model.classes_)
+    # 이미 변환된 artifact는 그대로
+    assert upgrade_calibration(artifact)["pipeline"] is upgraded
+
+    joblib.dump(artifact, tmp_path / "artifact.joblib")
+    reloaded = joblib.load(tmp_path / "artifact.joblib")["pipeline"]
+    np.testing.assert_array_equal(reloaded.predict_proba(features), upgraded.predict_proba(features))
+
+
+def test_upgrade_keeps_per_fold_models(base, calib):
+    X, y = calib
+    model = CalibratedClassifierCV(estimator=base, method=SIGMOID, cv=2).fit(X.head(600), y.head(600))
+    assert upgrade_calibration(model) is model
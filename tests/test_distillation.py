@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pytest
+
+from adapters.distillation import DistillationConfig, fidelity_report, fit_student
+
+from conftest import TARGET, _read, build_standin
+
+
+@pytest.fixture(scope="module")
+def teacher():
+    return build_standin("pr_auc", n_estimators=10, random_state=4)
+
+
+@pytest.fixture(scope="module")
+def holdout():
+    frame = _read("test")
+    return frame.drop(columns=[TARGET]), frame[TARGET].astype(int).to_numpy()
+
+
+def test_fidelity_report_on_itself(teacher, holdout):
+    X, y = holdout
+    report = fidelity_report(teacher, teacher, X, 0.5, y, latency_repeat=2)
+    assert report["rows"] == len(X)
+    assert report["max_abs_error"] == 0.0 and report["agreement_at_threshold"] == 1.0
+    assert report["pr_auc_delta"] == 0.0
+
+
+def test_fidelity_report_on_student(teacher, holdout):
+    X, y = holdout
+    train = _read("train").drop(columns=[TARGET])
+    num_cols = train.select_dtypes(include=["number"]).columns.tolist()
+    cat_cols = [c for c in train.columns if c not in num_cols]
+    config = DistillationConfig(augment_factor=0.5, student_params={"max_iter": 40})
+    student = fit_student(teacher, train, num_cols, cat_cols, config)
+
+    report = fidelity_report(teacher, student, X, 0.5, y, latency_repeat=2)
+    json.dumps(report)
+    assert 0.0 <= report["mean_abs_error"] <= report["p99_abs_error"] <= report["max_abs_error"] <= 1.0
+    # soft label 학습이라 student 확률은 teacher 근처에 있어야 한다.
+    assert report["mean_abs_error"] < 0.1
+    assert report["agreement_at_threshold"] > 0.8
+    assert 0.0 <= report["pr_auc_student"] <= 1.0
+    assert report["pr_auc_delta"] == pytest.approx(report["pr_auc_student"] - report["pr_auc_teacher"])
+    assert all(v > 0 for v in report["latency_ms"].values())
+    assert all(v > 0 for v in report["size_mb"].values())
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from adapters import feature_schema
+from adapters.feature_schema import FeatureSchema
+
+
+def test_align_fills_orders_and_casts():
+    schema = FeatureSchema(columns=("a", "b", "c"), numeric_columns=("a",), fill_values={"b": 0, "c": 0})
+    out = schema.align(pd.DataFrame({"c": [1], "a": ["2.5"], "extra": [9]}))
+    assert list(out.columns) == ["a", "b", "c"]
+    assert out.iloc[0].tolist() == [2.5, 0, 1]
+
+
+def test_plan_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(feature_schema, "MAX_PLANS", 4)
+    schema = FeatureSchema(columns=("a", "b"), fill_values={"a": 0, "b": 0})
+    for i in range(10):
+        schema.align(pd.DataFrame({"a": [1], f"x{i}": [0]}))
+    assert len(schema._plans) == 4
+    assert ("a", "x9") in schema._plans
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from sklearn.metrics import average_precision_score
+
+from adapters.calibration import base_estimator
+from adapters.forest_compaction import _float32_floor, compact_forest, drop_estimators, select_trees
+from adapters.forest_engine import _split_pipeline, compile_pipeline
+
+from conftest import TARGET, _read, build_standin
+
+
+@pytest.fixture
+def standin(strategy):
+    # drop_estimators가 모델을 바꾸므로 테스트마다 새로 만든다.
+    return build_standin(strategy, n_estimators=12, random_state=5)
+
+
+def test_collapse_keeps_tree_predictions(standin, features):
+    compiled = compile_pipeline(standin)
+    Xt = compiled.transform(features)
+    compact, stats = compact_forest(compiled.forest, float32=False)
+    assert stats.n_trees_after == compiled.forest.n_trees
+    assert stats.n_nodes_after == compact.n_nodes <= stats.n_nodes_before
+    np.testing.assert_array_equal(compact.predict_tree_proba(Xt), compiled.forest.predict_tree_proba(Xt))
+
+
+def test_float32_forest_matches_sklearn_trees(standin, features):
+    compiled = compile_pipeline(standin)
+    Xt = compiled.transform(features)
+    compact, stats = compact_forest(compiled.forest, float32=True)
+    assert compact.threshold.dtype == np.float32 and stats.bytes_after < stats.bytes_before
+    # 임계값을 내림했으므로 분기가 같고, 차이는 float32 leaf 값의 반올림뿐
+    np.testing.assert_allclose(compact.predict_tree_proba(Xt), compiled._estimator_tree_proba(Xt), rtol=0, atol=1e-7)
+
+
+def test_float32_floor_keeps_float32_decisions():
+    rng = np.random.default_rng(0)
+    threshold = rng.normal(size=2000) * 10.0 ** rng.integers(-3, 4, size=2000)
+    floor = _float32_floor(threshold)
+    assert floor.dtype == np.float32 and (floor.astype(np.float64) <= threshold).all()
+    # 임계값 바로 아래 / 위의 float32 입력
+    below, above = floor, np.nextafter(floor, np.float32(np.inf))
+    for x in (below, above):
+        np.testing.assert_array_equal(x.astype(np.float64) <= threshold, x <= floor)
+
+
+def test_drop_estimators_keeps_trees_and_samplers_aligned(standin, features):
+    _, forest = _split_pipeline(base_estimator(standin))
+    estimators, samplers, pipelines = list(forest.estimators_), list(forest.samplers_), list(forest.pipelines_)
+    keep = [0, 3, 5, 10]
+    compiled = compile_pipeline(standin)
+    compact, _ = compact_forest(compiled.forest, keep_trees=keep)
+
+    assert drop_estimators(standin, keep) == len(keep) == forest.n_estimators
+    assert forest.estimators_ == [estimators[i] for i in keep]
+    assert forest.samplers_ == [samplers[i] for i in keep]
+    assert forest.pipelines_ == [pipelines[i] for i in keep]
+
+    # 줄인 sklearn forest와 compact forest는 같은 트리를 쓴다 (큰 배치 경로도 같은 결과)
+    recompiled = compile_pipeline(standin, forest=compact)
+    assert recompiled.estimator is forest
+    Xt = recompiled.transform(features)
+    np.testing.assert_allclose(compact.predict_tree_proba(Xt), recompiled._estimator_tree_proba(Xt), rtol=0, atol=1e-7)
+    np.testing.assert_allclose(
+        recompiled.predict_proba(features)[:, 1], standin.predict_proba(features)[:, 1], rtol=0, atol=1e-6
+    )
+
+
+def test_select_trees_respects_tolerance(standin):
+    calib = _read("calib")
+    y = calib[TARGET].astype(int).to_numpy()
+    compiled = compile_pipeline(standin)
+    tree_proba = compiled.forest.predict_tree_proba(compiled.transform(calib.drop(columns=[TARGET])))
+    tol = 0.01
+    keep = select_trees(tree_proba, y, average_precision_score, tol=tol, min_trees=4, calibrate=compiled.calibrate)
+
+    assert keep == sorted(set(keep)) and 4 <= len(keep) <= tree_proba.shape[1]
+    baseline = average_precision_score(y, compiled.calibrate(tree_proba.mean(axis=1)))
+    kept = average_precision_score(y, compiled.calibrate(tree_proba[:, keep].mean(axis=1)))
+    assert baseline - kept <= tol + 1e-12
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters import forest_engine
+from adapters.forest_engine import compile_pipeline
+from adapters.session_fast_path import SessionFastPath
+
+ATOL = 1e-9
+
+
+@pytest.fixture
+def compiled(model):
+    return compile_pipeline(model)
+
+
+def _sklearn_pos(model, features):
+    return np.asarray(model.predict_proba(features))[:, 1]
+
+
+def test_compiled_matches_sklearn(model, compiled, features):
+    # estimator 없이 compiled 순회만 사용
+    actual = replace(compiled, estimator=None).predict_proba(features)
+    np.testing.assert_allclose(actual[:, 1], _sklearn_pos(model, features), rtol=0, atol=ATOL)
+    np.testing.assert_allclose(actual.sum(axis=1), 1.0, rtol=0, atol=ATOL)
+
+
+def test_large_batch_routes_to_sklearn(model, compiled, features, monkeypatch):
+    assert compiled.estimator is not None
+    assert not compiled.uses_estimator(1)
+
+    monkeypatch.setattr(forest_engine, "COMPILED_MAX_STEPS", 1)
+    assert compiled.uses_estimator(len(features))
+    actual = compiled.predict_proba(features)[:, 1]
+    np.testing.assert_allclose(actual, _sklearn_pos(model, features), rtol=0, atol=ATOL)
+
+
+def test_spread_routes_agree(compiled, features, monkeypatch):
+    head = features.head(300)
+    expected = replace(compiled, estimator=None).predict_spread(head)
+    monkeypatch.setattr(forest_engine, "COMPILED_MAX_STEPS", 1)
+    actual = compiled.predict_spread(head)
+    np.testing.assert_allclose(actual.probability, expected.probability, rtol=0, atol=ATOL)
+    np.testing.assert_allclose(actual.variance, expected.variance, rtol=0, atol=ATOL)
+    np.testing.assert_allclose(actual.quantiles, expected.quantiles, rtol=0, atol=ATOL)
+
+
+def test_fast_path_matches_sklearn(model, features):
+    fast = SessionFastPath.from_model(model)
+    head = features.head(64)
+    expected = _sklearn_pos(model, head)
+    records = head.to_dict("records")
+    np.testing.assert_allclose([fast.predict_one(r) for r in records], expected, rtol=0, atol=ATOL)
+    np.testing.assert_allclose(fast.predict_many(records), expected, rtol=0, atol=ATOL)
+
+
+def test_decide_matches_threshold(model, compiled, features):
+    pos = _sklearn_pos(model, features)
+    threshold = float(np.quantile(pos, 0.9))
+    decision = compiled.decide(features, threshold)
+    np.testing.assert_array_equal(decision.decision, pos >= threshold)
+    assert decision.trees_used.max() <= decision.n_trees
+    assert decision.mean_trees_used < decision.n_trees
+
+
+def test_spread_mean_matches_predict_proba(compiled, features):
+    head = features.head(300)
+    plain = replace(compiled, estimator=None)
+    spread = plain.predict_spread(head)
+    np.testing.assert_allclose(spread.probability, plain.predict_proba(head)[:, 1], rtol=0, atol=ATOL)
+    assert (spread.variance >= 0).all()
+    assert (np.diff(spread.quantiles, axis=1) >= -ATOL).all()
+
+
+def test_progressive_ends_exact(compiled, features):
+    head = features.head(50)
+    estimates = list(compiled.predict_progressive(head, first_trees=8, chunk_trees=16))
+    final = estimates[-1]
+    assert final.exact and final.trees_used == compiled.forest.n_trees
+    assert all(not e.exact for e in estimates[:-1])
+    np.testing.assert_array_equal(final.probability, replace(compiled, estimator=None).predict_proba(head)[:, 1])
+    for estimate in estimates[:-1]:
+        assert (estimate.lower <= final.probability + ATOL).all()
+        assert (final.probability <= estimate.upper + ATOL).all()
+
+
+def test_fused_record_matches_frame_with_none(compiled, features):
+    fused = compiled.fused
+    record = features.iloc[0].to_dict()
+    record[fused.numeric_columns[0]] = None
+    expected = fused.transform(pd.DataFrame([record])[list(features.columns)])
+    np.testing.assert_array_equal(fused.transform_record(record), expected)
+    assert np.isnan(fused.transform_record(record)).any()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from adapters.input_validation import (
+    BAD_TYPE,
+    MISSING,
+    NEGATIVE,
+    NOT_INTEGER,
+    OUT_OF_RANGE,
+    UNKNOWN_CATEGORY,
+    InputValidator,
+    describe_code,
+)
+
+NUM_COLS = ["Administrative", "ProductRelated_Duration", "BounceRates", "PageValues"]
+CAT_COLS = ["Month", "VisitorType", "Weekend"]
+
+
+@pytest.fixture(scope="module")
+def validator():
+    from conftest import _read
+
+    return InputValidator.from_training_data(_read("train"), NUM_COLS, CAT_COLS)
+
+
+@pytest.fixture
+def clean(features):
+    return features[NUM_COLS + CAT_COLS].head(8).reset_index(drop=True)
+
+
+def test_clean_rows_pass(validator, features):
+    report = validator.validate(features[NUM_COLS + CAT_COLS])
+    assert not (report.codes & ~np.uint16(OUT_OF_RANGE)).any()
+    assert report.valid.all()
+
+
+@pytest.mark.parametrize(
+    "column, value, code",
+    [
+        ("Administrative", np.nan, MISSING),
+        ("Administrative", -1, NEGATIVE | OUT_OF_RANGE),  # 학습 최솟값 0 밖
+        ("Administrative", 1.5, NOT_INTEGER),
+        ("PageValues", 1e9, OUT_OF_RANGE),
+        ("Month", "Smarch", UNKNOWN_CATEGORY),
+        ("Month", None, MISSING),
+        ("Weekend", "True", BAD_TYPE),
+    ],
+)
+def test_row_codes(validator, clean, column, value, code):
+    batch = clean.astype({column: object})
+    batch.loc[3, column] = value
+    report = validator.validate(batch)
+    assert report.codes[3] == code
+    assert not np.delete(report.codes, 3).any()
+    assert report.column_counts == {column: 1}
+    assert report.valid[3] == (code == OUT_OF_RANGE)
+
+
+def test_non_numeric_string_is_bad_type(validator, clean):
+    batch = clean.astype({"BounceRates": object})
+    batch.loc[0, "BounceRates"] = "n/a"
+    batch.loc[1, "BounceRates"] = "0.05"
+    report = validator.validate(batch)
+    assert report.codes[0] == BAD_TYPE
+    assert report.codes[1] == 0
+
+
+def test_missing_column_flags_every_row(validator, clean):
+    report = validator.validate(clean.drop(columns=["VisitorType"]))
+    assert (report.codes == MISSING).all()
+    assert report.column_counts == {"VisitorType": len(clean)}
+
+
+def test_split_and_round_trip(validator, clean):
+    batch = clean.astype({"Month": object})
+    batch.loc[[2, 5], "Month"] = "Smarch"
+    restored = InputValidator.from_dict(validator.to_dict())
+    report = restored.validate(batch)
+    np.testing.assert_array_equal(report.codes, validator.validate(batch).codes)
+
+    ok, quarantined = report.split(batch)
+    assert list(quarantined.index) == [2, 5]
+    assert len(ok) == len(batch) - 2
+    assert quarantined["error_reasons"].tolist() == [",".join(describe_code(UNKNOWN_CATEGORY))] * 2
+    assert report.summary() == {describe_code(UNKNOWN_CATEGORY)[0]: 2}
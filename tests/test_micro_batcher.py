@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from adapters.micro_batcher import MicroBatchConfig, MicroBatchDispatcher
+
+
+def _slow_double(records):
+    time.sleep(0.002)
+    return np.asarray(records, dtype=np.float64) * 2
+
+
+@pytest.mark.parametrize("max_queue", [1024, 2])
+def test_concurrent_counters_add_up(max_queue):
+    n = 400
+    config = MicroBatchConfig(max_batch=16, max_queue=max_queue, deadline_ms=5000.0)
+    dispatcher = MicroBatchDispatcher(_slow_double, config=config)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(dispatcher.predict, range(n)))
+    assert results == [2.0 * i for i in range(n)]
+
+    stats = dispatcher.stats()
+    assert stats["requests"] + stats["overloaded"] + stats["expired"] == n
+    assert stats["batches"] <= stats["requests"]
+    if max_queue == 2:
+        assert stats["overloaded"] > 0
+    else:
+        assert stats["requests"] == n
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import logging
+
+import joblib
+import numpy as np
+import pytest
+
+onnx = pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+
+from adapters.forest_engine import compile_pipeline  # noqa: E402
+from adapters.onnx_backend import (  # noqa: E402
+    export_metadata,
+    forest_to_onnx,
+    load_onnx_pipeline,
+    onnx_sidecar_path,
+)
+
+
+def _export(tmp_path, model):
+    artifact = tmp_path / "model.joblib"
+    joblib.dump(model, artifact)
+    compiled = compile_pipeline(model)
+    onnx.save(forest_to_onnx(compiled.forest, metadata=export_metadata(artifact, compiled)), onnx_sidecar_path(artifact))
+    return artifact
+
+
+def test_onnx_matches_sklearn(tmp_path, model, features):
+    artifact = _export(tmp_path, model)
+    pipeline = load_onnx_pipeline(artifact, model)
+    assert pipeline is not None
+
+    expected = model.predict_proba(features)[:, 1]
+    got = pipeline.predict_proba(features)[:, 1]
+    np.testing.assert_allclose(got, expected, atol=1e-5)
+    np.testing.assert_array_equal(got >= 0.5, expected >= 0.5)
+
+
+def test_stale_sidecar_is_ignored(tmp_path, model):
+    artifact = _export(tmp_path, model)
+    joblib.dump({"pipeline": model}, artifact)
+    assert load_onnx_pipeline(artifact, model) is None
+
+
+def test_broken_sidecar_logs_and_falls_back(tmp_path, model, caplog):
+    artifact = _export(tmp_path, model)
+    onnx_sidecar_path(artifact).write_bytes(b"not an onnx model")
+    with caplog.at_level(logging.WARNING, logger="adapters.onnx_backend"):
+        assert load_onnx_pipeline(artifact, model) is None
+    assert "Cannot use ONNX sidecar" in caplog.text
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+
+from adapters.forest_engine import compile_pipeline
+from adapters.path_contributions import NO_FEATURE, explain_compiled, top_k_columns
+
+ATOL = 1e-9
+
+
+def test_contributions_sum_to_prediction(model, features):
+    compiled = compile_pipeline(model)
+    X = compiled.transform(features.head(200))
+    pos, contributions, bias = compiled.forest.predict_contributions(X)
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), pos, rtol=0, atol=1e-6)
+    np.testing.assert_allclose(pos, compiled.forest.predict_proba(X)[:, 1], rtol=0, atol=ATOL)
+
+
+def test_explanation_probability_matches_predict_proba(model, features):
+    compiled = compile_pipeline(model)
+    head = features.head(200)
+    explanation = explain_compiled(compiled, head, top_k=3, exclude=("row_id",))
+    expected = replace(compiled, estimator=None).predict_proba(head)[:, 1]
+    np.testing.assert_allclose(explanation.probability, expected, rtol=0, atol=ATOL)
+    assert explanation.top_features.shape == (len(head), 3)
+    assert "row_id" not in {explanation.feature_names[j] for j in explanation.top_features.ravel() if j >= 0}
+
+
+def test_top_k_columns_orders_by_magnitude():
+    contributions = np.array([[0.1, -0.5, 0.0, 0.2], [0.0, 0.0, 0.0, 0.3]])
+    top, values = top_k_columns(contributions, 3)
+    np.testing.assert_array_equal(top, [[1, 3, 0], [3, NO_FEATURE, NO_FEATURE]])
+    np.testing.assert_allclose(values, [[-0.5, 0.2, 0.1], [0.3, 0.0, 0.0]])
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from adapters.prediction_cache import PredictionCache
+
+
+def _counting(calls):
+    def score(frame):
+        calls.append(len(frame))
+        return frame["x"].to_numpy(dtype=np.float64) / 10.0
+
+    return score
+
+
+def _frame(n):
+    return pd.DataFrame({"x": np.arange(n, dtype=np.float64), "c": ["a"] * n})
+
+
+def test_small_batches_are_cached():
+    cache = PredictionCache(max_entries=16, max_rows=4)
+    calls = []
+    frame = _frame(3)
+    first = cache.predict(frame, "token", _counting(calls))
+    second = cache.predict(frame, "token", _counting(calls))
+    np.testing.assert_array_equal(first, second)
+    assert calls == [3]
+    assert cache.stats()["hits"] == 3
+
+
+def test_only_missing_rows_are_scored():
+    cache = PredictionCache(max_entries=16, max_rows=4)
+    calls = []
+    cache.predict(_frame(2), "token", _counting(calls))
+    out = cache.predict(_frame(4), "token", _counting(calls))
+    np.testing.assert_array_equal(out, np.arange(4) / 10.0)
+    assert calls == [2, 2]
+
+
+def test_bulk_batches_bypass_cache():
+    cache = PredictionCache(max_entries=16, max_rows=4)
+    calls = []
+    cache.predict(_frame(2), "token", _counting(calls))
+    out = cache.predict(_frame(100), "token", _counting(calls))
+    np.testing.assert_array_equal(out, np.arange(100) / 10.0)
+    stats = cache.stats()
+    # 대량 채점은 LRU를 밀어내지 않는다.
+    assert stats["entries"] == 2 and stats["evictions"] == 0
+    assert stats["bypassed_rows"] == 100
+    assert calls == [2, 100]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.purchase_model_adapter import MODEL_STRATEGIES, PurchaseModelAdapter, PurchaseModelAdapterConfig
+from conftest import APP_DIR, ROOT, load_model
+
+ATOL = 1e-9
+
+
+@pytest.fixture(scope="module")
+def artifact_paths(tmp_path_factory):
+    out = tmp_path_factory.mktemp("artifacts")
+    paths = {}
+    for strategy in MODEL_STRATEGIES:
+        paths[strategy] = out / f"{strategy}.joblib"
+        joblib.dump({"pipeline": load_model(strategy), "best_threshold": 0.5}, paths[strategy])
+    return paths
+
+
+def _adapter(paths, micro_batch=False) -> PurchaseModelAdapter:
+    return PurchaseModelAdapter(PurchaseModelAdapterConfig(
+        root_dir=ROOT,
+        app_dir=APP_DIR,
+        roc_auc_model_path=paths["roc_auc"],
+        pr_auc_model_path=paths["pr_auc"],
+        micro_batch=micro_batch,
+    ))
+
+
+def test_predict_proba_all_matches_each_strategy(artifact_paths, features):
+    adapter = _adapter(artifact_paths)
+    head = features.head(300)
+    table = adapter.predict_proba_all(head)
+    assert list(table.index) == list(MODEL_STRATEGIES)
+    assert list(table.columns) == list(head.index)
+    for strategy in MODEL_STRATEGIES:
+        expected = np.asarray(load_model(strategy).predict_proba(head))[:, 1]
+        np.testing.assert_allclose(table.loc[strategy].to_numpy(), expected, rtol=0, atol=ATOL)
+
+
+@pytest.mark.parametrize("micro_batch", [False, True])
+def test_record_paths_match_dataframe(artifact_paths, features, micro_batch):
+    adapter = _adapter(artifact_paths, micro_batch=micro_batch)
+    head = features.head(16)
+    records = head.to_dict("records")
+    for strategy in MODEL_STRATEGIES:
+        expected = np.asarray(load_model(strategy).predict_proba(head))[:, 1]
+        single = [adapter.predict_record_probability(r, strategy=strategy) for r in records]
+        np.testing.assert_allclose(single, expected, rtol=0, atol=ATOL)
+        np.testing.assert_allclose(adapter.predict_records_probability(records, strategy=strategy), expected, rtol=0, atol=ATOL)
+        one = adapter.predict_purchase_probability(pd.DataFrame([records[0]]), strategy=strategy)
+        assert one == pytest.approx(expected[0], abs=ATOL)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from adapters.forest_engine import compile_pipeline
+from service.session_batch import RISK_BANDS, SessionBatch, SessionBatchResult, risk_band_codes
+
+
+def _as_plain(df: pd.DataFrame) -> pd.DataFrame:
+    return df.apply(lambda s: s.astype(object) if isinstance(s.dtype, pd.CategoricalDtype) else s)
+
+
+def test_frame_round_trip(features):
+    batch = SessionBatch.from_frame(features)
+    assert len(batch) == len(features)
+    assert batch.names == [c for c in features.columns if c in batch.columns] + list(batch.codes)
+    out = batch.to_frame()[list(features.columns)]
+    pd.testing.assert_frame_equal(_as_plain(out), features.astype({c: object for c in batch.codes}))
+
+
+def test_take_and_category_mask(features):
+    batch = SessionBatch.from_frame(features)
+    rows = np.flatnonzero(batch.category_mask("VisitorType", "New_Visitor"))
+    assert len(rows) == int((features["VisitorType"] == "New_Visitor").sum())
+    sub = batch.take(rows)
+    assert list(sub.index) == list(features.index[rows])
+    assert set(sub.to_frame()["VisitorType"].astype(object)) == {"New_Visitor"}
+    assert not batch.category_mask("VisitorType", "Alien").any()
+
+
+def test_from_arrays_matches_from_frame():
+    frame = pd.DataFrame({"x": [1.0, 2.0, 3.0], "c": ["a", "b", "a"]})
+    batch = SessionBatch.from_arrays({"x": [1.0, 2.0, 3.0]}, {"c": ([0, 1, 0], ["a", "b"])})
+    pd.testing.assert_frame_equal(_as_plain(batch.to_frame()), _as_plain(SessionBatch.from_frame(frame).to_frame()))
+    with pytest.raises(ValueError):
+        SessionBatch.from_arrays({"x": [1.0, 2.0]}, {"c": ([0, 1, 0], ["a", "b"])})
+
+
+def test_batch_scores_like_frame(model, features):
+    compiled = replace(compile_pipeline(model), estimator=None)
+    head = features.head(200)
+    expected = compiled.predict_proba(head)[:, 1]
+    actual = compiled.predict_proba(SessionBatch.from_frame(head).to_frame())[:, 1]
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+
+
+def test_result_frame():
+    prob = np.array([0.1, 0.45, 0.9])
+    band = risk_band_codes(prob)
+    result = SessionBatchResult(
+        probability=prob,
+        risk_band=band,
+        label=band,
+        reasons=np.array([[0, -1], [1, 0], [-1, -1]], dtype=np.int16),
+        reason_texts=("r0", "r1"),
+    )
+    assert band.tolist() == [0, 1, 2]
+    assert result.band_counts() == dict.fromkeys(RISK_BANDS, 1)
+    assert result.reasons_of(1) == ["r1", "r0"]
+    assert result.reason_counts() == {"r0": 2, "r1": 1}
+    frame = result.to_frame()
+    assert frame["risk_band"].astype(object).tolist() == list(RISK_BANDS)
+    assert frame["n_reasons"].tolist() == [1, 2, 0]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+import joblib
+import numpy as np
+import pytest
+
+from adapters.calibration import base_estimator
+from adapters.shared_model import SharedModelPublisher, SharedPipeline, attach_shared_artifact
+
+from conftest import build_standin
+
+
+@pytest.fixture(scope="module")
+def versions():
+    return build_standin("pr_auc", n_estimators=8, random_state=1), build_standin("pr_auc", n_estimators=8, random_state=2)
+
+
+def _dump(model, path, threshold: float) -> None:
+    joblib.dump({"pipeline": model, "base_pipeline": base_estimator(model), "best_threshold": threshold}, path)
+
+
+@pytest.fixture
+def published(versions, tmp_path):
+    path = tmp_path / "model.joblib"
+    _dump(versions[0], path, 0.3)
+    publisher = SharedModelPublisher([path], directory=tmp_path / "shm")
+    publisher.publish_all()
+    yield publisher, path.resolve()
+    publisher.close()
+
+
+def test_attach_matches_artifact(versions, published, features):
+    publisher, path = published
+    art = attach_shared_artifact(path, publisher.directory)
+    assert isinstance(art["pipeline"], SharedPipeline)
+    assert art["best_threshold"] == 0.3
+    np.testing.assert_allclose(art["pipeline"].predict_proba(features), versions[0].predict_proba(features), atol=1e-12)
+    assert not art.full_loaded
+
+    # 페이지(06_xai / 09_model_compare)가 쓰는 sklearn 객체는 처음 접근할 때 로드
+    assert list(art["base_pipeline"].named_steps) == ["preprocess", "model"]
+    assert list(art["pipeline"].named_steps) == ["preprocess", "model"]
+
+
+def test_republish_unlinks_old_block(versions, published, features):
+    publisher, path = published
+    old = attach_shared_artifact(path, publisher.directory)
+    old_block = publisher.published[path].block.name
+
+    _dump(versions[1], path, 0.7)
+    assert publisher.check() == [path]
+    new = attach_shared_artifact(path, publisher.directory)
+    assert new["pipeline"].shared_version == old["pipeline"].shared_version + 1
+    assert new["best_threshold"] == 0.7
+    np.testing.assert_allclose(new["pipeline"].predict_proba(features), versions[1].predict_proba(features), atol=1e-12)
+
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=old_block)
+    # 이미 붙어 있던 worker의 매핑은 unlink 후에도 유효
+    np.testing.assert_allclose(old["pipeline"].predict_proba(features), versions[0].predict_proba(features), atol=1e-12)
+
+
+def test_stale_descriptor_falls_back(versions, published):
+    publisher, path = published
+    # 게시 프로세스가 아직 새 파일을 올리지 않았으면 기다렸다가 None (호출부는 일반 로드)
+    _dump(versions[1], path, 0.7)
+    assert attach_shared_artifact(path, publisher.directory, wait_sec=0.2) is None
+
+    publisher.check()
+    assert attach_shared_artifact(path, publisher.directory, wait_sec=0.2)["best_threshold"] == 0.7